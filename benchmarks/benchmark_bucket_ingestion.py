@@ -0,0 +1,104 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""Benchmark the scaling of ``write_granules_bucket(parallel="processes")`` with the number of cores.
+
+Usage: ``python benchmarks/benchmark_bucket_ingestion.py --n_granules 32``
+
+A synthetic archive of 2A-GMI granules is written to a temporary directory.
+The granules are then ingested in a 5° geographic bucket with ``parallel=False``
+and with ``parallel="processes"`` using an increasing number of worker processes.
+The throughput is reported in granules per minute.
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import gpm
+from gpm.bucket import LonLatPartitioning, write_granules_bucket
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+VARIABLES = ["surfacePrecipitation", "convectivePrecipitation", "rainWaterPath", "iceWaterPath"]
+
+
+def granule_to_df(filepath):
+    """Open a granule and return a pandas dataframe."""
+    ds = gpm.open_granule(filepath, variables=VARIABLES)
+    return ds.gpm.to_pandas_dataframe()
+
+
+def create_synthetic_archive(dir_path, n_granules):
+    """Create a synthetic archive of 2A-GMI granules."""
+    os.makedirs(dir_path, exist_ok=True)
+    for i in range(n_granules):
+        start_time = START_TIME + i * ORBIT_DURATION
+        create_fake_granule(dir_path, start_time, granule_id=36000 + i, variables=VARIABLES)
+    return sorted(os.path.join(dir_path, filename) for filename in os.listdir(dir_path))
+
+
+def time_write_granules_bucket(filepaths, bucket_dir, **kwargs):
+    """Return the throughput (in granules per minute) of the bucket ingestion."""
+    t_i = time.perf_counter()
+    write_granules_bucket(
+        filepaths=filepaths,
+        bucket_dir=bucket_dir,
+        partitioning=LonLatPartitioning(size=5),
+        granule_to_df_func=granule_to_df,
+        **kwargs,
+    )
+    return len(filepaths) / (time.perf_counter() - t_i) * 60
+
+
+def main(n_granules, max_workers):
+    list_max_workers = [n for n in [1, 2, 4, 8, 16, 32, 64] if n < max_workers] + [max_workers]
+    with tempfile.TemporaryDirectory() as tmp_dir, gpm.config.set({"warn_non_contiguous_scans": False}):
+        filepaths = create_synthetic_archive(os.path.join(tmp_dir, "granules"), n_granules=n_granules)
+        rate_serial = time_write_granules_bucket(filepaths, os.path.join(tmp_dir, "serial"), parallel=False)
+        print(f"Number of granules: {n_granules}")
+        print(f"- parallel=False: {rate_serial:.1f} granules/minute")
+        for n_workers in list_max_workers:
+            rate = time_write_granules_bucket(
+                filepaths,
+                os.path.join(tmp_dir, f"processes_{n_workers}"),
+                parallel="processes",
+                max_workers=n_workers,
+            )
+            print(
+                f"- parallel='processes', max_workers={n_workers}: {rate:.1f} granules/minute "
+                f"(speedup {rate / rate_serial:.1f}x)",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_granules", type=int, default=32)
+    parser.add_argument("--max_workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    main(n_granules=args.n_granules, max_workers=args.max_workers)
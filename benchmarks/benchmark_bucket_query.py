@@ -0,0 +1,125 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""Benchmark a small-region, single-variable ``read_bucket`` query on a large bucket.
+
+Usage: ``python benchmarks/benchmark_bucket_query.py --n_rows 20_000_000``
+
+A synthetic bucket with random points over a 30° x 30° region and several variables
+is written with a 10° ``LonLatPartitioning``. The rows are sorted by latitude (as along the orbits of
+the merged archives), so that the row groups statistics are selective.
+The query reads a single variable within a 2° x 2° region with:
+
+- the former reader: eager ``pl.read_parquet`` of the selected partitions and spatial filtering in memory;
+- ``read_bucket`` with the hive partition columns (without manifest);
+- ``read_bucket`` with the bucket manifest.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from gpm.bucket import LonLatPartitioning, write_bucket
+from gpm.bucket.filters import filter_by_extent
+from gpm.bucket.io import get_bucket_partitioning, get_filepaths_within_paths
+from gpm.bucket.manifest import get_manifest_filepath
+from gpm.bucket.readers import read_bucket
+
+EXTENT = [10, 12, 40, 42]
+VARIABLES = [f"var_{i}" for i in range(8)]
+
+
+def create_synthetic_bucket(bucket_dir, n_rows, row_group_size):
+    """Write a synthetic bucket with random points over a 30° x 30° region."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "lon": rng.uniform(0, 30, n_rows),
+            "lat": rng.uniform(30, 60, n_rows),
+            "time": pd.Timestamp("2020-01-01") + pd.to_timedelta(np.arange(n_rows), unit="ms"),
+        },
+    )
+    for variable in VARIABLES:
+        df[variable] = rng.random(n_rows, dtype="float32")
+    df = df.sort_values("lat", ignore_index=True)
+    write_bucket(df, bucket_dir=bucket_dir, partitioning=LonLatPartitioning(size=10), row_group_size=row_group_size)
+
+
+def read_eager(bucket_dir, extent, variable):
+    """Read the bucket as the former ``read_bucket``: eager read of the partitions, then filtering."""
+    partitioning = get_bucket_partitioning(bucket_dir)
+    paths = [os.path.join(bucket_dir, dir_tree) for dir_tree in partitioning.directories_by_extent(extent)]
+    paths = [path for path in paths if os.path.exists(path)]
+    filepaths = get_filepaths_within_paths(paths)
+    df = pl.read_parquet(filepaths, hive_partitioning=False)
+    return filter_by_extent(df, extent=extent).select(variable)
+
+
+def read_lazy(bucket_dir, extent, variable):
+    """Read the bucket with the lazy query of ``read_bucket``."""
+    return read_bucket(bucket_dir, extent=extent, columns=[variable])
+
+
+def time_function(func, n_repeats, **kwargs):
+    """Return the best elapsed time (in seconds) and the output of a function."""
+    list_elapsed = []
+    for _ in range(n_repeats):
+        t_i = time.perf_counter()
+        output = func(**kwargs)
+        list_elapsed.append(time.perf_counter() - t_i)
+    return min(list_elapsed), output
+
+
+def main(n_rows, row_group_size, n_repeats):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bucket_dir = os.path.join(tmp_dir, "bucket")
+        create_synthetic_bucket(bucket_dir, n_rows=n_rows, row_group_size=row_group_size)
+        kwargs = {"bucket_dir": bucket_dir, "extent": EXTENT, "variable": VARIABLES[0]}
+        elapsed_eager, df_eager = time_function(read_eager, n_repeats=n_repeats, **kwargs)
+        elapsed_manifest, df_manifest = time_function(read_lazy, n_repeats=n_repeats, **kwargs)
+        os.remove(get_manifest_filepath(bucket_dir))
+        elapsed_hive, df_hive = time_function(read_lazy, n_repeats=n_repeats, **kwargs)
+        assert len(df_eager) == len(df_hive) == len(df_manifest)
+        print(f"Number of rows: {n_rows} ({len(df_eager)} selected rows)")
+        print(f"- eager read and filtering: {elapsed_eager:.3f} s")
+        print(f"- lazy scan with hive partitions: {elapsed_hive:.3f} s (speedup {elapsed_eager / elapsed_hive:.1f}x)")
+        print(
+            f"- lazy scan with manifest: {elapsed_manifest:.3f} s (speedup {elapsed_eager / elapsed_manifest:.1f}x)",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_rows", type=int, default=20_000_000)
+    parser.add_argument("--row_group_size", type=int, default=100_000)
+    parser.add_argument("--n_repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(n_rows=args.n_rows, row_group_size=args.row_group_size, n_repeats=args.n_repeats)
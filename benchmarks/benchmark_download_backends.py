@@ -0,0 +1,110 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""Benchmark the number of files downloaded per second by the CURL and PYTHON transfer tools.
+
+Usage: ``python benchmarks/benchmark_download_backends.py --n_files 200 --file_size 50000 --n_threads 10``
+
+Many small files, mimicking NRT granules, are served by local HTTP and FTP stand-in servers.
+The ``curl`` transfer tool spawns a process and opens a connection for every file, while
+the ``python`` transfer tool reuses one connection per thread across all the files.
+Since the servers are local, the benchmark underestimates the benefit of the connection
+reuse against remote servers, where every connection requires TLS and login round-trips.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from gpm.io.download import curl_ges_disc_cmd, run, run_transfers
+from gpm.tests.utils.servers import LocalFTPServer, LocalHTTPServer, start_server, stop_server
+
+
+def create_remote_files(remote_dir, n_files, file_size):
+    """Create the files served by the stand-in servers."""
+    filenames = [f"2A.GPM.GMI.GPROF2021v1.20240101-S{i:06d}-E{i:06d}.V07A.RT-H5" for i in range(n_files)]
+    for filename in filenames:
+        with open(os.path.join(remote_dir, filename), "wb") as f:
+            f.write(os.urandom(file_size))
+    return filenames
+
+
+def time_curl(remote_filepaths, local_filepaths, n_threads):
+    """Return the time required to download the files with curl."""
+    commands = [
+        curl_ges_disc_cmd(remote_filepath, local_filepath)
+        for remote_filepath, local_filepath in zip(remote_filepaths, local_filepaths)
+    ]
+    t_i = time.perf_counter()
+    status = run(commands, n_threads=n_threads, progress_bar=False, verbose=False)
+    elapsed = time.perf_counter() - t_i
+    assert all(status)
+    return elapsed
+
+
+def time_python(remote_filepaths, local_filepaths, n_threads):
+    """Return the time required to download the files with the python transfer tool."""
+    t_i = time.perf_counter()
+    status = run_transfers(
+        remote_filepaths,
+        local_filepaths,
+        username="anonymous",
+        password="",
+        n_threads=n_threads,
+        progress_bar=False,
+    )
+    elapsed = time.perf_counter() - t_i
+    assert all(status)
+    return elapsed
+
+
+def main(n_files, file_size, n_threads):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        remote_dir = os.path.join(tmp_dir, "remote")
+        os.makedirs(remote_dir)
+        filenames = create_remote_files(remote_dir, n_files=n_files, file_size=file_size)
+        print(f"{n_files} files of {file_size} bytes, {n_threads} threads:")
+        for server_class in [LocalHTTPServer, LocalFTPServer]:
+            server = start_server(server_class(remote_dir))
+            remote_filepaths = [f"{server.url}/{filename}" for filename in filenames]
+            for transfer_tool, time_function in [("CURL", time_curl), ("PYTHON", time_python)]:
+                local_dir = os.path.join(tmp_dir, f"{server_class.__name__}_{transfer_tool}")
+                os.makedirs(local_dir)
+                local_filepaths = [os.path.join(local_dir, filename) for filename in filenames]
+                elapsed = time_function(remote_filepaths, local_filepaths, n_threads=n_threads)
+                print(
+                    f"- {server.url.split(':')[0]} {transfer_tool}: {n_files / elapsed:.1f} files/s ({elapsed:.2f} s)",
+                )
+            stop_server(server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_files", type=int, default=200)
+    parser.add_argument("--file_size", type=int, default=50_000)
+    parser.add_argument("--n_threads", type=int, default=10)
+    args = parser.parse_args()
+    main(n_files=args.n_files, file_size=args.file_size, n_threads=args.n_threads)
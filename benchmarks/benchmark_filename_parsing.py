@@ -0,0 +1,86 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""Benchmark the bulk filename parser against the per-file filename parser.
+
+Usage: ``python benchmarks/benchmark_filename_parsing.py --n_files 1000000``
+
+The per-file parser is timed on a subset of the synthetic filenames and the
+timing is extrapolated to the full number of files.
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+
+from gpm.io.info import get_info_from_filepath, parse_filepaths
+
+
+def create_synthetic_filenames(n_files):
+    """Create synthetic 2A-DPR, 1C-GMI and IMERG filenames."""
+    start_time = datetime.datetime(2014, 3, 8)
+    rng = np.random.default_rng(seed=0)
+    offsets = rng.integers(0, 10 * 365 * 24 * 3600, size=n_files)
+    filenames = []
+    for i, offset in enumerate(offsets):
+        s_time = start_time + datetime.timedelta(seconds=int(offset))
+        e_time = s_time + datetime.timedelta(minutes=93)
+        date_str = s_time.strftime("%Y%m%d")
+        time_str = f"S{s_time.strftime('%H%M%S')}-E{e_time.strftime('%H%M%S')}"
+        if i % 3 == 0:
+            filenames.append(f"2A.GPM.DPR.V9-20211125.{date_str}-{time_str}.{i % 999999:06d}.V07A.HDF5")
+        elif i % 3 == 1:
+            filenames.append(f"1C.GPM.GMI.XCAL2016-C.{date_str}-{time_str}.{i % 999999:06d}.V07A.HDF5")
+        else:
+            filenames.append(f"3B-HHR.MS.MRG.3IMERG.{date_str}-{time_str}.{i % 1440:04d}.V07B.HDF5")
+    return filenames
+
+
+def main(n_files, n_files_per_file_parser):
+    filenames = create_synthetic_filenames(n_files)
+
+    t_i = time.perf_counter()
+    _ = parse_filepaths(filenames)
+    elapsed_bulk = time.perf_counter() - t_i
+
+    subset = filenames[: min(n_files, n_files_per_file_parser)]
+    t_i = time.perf_counter()
+    _ = [get_info_from_filepath(filename) for filename in subset]
+    elapsed_per_file = (time.perf_counter() - t_i) * n_files / len(subset)
+
+    print(f"Number of filenames: {n_files}")
+    print(f"- Bulk parser (parse_filepaths): {elapsed_bulk:.2f} s")
+    print(f"- Per-file parser (get_info_from_filepath, extrapolated): {elapsed_per_file:.2f} s")
+    print(f"- Speedup: {elapsed_per_file / elapsed_bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_files", type=int, default=1_000_000)
+    parser.add_argument("--n_files_per_file_parser", type=int, default=10_000)
+    args = parser.parse_args()
+    main(n_files=args.n_files, n_files_per_file_parser=args.n_files_per_file_parser)
@@ -0,0 +1,108 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""Benchmark the dask graph size and the computing time of the standard and fused decoding.
+
+Usage: ``python benchmarks/benchmark_fused_decoding.py --n_granules 30 --n_variables 40``
+
+Fake 2A-GMI granules with ``n_variables`` variables are written to a temporary directory.
+The variables are named after the 2A-<PMW> variables decoded by GPM-API.
+The granules are opened with ``gpm.open_dataset`` with the ``fuse_decoding`` configuration
+option disabled and enabled, and the number of tasks of the dask graph is reported.
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import dask
+
+import gpm
+from gpm.io.local import get_local_product_directory
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+from gpm.utils.dask import count_dask_tasks
+
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+DECODED_VARIABLES = [
+    "surfacePrecipitation",
+    "rainWaterPath",
+    "cloudWaterPath",
+    "iceWaterPath",
+    "sunGlintAngle",
+    "precipitationYesNoFlag",
+    "qualityFlag",
+    "pixelStatus",
+]
+
+
+def create_fake_archive(base_dir, n_granules, n_variables, n_scans):
+    """Create a local archive of fake 2A-GMI granules."""
+    variables = DECODED_VARIABLES[:n_variables]
+    variables += [f"variable{i}" for i in range(n_variables - len(variables))]
+    dir_path = get_local_product_directory(base_dir, "2A-GMI", product_type="RS", version=7, date=START_TIME.date())
+    os.makedirs(dir_path, exist_ok=True)
+    for i in range(n_granules):
+        start_time = START_TIME + i * ORBIT_DURATION
+        create_fake_granule(dir_path, start_time, granule_id=36000 + i, n_scans=n_scans, variables=variables)
+    return START_TIME + n_granules * ORBIT_DURATION
+
+
+def time_open_dataset(end_time, chunks, fuse_decoding):
+    """Return the number of dask tasks, the time to open the dataset and the time to compute it."""
+    with gpm.config.set({"fuse_decoding": fuse_decoding}):
+        t_i = time.perf_counter()
+        ds = gpm.open_dataset("2A-GMI", START_TIME, end_time, chunks=chunks)
+        elapsed_open = time.perf_counter() - t_i
+    n_tasks = count_dask_tasks(ds)
+    t_i = time.perf_counter()
+    ds.compute(scheduler="synchronous")
+    elapsed_compute = time.perf_counter() - t_i
+    return n_tasks, elapsed_open, elapsed_compute
+
+
+def main(n_granules, n_variables, n_scans, chunksize):
+    chunks = {"along_track": chunksize}
+    with tempfile.TemporaryDirectory() as base_dir, gpm.config.set({"base_dir": base_dir}):
+        end_time = create_fake_archive(base_dir, n_granules=n_granules, n_variables=n_variables, n_scans=n_scans)
+        print(f"{n_granules} granules with {n_variables} variables, chunks={chunks}:")
+        with dask.config.set(scheduler="synchronous"):
+            for fuse_decoding in [False, True]:
+                n_tasks, elapsed_open, elapsed_compute = time_open_dataset(end_time, chunks, fuse_decoding)
+                print(
+                    f"- fuse_decoding={fuse_decoding}: {n_tasks} tasks, "
+                    f"open {elapsed_open:.2f} s, compute {elapsed_compute:.2f} s",
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_granules", type=int, default=30)
+    parser.add_argument("--n_variables", type=int, default=40)
+    parser.add_argument("--n_scans", type=int, default=2963)
+    parser.add_argument("--chunksize", type=int, default=500)
+    args = parser.parse_args()
+    main(n_granules=args.n_granules, n_variables=args.n_variables, n_scans=args.n_scans, chunksize=args.chunksize)
@@ -0,0 +1,112 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""Benchmark the scaling of ``gpm.open_dataset(parallel="processes")`` with the number of cores.
+
+Usage: ``python benchmarks/benchmark_open_dataset_processes.py --n_granules 30``
+
+A synthetic day of 2A-GMI granules is written to a temporary GPM base directory.
+The whole day is opened and loaded in memory with ``parallel=False`` and with
+``parallel="processes"`` using an increasing number of worker processes.
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import gpm
+from gpm.io.local import get_local_product_directory
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+
+PRODUCT = "2A-GMI"
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+VARIABLES = [
+    "surfacePrecipitation",
+    "convectivePrecipitation",
+    "frozenPrecipitation",
+    "rainWaterPath",
+    "cloudWaterPath",
+    "iceWaterPath",
+    "mostLikelyPrecipitation",
+    "precip1stTertial",
+    "precip2ndTertial",
+    "probabilityOfPrecip",
+]
+
+
+def create_synthetic_day(base_dir, n_granules):
+    """Create a synthetic day of 2A-GMI granules."""
+    dir_path = get_local_product_directory(
+        base_dir=base_dir,
+        product=PRODUCT,
+        product_type="RS",
+        version=7,
+        date=START_TIME.date(),
+    )
+    os.makedirs(dir_path, exist_ok=True)
+    for i in range(n_granules):
+        start_time = START_TIME + i * ORBIT_DURATION
+        create_fake_granule(dir_path, start_time, granule_id=36000 + i, variables=VARIABLES)
+    return START_TIME, START_TIME + n_granules * ORBIT_DURATION
+
+
+def time_open_dataset(start_time, end_time, **kwargs):
+    """Return the time required to open and load the dataset."""
+    t_i = time.perf_counter()
+    ds = gpm.open_dataset(PRODUCT, start_time=start_time, end_time=end_time, **kwargs)
+    ds = ds.load()
+    ds.close()
+    return time.perf_counter() - t_i
+
+
+def main(n_granules, max_workers):
+    list_max_workers = [n for n in [1, 2, 4, 8, 16, 32, 64] if n < max_workers] + [max_workers]
+    with (
+        tempfile.TemporaryDirectory() as base_dir,
+        gpm.config.set(
+            {"base_dir": base_dir, "warn_non_contiguous_scans": False},
+        ),
+    ):
+        start_time, end_time = create_synthetic_day(base_dir, n_granules=n_granules)
+        elapsed_serial = time_open_dataset(start_time, end_time, parallel=False)
+        print(f"Number of granules: {n_granules}")
+        print(f"- parallel=False: {elapsed_serial:.2f} s")
+        for n_workers in list_max_workers:
+            elapsed = time_open_dataset(start_time, end_time, parallel="processes", max_workers=n_workers)
+            print(
+                f"- parallel='processes', max_workers={n_workers}: {elapsed:.2f} s "
+                f"(speedup {elapsed_serial / elapsed:.1f}x)",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_granules", type=int, default=30)
+    parser.add_argument("--max_workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    main(n_granules=args.n_granules, max_workers=args.max_workers)
@@ -0,0 +1,142 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Benchmark the time to open a single variable of a 2A-DPR granule with the netcdf4 and h5netcdf engines.
+
+Usage: ``python benchmarks/benchmark_open_granule_engine.py [--filepath <2A-DPR granule>]``
+
+If no ``filepath`` is specified, a synthetic 2A-DPR V07 granule mimicking the groups and
+variables of the ``FS`` scan mode is written to a temporary directory.
+The arrays of the synthetic granule are not allocated, so that only the time spent reading
+the HDF5 metadata and the requested variable is measured.
+The granule is opened with ``chunks=-1`` (the ``gpm.open_dataset`` default).
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import gpm
+
+FILENAME = "2A.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5"
+VARIABLE = "precipRateNearSurface"
+N_SCANS = 7936
+N_RAYS = 49
+N_BINS = 176
+
+# Number of 2D (nscan, nray) and 3D (nscan, nray, nbin) variables of each group of the FS scan mode
+FS_GROUPS = {
+    "ScanTime": (0, 0),
+    "scanStatus": (0, 0),
+    "navigation": (0, 0),
+    "PRE": (10, 3),
+    "VER": (6, 3),
+    "CSF": (8, 0),
+    "SRT": (20, 0),
+    "DSD": (1, 0),
+    "Experimental": (8, 2),
+    "SLV": (15, 5),
+    "FLG": (6, 1),
+    "TRG": (5, 0),
+}
+
+
+def _create_dataset(group, name, dims, dtype="f4"):
+    """Create an unallocated HDF5 dataset with the GPM DimensionNames attribute."""
+    shape = tuple({"nscan": N_SCANS, "nray": N_RAYS, "nbin": N_BINS}[dim] for dim in dims)
+    dataset = group.create_dataset(name, shape=shape, dtype=dtype, chunks=True, fillvalue=-9999.9)
+    dataset.attrs.create("DimensionNames", np.bytes_(",".join(dims)))
+    dataset.attrs.create("_FillValue", np.array(-9999.9, dtype=dtype))
+    return dataset
+
+
+def create_synthetic_granule(dir_path):
+    """Create a synthetic 2A-DPR granule without HDF5 dimension scales."""
+    import h5py
+
+    filepath = os.path.join(dir_path, FILENAME)
+    with h5py.File(filepath, mode="w") as f:
+        f.attrs.create("FileHeader", np.bytes_("GranuleNumber=36092;\nEmptyGranule=NOT_EMPTY;\n"))
+        fs = f.create_group("FS")
+        _create_dataset(fs, "Latitude", dims=["nscan", "nray"])[:] = 0
+        _create_dataset(fs, "Longitude", dims=["nscan", "nray"])[:] = 0
+        for name, (n_2d, n_3d) in FS_GROUPS.items():
+            group = fs.create_group(name)
+            if name == "ScanTime":
+                time = pd.date_range("2020-07-05 17:00:44", "2020-07-05 18:33:17", periods=N_SCANS)
+                for var, values in [
+                    ("Year", time.year),
+                    ("Month", time.month),
+                    ("DayOfMonth", time.day),
+                    ("Hour", time.hour),
+                    ("Minute", time.minute),
+                    ("Second", time.second),
+                ]:
+                    _create_dataset(group, var, dims=["nscan"], dtype="i2")[:] = values
+            elif name in ["scanStatus", "navigation"]:
+                for i in range(12):
+                    _create_dataset(group, f"{name}Var{i}", dims=["nscan"])
+            else:
+                for i in range(n_2d):
+                    _create_dataset(group, f"{name}Var2D{i}", dims=["nscan", "nray"])
+                for i in range(n_3d):
+                    _create_dataset(group, f"{name}Var3D{i}", dims=["nscan", "nray", "nbin"])
+        fs["SLV"]["SLVVar2D0"].attrs.modify("DimensionNames", np.bytes_("nscan,nray"))
+        fs["SLV"].move("SLVVar2D0", VARIABLE)
+    return filepath
+
+
+def time_open_granule(filepath, n_repeats, **kwargs):
+    """Return the minimum time required to open the granule and load the variable."""
+    list_elapsed = []
+    for _ in range(n_repeats):
+        t_i = time.perf_counter()
+        ds = gpm.open_granule(filepath, scan_mode="FS", variables=VARIABLE, chunks=-1, **kwargs)
+        ds[VARIABLE].load()
+        ds.close()
+        list_elapsed.append(time.perf_counter() - t_i)
+    return min(list_elapsed)
+
+
+def main(filepath, n_repeats):
+    with tempfile.TemporaryDirectory() as dir_path, gpm.config.set({"warn_non_contiguous_scans": False}):
+        if filepath is None:
+            filepath = create_synthetic_granule(dir_path)
+        elapsed_netcdf4 = time_open_granule(filepath, n_repeats=n_repeats, engine="netcdf4")
+        elapsed_h5netcdf = time_open_granule(filepath, n_repeats=n_repeats, engine="h5netcdf")
+        print(f"Time to open '{VARIABLE}' of {os.path.basename(filepath)} (best of {n_repeats}):")
+        print(f"- engine='netcdf4': {elapsed_netcdf4:.3f} s")
+        print(f"- engine='h5netcdf': {elapsed_h5netcdf:.3f} s (speedup {elapsed_netcdf4 / elapsed_h5netcdf:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filepath", type=str, default=None)
+    parser.add_argument("--n_repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(filepath=args.filepath, n_repeats=args.n_repeats)
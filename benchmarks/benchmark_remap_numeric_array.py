@@ -0,0 +1,106 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""Benchmark the lookup-table remapping engine against the np.select remapping.
+
+Usage: ``python benchmarks/benchmark_remap_numeric_array.py --n_pixels 10000000``
+
+For each flag variable decoded in ``decode_2a_radar``, ``decode_2a_pmw`` and ``decode_imerg``,
+the flag codes are remapped to the category indices on a synthetic array of random codes
+(including NaN and invalid codes).
+"""
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+import xarray as xr
+
+from gpm.dataset.decoding import decode_2a_pmw, decode_2a_radar, decode_imerg
+from gpm.dataset.decoding.utils import remap_numeric_array
+
+DECODING_MODULES = {
+    "2A-DPR": decode_2a_radar,
+    "2A-GMI": decode_2a_pmw,
+    "IMERG-FR": decode_imerg,
+}
+
+
+def select_remap_numeric_array(arr, remapping_dict, fill_value=np.nan):
+    """Remap the values of a numeric array with np.select (previous implementation)."""
+    conditions = [arr == i for i in remapping_dict]
+    choices = remapping_dict.values()
+    return np.select(conditions, choices, default=fill_value)
+
+
+def get_flag_values(product, module):
+    """Return the flag values of the variables decoded by a decoding module."""
+    dict_flag_values = {}
+    for name in dir(module):
+        if not name.startswith("decode_") or name == "decode_product":
+            continue
+        da = xr.DataArray(np.zeros(1), attrs={"gpm_api_product": product})
+        with xr.set_options(keep_attrs=True):
+            da = getattr(module, name)(da)
+        if "flag_values" in da.attrs:
+            dict_flag_values[name.removeprefix("decode_")] = da.attrs["flag_values"]
+    return dict_flag_values
+
+
+def _time(func, n_repeats):
+    list_elapsed = []
+    for _ in range(n_repeats):
+        t_i = time.perf_counter()
+        func()
+        list_elapsed.append(time.perf_counter() - t_i)
+    return min(list_elapsed)
+
+
+def main(n_pixels, n_repeats):
+    rng = np.random.default_rng(seed=0)
+    print(f"Number of pixels: {n_pixels}")
+    for product, module in DECODING_MODULES.items():
+        for variable, flag_values in get_flag_values(product, module).items():
+            remapping_dict = {value: i for i, value in enumerate(flag_values)}
+            codes = np.array([*flag_values, np.nan, -9999])
+            arr = rng.choice(codes, size=n_pixels)
+            expected = select_remap_numeric_array(arr, remapping_dict)
+            np.testing.assert_equal(remap_numeric_array(arr, remapping_dict), expected)
+            elapsed_select = _time(partial(select_remap_numeric_array, arr, remapping_dict), n_repeats)
+            elapsed_lut = _time(partial(remap_numeric_array, arr, remapping_dict), n_repeats)
+            print(
+                f"- {module.__name__.split('.')[-1]}.{variable} ({len(flag_values)} codes): "
+                f"np.select {elapsed_select:.3f} s, LUT {elapsed_lut:.3f} s, "
+                f"speedup {elapsed_select / elapsed_lut:.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_pixels", type=int, default=10_000_000)
+    parser.add_argument("--n_repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(n_pixels=args.n_pixels, n_repeats=args.n_repeats)
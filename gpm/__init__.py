@@ -40,9 +40,12 @@ from gpm.configs import (  # noqa
     define_configs,
     read_configs,
 )
-from gpm.dataset.dataset import open_dataset  # noqa
+from gpm.dataset.dataset import iter_granules, open_dataset  # noqa
 from gpm.dataset.datatree import open_datatree  # noqa
 from gpm.dataset.granule import open_granule  # noqa
+from gpm.dataset.references import build_reference_index  # noqa
+from gpm.dataset.zarr_archive import to_zarr_archive  # noqa
+from gpm.io import catalog  # noqa
 from gpm.io.download import download_archive as download  # noqa
 from gpm.io.download import (  # noqa
     download_daily_data,
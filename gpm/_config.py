@@ -51,12 +51,17 @@ _CONFIG_DEFAULTS = {
     "username_earthdata": None,
     "password_earthdata": None,
     "decode_variables": True,
+    "fuse_decoding": False,
+    "decode_dtype_policy": "default",
     "warn_non_contiguous_scans": True,
     "warn_non_regular_timesteps": True,
     "warn_invalid_geolocation": True,
     "warn_multiple_product_versions": True,
     "viz_hide_antimeridian_data": True,
     "remove_corrupted_files": False,
+    "use_local_catalog": False,
+    "use_granule_cache": False,
+    "use_listing_cache": False,
 }
 _CONFIG_DEFAULTS.update(_get_default_configs())
 
@@ -280,6 +280,19 @@ class GPM_Base_Accessor:
 
         return slice_range_at_min_value(self._obj, variable=variable)
 
+    #### Flags
+    @property
+    def flags(self):
+        from gpm.utils.flags import get_flags
+
+        return get_flags(self._obj)
+
+    @auto_wrap_docstring
+    def mask(self, **flags):
+        from gpm.utils.flags import get_flags_mask
+
+        return get_flags_mask(self._obj, **flags)
+
     #### Dataset utility
     @property
     def is_orbit(self):
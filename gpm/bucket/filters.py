@@ -17,8 +17,27 @@ def get_geodesic_distance_from_point(lons, lats, lon, lat):
     return distance
 
 
+def _get_lazy_geodesic_distance_from_point(lon, lat):
+    """Return the polars expression computing the geodesic distance from a point."""
+
+    def _compute_distance(coords):
+        distances = get_geodesic_distance_from_point(
+            lons=coords.struct.field("lon").to_numpy(),
+            lats=coords.struct.field("lat").to_numpy(),
+            lon=lon,
+            lat=lat,
+        )
+        return pl.Series(distances, dtype=pl.Float64)
+
+    return pl.struct("lon", "lat").map_batches(_compute_distance, return_dtype=pl.Float64)
+
+
 def filter_around_point(df, lon, lat, distance):
     # https://stackoverflow.com/questions/76262681/i-need-to-create-a-column-with-the-distance-between-two-coordinates-in-polars
+    # Compute the distance within the query plan of a polars LazyFrame
+    if isinstance(df, pl.LazyFrame):
+        df = df.with_columns(_get_lazy_geodesic_distance_from_point(lon=lon, lat=lat).alias("distance"))
+        return df.filter(pl.col("distance") <= distance)
     # Retrieve coordinates
     lons = df_get_column(df, column="lon")
     lats = df_get_column(df, column="lat")
@@ -46,6 +65,36 @@ def filter_by_extent(df, extent, x="lon", y="lat"):
     return df
 
 
+def filter_by_time(df, start_time=None, end_time=None, time="time"):
+    if isinstance(df, (pl.DataFrame, pl.LazyFrame)):
+        if start_time is not None:
+            df = df.filter(pl.col(time) >= start_time)
+        if end_time is not None:
+            df = df.filter(pl.col(time) <= end_time)
+    else:  # pandas
+        if start_time is not None:
+            df = df.loc[df[time] >= start_time]
+        if end_time is not None:
+            df = df.loc[df[time] <= end_time]
+    return df
+
+
+def filter_by_values(df, filters):
+    """Select the rows with values within the ``(vmin, vmax)`` range of each column of the ``filters`` dictionary."""
+    for column, (vmin, vmax) in filters.items():
+        if isinstance(df, (pl.DataFrame, pl.LazyFrame)):
+            if vmin is not None:
+                df = df.filter(pl.col(column) >= vmin)
+            if vmax is not None:
+                df = df.filter(pl.col(column) <= vmax)
+        else:  # pandas
+            if vmin is not None:
+                df = df.loc[df[column] >= vmin]
+            if vmax is not None:
+                df = df.loc[df[column] <= vmax]
+    return df
+
+
 def apply_spatial_filters(df, filters=None):
     if filters is None:
         filters = {}
@@ -55,3 +104,25 @@ def apply_spatial_filters(df, filters=None):
         lon, lat, distance = filters["point_radius"]
         df = filter_around_point(df, lon=lon, lat=lat, distance=distance)
     return df
+
+
+def apply_filters(df, filters=None):
+    """Apply the spatial, time, values and polars expressions filters.
+
+    The distance from a point is computed last, only for the rows selected by the other filters.
+    """
+    if filters is None:
+        filters = {}
+    if "extent" in filters:
+        df = filter_by_extent(df, extent=filters["extent"], x="lon", y="lat")
+    if "time_range" in filters:
+        start_time, end_time = filters["time_range"]
+        df = filter_by_time(df, start_time=start_time, end_time=end_time)
+    if "values" in filters:
+        df = filter_by_values(df, filters=filters["values"])
+    if "expressions" in filters:
+        df = df.filter(*filters["expressions"])
+    if "point_radius" in filters:
+        lon, lat, distance = filters["point_radius"]
+        df = filter_around_point(df, lon=lon, lat=lat, distance=distance)
+    return df
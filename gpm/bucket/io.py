@@ -26,10 +26,12 @@
 # -----------------------------------------------------------------------------.
 """This module provide utilities to search GPM Geographic Buckets files."""
 import concurrent
+import contextlib
 import fnmatch
 import importlib
 import os
 import re
+import sqlite3
 
 from gpm.utils.list import flatten_list
 from gpm.utils.yaml import read_yaml, write_yaml
@@ -57,6 +59,58 @@ def write_bucket_info(bucket_dir, partitioning):
     write_yaml(bucket_info, filepath=bucket_info_filepath, sort_keys=False)
 
 
+####------------------------------------------------------------------------------------------------------------------.
+########################
+#### Granules ledger ####
+########################
+
+LEDGER_FILENAME = "granules_ledger.sqlite"
+
+_LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS granules (
+    granule_id TEXT NOT NULL PRIMARY KEY,
+    n_rows INTEGER NOT NULL,
+    elapsed REAL NOT NULL
+);
+"""
+
+
+def get_granule_id(filepath):
+    """Return the identifier of a granule in a bucket archive (its filename without extension)."""
+    return os.path.splitext(os.path.basename(filepath))[0]
+
+
+@contextlib.contextmanager
+def _connect_ledger(bucket_dir):
+    """Open a connection to the ledger of the granules ingested in a bucket and commit the changes on exit."""
+    os.makedirs(bucket_dir, exist_ok=True)
+    con = sqlite3.connect(os.path.join(bucket_dir, LEDGER_FILENAME), timeout=60)
+    try:
+        con.executescript(_LEDGER_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def read_ingested_granules(bucket_dir):
+    """Return the identifiers of the granules already ingested in a bucket archive."""
+    if not os.path.exists(os.path.join(bucket_dir, LEDGER_FILENAME)):
+        return set()
+    with _connect_ledger(bucket_dir) as con:
+        return {row[0] for row in con.execute("SELECT granule_id FROM granules")}
+
+
+def record_ingested_granules(bucket_dir, results):
+    """Record the granules ingested in a bucket archive.
+
+    ``results`` is a list of dictionaries with the ``filepath``, ``n_rows`` and ``elapsed`` keys.
+    """
+    rows = [(get_granule_id(result["filepath"]), result["n_rows"], result["elapsed"]) for result in results]
+    with _connect_ledger(bucket_dir) as con:
+        con.executemany("INSERT OR REPLACE INTO granules VALUES (?, ?, ?)", rows)
+
+
 ####------------------------------------------------------------------------------------------------------------------.
 ###########################
 #### Search and filter ####
@@ -0,0 +1,304 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module provides the manifest of the files and row groups of a geographic bucket."""
+import os
+import re
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from gpm.bucket.io import get_filepaths, get_parallel_list_results, match_filters
+from gpm.utils.list import flatten_list
+
+MANIFEST_FILENAME = "_manifest"
+MANIFEST_COLUMNS = ["time", "lon", "lat"]
+
+
+def get_manifest_filepath(bucket_dir):
+    """Return the path of the manifest of a bucket archive."""
+    return os.path.join(bucket_dir, MANIFEST_FILENAME)
+
+
+def _get_manifest_columns(columns=None):
+    """Return the columns whose minimum and maximum values are recorded in the manifest."""
+    columns = MANIFEST_COLUMNS if columns is None else MANIFEST_COLUMNS + list(columns)
+    return list(dict.fromkeys(columns))
+
+
+def _get_row_group_min_max(parquet_file, row_group, columns):
+    """Return the minimum and maximum values of the columns of a row group.
+
+    The values are read from the Parquet statistics if available, otherwise they are computed.
+    """
+    metadata = parquet_file.metadata.row_group(row_group)
+    names = [metadata.column(i).path_in_schema for i in range(metadata.num_columns)]
+    dict_min_max = {}
+    for column in columns:
+        statistics = metadata.column(names.index(column)).statistics
+        if statistics is not None and statistics.has_min_max:
+            dict_min_max[column] = (statistics.min, statistics.max)
+    missing_columns = [column for column in columns if column not in dict_min_max]
+    if missing_columns:
+        table = parquet_file.read_row_group(row_group, columns=missing_columns)
+        for column in missing_columns:
+            min_max = pc.min_max(table[column])
+            dict_min_max[column] = (min_max["min"].as_py(), min_max["max"].as_py())
+    return dict_min_max
+
+
+def _get_file_manifest(filepath, bucket_dir, columns):
+    """Return the manifest records of the row groups of a file."""
+    parquet_file = pq.ParquetFile(filepath)
+    columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+    relative_filepath = os.path.relpath(filepath, bucket_dir)
+    records = []
+    for row_group in range(parquet_file.num_row_groups):
+        record = {
+            "filepath": relative_filepath,
+            "partition": os.path.dirname(relative_filepath),
+            "row_group": row_group,
+            "n_row_groups": parquet_file.num_row_groups,
+            "n_rows": parquet_file.metadata.row_group(row_group).num_rows,
+        }
+        for column, (vmin, vmax) in _get_row_group_min_max(parquet_file, row_group, columns).items():
+            record[f"{column}_min"] = vmin
+            record[f"{column}_max"] = vmax
+        records.append(record)
+    return records
+
+
+def get_files_manifest(filepaths, bucket_dir, columns=None, parallel=True):
+    """Return the manifest records of the row groups of the files of a bucket archive.
+
+    Parameters
+    ----------
+    filepaths : list
+        Paths of the Parquet files of the bucket archive.
+    bucket_dir : str
+        Base directory of the bucket archive.
+    columns : list, optional
+        Columns whose minimum and maximum values are recorded in addition to ``time``, ``lon`` and ``lat``.
+    parallel : bool, optional
+        Whether to read the files footers in multithreading. The default is ``True``.
+
+    Returns
+    -------
+    records : list
+        A dictionary for each row group with the ``filepath`` (relative to ``bucket_dir``),
+        the ``partition`` label, the ``row_group`` index, the number of row groups of the file
+        ``n_row_groups``, the number of rows ``n_rows``
+        and the ``<column>_min`` and ``<column>_max`` values of each column.
+
+    """
+    columns = _get_manifest_columns(columns)
+    if parallel:
+        list_records = get_parallel_list_results(
+            function=_get_file_manifest,
+            inputs=filepaths,
+            bucket_dir=bucket_dir,
+            columns=columns,
+        )
+    else:
+        list_records = [_get_file_manifest(filepath, bucket_dir=bucket_dir, columns=columns) for filepath in filepaths]
+    return flatten_list(list_records)
+
+
+def _get_manifest_schema(records, bucket_dir):
+    """Return the schema of the manifest, using the type of the columns of the bucket files."""
+    fields = [
+        pa.field("filepath", pa.string()),
+        pa.field("partition", pa.string()),
+        pa.field("row_group", pa.int64()),
+        pa.field("n_row_groups", pa.int64()),
+        pa.field("n_rows", pa.int64()),
+    ]
+    if not records:
+        return pa.schema(fields)
+    file_schema = pq.read_schema(os.path.join(bucket_dir, records[0]["filepath"]))
+    for key in records[0]:
+        column = key.removesuffix("_min")
+        if key.endswith("_min"):
+            data_type = file_schema.field(column).type
+            fields += [pa.field(f"{column}_min", data_type), pa.field(f"{column}_max", data_type)]
+    return pa.schema(fields)
+
+
+def write_bucket_manifest(bucket_dir, records):
+    """Write the manifest of a bucket archive.
+
+    The manifest is a Parquet file with a row for each row group of the bucket files.
+    As the ``_metadata`` file, it is named without the ``.parquet`` extension and with a
+    leading underscore so that it is ignored by the Parquet dataset readers.
+    It is read by ``read_bucket`` to select the files and row groups to read
+    without listing the bucket directories.
+    """
+    records = sorted(records, key=lambda record: (record["filepath"], record["row_group"]))
+    schema = _get_manifest_schema(records, bucket_dir=bucket_dir)
+    table = pa.Table.from_pylist(records, schema=schema)
+    pq.write_table(table, get_manifest_filepath(bucket_dir))
+
+
+def update_bucket_manifest(bucket_dir, columns=None, parallel=True):
+    """Create (or update) the manifest of a bucket archive from the files in the bucket directories.
+
+    Parameters
+    ----------
+    bucket_dir : str
+        Base directory of the bucket archive.
+    columns : list, optional
+        Columns whose minimum and maximum values are recorded in addition to ``time``, ``lon`` and ``lat``.
+    parallel : bool, optional
+        Whether to list the directories and read the files footers in multithreading.
+        The default is ``True``.
+
+    """
+    filepaths = get_filepaths(bucket_dir, parallel=parallel, file_extension=".parquet")
+    records = get_files_manifest(filepaths, bucket_dir=bucket_dir, columns=columns, parallel=parallel)
+    write_bucket_manifest(bucket_dir, records=records)
+
+
+def remove_bucket_manifest(bucket_dir):
+    """Remove the manifest of a bucket archive (if present).
+
+    The manifest must be removed by the writers adding files to a bucket archive without
+    recording them in the manifest, otherwise ``read_bucket`` would ignore the added files.
+    """
+    filepath = get_manifest_filepath(bucket_dir)
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+def read_bucket_manifest(bucket_dir):
+    """Read the manifest of a bucket archive.
+
+    Returns ``None`` if the bucket archive has no manifest.
+    """
+    filepath = get_manifest_filepath(bucket_dir)
+    if not os.path.exists(filepath):
+        return None
+    return pl.read_parquet(filepath)
+
+
+####--------------------------------------------------------------------------------------------------.
+#### Manifest pruning
+
+
+def _overlap(manifest, column, vmin=None, vmax=None):
+    """Return the expression selecting the row groups whose values of a column may lie within [vmin, vmax].
+
+    Row groups without the minimum and maximum values of the column are always selected.
+    """
+    if f"{column}_min" not in manifest.columns:
+        return pl.lit(True)
+    expr = pl.lit(True)
+    if vmin is not None:
+        expr = expr & (pl.col(f"{column}_max") >= vmin)
+    if vmax is not None:
+        expr = expr & (pl.col(f"{column}_min") <= vmax)
+    return expr.fill_null(True)
+
+
+def prune_bucket_manifest(
+    manifest,
+    partitions=None,
+    extent=None,
+    start_time=None,
+    end_time=None,
+    filters=None,
+    file_extension=None,
+    glob_pattern=None,
+    regex_pattern=None,
+):
+    """Select the row groups of the manifest which may contain data matching the specified criteria.
+
+    Parameters
+    ----------
+    manifest : `polars.DataFrame`
+        Manifest of the bucket archive.
+    partitions : list, optional
+        Labels of the partitions to select.
+    extent : list, optional
+        The extent specified as [xmin, xmax, ymin, ymax].
+    start_time : `datetime.datetime`, optional
+        Start time of the data to select.
+    end_time : `datetime.datetime`, optional
+        End time of the data to select.
+    filters : dict, optional
+        Dictionary with the ``(vmin, vmax)`` range of values to select for some columns.
+        ``None`` bounds are not applied.
+    file_extension, glob_pattern, regex_pattern : str, optional
+        Filename filtering criteria.
+
+    Returns
+    -------
+    manifest : `polars.DataFrame`
+        Manifest of the selected row groups.
+
+    """
+    exprs = []
+    if partitions is not None:
+        exprs.append(pl.col("partition").is_in(list(partitions)))
+    if extent is not None:
+        exprs.append(_overlap(manifest, "lon", vmin=extent[0], vmax=extent[1]))
+        exprs.append(_overlap(manifest, "lat", vmin=extent[2], vmax=extent[3]))
+    if start_time is not None or end_time is not None:
+        exprs.append(_overlap(manifest, "time", vmin=start_time, vmax=end_time))
+    for column, (vmin, vmax) in (filters or {}).items():
+        exprs.append(_overlap(manifest, column, vmin=vmin, vmax=vmax))
+    if exprs:
+        manifest = manifest.filter(*exprs)
+    if file_extension is not None or glob_pattern is not None or regex_pattern is not None:
+        if regex_pattern is not None:
+            regex_pattern = re.compile(regex_pattern)
+        is_matching = [
+            match_filters(
+                os.path.basename(filepath),
+                file_extension=file_extension,
+                glob_pattern=glob_pattern,
+                regex_pattern=regex_pattern,
+            )
+            for filepath in manifest["filepath"]
+        ]
+        manifest = manifest.filter(pl.Series(is_matching, dtype=pl.Boolean))
+    return manifest
+
+
+def get_manifest_row_groups(manifest, bucket_dir):
+    """Return a dictionary with the row groups to read of each file of the manifest.
+
+    The value of a file is ``None`` if all its row groups are selected.
+    """
+    df_files = manifest.group_by("filepath", maintain_order=True).agg(
+        pl.col("row_group"),
+        pl.col("n_row_groups").first(),
+    )
+    return {
+        os.path.join(bucket_dir, filepath): row_groups if len(row_groups) < n_row_groups else None
+        for filepath, row_groups, n_row_groups in df_files.iter_rows()
+    }
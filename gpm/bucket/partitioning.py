@@ -582,6 +582,43 @@ class Base2DPartitioning:
         dict_labels = self.get_partitions_around_point(x=x, y=y, distance=distance, size=size)
         return self._directories(dict_labels=dict_labels)
 
+    def is_aligned_with(self, partitioning):
+        """Return whether each partition lies within a single partition of another partitioning.
+
+        This is the case if the other partitioning covers the extent of the partitioning
+        and if its bounds within the extent are also bounds of the partitioning.
+        """
+        for bounds, other_bounds in zip(self.bounds, partitioning.bounds):
+            if other_bounds[0] > bounds[0] and not np.isclose(other_bounds[0], bounds[0]):
+                return False
+            if other_bounds[-1] < bounds[-1] and not np.isclose(other_bounds[-1], bounds[-1]):
+                return False
+            inner_bounds = other_bounds[(other_bounds > bounds[0]) & (other_bounds < bounds[-1])]
+            if not all(np.isclose(bounds, value).any() for value in inner_bounds):
+                return False
+        return True
+
+    def get_directories_mapping(self, partitioning):
+        """Return a dictionary mapping each directory tree to the directory tree of an aligned partitioning."""
+        if not self.is_aligned_with(partitioning):
+            raise ValueError(
+                "The partitionings are not aligned: each partition must lie within a single partition "
+                "of the other partitioning.",
+            )
+        # Retrieve the directories of all partitions
+        x_indices, y_indices = np.arange(0, self.n_x), np.arange(0, self.n_y)
+        directories = self._directories(dict_labels=self._get_dict_labels_combo(x_indices, y_indices))
+        x_indices, y_indices = get_array_combinations(x_indices, y_indices)
+        # Retrieve the partitions enclosing the centroids
+        x_centroids, y_centroids = self.query_centroids_by_indices(x_indices, y_indices)
+        labels = partitioning.query_labels(x_centroids, y_centroids)
+        if partitioning.n_levels > 1:
+            dict_labels = {partitioning.levels[i]: labels[i] for i in range(0, partitioning.n_levels)}
+        else:
+            dict_labels = {partitioning.levels[0]: labels}
+        other_directories = partitioning._directories(dict_labels=dict_labels)
+        return dict(zip(directories.tolist(), other_directories.tolist()))
+
     def add_labels(self, df, x, y, remove_invalid_rows=True):
         """Add partitions labels to the dataframe.
 
@@ -28,15 +28,20 @@
 import os
 
 import dask.dataframe as dd
+import numpy as np
 import pandas as pd
 import polars as pl
+import pyarrow.dataset
+import pyarrow.fs
 
-from gpm.bucket.filters import apply_spatial_filters
+from gpm.bucket.filters import apply_filters
 from gpm.bucket.io import (
     get_bucket_partitioning,
     get_filepaths,
     get_filepaths_within_paths,
 )
+from gpm.bucket.manifest import get_manifest_row_groups, prune_bucket_manifest, read_bucket_manifest
+from gpm.io.checks import check_time
 from gpm.utils.geospatial import (
     get_continent_extent,
     get_country_extent,
@@ -97,32 +102,75 @@ def _change_backend_from_polars(df, backend):
     return df
 
 
-def _read_dataframe(source, backend, filters=None, **polars_kwargs):
-    """Read bucket with polars and convert to backend of choice."""
+def _scan_row_groups(source):
+    """Scan the selected row groups of Parquet files.
+
+    ``source`` is a dictionary with the list of row groups to read of each file (``None`` to read all).
+    """
+    parquet_format = pyarrow.dataset.ParquetFileFormat()
+    filesystem = pyarrow.fs.LocalFileSystem()
+    fragments = [
+        parquet_format.make_fragment(filepath, filesystem=filesystem, row_groups=row_groups)
+        for filepath, row_groups in source.items()
+    ]
+    dataset = pyarrow.dataset.FileSystemDataset(
+        fragments,
+        schema=fragments[0].physical_schema,
+        format=parquet_format,
+        filesystem=filesystem,
+    )
+    return pl.scan_pyarrow_dataset(dataset)
+
+
+def _scan_dataframe(source, **polars_kwargs):
+    """Define the lazy scan of the bucket files.
+
+    ``source`` can be a dictionary with the list of row groups to read of each file (``None`` to read all).
+    The row groups are selected only if no other polars arguments than ``hive_partitioning=False`` are specified.
+    """
+    if isinstance(source, dict):
+        if any(row_groups is not None for row_groups in source.values()) and not any(polars_kwargs.values()):
+            return _scan_row_groups(source)
+        source = list(source)
+    return pl.scan_parquet(source=source, **polars_kwargs)
+
+
+def _get_partitions_filter(partitioning, extent):
+    """Return the polars expression selecting the hive partitions intersecting the extent."""
+    dict_labels = partitioning.get_partitions_by_extent(extent=extent)
+    return pl.all_horizontal(
+        [pl.col(level).is_in(np.unique(labels).astype(str).tolist()) for level, labels in dict_labels.items()],
+    )
+
+
+def _read_dataframe(source, backend, filters=None, columns=None, n_rows=None, partitions=None, **polars_kwargs):
+    """Read bucket with polars and convert to backend of choice.
+
+    The filters, the columns and the number of rows are applied to a single lazy scan of the files.
+    Polars pushes them down into the scan, so that only the required partitions, row groups and
+    columns are decoded.
+    The ``partitions`` (hive) columns are used for filtering and are dropped from the returned dataframe.
+    """
     if source is None or len(source) == 0:
         raise ValueError("No files available matching your request.")
-    is_lazy = False
     # Preprocess polars kwargs
     if "hive_partitioning" not in polars_kwargs:
         polars_kwargs["hive_partitioning"] = False
-    # Read dataframe with polars
-    if "columns" not in polars_kwargs:  # backend == "polars_lazy":
-        is_lazy = True
-        df = pl.scan_parquet(
-            source=source,
-            **polars_kwargs,
-        )
-    else:
-        df = pl.read_parquet(
-            source=source,
-            **polars_kwargs,
-        )
 
-    # Apply spatial filtering to remove unrelevant data within partitions
-    df = apply_spatial_filters(df, filters=filters)
+    # Define the lazy query plan
+    df = _scan_dataframe(source, **polars_kwargs)
+    df = apply_filters(df, filters=filters)
+    if columns is not None:
+        if filters and "point_radius" in filters:
+            columns = [*columns, "distance"]
+        df = df.select(columns)
+    elif partitions:
+        df = df.drop(partitions)
+    if n_rows is not None:
+        df = df.head(n_rows)
 
     # Put data into memory if not polars lazy
-    if is_lazy and backend != "polars_lazy":
+    if backend != "polars_lazy":
         df = df.collect()
         if df.shape[0] == 0:
             raise ValueError("No data match your request.")
@@ -143,6 +191,10 @@ def read_bucket(
     distance=None,
     size=None,
     padding=0,
+    # Time and values filters
+    start_time=None,
+    end_time=None,
+    filters=None,
     # Filename filters
     file_extension=None,
     glob_pattern=None,
@@ -158,9 +210,21 @@ def read_bucket(
     The ``extent``, ``country``, ``continent``, or ``point`` arguments allows to read only a spatial subset
     of the original bucket. Please specify only one of this arguments !
 
+    The ``start_time``, ``end_time`` and ``filters`` arguments allows to read only the data within
+    a time period and a range of values of some columns.
+
     The ``file_extension``, ``glob_pattern`` and ``regex_pattern`` arguments allows to further restrict the
     selection of files read from the partitioned dataset.
 
+    If the bucket has a manifest (written by ``write_bucket`` and ``merge_granule_buckets``),
+    the files and row groups to read are selected with the manifest, without listing the bucket directories.
+    The manifest is removed by ``write_granule_bucket`` and ``write_granules_bucket``. If files are added
+    to the bucket by other means, call ``gpm.bucket.manifest.update_bucket_manifest`` to update it.
+    Otherwise, the partitions of ``hive`` partitioned buckets are selected with the partition columns.
+
+    All filters and the columns selection are applied to a single lazy ``polars.scan_parquet`` query,
+    so that only the required row groups and columns are decoded.
+
     Parameters
     ----------
     bucket_dir : str
@@ -186,6 +250,15 @@ def read_bucket(
         If two values are provided (x, y), they are interpreted as longitude and latitude padding, respectively.
         If four values are provided, they directly correspond to padding for each side (left, right, top, bottom).
         Default is 0.
+    start_time : `datetime.datetime`, optional
+        Start time of the data to read. The ``time`` column is used.
+    end_time : `datetime.datetime`, optional
+        End time of the data to read. The ``time`` column is used.
+    filters : dict, `polars.Expr` or list, optional
+        Dictionary with the ``(vmin, vmax)`` range of values to read of some columns.
+        ``None`` bounds are not applied (i.e. ``{"dummy_var": (0.5, None)}``).
+        Alternatively, a polars expression or a list of polars expressions selecting the rows to read
+        (i.e. ``pl.col("dummy_var") > 0.5``).
     file_extension : str, optional
         Name of the file extension. The default is ``None``.
     glob_pattern : str, optional
@@ -197,10 +270,10 @@ def read_bucket(
         The default is a polars.DataFrame.
         Valid backends are ``pandas``, ``polars_lazy`` and ``pyarrow``.
     **polars_kwargs : dict
-        Arguments to be passed to polars.read_parquet()
+        Arguments to be passed to polars.scan_parquet()
         ``columns`` allow to specify the subset of columns to read.
-        ``n_rows`` allows to stop reading data from Parquet files after reading n_rows.
-        For other arguments, please refer to:  https://docs.pola.rs/py-polars/html/reference/api/polars.read_parquet.html
+        ``n_rows`` allows to stop reading data from Parquet files after having selected n_rows.
+        For other arguments, please refer to:  https://docs.pola.rs/py-polars/html/reference/api/polars.scan_parquet.html
 
     Returns
     -------
@@ -213,21 +286,30 @@ def read_bucket(
     specified_filters = [opt for opt in spatial_filter_options if opt is not None]
     if len(specified_filters) > 1:
         raise ValueError("Specify only one between extent, country, continent, and point arguments.")
+
+    # Define the time and values filters
+    dict_filters = {}
+    if start_time is not None or end_time is not None:
+        start_time = check_time(start_time) if start_time is not None else None
+        end_time = check_time(end_time) if end_time is not None else None
+        dict_filters["time_range"] = (start_time, end_time)
+    if isinstance(filters, pl.Expr):
+        filters = [filters]
+    if isinstance(filters, dict):
+        dict_filters["values"] = filters
+    elif filters:
+        dict_filters["expressions"] = list(filters)
+
+    # Define the spatial filters
+    dir_trees = None
     if specified_filters:
         # Read partitioning class
         partitioning = get_bucket_partitioning(bucket_dir)
         # Infer dir_tree based on the specified spatial filters
-        if extent is not None:
-            dir_trees = partitioning.directories_by_extent(extent)
-            filters = {"extent": extent}
-        elif country is not None:
+        if country is not None:
             extent = get_country_extent(name=country, padding=padding)
-            dir_trees = partitioning.directories_by_extent(extent)
-            filters = {"extent": extent}
         elif continent is not None:
             extent = get_continent_extent(name=continent, padding=padding)
-            dir_trees = partitioning.directories_by_extent(extent)
-            filters = {"extent": extent}
         elif point is not None:
             lon, lat = point
             extent = get_geographic_extent_around_point(
@@ -236,8 +318,44 @@ def read_bucket(
                 distance=distance,
                 size=size,
             )
-            dir_trees = partitioning.directories_by_extent(extent)
-            filters = {"point_radius": (lon, lat, distance)} if distance else {"extent": extent}
+        dir_trees = partitioning.directories_by_extent(extent)
+        # The extent is also used around the point to prune the row groups before computing distances
+        dict_filters["extent"] = extent
+        if point is not None and distance:
+            dict_filters["point_radius"] = (lon, lat, distance)
+
+    # Select the files and row groups to read with the bucket manifest
+    has_filename_filters = file_extension is not None or glob_pattern is not None or regex_pattern is not None
+    manifest = read_bucket_manifest(bucket_dir)
+    if manifest is None:
+        partitioning = get_bucket_partitioning(bucket_dir)
+    partitions = None
+    if manifest is not None:
+        manifest = prune_bucket_manifest(
+            manifest,
+            partitions=dir_trees,
+            extent=extent,
+            start_time=start_time,
+            end_time=end_time,
+            filters=dict_filters.get("values"),
+            file_extension=file_extension,
+            glob_pattern=glob_pattern,
+            regex_pattern=regex_pattern,
+        )
+        source = get_manifest_row_groups(manifest, bucket_dir=bucket_dir)
+    # Otherwise scan the hive partitioned dataset and select the partitions with the partition columns
+    elif not has_filename_filters and partitioning.flavor == "hive":
+        glob_pattern = ["*" for i in range(partitioning.n_levels + 1)]
+        source = os.path.join(bucket_dir, *glob_pattern)
+        if polars_kwargs.get("hive_partitioning", True):
+            partitions = list(partitioning.order)
+            polars_kwargs["hive_partitioning"] = True
+            polars_kwargs.setdefault("hive_schema", dict.fromkeys(partitions, pl.String))
+            if specified_filters:
+                partitions_filter = _get_partitions_filter(partitioning, extent=extent)
+                dict_filters["expressions"] = [partitions_filter, *dict_filters.get("expressions", [])]
+    # Otherwise list the files of the partitions
+    elif specified_filters:
         # Define partitions paths
         paths = [os.path.join(bucket_dir, dir_tree) for dir_tree in dir_trees]
         #  Select only existing directories
@@ -250,21 +368,24 @@ def read_bucket(
             glob_pattern=glob_pattern,
             regex_pattern=regex_pattern,
         )
+    # If no filename filtering, specify a glob pattern across all the partitioned dataset
+    elif not has_filename_filters:
+        glob_pattern = ["*" for i in range(partitioning.n_levels + 1)]
+        source = os.path.join(bucket_dir, *glob_pattern)
+    # Alternatively search for files that match the desired criteria
     else:
-        filters = {}
-        # If no filename filtering, specify a glob pattern across all the partitioned dataset
-        if file_extension is None and glob_pattern is None and regex_pattern is None:
-            partitioning = get_bucket_partitioning(bucket_dir)
-            glob_pattern = ["*" for i in range(partitioning.n_levels + 1)]
-            source = os.path.join(bucket_dir, *glob_pattern)
-        # Alternatively search for files that match the desired criteria
-        else:
-            source = get_filepaths(
-                bucket_dir=bucket_dir,
-                parallel=True,
-                file_extension=file_extension,
-                glob_pattern=glob_pattern,
-                regex_pattern=regex_pattern,
-            )
+        source = get_filepaths(
+            bucket_dir=bucket_dir,
+            parallel=True,
+            file_extension=file_extension,
+            glob_pattern=glob_pattern,
+            regex_pattern=regex_pattern,
+        )
     # Read the dataframe
-    return _read_dataframe(source=source, backend=backend, filters=filters, **polars_kwargs)
+    return _read_dataframe(
+        source=source,
+        backend=backend,
+        filters=dict_filters,
+        partitions=partitions,
+        **polars_kwargs,
+    )
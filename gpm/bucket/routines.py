@@ -25,17 +25,41 @@
 
 # -----------------------------------------------------------------------------.
 """This module provides the routines for the creation of GPM Geographic Buckets."""
+import concurrent.futures
+import math
 import os
 import time
 
 import dask
+import dask.dataframe as dd
+import pandas as pd
 import pyarrow as pa
 import pyarrow.dataset
 import pyarrow.parquet as pq
 from tqdm import tqdm
 
-from gpm.bucket.io import get_bucket_partitioning, get_filepaths_by_partition, write_bucket_info
-from gpm.bucket.writers import preprocess_writer_kwargs, write_dataset_metadata, write_partitioned_dataset
+import gpm
+from gpm.bucket.io import (
+    get_bucket_partitioning,
+    get_filepaths_by_partition,
+    get_granule_id,
+    read_ingested_granules,
+    record_ingested_granules,
+    write_bucket_info,
+)
+from gpm.bucket.manifest import (
+    get_files_manifest,
+    remove_bucket_manifest,
+    update_bucket_manifest,
+    write_bucket_manifest,
+)
+from gpm.bucket.writers import (
+    convert_size_to_bytes,
+    estimate_row_group_size,
+    preprocess_writer_kwargs,
+    write_dataset_metadata,
+    write_partitioned_dataset,
+)
 from gpm.io.info import group_filepaths
 from gpm.utils.dask import clean_memory, get_client
 from gpm.utils.parallel import compute_list_delayed
@@ -83,11 +107,14 @@ def write_granule_bucket(
         More information available at https://arrow.apache.org/docs/python/generated/pyarrow.dataset.write_dataset.html
 
     """
+    # Remove the bucket manifest (which would not list the added files)
+    remove_bucket_manifest(bucket_dir)
+
     # Define unique prefix name so to add files to the bucket archive
     # - This prevent risk of overwriting
     # - If df is pandas.dataframe -->  f"{filename_prefix}_" + "{i}.parquet"
     # - if df is a dask.dataframe -->  f"{filename_prefix}_dask.partition_{part_index}"
-    filename_prefix = os.path.splitext(os.path.basename(src_filepath))[0]
+    filename_prefix = get_granule_id(src_filepath)
 
     # Retrieve dataframe
     df = granule_to_df_func(src_filepath)
@@ -120,6 +147,139 @@ def _try_write_granule_bucket(**kwargs):
     return info
 
 
+_WORKER_STATE = {}
+
+
+def _initialize_bucket_worker(bucket_dir, partitioning, granule_to_df_func, x, y, writer_kwargs, config):
+    """Initialize the state of a bucket writer process.
+
+    The partitioning and the ``granule_to_df_func`` are unpickled and the Parquet
+    file write options are built once per process instead of once per granule.
+    """
+    gpm.config.set(config)
+    writer_kwargs = writer_kwargs.copy()
+    if writer_kwargs.get("file_options") is None:
+        file_options = {
+            "compression": writer_kwargs.pop("compression", None),
+            "compression_level": writer_kwargs.pop("compression_level", None),
+            "write_statistics": writer_kwargs.pop("write_statistics", False),
+        }
+        writer_kwargs["file_options"] = pa.dataset.ParquetFileFormat().make_write_options(**file_options)
+    _WORKER_STATE.update(
+        {
+            "bucket_dir": bucket_dir,
+            "partitioning": partitioning,
+            "granule_to_df_func": granule_to_df_func,
+            "x": x,
+            "y": y,
+            "writer_kwargs": writer_kwargs,
+        },
+    )
+
+
+def _write_granule_bucket_in_worker(src_filepath):
+    """Write the bucket of a granule using the state of the current worker process.
+
+    Returns
+    -------
+    result : dict
+        Dictionary with the granule ``filepath``, the number of written rows ``n_rows``,
+        the ``elapsed`` time in seconds, the ``pid`` of the worker process and the ``error``
+        message (``None`` if the granule has been successfully written).
+    """
+    state = _WORKER_STATE
+    t_i = time.perf_counter()
+    try:
+        # Load the dataframe synchronously
+        with dask.config.set(scheduler="single-threaded"):
+            df = state["granule_to_df_func"](src_filepath)
+            if isinstance(df, dd.DataFrame):
+                df = df.compute()
+        df = state["partitioning"].add_labels(df=df, x=state["x"], y=state["y"])
+        write_partitioned_dataset(
+            df=df,
+            base_dir=state["bucket_dir"],
+            filename_prefix=get_granule_id(src_filepath),
+            partitions=state["partitioning"].order,
+            partitioning_flavor=state["partitioning"].flavor,
+            **state["writer_kwargs"],
+        )
+        n_rows = len(df)
+        error = None
+    except Exception as e:
+        n_rows = 0
+        error = str(e)
+    return {
+        "filepath": src_filepath,
+        "n_rows": n_rows,
+        "elapsed": time.perf_counter() - t_i,
+        "pid": os.getpid(),
+        "error": error,
+    }
+
+
+def _write_granules_bucket_with_processes(
+    filepaths,
+    bucket_dir,
+    partitioning,
+    granule_to_df_func,
+    max_workers=None,
+    resume=False,
+    x="lon",
+    y="lat",
+    **writer_kwargs,
+):
+    """Write the granules bucket with a pool of processes.
+
+    The granules are submitted at once: a worker process starts a new granule as soon as
+    it finished the previous one. Each successfully written granule is recorded in the
+    bucket ledger as soon as it completes, so that an interrupted run can be resumed.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    # Skip the granules already ingested
+    if resume:
+        ingested_granules = read_ingested_granules(bucket_dir)
+        n_filepaths = len(filepaths)
+        filepaths = [filepath for filepath in filepaths if get_granule_id(filepath) not in ingested_granules]
+        print(f"{n_filepaths - len(filepaths)} granules already ingested. {len(filepaths)} granules to process.")
+
+    # Spawn the worker processes to avoid deadlocks of the HDF5 and dask locks inherited by forked processes
+    mp_context = multiprocessing.get_context("spawn")
+    initargs = (bucket_dir, partitioning, granule_to_df_func, x, y, writer_kwargs, dict(gpm.config.config))
+    list_results = []
+    t_i = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_initialize_bucket_worker,
+        initargs=initargs,
+    ) as executor:
+        futures = [executor.submit(_write_granule_bucket_in_worker, filepath) for filepath in filepaths]
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            result = future.result()
+            list_results.append(result)
+            if result["error"] is None:
+                record_ingested_granules(bucket_dir, [result])
+            else:
+                print(f"An error occurred while processing {result['filepath']}: {result['error']}")
+    elapsed = time.perf_counter() - t_i
+
+    # Report the throughput
+    n_granules = sum(result["error"] is None for result in list_results)
+    rate = n_granules / max(elapsed, 1e-9) * 60
+    print(f"{n_granules} granules bucketed at {rate:.1f} granules per minute.")
+    return pd.DataFrame(list_results, columns=["filepath", "n_rows", "elapsed", "pid", "error"])
+
+
+def _check_parallel(parallel):
+    """Check the validity of the ``parallel`` argument."""
+    if parallel not in [True, False, "processes"]:
+        raise ValueError("'parallel' must be either True, False or 'processes'.")
+    return parallel
+
+
 @print_task_elapsed_time(prefix="Granules Bucketing Operation Terminated.")
 def write_granules_bucket(
     filepaths,
@@ -131,6 +291,8 @@ def write_granules_bucket(
     parallel=True,
     max_concurrent_tasks=None,
     max_dask_total_tasks=500,
+    max_workers=None,
+    resume=False,
     # Writer kwargs
     row_group_size="500MB",
     **writer_kwargs,
@@ -153,8 +315,10 @@ def write_granules_bucket(
         - 15° degree corresponds to 288 directories (24*12)
     granule_to_df_func : callable
         Function taking a granule filepath, opening it and returning a pandas or dask dataframe.
-    parallel : bool
+    parallel : bool or str
         Whether to bucket several granules in parallel.
+        If ``True``, the granules are processed with Dask by blocks of ``max_dask_total_tasks`` granules.
+        If ``"processes"``, the granules are processed by a pool of ``max_workers`` processes.
         The default is ``True``.
     max_concurrent_tasks : int
         The maximum number of Dask tasks to be concurrently executed.
@@ -163,6 +327,12 @@ def write_granules_bucket(
     max_dask_total_tasks : int
         The maximum number of Dask tasks to be scheduled.
         The default is 500.
+    max_workers : int, optional
+        The number of worker processes if ``parallel="processes"``.
+        If ``None``, it defaults to the number of processors.
+    resume : bool, optional
+        If ``parallel="processes"``, whether to skip the granules recorded in the bucket ledger
+        as already ingested. The default is ``False``.
     row_group_size : int or str, optional
         Maximum number of rows in each written Parquet row group.
         If specified as a string (i.e. "500 MB"), the equivalent row group size
@@ -174,13 +344,39 @@ def write_granules_bucket(
         The default ``use_threads`` is ``True``, which enable multithreaded file writing.
         More information available at https://arrow.apache.org/docs/python/generated/pyarrow.dataset.write_dataset.html
 
+    Returns
+    -------
+    report : pandas.DataFrame or None
+        If ``parallel="processes"``, a dataframe reporting for each processed granule the ``filepath``,
+        the number of written rows ``n_rows``, the processing time ``elapsed`` in seconds,
+        the ``pid`` of the worker process and the ``error`` message (if any).
+        The granules successfully written are recorded in the ``granules_ledger.sqlite`` ledger
+        of the bucket directory.
+
     """
+    parallel = _check_parallel(parallel)
+
     # Define flavor of directory partitioning
     writer_kwargs["row_group_size"] = row_group_size
 
     # Write down the information of the bucket
     write_bucket_info(bucket_dir=bucket_dir, partitioning=partitioning)
 
+    # Remove the bucket manifest (which would not list the added files)
+    remove_bucket_manifest(bucket_dir)
+
+    # Process the granules with a pool of processes
+    if parallel == "processes":
+        return _write_granules_bucket_with_processes(
+            filepaths=filepaths,
+            bucket_dir=bucket_dir,
+            partitioning=partitioning,
+            granule_to_df_func=granule_to_df_func,
+            max_workers=max_workers,
+            resume=resume,
+            **writer_kwargs,
+        )
+
     # Split long list of files in blocks
     list_blocks = split_list_in_blocks(filepaths, block_size=max_dask_total_tasks)
 
@@ -222,6 +418,7 @@ def write_granules_bucket(
             client = get_client()
             clean_memory(client)
             client.restart()
+    return None
 
 
 ####--------------------------------------------------------------------------------------------------.
@@ -236,6 +433,7 @@ def write_bucket(
     # Writer arguments
     filename_prefix="part",
     row_group_size="500MB",
+    manifest_columns=None,
     **writer_kwargs,
 ):
     """
@@ -263,11 +461,16 @@ def write_bucket(
         Maximum number of rows in each written Parquet row group.
         If specified as a string (i.e. "500 MB"), the equivalent row group size
         number is estimated. The default is "500MB".
+    manifest_columns : list, optional
+        Columns whose minimum and maximum values are recorded in the bucket manifest,
+        in addition to ``time``, ``lon`` and ``lat``. The default is ``None``.
     **writer_kwargs: dict
         Optional arguments to be passed to the pyarrow Dataset Writer.
         Common arguments are 'format' and 'use_threads'.
         The default file ``format`` is ``'parquet'``.
         The default ``use_threads`` is ``True``, which enable multithreaded file writing.
+        The default ``write_statistics`` is ``True``, so that the readers can skip the
+        row groups not matching the query.
         More information available at https://arrow.apache.org/docs/python/generated/pyarrow.dataset.write_dataset.html
 
     """
@@ -281,7 +484,9 @@ def write_bucket(
     df = partitioning.add_labels(df=df, x=x, y=y)
 
     # Write bucket
+    # - Write the row groups statistics to enable predicate pushdown when reading
     writer_kwargs["row_group_size"] = row_group_size
+    writer_kwargs.setdefault("write_statistics", True)
     write_partitioned_dataset(
         df=df,
         base_dir=bucket_dir,
@@ -291,11 +496,165 @@ def write_bucket(
         **writer_kwargs,
     )
 
+    # Write the bucket manifest
+    update_bucket_manifest(bucket_dir, columns=manifest_columns)
+
 
 ####--------------------------------------------------------------------------------------------------.
 #### Merge Granules
 
 
+def _group_partitions_files(dict_partition_files, directories_mapping):
+    """Group the files of the source partitions by destination partition."""
+    dict_dst_partition_files = {}
+    for partition_label, filepaths in dict_partition_files.items():
+        dict_dst_partition_files.setdefault(directories_mapping[partition_label], []).extend(filepaths)
+    return dict_dst_partition_files
+
+
+def _define_merge_tasks(dict_partition_files, max_partition_size):
+    """Define the tasks of the bucket merging.
+
+    A task merges the files of a partition.
+    The partitions larger than ``max_partition_size`` bytes are split into a task per year.
+    The tasks are sorted by decreasing size, so that the largest tasks are scheduled first.
+    """
+    tasks = []
+    for partition_label, filepaths in dict_partition_files.items():
+        year_dict = group_filepaths(filepaths, groups="year")
+        sizes = {year: sum(os.path.getsize(filepath) for filepath in fpaths) for year, fpaths in year_dict.items()}
+        if sum(sizes.values()) > max_partition_size:
+            tasks += [
+                {"partition": partition_label, "year_filepaths": {year: fpaths}, "size": sizes[year]}
+                for year, fpaths in year_dict.items()
+            ]
+        else:
+            tasks.append({"partition": partition_label, "year_filepaths": year_dict, "size": sum(sizes.values())})
+    return sorted(tasks, key=lambda task: task["size"], reverse=True)
+
+
+def _estimate_merge_task_memory(bytes_per_row, row_group_size, batch_size, batch_readahead, fragment_readahead):
+    """Estimate the peak memory (in bytes) required by a merge task.
+
+    The dataset writer buffers a row group before writing it to disk, while the
+    scanner reads ahead ``batch_readahead`` batches of ``fragment_readahead`` files.
+    """
+    n_rows = (row_group_size or 0) + batch_size * batch_readahead * fragment_readahead
+    return int(bytes_per_row * n_rows)
+
+
+def _get_merge_n_workers(task_memory, memory_budget=None, max_workers=None):
+    """Return the number of merge processes fitting within the memory budget."""
+    n_workers = max_workers if max_workers is not None else os.cpu_count()
+    if memory_budget is not None:
+        n_workers = min(n_workers, convert_size_to_bytes(memory_budget) // max(task_memory, 1))
+    return max(1, n_workers)
+
+
+def _get_written_files(partition_dir, year):
+    """Return the files of a year written in a partition of the merged bucket."""
+    if not os.path.exists(partition_dir):
+        return []
+    return [
+        os.path.join(partition_dir, filename)
+        for filename in os.listdir(partition_dir)
+        if filename.startswith(f"{year}_") and filename.endswith(".parquet")
+    ]
+
+
+def _merge_partition(
+    partition_label,
+    year_filepaths,
+    dst_bucket_dir,
+    writer_kwargs,
+    scanner_kwargs,
+    manifest_columns=None,
+):
+    """Merge the per-granule files of a partition into a file per year (or more if ``max_file_size`` is reached).
+
+    This function is executed by the worker processes of ``merge_granule_buckets(parallel=True)``.
+
+    Returns
+    -------
+    list_reports : list
+        Report of the merging of each year.
+    metadata_collector : list
+        Parquet metadata of the written files (if ``write_metadata=True``).
+    manifest_records : list
+        Manifest records of the row groups of the written files.
+
+    """
+    writer_kwargs, metadata_collector = preprocess_writer_kwargs(writer_kwargs=writer_kwargs.copy(), df=None)
+    partition_dir = os.path.join(dst_bucket_dir, partition_label)
+    list_reports = []
+    manifest_records = []
+    for year, filepaths in year_filepaths.items():
+        t_i = time.perf_counter()
+        basename_template = f"{year}_" + "{i}.parquet"
+        # Read Dataset
+        dataset = pyarrow.dataset.dataset(filepaths, format="parquet")
+
+        # Define scanner
+        scanner = dataset.scanner(**scanner_kwargs)
+
+        # Rewrite dataset
+        pa.dataset.write_dataset(
+            scanner,
+            base_dir=partition_dir,
+            basename_template=basename_template,
+            # Directory options
+            create_dir=True,
+            existing_data_behavior="overwrite_or_ignore",
+            # Options
+            **writer_kwargs,
+        )
+        dst_filepaths = _get_written_files(partition_dir, year)
+        manifest_records += get_files_manifest(dst_filepaths, bucket_dir=dst_bucket_dir, columns=manifest_columns)
+        list_reports.append(
+            {
+                "partition": partition_label,
+                "year": year,
+                "n_src_files": len(filepaths),
+                "src_size": sum(os.path.getsize(filepath) for filepath in filepaths),
+                "n_dst_files": len(dst_filepaths),
+                "dst_size": sum(os.path.getsize(filepath) for filepath in dst_filepaths),
+                "elapsed": time.perf_counter() - t_i,
+            },
+        )
+    return list_reports, metadata_collector, manifest_records
+
+
+def _get_n_rows(filepath):
+    return pq.read_metadata(filepath).num_rows
+
+
+def _get_merge_dry_run_report(tasks, max_rows_per_file):
+    """Report the expected number and size of the files of the merged bucket.
+
+    The number of rows of each partition is read from the Parquet footers of the source files.
+    The size of the merged files is estimated as the size of the source files.
+    """
+    list_reports = []
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        for task in tasks:
+            for year, filepaths in task["year_filepaths"].items():
+                n_rows = sum(executor.map(_get_n_rows, filepaths))
+                n_dst_files = math.ceil(n_rows / max_rows_per_file) if max_rows_per_file else int(n_rows > 0)
+                src_size = sum(os.path.getsize(filepath) for filepath in filepaths)
+                list_reports.append(
+                    {
+                        "partition": task["partition"],
+                        "year": year,
+                        "n_src_files": len(filepaths),
+                        "n_rows": n_rows,
+                        "src_size": src_size,
+                        "n_dst_files": n_dst_files,
+                        "dst_size": src_size,
+                    },
+                )
+    return pd.DataFrame(list_reports)
+
+
 @print_task_elapsed_time(prefix="Bucket Merging Terminated.")
 def merge_granule_buckets(
     src_bucket_dir,
@@ -305,8 +664,15 @@ def merge_granule_buckets(
     compression="snappy",
     compression_level=None,
     write_metadata=False,
-    write_statistics=False,
+    write_statistics=True,
     # Computing options
+    parallel=False,
+    max_workers=None,
+    memory_budget=None,
+    max_partition_size="1GB",
+    dry_run=False,
+    dst_partitioning=None,
+    manifest_columns=None,
     max_open_files=0,
     use_threads=True,
     # Scanner options
@@ -344,6 +710,42 @@ def merge_granule_buckets(
         to read the pyArrow documentation of the codec you are using at
         https://arrow.apache.org/docs/python/generated/pyarrow.Codec.html
         The default is ``None``.
+    write_metadata : bool, optional
+        Whether to write the ``_metadata`` and ``_common_metadata`` files. The default is ``False``.
+    write_statistics : bool, optional
+        Whether to write the Parquet row groups statistics, which enable ``read_bucket``
+        to skip the row groups not matching the query. The default is ``True``.
+    parallel : bool, optional
+        Whether to merge several partitions concurrently in a pool of processes.
+        The worker processes are spawned: in a script, call ``merge_granule_buckets``
+        within an ``if __name__ == "__main__":`` block.
+        The threads available to each worker process for reading and writing the files
+        (if ``use_threads=True``) are divided by the number of worker processes.
+        The default is ``False``.
+    max_workers : int, optional
+        Maximum number of worker processes if ``parallel=True``.
+        If ``None``, it defaults to the number of processors.
+    memory_budget : int or str, optional
+        Memory available for the merging (i.e. ``"64GB"``).
+        If specified, the number of worker processes is limited so that the estimated
+        peak memory of the concurrent tasks fits in the budget.
+        The default is ``None``.
+    max_partition_size : int or str, optional
+        Size of the source files above which the years of a partition are merged
+        by separate tasks. The default is ``"1GB"``.
+    dry_run : bool, optional
+        If ``True``, nothing is written and the expected number and size of the merged
+        files of each partition are returned. The default is ``False``.
+    dst_partitioning : `gpm.bucket.SpatialPartitioning`, optional
+        Partitioning of the merged bucket archive.
+        It must be aligned with the partitioning of the source bucket archive: each source
+        partition must lie within a single destination partition (i.e. 1° ``LonLatPartitioning``
+        into 5° ``LonLatPartitioning`` or a 10° ``TilePartitioning``).
+        The files of the source partitions are streamed into their destination partition.
+        If ``None`` (the default), the partitioning of the source bucket archive is used.
+    manifest_columns : list, optional
+        Columns whose minimum and maximum values are recorded in the bucket manifest,
+        in addition to ``time``, ``lon`` and ``lat``. The default is ``None``.
     max_open_files, int, optional
         If greater than 0 then this will limit the maximum number of files that can be left open.
         If an attempt is made to open too many files then the least recently used file will be closed.
@@ -370,12 +772,20 @@ def merge_granule_buckets(
 
     Returns
     -------
-    None.
+    report : pandas.DataFrame
+        Report with, for each partition and year, the number ``n_src_files`` and size ``src_size``
+        of the source files and the number ``n_dst_files`` and size ``dst_size`` of the merged files.
+        If ``dry_run=True``, the number of rows ``n_rows`` and the expected merged files are reported.
+        Otherwise the merging time ``elapsed`` is reported.
 
     """
     # Retrieve partitioning class
     partitioning = get_bucket_partitioning(bucket_dir=src_bucket_dir)
 
+    # Map the source partitions to the destination partitions
+    if dst_partitioning is not None:
+        directories_mapping = partitioning.get_directories_mapping(dst_partitioning)
+
     # Identify Parquet filepaths for each bin
     print("Searching of Parquet files has started.")
     t_i = time.time()
@@ -386,21 +796,28 @@ def merge_granule_buckets(
     print(f"Searching of Parquet files ended. Elapsed time: {t_elapsed} minutes.")
     print(f"{n_geographic_bins} geographic partitions to process.")
 
+    # Group the source partitions into the destination partitions
+    if dst_partitioning is not None:
+        dict_partition_files = _group_partitions_files(dict_partition_files, directories_mapping=directories_mapping)
+        partitioning = dst_partitioning
+        print(f"{len(dict_partition_files)} destination partitions to write.")
+
     # Retrieve list of partitions
     list_partitions = list(dict_partition_files.keys())
 
-    # Write the new partitioning class
-    # TODO: add option maybe to provide new partitioning to this routine !
-    # --> Will require to load data into memory inside a partition (instead of scanner) !
-    # --> Check that new partitioning is aligned and subset of original partitioning?
-    write_bucket_info(bucket_dir=dst_bucket_dir, partitioning=partitioning)
-
     # -----------------------------------------------------------------------------------------------.
     # Retrieve table schema
+    # - Do not add the partitioning columns inferred from the directory names
     template_filepath = dict_partition_files[list_partitions[0]][0]
-    template_table = pq.read_table(template_filepath)
+    template_table = pq.read_table(template_filepath, partitioning=None)
     schema = template_table.schema
 
+    # Define the number of rows of the row groups and files
+    if isinstance(row_group_size, str):
+        row_group_size = estimate_row_group_size(df=template_table, size=row_group_size)
+    if isinstance(max_file_size, str):
+        max_file_size = estimate_row_group_size(df=template_table, size=max_file_size)
+
     # Define writer_kwargs
     writer_kwargs = {}
     writer_kwargs["row_group_size"] = row_group_size
@@ -411,46 +828,95 @@ def merge_granule_buckets(
     writer_kwargs["use_threads"] = use_threads
     writer_kwargs["write_metadata"] = write_metadata
     writer_kwargs["write_statistics"] = write_statistics
-    writer_kwargs, metadata_collector = preprocess_writer_kwargs(
-        writer_kwargs=writer_kwargs,
-        df=template_table,
+
+    # Define scanner_kwargs
+    scanner_kwargs = {
+        "batch_size": batch_size,
+        "batch_readahead": batch_readahead,
+        "fragment_readahead": fragment_readahead,
+        "use_threads": use_threads,
+    }
+
+    # Define the merging tasks
+    tasks = _define_merge_tasks(dict_partition_files, max_partition_size=convert_size_to_bytes(max_partition_size))
+
+    # Define the number of worker processes
+    task_memory = _estimate_merge_task_memory(
+        bytes_per_row=template_table.nbytes / max(template_table.num_rows, 1),
+        row_group_size=row_group_size,
+        batch_size=batch_size,
+        batch_readahead=batch_readahead,
+        fragment_readahead=fragment_readahead,
     )
+    n_workers = _get_merge_n_workers(task_memory, memory_budget=memory_budget, max_workers=max_workers)
+    n_workers = min(n_workers, len(tasks)) if parallel else 1
+
+    # -----------------------------------------------------------------------------------------------.
+    # Report the expected output if dry run
+    if dry_run:
+        report = _get_merge_dry_run_report(tasks, max_rows_per_file=max_file_size)
+        print(f"{len(tasks)} merging tasks with {n_workers} processes ({task_memory / 1024**3:.2f} GB per task).")
+        print(
+            f"Expected output: {report['n_dst_files'].sum()} files, {report['dst_size'].sum() / 1024**3:.2f} GB.",
+        )
+        return report
+
+    # Write the new partitioning class
+    write_bucket_info(bucket_dir=dst_bucket_dir, partitioning=partitioning)
 
     # -----------------------------------------------------------------------------------------------.
     # Concatenate data within bins
     # - Cannot rewrite directly the full pyarrow.dataset because there is no way to specify when
     #    data from each partition have been scanned completely (and can be written to disk)
-    print("Start concatenating the granules bucket archive")
-    # partition_label = "latbin=0/lonbin=10"
-    # filepaths = dict_partition_files[partition_label]
-    n_partitions = len(dict_partition_files)
-    for partition_label, filepaths in tqdm(dict_partition_files.items(), total=n_partitions):
-        partition_dir = os.path.join(dst_bucket_dir, partition_label)
-        year_dict = group_filepaths(filepaths, groups="year")
-        for year, year_filepaths in year_dict.items():
-            basename_template = f"{year}_" + "{i}.parquet"
-            # Read Dataset
-            dataset = pyarrow.dataset.dataset(year_filepaths, format="parquet")
-
-            # Define scanner
-            scanner = dataset.scanner(
-                batch_size=batch_size,
-                batch_readahead=batch_readahead,
-                fragment_readahead=fragment_readahead,
-                use_threads=use_threads,
-            )
-
-            # Rewrite dataset
-            pa.dataset.write_dataset(
-                scanner,
-                base_dir=partition_dir,
-                basename_template=basename_template,
-                # Directory options
-                create_dir=True,
-                existing_data_behavior="overwrite_or_ignore",
-                # Options
-                **writer_kwargs,
-            )
+    # - Each partition (or partition year) is rewritten by a separate task
+    print(f"Start concatenating the granules bucket archive ({len(tasks)} tasks, {n_workers} processes)")
+    task_kwargs = {
+        "dst_bucket_dir": dst_bucket_dir,
+        "writer_kwargs": writer_kwargs,
+        "scanner_kwargs": scanner_kwargs,
+        "manifest_columns": manifest_columns,
+    }
+    list_reports = []
+    metadata_collector = []
+    manifest_records = []
+    progress_bar = tqdm(total=len(tasks))
+    if n_workers == 1:
+        for task in tasks:
+            reports, metadata, records = _merge_partition(task["partition"], task["year_filepaths"], **task_kwargs)
+            list_reports += reports
+            metadata_collector += metadata
+            manifest_records += records
+            progress_bar.set_postfix_str(task["partition"])
+            progress_bar.update(1)
+    else:
+        import multiprocessing
+
+        # Spawn the worker processes to avoid deadlocks of the locks inherited by forked processes
+        # - Share the CPU cores between the threads of the worker processes
+        mp_context = multiprocessing.get_context("spawn")
+        n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=mp_context,
+            initializer=pa.set_cpu_count,
+            initargs=(n_threads,),
+        ) as executor:
+            futures = {
+                executor.submit(_merge_partition, task["partition"], task["year_filepaths"], **task_kwargs): task
+                for task in tasks
+            }
+            for future in concurrent.futures.as_completed(futures):
+                reports, metadata, records = future.result()
+                list_reports += reports
+                metadata_collector += metadata
+                manifest_records += records
+                progress_bar.set_postfix_str(futures[future]["partition"])
+                progress_bar.update(1)
+    progress_bar.close()
+
+    # Write the bucket manifest
+    write_bucket_manifest(dst_bucket_dir, records=manifest_records)
 
     if metadata_collector:
         write_dataset_metadata(base_dir=dst_bucket_dir, metadata_collector=metadata_collector, schema=schema)
+    return pd.DataFrame(list_reports)
@@ -0,0 +1,376 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module contains functions to cache the structure and attributes of the GPM granules.
+
+Opening a granule with ``open_datatree`` requires to open all the HDF5 groups of the granule,
+to rename the dimensions of all variables and to parse the global attributes.
+The groups, the variables and their dimensions are identical across the granules of a product
+and are cached for each (product, version, scan_mode), where version is the full granule version
+(i.e. ``V07B``). The parsed global attributes are cached for each granule and are invalidated
+when the granule file is modified.
+
+With the structure cache, ``open_cached_datatree`` opens only the groups containing the
+requested variables. The caches are kept in memory and persisted in a SQLite database
+at ``<base_dir>/GPM/granules_cache.sqlite``.
+The caches are used only if the ``use_granule_cache`` configuration option is enabled.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+
+import datatree
+import numpy as np
+import xarray as xr
+
+from gpm.dataset.attrs import get_granule_attrs
+from gpm.dataset.datatree import check_non_empty_granule, get_required_groups, open_datatree, open_group_dataset
+from gpm.dataset.groups_variables import _get_relevant_groups_variables_from_dict
+from gpm.io.info import get_product_from_filepath, get_version_from_filepath
+
+CACHE_FILENAME = "granules_cache.sqlite"
+# Version of the cache schema. The cache tables are recreated when the version changes.
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS structures (
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    scan_mode TEXT NOT NULL,
+    structure TEXT NOT NULL,
+    PRIMARY KEY (product, version, scan_mode)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    filepath TEXT NOT NULL PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    attrs TEXT NOT NULL
+);
+"""
+
+_MAX_CACHED_ATTRIBUTES = 10_000
+
+_STRUCTURES = {}
+_ATTRIBUTES = {}
+
+
+####--------------------------------------------------------------------------.
+########################
+#### SQLite storage ####
+########################
+
+
+def _encode_json_value(value):
+    """Encode the NumPy arrays and scalars of the cached attributes."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return {"__numpy__": value.tolist(), "dtype": value.dtype.str, "ndim": value.ndim}
+    raise TypeError(f"Object of type {type(value).__name__} can not be cached.")
+
+
+def _decode_json_object(obj):
+    """Decode the NumPy arrays and scalars of the cached attributes."""
+    if "__numpy__" not in obj:
+        return obj
+    value = np.array(obj["__numpy__"], dtype=obj["dtype"])
+    return value if obj["ndim"] > 0 else value[()]
+
+
+def _dumps(obj):
+    """Serialize a cached object to JSON."""
+    return json.dumps(obj, default=_encode_json_value)
+
+
+def _loads(content):
+    """Deserialize a cached object from JSON."""
+    return json.loads(content, object_hook=_decode_json_object)
+
+
+def get_granules_cache_filepath(base_dir=None):
+    """Return the filepath of the granules cache."""
+    from gpm.configs import get_base_dir
+    from gpm.io.checks import check_base_dir
+
+    base_dir = get_base_dir(base_dir=base_dir)
+    base_dir = check_base_dir(base_dir)
+    return os.path.join(base_dir, "GPM", CACHE_FILENAME)
+
+
+@contextlib.contextmanager
+def _connect():
+    """Open a connection to the granules cache and commit the changes on exit.
+
+    If the GPM base directory is not specified, ``None`` is returned and the caches are kept only in memory.
+    """
+    try:
+        filepath = get_granules_cache_filepath()
+    except ValueError:
+        yield None
+        return
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    con = sqlite3.connect(filepath, timeout=60)
+    try:
+        if con.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            con.executescript("DROP TABLE IF EXISTS structures; DROP TABLE IF EXISTS attributes;")
+            con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def clear_granules_cache():
+    """Remove the cached granules structures and attributes."""
+    _STRUCTURES.clear()
+    _ATTRIBUTES.clear()
+    with _connect() as con:
+        if con is not None:
+            con.execute("DELETE FROM structures")
+            con.execute("DELETE FROM attributes")
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Structure cache ####
+#########################
+
+
+def get_datatree_structure(dt, scan_mode):
+    """Return the structure of a granule scan mode.
+
+    The structure is a dictionary with:
+
+    - ``groups``: the path of each group. The ``<scan_mode>`` node is represented by ``''``.
+    - ``variables``: the variables of each group.
+    - ``dims``: the dimensions of each variable of each group.
+
+    The datatree dimensions must have been already renamed.
+    """
+    groups = {}
+    variables = {}
+    dims = {}
+    for path in dt[scan_mode].groups:
+        name = path.split("/")[-1]
+        name = "" if name == scan_mode else name
+        ds = dt[path]
+        groups[name] = path
+        variables[name] = list(ds.data_vars)
+        dims[path] = {var: list(ds[var].dims) for var in ds.data_vars}
+    return {"groups": groups, "variables": variables, "dims": dims}
+
+
+def get_cached_structure(product, version, scan_mode):
+    """Return the cached structure of a product scan mode (or ``None``).
+
+    The ``version`` is the full granule version (i.e. ``V07B``), as the structure
+    of the granules can change across minor versions.
+    """
+    key = (product, version, scan_mode)
+    if key not in _STRUCTURES:
+        with _connect() as con:
+            if con is None:
+                return None
+            record = con.execute(
+                "SELECT structure FROM structures WHERE product = ? AND version = ? AND scan_mode = ?",
+                key,
+            ).fetchone()
+        if record is None:
+            return None
+        _STRUCTURES[key] = _loads(record[0])
+    return _STRUCTURES[key]
+
+
+def set_cached_structure(product, version, scan_mode, structure):
+    """Cache the structure of a product scan mode."""
+    key = (product, version, scan_mode)
+    _STRUCTURES[key] = structure
+    with _connect() as con:
+        if con is not None:
+            con.execute("INSERT OR REPLACE INTO structures VALUES (?, ?, ?, ?)", (*key, _dumps(structure)))
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Attributes cache ####
+##########################
+
+
+def _get_file_stats(filepath):
+    """Return the modification time (in nanoseconds) and the size of a file."""
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_root_attrs(filepath):
+    """Read the global attributes of a granule."""
+    import netCDF4
+
+    with netCDF4.Dataset(filepath, mode="r") as nc:
+        return {key: nc.getncattr(key) for key in nc.ncattrs()}
+
+
+def _get_attrs_record(filepath):
+    """Return the cached record of the global attributes of a granule (or ``None``)."""
+    record = _ATTRIBUTES.get(filepath)
+    if record is None:
+        with _connect() as con:
+            if con is not None:
+                record = con.execute(
+                    "SELECT mtime, file_size, attrs FROM attributes WHERE filepath = ?",
+                    (filepath,),
+                ).fetchone()
+        if record is not None:
+            record = (tuple(record[0:2]), tuple(_loads(record[2])))
+    return record
+
+
+def set_cached_attrs(filepath, attrs, granule_attrs, stats=None):
+    """Cache the global attributes of a granule."""
+    if stats is None:
+        stats = _get_file_stats(filepath)
+    if len(_ATTRIBUTES) >= _MAX_CACHED_ATTRIBUTES:
+        _ATTRIBUTES.clear()
+    _ATTRIBUTES[filepath] = (stats, (attrs, granule_attrs))
+    with _connect() as con:
+        if con is not None:
+            con.execute(
+                "INSERT OR REPLACE INTO attributes VALUES (?, ?, ?, ?)",
+                (filepath, *stats, _dumps((attrs, granule_attrs))),
+            )
+
+
+def get_cached_attrs(filepath):
+    """Return the global attributes of a granule.
+
+    The attributes are read from the file only if the granule is not cached or
+    if the file has been modified.
+
+    Returns
+    -------
+    attrs : dict
+        Global attributes of the granule, as read from the file.
+    granule_attrs : dict
+        Parsed global attributes returned by ``get_granule_attrs``.
+
+    """
+    stats = _get_file_stats(filepath)
+    record = _get_attrs_record(filepath)
+    if record is not None and record[0] == stats:
+        attrs, granule_attrs = record[1]
+        _ATTRIBUTES[filepath] = record
+    else:
+        attrs = _read_root_attrs(filepath)
+        granule_attrs = get_granule_attrs(xr.Dataset(attrs=attrs))
+        set_cached_attrs(filepath, attrs=attrs, granule_attrs=granule_attrs, stats=stats)
+    return attrs, granule_attrs.copy()
+
+
+####--------------------------------------------------------------------------.
+#######################
+#### Cached opening ###
+#######################
+
+
+def _set_dataset_dims(ds, dims):
+    """Rename the dimensions of the dataset variables with the cached dimensions."""
+    dict_var = {var: xr.Variable(dims[var], ds[var].variable.data, ds[var].attrs, ds[var].encoding) for var in ds}
+    return xr.Dataset(dict_var, attrs=ds.attrs)
+
+
+def _open_partial_datatree(filepath, structure, scan_mode, groups, attrs, chunks, decode_cf, engine):
+    """Open only the specified groups of a granule into a DataTree object.
+
+    The ``<scan_mode>`` node and, for orbit products, the ``ScanTime`` group are always opened.
+    """
+    dict_ds = {"/": xr.Dataset(attrs=attrs)}
+    for group in get_required_groups(groups, scan_mode=scan_mode):
+        path = structure["groups"][group]
+        ds = open_group_dataset(filepath, group=path, chunks=chunks, decode_cf=decode_cf, engine=engine)
+        dict_ds[path] = _set_dataset_dims(ds, structure["dims"][path])
+    return datatree.DataTree.from_dict(dict_ds)
+
+
+def open_cached_datatree(
+    filepath,
+    scan_mode,
+    variables=None,
+    groups=None,
+    chunks={},
+    decode_cf=False,
+    engine="netcdf4",
+):
+    """Open a granule into a DataTree object using the granules structure cache.
+
+    If the structure of the granule product is cached, only the groups containing the requested
+    ``variables`` and ``groups`` are opened with the specified ``engine``.
+    Otherwise the full granule is opened with ``open_datatree`` and its structure is cached.
+
+    Returns
+    -------
+    dt : datatree.DataTree
+        The granule DataTree.
+    granule_attrs : dict
+        Parsed global attributes returned by ``get_granule_attrs``.
+
+    """
+    product = get_product_from_filepath(filepath)
+    version = get_version_from_filepath(filepath, integer=False)
+    structure = get_cached_structure(product, version, scan_mode)
+    if structure is not None:
+        try:
+            attrs, granule_attrs = get_cached_attrs(filepath)
+            check_non_empty_granule(xr.Dataset(attrs=attrs), filepath)
+            required_groups, _ = _get_relevant_groups_variables_from_dict(
+                structure["variables"],
+                variables=variables,
+                groups=groups,
+            )
+            dt = _open_partial_datatree(
+                filepath,
+                structure=structure,
+                scan_mode=scan_mode,
+                groups=required_groups,
+                attrs=attrs,
+                chunks=chunks,
+                decode_cf=decode_cf,
+                engine=engine,
+            )
+        except (KeyError, OSError, ValueError):
+            # Fall back to open the full granule (and raise the relevant errors)
+            # - KeyError: group or variable missing in the cached structure or attributes
+            # - OSError: group missing in the file or unreadable file
+            # - ValueError: empty granule or invalid variables
+            pass
+        else:
+            return dt, granule_attrs
+    dt = open_datatree(filepath=filepath, chunks=chunks, decode_cf=decode_cf, use_api_defaults=True, engine=engine)
+    granule_attrs = get_granule_attrs(dt)
+    if scan_mode in dt.children:
+        set_cached_structure(product, version, scan_mode, get_datatree_structure(dt, scan_mode))
+        set_cached_attrs(filepath, attrs=dt.attrs, granule_attrs=granule_attrs)
+    return dt, granule_attrs.copy()
@@ -38,6 +38,12 @@ from gpm.dataset.crs import set_dataset_crs
 from gpm.dataset.decoding.cf import apply_cf_decoding
 from gpm.dataset.decoding.coordinates import set_coordinates
 from gpm.dataset.decoding.dataarray_attrs import standardize_dataarrays_attrs
+from gpm.dataset.decoding.dtypes import (
+    apply_decode_dtype_policy,
+    check_decode_dtype_policy,
+    get_source_dtypes,
+)
+from gpm.dataset.decoding.fused import split_fused_variables
 from gpm.dataset.decoding.routines import decode_variables
 from gpm.utils.checks import has_valid_geolocation, is_regular
 from gpm.utils.time import (
@@ -124,6 +130,49 @@ def reshape_dataset(ds):
     return ds
 
 
+def _subset_dataset_by_time(ds, start_time=None, end_time=None):
+    """Subset the dataset for start_time and end_time.
+
+    - Raise warning if the time period is not fully covered
+    - The warning can raise if some data are not downloaded or some granule
+      at the start/end of the period are empty
+    - Skip subsetting if time_bnds in dataset coordinates (i.e. IMERG case)
+    """
+    if "time_bnds" not in ds:
+        ds = subset_by_time(ds, start_time=start_time, end_time=end_time)
+    _check_time_period_coverage(ds, start_time=start_time, end_time=end_time, raise_error=False)
+    return ds
+
+
+def _warn_invalid_coordinates(ds):
+    """Warn about non-contiguous scans, non-regular timesteps or invalid geolocation.
+
+    - non-contiguous scans in orbit data
+    - non-regular timesteps in grid data
+    - invalid geolocation coordinates
+    --> Put lon/lat in memory first to avoid recomputing it
+    """
+    from gpm import config
+
+    ds["lon"] = ds["lon"].compute()
+    ds["lat"] = ds["lat"].compute()
+    try:
+        if is_grid(ds):
+            if config.get("warn_non_contiguous_scans") and not is_regular(ds):
+                msg = "Missing timesteps across the dataset !"
+                warnings.warn(msg, GPM_Warning, stacklevel=3)
+        elif is_orbit(ds):
+            if config.get("warn_invalid_geolocation") and not has_valid_geolocation(ds):
+                msg = "Presence of invalid geolocation coordinates !"
+                warnings.warn(msg, GPM_Warning, stacklevel=3)
+            if config.get("warn_non_contiguous_scans") and not is_regular(ds):
+                msg = "Presence of non-contiguous scans !"
+                warnings.warn(msg, GPM_Warning, stacklevel=3)
+    except Exception:
+        pass
+    return ds
+
+
 def finalize_dataset(ds, product, decode_cf, scan_mode, start_time=None, end_time=None):
     """Finalize GPM `xarray.Dataset` object."""
     import pyproj
@@ -146,9 +195,25 @@ def finalize_dataset(ds, product, decode_cf, scan_mode, start_time=None, end_tim
     # - Add range id, radar and pmw frequencies ...
     ds = set_coordinates(ds, product, scan_mode)
 
+    ##------------------------------------------------------------------------.
+    # Decode the dask variables with element-wise decoding in a single map_blocks layer
+    # - The other variables are decoded below
+    variables = list(ds.data_vars)
+    fused_variables = {}
+    dtype_policy = check_decode_dtype_policy(config.get("decode_dtype_policy"))
+    if config.get("fuse_decoding"):
+        ds, fused_variables = split_fused_variables(
+            ds,
+            product=product,
+            decode_cf=decode_cf,
+            decode_product=config.get("decode_variables"),
+            dtype_policy=dtype_policy,
+        )
+
     ##------------------------------------------------------------------------.
     # Decode dataset
     # - _FillValue is moved from attrs to encoding !
+    source_dtypes = get_source_dtypes(ds)
     if decode_cf:
         ds = apply_cf_decoding(ds)
     if "time_bnds" in ds:
@@ -166,6 +231,12 @@ def finalize_dataset(ds, product, decode_cf, scan_mode, start_time=None, end_tim
     if config.get("decode_variables"):
         ds = decode_variables(ds, product)
 
+    # Cast flags to small integers and float64 variables to float32 (if decode_dtype_policy="compact")
+    ds = apply_decode_dtype_policy(ds, policy=dtype_policy, source_dtypes=source_dtypes)
+    if fused_variables:
+        ds = ds.assign(fused_variables)
+        ds = ds[[var for var in variables if var in ds] + [var for var in ds.data_vars if var not in variables]]
+
     ##------------------------------------------------------------------------.
     # Add CF-compliant coordinates attributes and encoding
     ds = set_coords_attrs(ds)
@@ -202,36 +273,11 @@ def finalize_dataset(ds, product, decode_cf, scan_mode, start_time=None, end_tim
 
     ##------------------------------------------------------------------------.
     # Subset dataset for start_time and end_time
-    # - Raise warning if the time period is not fully covered
-    # - The warning can raise if some data are not downloaded or some granule
-    #   at the start/end of the period are empty
-    # - Skip subsetting if time_bnds in dataset coordinates (i.e. IMERG case)
-    if "time_bnds" not in ds:
-        ds = subset_by_time(ds, start_time=start_time, end_time=end_time)
-    _check_time_period_coverage(ds, start_time=start_time, end_time=end_time, raise_error=False)
+    ds = _subset_dataset_by_time(ds, start_time=start_time, end_time=end_time)
 
     ###-----------------------------------------------------------------------.
-    # Warn if:
-    # - non-contiguous scans in orbit data
-    # - non-regular timesteps in grid data
-    # - invalid geolocation coordinates
-    # --> Put lon/lat in memory first to avoid recomputing it
-    ds["lon"] = ds["lon"].compute()
-    ds["lat"] = ds["lat"].compute()
-    try:
-        if is_grid(ds):
-            if config.get("warn_non_contiguous_scans") and not is_regular(ds):
-                msg = "Missing timesteps across the dataset !"
-                warnings.warn(msg, GPM_Warning, stacklevel=2)
-        elif is_orbit(ds):
-            if config.get("warn_invalid_geolocation") and not has_valid_geolocation(ds):
-                msg = "Presence of invalid geolocation coordinates !"
-                warnings.warn(msg, GPM_Warning, stacklevel=2)
-            if config.get("warn_non_contiguous_scans") and not is_regular(ds):
-                msg = "Presence of non-contiguous scans !"
-                warnings.warn(msg, GPM_Warning, stacklevel=2)
-    except Exception:
-        pass
+    # Warn about invalid coordinates
+    ds = _warn_invalid_coordinates(ds)
 
     ###-----------------------------------------------------------------------.
     return ds
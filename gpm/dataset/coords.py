@@ -49,19 +49,24 @@ def _get_orbit_scan_time(dt, scan_mode):
     return pd.to_datetime(dict_time).to_numpy()
 
 
-def get_orbit_coords(dt, scan_mode):
-    """Get coordinates from Orbit objects."""
+def get_orbit_coords(dt, scan_mode, along_track_slice=None):
+    """Get coordinates from Orbit objects.
+
+    If ``along_track_slice`` is specified, only the coordinates of the selected scans are read.
+    """
     attrs = decode_string(dt.attrs["FileHeader"])
     granule_id = attrs["GranuleNumber"]
+    if along_track_slice is None:
+        along_track_slice = slice(None)
 
     ds = dt[scan_mode]
-    time = _get_orbit_scan_time(dt, scan_mode)
+    time = _get_orbit_scan_time(dt, scan_mode)[along_track_slice]
 
-    lon = ds["Longitude"].data
-    lat = ds["Latitude"].data
+    lon = ds["Longitude"].isel(along_track=along_track_slice).data
+    lat = ds["Latitude"].isel(along_track=along_track_slice).data
     n_along_track, n_cross_track = lon.shape
     granule_id = np.repeat(granule_id, n_along_track)
-    along_track_id = np.arange(n_along_track)
+    along_track_id = np.arange(ds["Longitude"].shape[0])[along_track_slice]
     cross_track_id = np.arange(n_cross_track)
     gpm_id = [str(g) + "-" + str(z) for g, z in zip(granule_id, along_track_id)]
 
@@ -84,6 +89,20 @@ def get_time_delta_from_time_interval(time_interval):
     return time_interval_dict[time_interval]
 
 
+def _get_grid_start_time(dt):
+    """Return the start time of the accumulation period of each timestep.
+
+    The DataTree of a multi-granule virtual dataset (see ``gpm.build_reference_index``)
+    stores the start time of each granule in the ``gpm_granules_start_time`` attribute.
+    """
+    if "gpm_granules_start_time" in dt.attrs:
+        return np.array(dt.attrs["gpm_granules_start_time"]).astype("M8[ns]")
+    attrs = decode_string(dt.attrs["FileHeader"])
+    start_time = attrs["StartGranuleDateTime"][:-1]  # 2016-03-09T10:30:00.000Z
+    # end_time = attrs["StopGranuleDateTime"][:-1]    # 2003-05-01T23:59:59.999Z
+    return np.array([start_time]).astype("M8[ns]")
+
+
 def get_grid_coords(dt, scan_mode):
     """Get coordinates from Grid objects.
 
@@ -93,11 +112,9 @@ def get_grid_coords(dt, scan_mode):
     NOTE: IMERG and GRID products does not have GranuleNumber!
     """
     attrs = decode_string(dt.attrs["FileHeader"])
-    start_time = attrs["StartGranuleDateTime"][:-1]  # 2016-03-09T10:30:00.000Z
-    # end_time = attrs["StopGranuleDateTime"][:-1]    # 2003-05-01T23:59:59.999Z
     time_interval = attrs["TimeInterval"]
     time_delta = get_time_delta_from_time_interval(time_interval)
-    start_time = np.array([start_time]).astype("M8[ns]")
+    start_time = _get_grid_start_time(dt)
     end_time = start_time + time_delta
 
     # Define time coordinate
@@ -109,7 +126,7 @@ def get_grid_coords(dt, scan_mode):
         "description": "End time of the accumulation period",
     }
     # Define time bounds
-    time_bnds = np.concatenate((start_time, end_time)).reshape(1, 2)
+    time_bnds = np.stack((start_time, end_time), axis=1)
     time_bnds = xr.DataArray(time_bnds, dims=("time", "nv"))
 
     # Define dictionary with coordinates (DataArray)
@@ -121,9 +138,14 @@ def get_grid_coords(dt, scan_mode):
     }
 
 
-def get_coords(dt, scan_mode):
-    """Get coordinates from GPM objects."""
-    return get_grid_coords(dt, scan_mode) if scan_mode == "Grid" else get_orbit_coords(dt, scan_mode)
+def get_coords(dt, scan_mode, along_track_slice=None):
+    """Get coordinates from GPM objects.
+
+    ``along_track_slice`` is used only for Orbit objects.
+    """
+    if scan_mode == "Grid":
+        return get_grid_coords(dt, scan_mode)
+    return get_orbit_coords(dt, scan_mode, along_track_slice)
 
 
 def _subset_dict_by_dataset(ds, dictionary):
@@ -25,14 +25,23 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains functions to read files into a GPM-API Dataset."""
+import datetime
+import queue
+import threading
 import warnings
+from contextlib import nullcontext
 from functools import partial
 
 import xarray as xr
 
-from gpm.dataset.conventions import finalize_dataset
+import gpm
+from gpm.dataset.conventions import _subset_dataset_by_time, _warn_invalid_coordinates, finalize_dataset
+from gpm.dataset.footprint import crop_granule, get_along_track_slices
 from gpm.dataset.granule import _open_granule
+from gpm.dataset.references import open_reference_dataset
+from gpm.dataset.zarr_archive import open_zarr_archive
 from gpm.io.checks import (
+    check_engine,
     check_groups,
     check_product,
     check_scan_mode,
@@ -41,6 +50,7 @@ from gpm.io.checks import (
     check_variables,
 )
 from gpm.io.find import find_filepaths
+from gpm.io.info import _to_pydatetime, parse_filepaths
 from gpm.utils.checks import has_missing_granules
 from gpm.utils.warnings import GPM_Warning
 
@@ -80,8 +90,26 @@ def _get_scheduler(get=None, collection=None):
     return "threaded"
 
 
-def _try_open_granule(filepath, scan_mode, variables, groups, prefix_group, decode_cf, chunks):
-    """Try open a granule."""
+def _try_open_granule(
+    filepath,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    decode_cf,
+    chunks,
+    start_time=None,
+    end_time=None,
+    along_track_slice=None,
+    extent=None,
+    engine="netcdf4",
+):
+    """Try open a granule.
+
+    Only the along-track scans within the time period and ``along_track_slice`` are read.
+    If ``extent`` is specified, the granule is subsetted with ``crop_granule``.
+    ``None`` is returned if the granule does not have scans within the period and region of interest.
+    """
     try:
         ds = _open_granule(
             filepath,
@@ -91,7 +119,16 @@ def _try_open_granule(filepath, scan_mode, variables, groups, prefix_group, deco
             decode_cf=decode_cf,
             prefix_group=prefix_group,
             chunks=chunks,
+            start_time=start_time,
+            end_time=end_time,
+            along_track_slice=along_track_slice,
+            engine=engine,
         )
+        if ds is not None and extent is not None:
+            ds_cropped = crop_granule(ds, extent=extent, start_time=start_time, end_time=end_time)
+            if ds_cropped is None:
+                ds.close()
+            ds = ds_cropped
     except Exception as e:
         msg = f"The following error occurred while opening the {filepath} granule: {e}"
         warnings.warn(msg, GPM_Warning, stacklevel=3)
@@ -99,8 +136,11 @@ def _try_open_granule(filepath, scan_mode, variables, groups, prefix_group, deco
     return ds
 
 
-def _get_datasets_and_closers(filepaths, parallel, **open_kwargs):
-    """Open the granule in parallel with dask delayed."""
+def _get_datasets_and_closers(filepaths, parallel, along_track_slices=None, **open_kwargs):
+    """Open the granule in parallel with dask delayed.
+
+    ``along_track_slices`` is an optional dictionary with the along-track slice to read of each filepath.
+    """
     if parallel:
         import dask
 
@@ -111,7 +151,8 @@ def _get_datasets_and_closers(filepaths, parallel, **open_kwargs):
         open_ = _try_open_granule
         getattr_ = getattr
 
-    list_ds = [open_(p, **open_kwargs) for p in filepaths]
+    along_track_slices = {} if along_track_slices is None else along_track_slices
+    list_ds = [open_(p, along_track_slice=along_track_slices.get(p), **open_kwargs) for p in filepaths]
     list_closers = [getattr_(ds, "_close", None) for ds in list_ds]
 
     # If parallel=True, compute the delayed datasets lists here
@@ -139,10 +180,16 @@ def _open_valid_granules(
     prefix_group,
     chunks,
     parallel=False,
+    start_time=None,
+    end_time=None,
+    along_track_slices=None,
+    extent=None,
+    engine="netcdf4",
 ):
     """Open a list of HDF granules.
 
     Corrupted granules are not returned !
+    Granules without scans within the time period and the ``extent`` region of interest are not returned !
 
     Does not apply yet CF decoding !
 
@@ -165,6 +212,11 @@ def _open_valid_granules(
         prefix_group=prefix_group,
         chunks=chunks,
         parallel=parallel,
+        start_time=start_time,
+        end_time=end_time,
+        along_track_slices=along_track_slices,
+        extent=extent,
+        engine=engine,
     )
 
     if len(list_ds) == 0:
@@ -172,6 +224,125 @@ def _open_valid_granules(
     return list_ds, list_closers
 
 
+def _open_finalized_granule(
+    filepath,
+    product,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    decode_cf,
+    config,
+    start_time=None,
+    end_time=None,
+    along_track_slice=None,
+    extent=None,
+    engine="netcdf4",
+):
+    """Open, subset and finalize a granule in memory.
+
+    This function is executed by the worker processes of ``open_dataset(parallel="processes")``.
+    The checks of the dataset coordinates are deferred to the concatenated dataset.
+
+    Returns
+    -------
+    ds : xarray.Dataset or None
+        The finalized granule dataset with the data loaded in memory.
+    list_warnings : list
+        List of ``(message, category)`` of the warnings raised while opening the granule.
+
+    """
+    with gpm.config.set(config), warnings.catch_warnings(record=True) as list_warnings:
+        warnings.simplefilter("always")
+        ds = _try_open_granule(
+            filepath,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            prefix_group=prefix_group,
+            decode_cf=False,
+            chunks=-1,
+            start_time=start_time,
+            end_time=end_time,
+            along_track_slice=along_track_slice,
+            extent=extent,
+            engine=engine,
+        )
+        if ds is not None:
+            with gpm.config.set({"warn_non_contiguous_scans": False, "warn_invalid_geolocation": False}):
+                ds = finalize_dataset(
+                    ds=ds,
+                    product=product,
+                    scan_mode=scan_mode,
+                    decode_cf=decode_cf,
+                    start_time=None,
+                    end_time=None,
+                )
+            ds = ds.load(scheduler="synchronous")
+            ds.close()
+            ds.set_close(None)
+    list_warnings = [(str(w.message), w.category) for w in list_warnings]
+    return ds, list_warnings
+
+
+def _open_finalized_granules(filepaths, max_workers=None, along_track_slices=None, **open_kwargs):
+    """Open, subset and finalize the granules in parallel using a pool of processes.
+
+    The finalized granule datasets are loaded in memory by the worker processes
+    and returned to the main process as pickled numpy arrays.
+    The GPM-API configuration of the main process is forwarded to the worker processes.
+    The order of the input ``filepaths`` is preserved.
+    Corrupted granules or granules without data within the region of interest are not returned !
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    along_track_slices = {} if along_track_slices is None else along_track_slices
+    config = dict(gpm.config.config)
+    # Spawn the worker processes to avoid deadlocks of the HDF5 and dask locks inherited by forked processes
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        list_futures = [
+            executor.submit(
+                _open_finalized_granule,
+                filepath,
+                config=config,
+                along_track_slice=along_track_slices.get(filepath),
+                **open_kwargs,
+            )
+            for filepath in filepaths
+        ]
+        list_results = [future.result() for future in list_futures]
+
+    # Raise the warnings of the worker processes
+    list_ds = []
+    for ds, list_warnings in list_results:
+        for msg, category in list_warnings:
+            warnings.warn(msg, category, stacklevel=3)
+        if ds is not None:
+            list_ds.append(ds)
+    if len(list_ds) == 0:
+        raise ValueError("No valid GPM granule available for current request.")
+    return list_ds
+
+
+def _check_parallel(parallel):
+    """Check the validity of the ``parallel`` argument."""
+    if parallel not in [True, False, "processes"]:
+        raise ValueError("'parallel' must be either True, False or 'processes'.")
+    return parallel
+
+
+def _check_storage(storage):
+    """Check the validity of the ``storage`` argument of ``open_dataset``."""
+    if not isinstance(storage, str):
+        raise TypeError("'storage' must be a string.")
+    valid_storages = ["LOCAL", "ZARR"]
+    if storage.upper() not in valid_storages:
+        raise ValueError(f"{storage} is an invalid 'storage'. Valid values are {valid_storages}.")
+    return storage.upper()
+
+
 def _concat_datasets(l_datasets):
     """Concatenate datasets together."""
     dims = list(l_datasets[0].dims)
@@ -188,6 +359,274 @@ def _concat_datasets(l_datasets):
     )
 
 
+def _concat_and_finalize_datasets(list_ds, list_closers, product, scan_mode, decode_cf, start_time, end_time, extent):
+    """Concatenate the granule datasets and finalize the resulting dataset."""
+    ##-------------------------------------------------------------------------.
+    # TODO - Extract attributes and add as coordinate ?
+    # - From each granule, select relevant (discard/sum values/copy)
+    # - Sum of MissingData, NumberOfRainPixels
+    # - MissingData in FileHeaderGroup: The number of missing scans.
+
+    ##-------------------------------------------------------------------------.
+    # Concat all datasets
+    # - If concatenation fails, close connection to disk !
+    try:
+        ds = _concat_datasets(list_ds)
+    except ValueError:
+        for ds in list_ds:
+            ds.close()
+        raise
+
+    ##-------------------------------------------------------------------------.
+    # Set dataset closers to execute when ds is closed
+    ds.set_close(partial(_multi_file_closer, list_closers))
+
+    ##-------------------------------------------------------------------------.
+    # Finalize dataset
+    # - If the orbit granules have been cropped to the region of interest, the time period
+    #   has been already subsetted and the scans are expected to be non-contiguous
+    is_cropped_orbit = extent is not None and "along_track" in ds.dims
+    with gpm.config.set({"warn_non_contiguous_scans": False}) if is_cropped_orbit else nullcontext():
+        ds = finalize_dataset(
+            ds=ds,
+            product=product,
+            scan_mode=scan_mode,
+            decode_cf=decode_cf,
+            start_time=None if is_cropped_orbit else start_time,
+            end_time=None if is_cropped_orbit else end_time,
+        )
+    return ds
+
+
+def _open_dataset_lazily(
+    filepaths,
+    product,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    chunks,
+    decode_cf,
+    start_time,
+    end_time,
+    along_track_slices,
+    extent,
+    parallel,
+    engine="netcdf4",
+):
+    """Open, concatenate and finalize the granules lazily."""
+    # Initialize list (to store Dataset of each granule )
+    # - For orbit products, only the along-track scans within the time period are read
+    list_ds, list_closers = _open_valid_granules(
+        filepaths=filepaths,
+        scan_mode=scan_mode,
+        variables=variables,
+        groups=groups,
+        prefix_group=prefix_group,
+        parallel=parallel,
+        chunks=chunks,
+        start_time=start_time,
+        end_time=end_time,
+        along_track_slices=along_track_slices,
+        extent=extent,
+        engine=engine,
+    )
+
+    ##-------------------------------------------------------------------------.
+    # Concatenate and finalize the datasets
+    return _concat_and_finalize_datasets(
+        list_ds,
+        list_closers,
+        product=product,
+        scan_mode=scan_mode,
+        decode_cf=decode_cf,
+        start_time=start_time,
+        end_time=end_time,
+        extent=extent,
+    )
+
+
+def _open_dataset_with_processes(
+    filepaths,
+    product,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    chunks,
+    decode_cf,
+    start_time,
+    end_time,
+    along_track_slices,
+    extent,
+    max_workers,
+    engine="netcdf4",
+):
+    """Open, subset and finalize the granules in a pool of processes and concatenate them."""
+    list_ds = _open_finalized_granules(
+        filepaths,
+        max_workers=max_workers,
+        along_track_slices=along_track_slices,
+        product=product,
+        scan_mode=scan_mode,
+        variables=variables,
+        groups=groups,
+        prefix_group=prefix_group,
+        decode_cf=decode_cf,
+        start_time=start_time,
+        end_time=end_time,
+        extent=extent,
+        engine=engine,
+    )
+    # Map in-memory data variables to dask arrays (one chunk per granule)
+    if chunks is not None:
+        list_ds = [ds.assign({var: ds[var].chunk(chunks) for var in ds.data_vars}) for ds in list_ds]
+
+    # Concat all datasets
+    ds = _concat_datasets(list_ds)
+
+    # Subset the time period and check the coordinates of the concatenated dataset
+    # - If the orbit granules have been cropped to the region of interest, the time period
+    #   has been already subsetted and the scans are expected to be non-contiguous
+    is_cropped_orbit = extent is not None and "along_track" in ds.dims
+    if not is_cropped_orbit:
+        ds = _subset_dataset_by_time(ds, start_time=start_time, end_time=end_time)
+    with gpm.config.set({"warn_non_contiguous_scans": False}) if is_cropped_orbit else nullcontext():
+        return _warn_invalid_coordinates(ds)
+
+
+def _open_dataset_from_references(
+    filepath,
+    product,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    chunks,
+    decode_cf,
+    start_time,
+    end_time,
+    extent,
+):
+    """Open and finalize the virtual dataset described by a reference index."""
+    if scan_mode != "Grid":
+        raise ValueError("'from_references' is available only for grid products.")
+    ds = open_reference_dataset(
+        filepath=filepath,
+        product=product,
+        scan_mode=scan_mode,
+        variables=variables,
+        groups=groups,
+        prefix_group=prefix_group,
+        chunks=chunks,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    ds = finalize_dataset(
+        ds=ds,
+        product=product,
+        scan_mode=scan_mode,
+        decode_cf=decode_cf,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    if extent is not None:
+        from gpm.utils.geospatial import crop
+
+        ds = crop(ds, extent=extent)
+    return ds
+
+
+def _open_dataset_from_zarr(
+    product,
+    start_time,
+    end_time,
+    variables,
+    groups,
+    scan_mode,
+    version,
+    product_type,
+    chunks,
+    extent,
+):
+    """Open the Zarr archive of a product and crop it to the region of interest."""
+    if groups is not None:
+        raise ValueError("'groups' can not be specified with storage='ZARR'. Specify the 'variables' instead.")
+    ds = open_zarr_archive(
+        product=product,
+        start_time=start_time,
+        end_time=end_time,
+        variables=variables,
+        scan_mode=scan_mode,
+        version=version,
+        product_type=product_type,
+        chunks=chunks,
+    )
+    if extent is not None:
+        from gpm.utils.geospatial import crop
+
+        ds = crop(ds, extent=extent)
+    return ds
+
+
+def _warn_missing_granules(ds):
+    """Warn if the dataset has missing granules."""
+    if has_missing_granules(ds):
+        msg = "The GPM Dataset has missing granules !"
+        warnings.warn(msg, GPM_Warning, stacklevel=3)
+
+
+def _find_granules(product, product_type, version, scan_mode, start_time, end_time, extent, verbose):
+    """Find the local granules of the requested period and region of interest.
+
+    Returns
+    -------
+    filepaths : list
+        List of the granules filepaths.
+    along_track_slices : dict or None
+        Dictionary with the along-track slice to read of each filepath.
+        ``None`` if ``extent`` is ``None``.
+
+    """
+    # Find filepaths
+    filepaths = find_filepaths(
+        storage="LOCAL",
+        version=version,
+        product=product,
+        product_type=product_type,
+        start_time=start_time,
+        end_time=end_time,
+        verbose=verbose,
+    )
+
+    # Check that files have been downloaded on disk
+    if len(filepaths) == 0:
+        raise ValueError("No files found on disk. Please download them before.")
+
+    # Discard the granules not intersecting the region of interest
+    # - Granules without 2D geolocation (i.e. grid products) are not indexed and are all kept
+    along_track_slices = None
+    if extent is not None:
+        along_track_slices = get_along_track_slices(filepaths, scan_mode=scan_mode, extent=extent)
+        filepaths = list(along_track_slices)
+        if len(filepaths) == 0:
+            raise ValueError("No GPM granule intersects the specified region of interest.")
+    return filepaths, along_track_slices
+
+
+def _check_extent_and_country(extent, country):
+    """Return the extent of the region of interest (or ``None``)."""
+    from gpm.utils.geospatial import check_extent, get_country_extent
+
+    if extent is not None and country is not None:
+        raise ValueError("Specify either 'extent' or 'country', not both.")
+    if country is not None:
+        return get_country_extent(country)
+    if extent is not None:
+        return check_extent(extent)
+    return None
+
+
 def open_dataset(
     product,
     start_time,
@@ -201,6 +640,12 @@ def open_dataset(
     decode_cf=True,
     parallel=False,
     prefix_group=False,
+    extent=None,
+    country=None,
+    max_workers=None,
+    engine="netcdf4",
+    from_references=None,
+    storage="LOCAL",
     verbose=False,
 ):
     """Lazily map HDF5 data into `xarray.Dataset` with relevant GPM data and attributes.
@@ -268,10 +713,49 @@ def open_dataset(
         If you aim to save the Dataset to disk as netCDF or Zarr, you need to set ``prefix_group=False``
         or later remove the prefix before writing the dataset.
         The default is ``False``.
-    parallel : bool
+    parallel : bool or str
         If ``True``, the dataset are opened in parallel using ``dask.delayed``.
         If ``parallel=True``, ``'chunks'`` can not be ``None``. The underlying data must be ``dask.Array``.
+        If ``'processes'``, each granule is opened, subsetted and finalized in a pool of ``max_workers``
+        processes. The granule data are loaded in memory by the worker processes and concatenated
+        in the main process. If ``chunks`` is not ``None``, the data are then mapped to ``dask.Array``
+        with one chunk per granule.
         The default is ``False``.
+    extent : list or tuple, optional
+        Geographic extent ``[lon_min, lon_max, lat_min, lat_max]`` of the region of interest.
+        For orbit products, the granules not intersecting the extent are not opened, and only the
+        along-track scans of each granule between the first and last scan crossing the extent are returned.
+        The granules footprints are computed once and stored in ``<base_dir>/GPM/footprints.sqlite``.
+        For grid products, the dataset is cropped to the extent.
+        The default is ``None``.
+    country : str, optional
+        Name of the country of interest. Alternative to ``extent``.
+        The default is ``None``.
+    max_workers : int, optional
+        Maximum number of worker processes if ``parallel='processes'``.
+        If ``None``, it defaults to the number of processors of the machine.
+        The default is ``None``.
+    engine : str, optional
+        Engine used to read the HDF5 granules. Either ``'netcdf4'`` or ``'h5netcdf'``.
+        With ``'netcdf4'``, all the HDF5 groups of each granule are opened.
+        With ``'h5netcdf'``, only the HDF5 groups containing the requested variables and
+        the coordinates are opened. The ``h5netcdf`` package is required.
+        The default is ``'netcdf4'``.
+    from_references : str, optional
+        Filepath of a reference index created with ``gpm.build_reference_index``.
+        If specified, the granules are not opened: the dataset is read from the virtual Zarr store
+        described by the reference index, where each variable is a single array spanning all granules.
+        Use ``chunks={}`` to map each variable to a ``dask.Array`` with the native HDF5 chunks.
+        Only grid products are supported. ``parallel`` and ``engine`` are ignored.
+        The ``kerchunk``, ``zarr`` and ``fsspec`` packages are required.
+        The default is ``None``.
+    storage : str, optional
+        Storage from which to read the data. Either ``'LOCAL'`` or ``'ZARR'``.
+        With ``'LOCAL'``, the HDF5 granules in the local GPM archive are opened.
+        With ``'ZARR'``, the data are read from the Zarr archive created with ``gpm.to_zarr_archive``.
+        The Zarr archive stores CF-decoded data: ``decode_cf``, ``parallel``, ``engine`` and
+        ``prefix_group`` are ignored. ``groups`` can not be specified.
+        The default is ``'LOCAL'``.
 
     Returns
     -------
@@ -290,75 +774,457 @@ def open_dataset(
     start_time, end_time = check_start_end_time(start_time, end_time)
     start_time, end_time = check_valid_time_request(start_time, end_time, product)
 
+    # Check region of interest
+    extent = _check_extent_and_country(extent=extent, country=country)
+
+    # Check parallel option
+    parallel = _check_parallel(parallel)
+
+    # Check engine
+    engine = check_engine(engine)
+
+    # Check storage
+    storage = _check_storage(storage)
+
+    ##------------------------------------------------------------------------.
+    # Open the virtual dataset described by the reference index
+    if from_references is not None:
+        ds = _open_dataset_from_references(
+            filepath=from_references,
+            product=product,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            prefix_group=prefix_group,
+            chunks=chunks,
+            decode_cf=decode_cf,
+            start_time=start_time,
+            end_time=end_time,
+            extent=extent,
+        )
+        _warn_missing_granules(ds)
+        return ds
+
+    ##------------------------------------------------------------------------.
+    # Open the Zarr archive created with gpm.to_zarr_archive
+    if storage == "ZARR":
+        ds = _open_dataset_from_zarr(
+            product=product,
+            start_time=start_time,
+            end_time=end_time,
+            variables=variables,
+            groups=groups,
+            scan_mode=scan_mode,
+            version=version,
+            product_type=product_type,
+            chunks=chunks,
+            extent=extent,
+        )
+        _warn_missing_granules(ds)
+        return ds
+
     ##------------------------------------------------------------------------.
     # Find filepaths
-    filepaths = find_filepaths(
-        storage="LOCAL",
-        version=version,
+    # - Discard the granules not intersecting the region of interest
+    filepaths, along_track_slices = _find_granules(
         product=product,
         product_type=product_type,
+        version=version,
+        scan_mode=scan_mode,
         start_time=start_time,
         end_time=end_time,
+        extent=extent,
         verbose=verbose,
     )
 
     ##------------------------------------------------------------------------.
-    # Check that files have been downloaded on disk
-    if len(filepaths) == 0:
-        raise ValueError("No files found on disk. Please download them before.")
+    # Open, subset and finalize each granule in a pool of processes
+    if parallel == "processes":
+        ds = _open_dataset_with_processes(
+            filepaths=filepaths,
+            product=product,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            prefix_group=prefix_group,
+            chunks=chunks,
+            decode_cf=decode_cf,
+            start_time=start_time,
+            end_time=end_time,
+            along_track_slices=along_track_slices,
+            extent=extent,
+            max_workers=max_workers,
+            engine=engine,
+        )
+    else:
+        ds = _open_dataset_lazily(
+            filepaths=filepaths,
+            product=product,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            prefix_group=prefix_group,
+            chunks=chunks,
+            decode_cf=decode_cf,
+            start_time=start_time,
+            end_time=end_time,
+            along_track_slices=along_track_slices,
+            extent=extent,
+            parallel=parallel,
+            engine=engine,
+        )
+    is_cropped_orbit = extent is not None and "along_track" in ds.dims
 
     ##------------------------------------------------------------------------.
-    # Initialize list (to store Dataset of each granule )
-    list_ds, list_closers = _open_valid_granules(
-        filepaths=filepaths,
+    # Crop grid products to the region of interest
+    if extent is not None and not is_cropped_orbit:
+        from gpm.utils.geospatial import crop
+
+        ds = crop(ds, extent=extent)
+
+    ##------------------------------------------------------------------------.
+    # Warns about missing granules
+    if not is_cropped_orbit:
+        _warn_missing_granules(ds)
+
+    ##------------------------------------------------------------------------.
+    # Return Dataset
+    return ds
+
+
+####--------------------------------------------------------------------------.
+
+
+####--------------------------------------------------------------------------.
+#### Granules iterator ####
+
+
+_ITER_GRANULES_MAX_GAP = datetime.timedelta(minutes=1)
+_ITER_GRANULES_POLL_INTERVAL = 0.1
+
+
+def _get_contiguous_blocks(filepaths, n_granules):
+    """Split the filepaths in blocks of at most ``n_granules`` time-contiguous granules.
+
+    A new block is started when the granule start time is more than one minute
+    after the end time of the previous granule.
+    """
+    df = parse_filepaths(filepaths).sort_values("start_time", kind="stable")
+    filepaths = list(df["filepath"])
+    start_times = _to_pydatetime(df["start_time"])
+    end_times = _to_pydatetime(df["end_time"])
+    list_blocks = []
+    block = []
+    for i, filepath in enumerate(filepaths):
+        is_gap = i > 0 and (start_times[i] - end_times[i - 1]) > _ITER_GRANULES_MAX_GAP
+        if len(block) == n_granules or (is_gap and len(block) > 0):
+            list_blocks.append(block)
+            block = []
+        block.append(filepath)
+    if len(block) > 0:
+        list_blocks.append(block)
+    return list_blocks
+
+
+def _open_granules_block(
+    filepaths,
+    product,
+    scan_mode,
+    variables,
+    groups,
+    prefix_group,
+    chunks,
+    decode_cf,
+    start_time,
+    end_time,
+    along_track_slices,
+    extent,
+    engine="netcdf4",
+):
+    """Open and finalize a block of contiguous granules.
+
+    ``None`` is returned if the block does not contain any valid granule.
+    """
+    list_ds, list_closers = _get_datasets_and_closers(
+        filepaths,
         scan_mode=scan_mode,
         variables=variables,
         groups=groups,
+        decode_cf=False,
         prefix_group=prefix_group,
-        parallel=parallel,
         chunks=chunks,
+        parallel=False,
+        start_time=start_time,
+        end_time=end_time,
+        along_track_slices=along_track_slices,
+        extent=extent,
+        engine=engine,
+    )
+    if len(list_ds) == 0:
+        return None
+    # The time period has been already subsetted when opening the granules
+    return _concat_and_finalize_datasets(
+        list_ds,
+        list_closers,
+        product=product,
+        scan_mode=scan_mode,
+        decode_cf=decode_cf,
+        start_time=None,
+        end_time=None,
+        extent=extent,
     )
 
-    ##-------------------------------------------------------------------------.
-    # TODO - Extract attributes and add as coordinate ?
-    # - From each granule, select relevant (discard/sum values/copy)
-    # - Sum of MissingData, NumberOfRainPixels
-    # - MissingData in FileHeaderGroup: The number of missing scans.
 
-    ##-------------------------------------------------------------------------.
-    # Concat all datasets
-    # - If concatenation fails, close connection to disk !
-    try:
-        ds = _concat_datasets(list_ds)
-    except ValueError:
-        for ds in list_ds:
-            ds.close()
-        raise
+class _GranulesPrefetcher:
+    """Open, finalize and load the blocks of granules in a background thread.
 
-    ##-------------------------------------------------------------------------.
-    # Set dataset closers to execute when ds is closed
-    ds.set_close(partial(_multi_file_closer, list_closers))
+    At most ``prefetch`` blocks are waiting in the queue. If ``max_memory`` is specified,
+    the prefetching of a new block is delayed until the memory of the blocks in the queue
+    and of the block currently yielded to the caller allows to load it.
+    """
 
-    ##-------------------------------------------------------------------------.
-    # Finalize dataset
-    ds = finalize_dataset(
-        ds=ds,
+    def __init__(self, list_blocks, open_block, prefetch, max_memory):
+        self.list_blocks = list_blocks
+        self.open_block = open_block
+        self.max_memory = max_memory
+        self.queue = queue.Queue(maxsize=prefetch)
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.n_bytes = 0
+        self.thread = threading.Thread(target=self._run, name="gpm-iter-granules", daemon=True)
+
+    def _put(self, item):
+        """Put an item in the queue unless the iterator has been closed."""
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=_ITER_GRANULES_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _reserve(self, n_bytes):
+        """Wait until ``n_bytes`` can be loaded in memory without exceeding ``max_memory``.
+
+        A block larger than ``max_memory`` is loaded when no other block is in memory.
+        """
+        if self.max_memory is None:
+            return True
+        with self.condition:
+            while self.n_bytes > 0 and self.n_bytes + n_bytes > self.max_memory:
+                if self.stop_event.is_set():
+                    return False
+                self.condition.wait(timeout=_ITER_GRANULES_POLL_INTERVAL)
+            self.n_bytes += n_bytes
+        return True
+
+    def release(self, n_bytes):
+        """Release the memory of a block no longer used by the caller."""
+        if self.max_memory is None:
+            return
+        with self.condition:
+            self.n_bytes -= n_bytes
+            self.condition.notify_all()
+
+    def _run(self):
+        try:
+            for filepaths in self.list_blocks:
+                if self.stop_event.is_set():
+                    return
+                ds = self.open_block(filepaths)
+                if ds is None:
+                    continue
+                n_bytes = ds.nbytes
+                try:
+                    is_reserved = self._reserve(n_bytes)
+                    if is_reserved:
+                        ds = ds.load()
+                except BaseException:
+                    ds.close()
+                    raise
+                if not is_reserved or not self._put((ds, n_bytes, None)):
+                    ds.close()
+                    return
+        except Exception as e:
+            self._put((None, 0, e))
+            return
+        self._put(None)
+
+    def __iter__(self):
+        self.thread.start()
+        n_bytes = 0
+        try:
+            while True:
+                # Release the memory of the block previously yielded (no longer used by the caller)
+                self.release(n_bytes)
+                n_bytes = 0
+                item = self.queue.get()
+                if item is None:
+                    return
+                ds, n_bytes, error = item
+                if error is not None:
+                    raise error
+                yield ds
+        finally:
+            self.stop_event.set()
+            self.release(n_bytes)
+            self.thread.join()
+            while not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is not None and item[0] is not None:
+                    item[0].close()
+
+
+def iter_granules(
+    product,
+    start_time,
+    end_time,
+    variables=None,
+    groups=None,
+    scan_mode=None,
+    version=None,
+    product_type="RS",
+    chunks=-1,
+    decode_cf=True,
+    prefix_group=False,
+    n_granules=1,
+    prefetch=1,
+    max_memory=None,
+    extent=None,
+    country=None,
+    engine="netcdf4",
+    verbose=False,
+):
+    """Iterate over the GPM granules of a time period.
+
+    Yield an in-memory `xarray.Dataset` for each granule (or for each block of ``n_granules``
+    contiguous granules). The granules are opened and finalized as with ``gpm.open_dataset``.
+    While the caller processes a dataset, the next granules are opened, decoded and loaded
+    in a background thread.
+
+    Parameters
+    ----------
+    product : str
+        GPM product acronym.
+    start_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        Start time.
+        Accepted types: ``datetime.datetime``, ``datetime.date``, ``numpy.datetime64`` or ``str``.
+        If string type, it expects the isoformat ``YYYY-MM-DD hh:mm:ss``.
+    end_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        End time.
+        Accepted types: ``datetime.datetime``, ``datetime.date``, ``numpy.datetime64`` or ``str``.
+        If string type, it expects the isoformat ``YYYY-MM-DD hh:mm:ss``.
+    variables : list, str, optional
+        Variables to read from the HDF5 file.
+        The default is ``None`` (all variables).
+    groups : list, str, optional
+        HDF5 Groups from which to read all variables.
+        The default is ``None`` (all groups).
+    scan_mode : str, optional
+        Scan mode of the GPM product. The default is ``None``.
+        Use ``gpm.available_scan_modes(product, version)`` to get the available scan modes for a specific product.
+    version : int, optional
+        GPM version of the data to retrieve if ``product_type = "RS"``.
+    product_type : str, optional
+        GPM product type. Either ``'RS'`` (Research) or ``'NRT'`` (Near-Real-Time).
+        The default is ``'RS'``.
+    chunks : int, dict, str or None, optional
+        Chunk size used to open each granule. See ``gpm.open_dataset``.
+        The yielded datasets are always loaded in memory.
+        The default is ``-1``.
+    decode_cf: bool, optional
+        Whether to decode the dataset. The default is ``True``.
+    prefix_group: bool, optional
+        Whether to add the group as a prefix to the variable names.
+        The default is ``False``.
+    n_granules : int, optional
+        Maximum number of granules of each yielded dataset.
+        A new dataset is started whenever there is a time gap between two consecutive granules.
+        The default is ``1``.
+    prefetch : int, optional
+        Maximum number of datasets prefetched by the background thread.
+        The default is ``1``.
+    max_memory : int or str, optional
+        Maximum memory of the datasets prefetched and of the dataset currently yielded.
+        Accepted values are a number of bytes or a string like ``'2GB'``.
+        A dataset exceeding ``max_memory`` is loaded only once the previous dataset has been released.
+        The default is ``None`` (no limit other than ``prefetch``).
+    extent : list or tuple, optional
+        Geographic extent ``[lon_min, lon_max, lat_min, lat_max]`` of the region of interest.
+        See ``gpm.open_dataset``. The default is ``None``.
+    country : str, optional
+        Name of the country of interest. Alternative to ``extent``.
+        The default is ``None``.
+    engine : str, optional
+        Engine used to read the HDF5 granules. See ``gpm.open_dataset``.
+        The default is ``'netcdf4'``.
+
+    Yields
+    ------
+    xarray.Dataset
+
+    """
+    from dask.utils import parse_bytes
+
+    ## Check valid product and variables
+    product = check_product(product, product_type=product_type)
+    variables = check_variables(variables)
+    groups = check_groups(groups)
+
+    ## Check scan_mode
+    scan_mode = check_scan_mode(scan_mode, product, version=version)
+
+    # Check valid start/end time
+    start_time, end_time = check_start_end_time(start_time, end_time)
+    start_time, end_time = check_valid_time_request(start_time, end_time, product)
+
+    # Check region of interest
+    extent = _check_extent_and_country(extent=extent, country=country)
+
+    # Check iteration options
+    if not isinstance(n_granules, int) or n_granules < 1:
+        raise ValueError("'n_granules' must be a positive integer.")
+    if not isinstance(prefetch, int) or prefetch < 1:
+        raise ValueError("'prefetch' must be a positive integer.")
+    if max_memory is not None:
+        max_memory = parse_bytes(max_memory)
+
+    # Check engine
+    engine = check_engine(engine)
+
+    ##------------------------------------------------------------------------.
+    # Find filepaths
+    filepaths, along_track_slices = _find_granules(
         product=product,
+        product_type=product_type,
+        version=version,
         scan_mode=scan_mode,
-        decode_cf=decode_cf,
         start_time=start_time,
         end_time=end_time,
+        extent=extent,
+        verbose=verbose,
     )
 
     ##------------------------------------------------------------------------.
-    # Warns about missing granules
-    if has_missing_granules(ds):
-        msg = "The GPM Dataset has missing granules !"
-        warnings.warn(msg, GPM_Warning, stacklevel=1)
+    # Define blocks of contiguous granules
+    list_blocks = _get_contiguous_blocks(filepaths, n_granules=n_granules)
+    open_block = partial(
+        _open_granules_block,
+        product=product,
+        scan_mode=scan_mode,
+        variables=variables,
+        groups=groups,
+        prefix_group=prefix_group,
+        chunks=chunks,
+        decode_cf=decode_cf,
+        start_time=start_time,
+        end_time=end_time,
+        along_track_slices=along_track_slices,
+        extent=extent,
+        engine=engine,
+    )
 
     ##------------------------------------------------------------------------.
-    # Return Dataset
-    return ds
-
-
-####--------------------------------------------------------------------------.
+    # Yield the blocks prefetched in the background thread
+    prefetcher = _GranulesPrefetcher(list_blocks, open_block=open_block, prefetch=prefetch, max_memory=max_memory)
+    yield from prefetcher
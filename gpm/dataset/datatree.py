@@ -32,7 +32,8 @@ import xarray as xr
 
 import gpm
 from gpm.dataset.attrs import decode_string
-from gpm.dataset.dimensions import _rename_datatree_dimensions
+from gpm.dataset.dimensions import _rename_dataset_dimensions, _rename_datatree_dimensions
+from gpm.dataset.groups_variables import _get_relevant_groups_variables_from_dict
 
 # TODO:
 # --> open datatrees and concat datatrees
@@ -41,7 +42,15 @@ from gpm.dataset.dimensions import _rename_datatree_dimensions
 # --> gpm.open_dataset(datatree=False)  # or if multiple scan_modes provided
 
 
-def open_datatree(filepath, chunks={}, decode_cf=False, use_api_defaults=True):
+def _get_engine_kwargs(engine):
+    """Return the engine specific arguments to open a GPM HDF5 file."""
+    # GPM HDF5 files do not define dimension scales
+    if engine == "h5netcdf":
+        return {"phony_dims": "access"}
+    return {}
+
+
+def open_datatree(filepath, chunks={}, decode_cf=False, use_api_defaults=True, engine="netcdf4"):
     """Open HDF5 in datatree object.
 
     - chunks={} --> Lazy map to dask.array
@@ -51,7 +60,13 @@ def open_datatree(filepath, chunks={}, decode_cf=False, use_api_defaults=True):
     - chunks=None --> lazy map to numpy.array
     """
     try:
-        dt = datatree.open_datatree(filepath, engine="netcdf4", chunks=chunks, decode_cf=decode_cf)
+        dt = datatree.open_datatree(
+            filepath,
+            engine=engine,
+            chunks=chunks,
+            decode_cf=decode_cf,
+            **_get_engine_kwargs(engine),
+        )
         check_non_empty_granule(dt, filepath)
     except Exception as e:
         check_valid_granule(filepath)
@@ -61,6 +76,76 @@ def open_datatree(filepath, chunks={}, decode_cf=False, use_api_defaults=True):
     return _rename_datatree_dimensions(dt, use_api_defaults=use_api_defaults)
 
 
+def open_group_dataset(filepath, group, chunks={}, decode_cf=False, engine="netcdf4"):
+    """Open a single HDF5 group into a `xarray.Dataset` (without renaming the dimensions)."""
+    return xr.open_dataset(
+        filepath,
+        engine=engine,
+        group=group,
+        chunks=chunks,
+        decode_cf=decode_cf,
+        **_get_engine_kwargs(engine),
+    )
+
+
+def get_required_groups(groups, scan_mode):
+    """Return the groups to open to retrieve the variables and coordinates of a scan mode.
+
+    The ``<scan_mode>`` node (represented by ``''``) and, for orbit products, the ``ScanTime`` group
+    are always required.
+    """
+    required_groups = ["", *groups] if scan_mode == "Grid" else ["", "ScanTime", *groups]
+    return list(dict.fromkeys(required_groups))
+
+
+def _read_h5_structure(filepath, scan_mode):
+    """Read the global attributes, the groups paths and the groups variables of a granule scan mode.
+
+    Only the HDF5 metadata are read. The ``<scan_mode>`` node is represented by ``''``.
+    """
+    import h5netcdf
+
+    with h5netcdf.File(filepath, mode="r", phony_dims="access") as f:
+        attrs = dict(f.attrs)
+        node = f[scan_mode]
+        group_paths = {"": node.name}
+        group_variables = {"": list(node.variables)}
+        for name, group in node.groups.items():
+            group_paths[name] = group.name
+            group_variables[name] = list(group.variables)
+    return attrs, group_paths, group_variables
+
+
+def open_partial_datatree(
+    filepath,
+    scan_mode,
+    variables=None,
+    groups=None,
+    chunks={},
+    decode_cf=False,
+    use_api_defaults=True,
+):
+    """Open with ``h5netcdf`` only the HDF5 groups of a scan mode required to read ``variables`` and ``groups``.
+
+    The ``<scan_mode>`` node and, for orbit products, the ``ScanTime`` group are always opened.
+    The groups are identified by reading the HDF5 metadata with ``h5netcdf``.
+    """
+    try:
+        attrs, group_paths, group_variables = _read_h5_structure(filepath, scan_mode=scan_mode)
+        check_non_empty_granule(xr.Dataset(attrs=attrs), filepath)
+        groups, _ = _get_relevant_groups_variables_from_dict(group_variables, variables=variables, groups=groups)
+        dict_ds = {"/": xr.Dataset(attrs=attrs)}
+        for group in get_required_groups(groups, scan_mode=scan_mode):
+            path = group_paths[group]
+            ds = open_group_dataset(filepath, group=path, chunks=chunks, decode_cf=decode_cf, engine="h5netcdf")
+            dict_ds[path] = _rename_dataset_dimensions(ds, use_api_defaults=use_api_defaults)
+        dt = datatree.DataTree.from_dict(dict_ds)
+    except Exception as e:
+        check_valid_granule(filepath)
+        raise ValueError(e)
+    return dt
+
+
 def check_non_empty_granule(dt, filepath):
     """Check that the datatree (or dataset) is not empty."""
     attrs = dt.attrs
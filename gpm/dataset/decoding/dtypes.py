@@ -0,0 +1,166 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module contains functions to control the data types of the decoded GPM product variables.
+
+With the ``"default"`` decoding dtype policy, missing values are represented by ``np.nan``.
+Consequently, integer flags are promoted to ``float64`` by the CF decoding and the product decoding.
+
+With the ``"compact"`` decoding dtype policy:
+
+- flag variables (i.e. with the ``flag_values`` attribute) are stored with the smallest integer
+  data type able to represent the flag values. Missing values are set to the ``_FillValue`` attribute.
+- float variables promoted to ``float64`` from a ``float32`` or small integer source variable
+  are casted back to ``float32``.
+"""
+
+import numpy as np
+
+DECODE_DTYPE_POLICIES = ["default", "compact"]
+
+
+def check_decode_dtype_policy(policy):
+    """Check the validity of the decoding dtype policy."""
+    if policy not in DECODE_DTYPE_POLICIES:
+        raise ValueError(f"Invalid decode_dtype_policy '{policy}'. Valid values are {DECODE_DTYPE_POLICIES}.")
+    return policy
+
+
+def _is_flag_dataarray(da):
+    """Check if a `xarray.DataArray` is a flag variable with integer flag values."""
+    flag_values = da.attrs.get("flag_values", None)
+    if flag_values is None or len(flag_values) == 0:
+        return False
+    return all(float(value).is_integer() for value in np.atleast_1d(flag_values))
+
+
+def get_compact_flag_dtype(flag_values):
+    """Return the smallest integer dtype and fill value able to represent the flag values.
+
+    Unsigned dtypes use the maximum value as fill value, signed dtypes use the minimum value.
+    """
+    flag_values = np.atleast_1d(flag_values)
+    min_value, max_value = flag_values.min(), flag_values.max()
+    for dtype in [np.uint8, np.uint16, np.int16, np.int32]:
+        info = np.iinfo(dtype)
+        fill_value = info.max if info.min == 0 else info.min
+        if min_value >= info.min and max_value <= info.max and fill_value not in flag_values:
+            return np.dtype(dtype), dtype(fill_value)
+    return np.dtype(np.int64), np.int64(np.iinfo(np.int64).min)
+
+
+def compact_flag_dataarray(da):
+    """Cast a flag `xarray.DataArray` to the smallest integer dtype with an explicit ``_FillValue``.
+
+    Missing values and values not representable by the integer dtype are set to the ``_FillValue``.
+    """
+    dtype, fill_value = get_compact_flag_dtype(da.attrs["flag_values"])
+    if np.issubdtype(da.dtype, np.integer) and "_FillValue" in da.attrs:
+        da = da.where(da != da.attrs["_FillValue"])
+    info = np.iinfo(dtype)
+    min_value = info.min + 1 if fill_value == info.min else info.min
+    max_value = info.max - 1 if fill_value == info.max else info.max
+    attrs = da.attrs.copy()
+    encoding = da.encoding.copy()
+    da = da.where((da >= min_value) & (da <= max_value), fill_value).astype(dtype)
+    da.attrs = attrs
+    da.attrs["_FillValue"] = fill_value
+    da.encoding = encoding
+    da.encoding.pop("_FillValue", None)
+    da.encoding["dtype"] = dtype
+    return da
+
+
+def _is_float32_source(source_dtype):
+    """Check if the values of a source dtype can be represented exactly as ``float32``."""
+    source_dtype = np.dtype(source_dtype)
+    if np.issubdtype(source_dtype, np.floating):
+        return source_dtype.itemsize <= 4
+    if np.issubdtype(source_dtype, np.integer):
+        return source_dtype.itemsize <= 2
+    return False
+
+
+def compact_float_dataarray(da, source_dtype=None):
+    """Cast a ``float64`` `xarray.DataArray` to ``float32`` if the source variable fits in ``float32``.
+
+    If ``source_dtype`` is not specified, the source dtype is taken from the ``dtype`` encoding.
+    """
+    if source_dtype is None:
+        source_dtype = da.encoding.get("dtype", da.dtype)
+    if da.dtype != np.float64 or not _is_float32_source(source_dtype):
+        return da
+    attrs = da.attrs.copy()
+    encoding = da.encoding.copy()
+    da = da.astype(np.float32)
+    da.attrs = attrs
+    da.encoding = encoding
+    return da
+
+
+def get_source_dtypes(ds):
+    """Return a dictionary with the dtype of each dataset variable before decoding."""
+    return {var: ds[var].dtype for var in ds.data_vars}
+
+
+def apply_decode_dtype_policy(ds, policy, source_dtypes=None):
+    """Apply the decoding dtype policy to the dataset variables.
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        Decoded dataset.
+    policy : str
+        Decoding dtype policy. Either ``"default"`` or ``"compact"``.
+    source_dtypes : dict, optional
+        Dtype of the variables before decoding (see ``get_source_dtypes``).
+        The product decoding does not preserve the variables encoding.
+        If a variable is not in ``source_dtypes``, the source dtype is taken from the ``dtype`` encoding.
+
+    """
+    if check_decode_dtype_policy(policy) == "default":
+        return ds
+    source_dtypes = {} if source_dtypes is None else source_dtypes
+    for var in list(ds.data_vars):
+        if _is_flag_dataarray(ds[var]):
+            ds[var] = compact_flag_dataarray(ds[var])
+        else:
+            ds[var] = compact_float_dataarray(ds[var], source_dtype=source_dtypes.get(var))
+    return ds
+
+
+def mask_fill_value(da):
+    """Set the ``_FillValue`` of an integer `xarray.DataArray` to ``np.nan``.
+
+    Integer variables decoded with the ``"compact"`` decoding dtype policy represent missing values
+    with the ``_FillValue`` attribute. This function restores the ``np.nan`` representation.
+    """
+    if not np.issubdtype(da.dtype, np.integer) or "_FillValue" not in da.attrs:
+        return da
+    attrs = da.attrs.copy()
+    fill_value = attrs.pop("_FillValue")
+    da = da.where(da != fill_value)
+    da.attrs = attrs
+    return da
@@ -0,0 +1,153 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""This module contains functions to apply the decoding of each variable in a single dask task per chunk.
+
+With the standard decoding, the CF decoding and each operation of the product decoding functions
+(i.e. ``da.where``, ``da / 100``, ...) add a layer of dask tasks to each variable.
+With the fused decoding, the CF decoding and the product decoding of a variable are applied by
+a single ``dask.array.map_blocks`` function, which runs the standard decoding on each numpy chunk.
+
+Only the variables whose decoding is element-wise are fused. The variables whose decoding changes
+the variable name or dimensions (i.e. ``paramDSD`` in 2A-<RADAR> products) are decoded with the
+standard decoding.
+"""
+
+import dask.array
+import numpy as np
+import xarray as xr
+
+from gpm.dataset.decoding.cf import apply_cf_decoding
+from gpm.dataset.decoding.dtypes import apply_decode_dtype_policy, get_source_dtypes
+from gpm.dataset.decoding.routines import get_product_decoding_function
+
+
+def _decode_dataset(ds, decode_cf, decode_function, dtype_policy):
+    """Apply the standard CF decoding, product decoding and decoding dtype policy to a dataset."""
+    source_dtypes = get_source_dtypes(ds)
+    if decode_cf:
+        ds = apply_cf_decoding(ds)
+    if decode_function is not None:
+        ds = decode_function(ds)
+    return apply_decode_dtype_policy(ds, policy=dtype_policy, source_dtypes=source_dtypes)
+
+
+def _decode_variable(variable, name, decode_cf, decode_function, dtype_policy):
+    """Decode a single variable and return the decoded variable (or ``None`` if the variable is removed)."""
+    ds = _decode_dataset(
+        xr.Dataset({name: variable}),
+        decode_cf=decode_cf,
+        decode_function=decode_function,
+        dtype_policy=dtype_policy,
+    )
+    if list(ds.data_vars) != [name] or ds[name].dims != variable.dims:
+        return None
+    return ds[name].variable
+
+
+def _decode_block(block, variable_name, dims, attrs, encoding, decode_cf, decode_function, dtype_policy):
+    """Decode a numpy chunk of a variable."""
+    variable = xr.Variable(dims, block, attrs=attrs, encoding=encoding)
+    return _decode_variable(
+        variable,
+        name=variable_name,
+        decode_cf=decode_cf,
+        decode_function=decode_function,
+        dtype_policy=dtype_policy,
+    ).data
+
+
+def _get_fused_variable(variable, name, decode_cf, decode_function, dtype_policy):
+    """Return the decoded variable with the decoding fused in a single ``map_blocks`` layer.
+
+    The decoded attributes, encodings and dtype are inferred by decoding a sample with the shape of the first chunk.
+    ``None`` is returned if the decoding of the variable is not element-wise.
+    """
+    sample_shape = tuple(chunks[0] for chunks in variable.chunks)
+    sample = xr.Variable(
+        variable.dims,
+        np.broadcast_to(np.zeros((), dtype=variable.dtype), sample_shape),
+        attrs=variable.attrs,
+        encoding=variable.encoding,
+    )
+    try:
+        decoded_sample = _decode_variable(
+            sample,
+            name=name,
+            decode_cf=decode_cf,
+            decode_function=decode_function,
+            dtype_policy=dtype_policy,
+        )
+    except Exception:
+        return None
+    if decoded_sample is None or decoded_sample.shape != sample_shape:
+        return None
+    data = dask.array.map_blocks(
+        _decode_block,
+        variable.data,
+        dtype=decoded_sample.dtype,
+        name=f"decode-{name}-{dask.base.tokenize(variable.data, decode_cf, decode_function, dtype_policy)}",
+        meta=np.array((), dtype=decoded_sample.dtype),
+        variable_name=name,
+        dims=variable.dims,
+        attrs=variable.attrs,
+        encoding=variable.encoding,
+        decode_cf=decode_cf,
+        decode_function=decode_function,
+        dtype_policy=dtype_policy,
+    )
+    return xr.Variable(variable.dims, data, attrs=decoded_sample.attrs, encoding=decoded_sample.encoding)
+
+
+def split_fused_variables(ds, product, decode_cf, decode_product, dtype_policy="default"):
+    """Decode the dask variables with element-wise decoding in a single ``map_blocks`` layer.
+
+    Returns
+    -------
+    ds : xarray.Dataset
+        Dataset without the fused variables, still to be decoded with the standard decoding.
+    fused_variables : dict
+        Dictionary with the decoded fused variables.
+
+    """
+    fused_variables = {}
+    # Retrieve the product decoding function once (and not at each chunk)
+    decode_function = get_product_decoding_function(product) if decode_product else None
+    if not decode_cf and decode_function is None:
+        return ds, fused_variables
+    for name in list(ds.data_vars):
+        variable = ds[name].variable
+        if not isinstance(variable.data, dask.array.Array):
+            continue
+        fused_variable = _get_fused_variable(
+            variable,
+            name=name,
+            decode_cf=decode_cf,
+            decode_function=decode_function,
+            dtype_policy=dtype_policy,
+        )
+        if fused_variable is not None:
+            fused_variables[name] = fused_variable
+    return ds.drop_vars(list(fused_variables)), fused_variables
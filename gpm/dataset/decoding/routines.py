@@ -46,31 +46,41 @@ def _get_decoding_function(module_name):
     return decode_function
 
 
-def decode_variables(ds, product):
-    """Decode the variables of a given GPM product."""
+def get_product_decoding_function(product):
+    """Return the decode_product function of a given GPM product (or ``None`` if not available)."""
     # Decode variables of 1B-<RADAR> products
     if product in available_products(product_categories="RADAR", product_levels="1B"):
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_1b_radar")(ds)
+        module_name = "gpm.dataset.decoding.decode_1b_radar"
 
     # Decode variables of 2A-<RADAR> products
     elif product in available_products(product_categories="RADAR", product_levels="2A"):
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_2a_radar")(ds)
+        module_name = "gpm.dataset.decoding.decode_2a_radar"
 
     # Decode variables of 2B-<CORRA> products
     elif "CORRA" in product:
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_2b_corra")(ds)
+        module_name = "gpm.dataset.decoding.decode_2b_corra"
 
     # Decode variables of 2A-<PMW> products
     elif product in available_products(product_categories="PMW", product_levels="2A"):
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_2a_pmw")(ds)
+        module_name = "gpm.dataset.decoding.decode_2a_pmw"
 
     # Decode variables of 1C-<PMW> products
     elif product in available_products(product_categories="PMW", product_levels="1C"):
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_1c_pmw")(ds)
+        module_name = "gpm.dataset.decoding.decode_1c_pmw"
 
     # Decode variables of IMERG products
     elif product in available_products(product_categories="IMERG"):
-        ds = _get_decoding_function("gpm.dataset.decoding.decode_imerg")(ds)
+        module_name = "gpm.dataset.decoding.decode_imerg"
+    else:
+        return None
+    return _get_decoding_function(module_name)
+
+
+def decode_variables(ds, product):
+    """Decode the variables of a given GPM product."""
+    decode_function = get_product_decoding_function(product)
+    if decode_function is not None:
+        ds = decode_function(ds)
 
     # if ds.attrs.get("TotalQualityCode"):
     #     TotalQualityCode = ds.attrs.get("TotalQualityCode")
@@ -54,21 +54,82 @@ def add_decoded_flag(ds, variables):
 #     return new_arr
 
 
+def _get_remapped_dtype(values, fill_value):
+    """Return the smallest dtype able to represent the remapped values and the fill value.
+
+    Floating outputs (i.e. with ``np.nan`` fill value) are at least ``float32``.
+    """
+    values = [*values, fill_value]
+    if np.array(values).dtype.kind in "iu":
+        for dtype in ["uint8", "int8", "uint16", "int16", "uint32", "int32"]:
+            if np.iinfo(dtype).min <= min(values) and max(values) <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.array(values).dtype
+    dtype = np.result_type(*[np.min_scalar_type(value) for value in values])
+    return np.promote_types(dtype, np.float32)
+
+
+def _get_remapping_tables(remapping_dict, fill_value=np.nan):
+    """Return the lookup tables of a remapping dictionary.
+
+    Returns
+    -------
+    keys : numpy.ndarray
+        Sorted remapping keys.
+    values : numpy.ndarray
+        Remapped values of the sorted keys, followed by the fill value.
+    lut : numpy.ndarray or None
+        Dense lookup table indexed by ``code - keys[0]``, with the fill value at the last position.
+        ``None`` if the keys are not integers or are too sparse.
+
+    """
+    dtype = _get_remapped_dtype(remapping_dict.values(), fill_value)
+    keys = np.array(sorted(remapping_dict))
+    values = np.array([remapping_dict[key] for key in keys] + [fill_value], dtype=dtype)
+    lut = None
+    if keys.size > 0 and keys.dtype.kind in "iu":
+        n_codes = int(keys[-1] - keys[0]) + 1
+        if n_codes <= max(256, 4 * keys.size):
+            lut = np.full(n_codes + 1, fill_value, dtype=dtype)
+            lut[keys - keys[0]] = values[:-1]
+    return keys, values, lut
+
+
+def _np_remap_with_tables(arr, keys, values, lut):
+    """Remap the values of a numeric array using the lookup tables of ``_get_remapping_tables``.
+
+    Dense integer codes index directly the lookup table. Otherwise, the codes are searched
+    in the sorted keys. The values not in the keys (and NaN) are set to the fill value.
+    """
+    arr = np.asarray(arr)
+    if keys.size == 0:
+        return np.full(arr.shape, values[-1], dtype=values.dtype)
+    if lut is not None:
+        is_valid = (arr >= keys[0]) & (arr <= keys[-1])
+        if arr.dtype.kind == "f":
+            is_valid &= np.floor(arr) == arr
+        indices = np.where(is_valid, arr - keys[0], lut.size - 1).astype(np.intp)
+        return lut[indices]
+    indices = np.minimum(np.searchsorted(keys, arr), keys.size - 1)
+    indices[keys[indices] != arr] = values.size - 1
+    return values[indices]
+
+
 def _np_remap_numeric_array(arr, remapping_dict, fill_value=np.nan):
-    # Define conditions
-    conditions = [arr == i for i in remapping_dict]
-    # Define choices corresponding to conditions
-    choices = remapping_dict.values()
-    # Apply np.select to transform the array
-    return np.select(conditions, choices, default=fill_value)
+    return _np_remap_with_tables(arr, *_get_remapping_tables(remapping_dict, fill_value=fill_value))
 
 
 def _dask_remap_numeric_array(arr, remapping_dict, fill_value=np.nan):
-    return dask.array.map_blocks(_np_remap_numeric_array, arr, remapping_dict, fill_value, dtype=arr.dtype)
+    keys, values, lut = _get_remapping_tables(remapping_dict, fill_value=fill_value)
+    return dask.array.map_blocks(_np_remap_with_tables, arr, keys, values, lut, dtype=values.dtype)
 
 
 def remap_numeric_array(arr, remapping_dict, fill_value=np.nan):
-    """Remap the values of a numeric array."""
+    """Remap the values of a numeric array.
+
+    The values not in ``remapping_dict`` are set to ``fill_value``.
+    The output has the smallest dtype able to represent the remapped values and ``fill_value``.
+    """
     if hasattr(arr, "chunks"):
         return _dask_remap_numeric_array(arr, remapping_dict, fill_value=fill_value)
     return _np_remap_numeric_array(arr, remapping_dict, fill_value=fill_value)
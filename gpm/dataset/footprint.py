@@ -0,0 +1,333 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module contains functions to maintain a spatial index of the GPM orbit granules footprints.
+
+The footprint of a granule is summarized by the bounding boxes of consecutive blocks of
+``N_SCANS_PER_BLOCK`` along-track scans, computed once from the ``Latitude`` and ``Longitude``
+arrays of the granule scan mode.
+The footprints are stored in a SQLite database at ``<base_dir>/GPM/footprints.sqlite``
+and are recomputed only if the granule file is modified.
+
+The index enables ``gpm.open_dataset(extent=...)`` to skip the granules not intersecting a region
+before opening them, and to read only the along-track scans of the granules that do.
+"""
+
+import contextlib
+import os
+import sqlite3
+import warnings
+
+import numpy as np
+
+from gpm.configs import get_base_dir
+from gpm.io.checks import check_base_dir
+
+FOOTPRINT_FILENAME = "footprints.sqlite"
+
+N_SCANS_PER_BLOCK = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS footprints (
+    filepath TEXT NOT NULL,
+    scan_mode TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    n_scans INTEGER NOT NULL,
+    n_scans_per_block INTEGER NOT NULL,
+    bounds BLOB NOT NULL,
+    PRIMARY KEY (filepath, scan_mode)
+);
+"""
+
+_SQLITE_MAX_VARIABLES = 500
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Footprint index  ####
+##########################
+
+
+def get_footprint_index_filepath(base_dir=None):
+    """Return the filepath of the granules footprint index."""
+    base_dir = get_base_dir(base_dir=base_dir)
+    base_dir = check_base_dir(base_dir)
+    return os.path.join(base_dir, "GPM", FOOTPRINT_FILENAME)
+
+
+@contextlib.contextmanager
+def _connect(base_dir=None):
+    """Open a connection to the footprint index and commit the changes on exit."""
+    filepath = get_footprint_index_filepath(base_dir=base_dir)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    con = sqlite3.connect(filepath, timeout=60)
+    try:
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def _get_file_stats(filepath):
+    """Return the modification time (in nanoseconds) and the size of a file."""
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_geolocation(filepath, scan_mode):
+    """Read the ``Longitude`` and ``Latitude`` arrays of a granule scan mode.
+
+    Invalid coordinates are set to ``np.nan``.
+    """
+    import netCDF4
+
+    with netCDF4.Dataset(filepath, mode="r") as nc:
+        group = nc[scan_mode]
+        group.set_auto_mask(False)
+        lon = np.asarray(group["Longitude"][:], dtype="float32")
+        lat = np.asarray(group["Latitude"][:], dtype="float32")
+    lon[np.abs(lon) > 180] = np.nan
+    lat[np.abs(lat) > 90] = np.nan
+    return lon, lat
+
+
+def compute_footprint_bounds(lon, lat, n_scans_per_block=N_SCANS_PER_BLOCK):
+    """Compute the bounding boxes of blocks of consecutive along-track scans.
+
+    Parameters
+    ----------
+    lon : numpy.ndarray
+        Longitude array of shape ``(along_track, cross_track)``.
+    lat : numpy.ndarray
+        Latitude array of shape ``(along_track, cross_track)``.
+    n_scans_per_block : int, optional
+        Number of along-track scans summarized by each bounding box.
+        The default is ``N_SCANS_PER_BLOCK``.
+
+    Returns
+    -------
+    bounds : numpy.ndarray
+        Array of shape ``(n_blocks, 4)`` with the ``[lon_min, lon_max, lat_min, lat_max]``
+        of each block. Blocks without valid coordinates have ``np.nan`` bounds.
+        Blocks crossing the antimeridian span all longitudes.
+
+    """
+    n_scans = lon.shape[0]
+    n_blocks = int(np.ceil(n_scans / n_scans_per_block))
+    # Pad the arrays to a multiple of n_scans_per_block
+    pad_width = ((0, n_blocks * n_scans_per_block - n_scans), (0, 0))
+    lon = np.pad(lon.astype("float32"), pad_width, constant_values=np.nan).reshape(n_blocks, -1)
+    lat = np.pad(lat.astype("float32"), pad_width, constant_values=np.nan).reshape(n_blocks, -1)
+    # Compute bounds
+    # - Silence warning related to All-NaN blocks
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        bounds = np.stack(
+            [np.nanmin(lon, axis=1), np.nanmax(lon, axis=1), np.nanmin(lat, axis=1), np.nanmax(lat, axis=1)],
+            axis=1,
+        )
+    # Span all longitudes for blocks crossing the antimeridian
+    is_crossing_antimeridian = (bounds[:, 1] - bounds[:, 0]) > 180
+    bounds[is_crossing_antimeridian, 0:2] = [-180, 180]
+    return bounds
+
+
+def _compute_granule_footprint(filepath, scan_mode):
+    """Compute the footprint index record of a granule."""
+    mtime, file_size = _get_file_stats(filepath)
+    lon, lat = _read_geolocation(filepath, scan_mode)
+    bounds = compute_footprint_bounds(lon, lat, n_scans_per_block=N_SCANS_PER_BLOCK)
+    return (
+        filepath,
+        scan_mode,
+        mtime,
+        file_size,
+        lon.shape[0],
+        N_SCANS_PER_BLOCK,
+        bounds.astype("float32").tobytes(),
+    )
+
+
+def _select_footprints(con, filepaths, scan_mode):
+    """Retrieve the footprint index records of the specified granules."""
+    records = []
+    for i in range(0, len(filepaths), _SQLITE_MAX_VARIABLES):
+        chunk = filepaths[i : i + _SQLITE_MAX_VARIABLES]
+        placeholders = ",".join("?" * len(chunk))
+        query = (
+            "SELECT filepath, mtime, file_size, n_scans, n_scans_per_block, bounds FROM footprints "
+            f"WHERE scan_mode = ? AND filepath IN ({placeholders})"
+        )
+        records.extend(con.execute(query, [scan_mode, *chunk]).fetchall())
+    return {record[0]: record[1:] for record in records}
+
+
+def update_footprint_index(filepaths, scan_mode, base_dir=None):
+    """Add the footprints of new or modified granules to the footprint index.
+
+    Granules whose geolocation can not be read are not indexed.
+
+    Parameters
+    ----------
+    filepaths : list
+        List of GPM granule filepaths.
+    scan_mode : str
+        Scan mode of the GPM product.
+    base_dir : str, optional
+        The path to the GPM base directory. If ``None``, it use the one specified
+        in the GPM-API config file. The default is ``None``.
+
+    Returns
+    -------
+    n_indexed : int
+        Number of granules (re)indexed.
+
+    """
+    filepaths = list(filepaths)
+    with _connect(base_dir=base_dir) as con:
+        dict_footprints = _select_footprints(con, filepaths, scan_mode=scan_mode)
+        records = []
+        for filepath in filepaths:
+            if filepath in dict_footprints and dict_footprints[filepath][0:2] == _get_file_stats(filepath):
+                continue
+            try:
+                records.append(_compute_granule_footprint(filepath, scan_mode=scan_mode))
+            except Exception:
+                continue
+        con.executemany("INSERT OR REPLACE INTO footprints VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+    return len(records)
+
+
+def _is_intersecting_extent(bounds, extent):
+    """Return a boolean array indicating which bounding boxes intersect the extent."""
+    with np.errstate(invalid="ignore"):
+        return (
+            (bounds[:, 0] <= extent[1])
+            & (bounds[:, 1] >= extent[0])
+            & (bounds[:, 2] <= extent[3])
+            & (bounds[:, 3] >= extent[2])
+        )
+
+
+def get_along_track_slices(filepaths, scan_mode, extent, base_dir=None):
+    """Return the along-track slices of the granules intersecting an extent.
+
+    The footprint index is updated for the new or modified granules.
+
+    Parameters
+    ----------
+    filepaths : list
+        List of GPM granule filepaths.
+    scan_mode : str
+        Scan mode of the GPM product.
+    extent : list or tuple
+        The extent specified as ``[lon_min, lon_max, lat_min, lat_max]``.
+    base_dir : str, optional
+        The path to the GPM base directory. If ``None``, it use the one specified
+        in the GPM-API config file. The default is ``None``.
+
+    Returns
+    -------
+    dict_slices : dict
+        Dictionary with the filepaths of the granules possibly intersecting the extent as keys and
+        the ``slice`` of along-track scans intersecting the extent as values.
+        Granules not present in the footprint index are returned with ``slice(None)``.
+        The order of the input ``filepaths`` is preserved.
+
+    """
+    filepaths = list(filepaths)
+    update_footprint_index(filepaths, scan_mode=scan_mode, base_dir=base_dir)
+    with _connect(base_dir=base_dir) as con:
+        dict_footprints = _select_footprints(con, filepaths, scan_mode=scan_mode)
+    dict_slices = {}
+    for filepath in filepaths:
+        if filepath not in dict_footprints:
+            dict_slices[filepath] = slice(None)
+            continue
+        _, _, n_scans, n_scans_per_block, bounds = dict_footprints[filepath]
+        bounds = np.frombuffer(bounds, dtype="float32").reshape(-1, 4)
+        idx_blocks = np.where(_is_intersecting_extent(bounds, extent))[0]
+        if idx_blocks.size == 0:
+            continue
+        start = int(idx_blocks[0]) * n_scans_per_block
+        end = min((int(idx_blocks[-1]) + 1) * n_scans_per_block, n_scans)
+        dict_slices[filepath] = slice(start, end)
+    return dict_slices
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Granule subset  ####
+#########################
+
+
+def crop_granule(ds, extent, along_track_slice=None, start_time=None, end_time=None):
+    """Subset a granule to the along-track scans intersecting an extent and a time period.
+
+    The granule is first subsetted lazily with ``along_track_slice``. The scans between the first and
+    the last scan with a pixel within the extent (and the time period) are then selected.
+    Datasets without the ``along_track`` dimension (i.e. grid products) are returned unchanged.
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        GPM orbit granule dataset.
+    extent : list or tuple
+        The extent specified as ``[lon_min, lon_max, lat_min, lat_max]``.
+    along_track_slice : slice, optional
+        Along-track slice returned by ``get_along_track_slices``.
+    start_time : datetime.datetime, optional
+        Start time of the period of interest.
+    end_time : datetime.datetime, optional
+        End time of the period of interest.
+
+    Returns
+    -------
+    ds : xarray.Dataset or None
+        The subsetted granule. ``None`` if no scan is within the extent and time period.
+
+    """
+    if "along_track" not in ds.dims:
+        return ds
+    if along_track_slice is not None:
+        ds = ds.isel(along_track=along_track_slice)
+    lon = np.asarray(ds["lon"].transpose("along_track", ...).data)
+    lat = np.asarray(ds["lat"].transpose("along_track", ...).data)
+    with np.errstate(invalid="ignore"):
+        is_inside = (lon >= extent[0]) & (lon <= extent[1]) & (lat >= extent[2]) & (lat <= extent[3])
+    is_inside = is_inside.reshape(is_inside.shape[0], -1).any(axis=1)
+    if "time" in ds.coords and (start_time is not None or end_time is not None):
+        time = ds["time"].to_numpy()
+        if start_time is not None:
+            is_inside &= ~(time < np.datetime64(start_time))
+        if end_time is not None:
+            is_inside &= ~(time > np.datetime64(end_time))
+    idx_scans = np.where(is_inside)[0]
+    if idx_scans.size == 0:
+        return None
+    return ds.isel(along_track=slice(int(idx_scans[0]), int(idx_scans[-1]) + 1))
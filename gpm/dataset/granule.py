@@ -30,11 +30,13 @@ import warnings
 import numpy as np
 import xarray as xr
 
+import gpm
 from gpm.dataset.attrs import get_granule_attrs
 from gpm.dataset.conventions import finalize_dataset
-from gpm.dataset.coords import get_coords
+from gpm.dataset.coords import _get_orbit_scan_time, get_coords
 from gpm.dataset.groups_variables import _get_relevant_groups_variables
 from gpm.io.checks import (
+    check_engine,
     check_groups,
     check_scan_mode,
     check_variables,
@@ -81,14 +83,17 @@ def _process_group_dataset(ds, group, variables, prefix_group=False):
     return ds
 
 
-def _get_scan_mode_info(dt, scan_mode, variables, groups):
-    """Retrieve coordinates, attributes and valid variables and groups."""
+def _get_scan_mode_info(dt, scan_mode, variables, groups, along_track_slice=None, attrs=None):
+    """Retrieve coordinates, attributes and valid variables and groups.
+
+    If ``attrs`` is specified, the global attributes are not parsed from the root.
+    """
     # Get global attributes from the root
-    attrs = get_granule_attrs(dt)
+    attrs = get_granule_attrs(dt) if attrs is None else attrs
     attrs["ScanMode"] = scan_mode
 
     # Get coordinates
-    coords = get_coords(dt, scan_mode)
+    coords = get_coords(dt, scan_mode, along_track_slice=along_track_slice)
 
     # Get groups to process (filtering out groups without any `variables`)
     groups, variables = _get_relevant_groups_variables(
@@ -100,8 +105,18 @@ def _get_scan_mode_info(dt, scan_mode, variables, groups):
     return (coords, attrs, groups, variables)
 
 
-def _get_flattened_scan_mode_dataset(dt, scan_mode, groups, variables=None, prefix_group=False):
-    """Retrieve scan mode dataset."""
+def _get_flattened_scan_mode_dataset(
+    dt,
+    scan_mode,
+    groups,
+    variables=None,
+    prefix_group=False,
+    along_track_slice=None,
+):
+    """Retrieve scan mode dataset.
+
+    If ``along_track_slice`` is specified, the variables are lazily subsetted along-track.
+    """
     list_ds = []
     for group in groups:
         if group == scan_mode:
@@ -109,6 +124,8 @@ def _get_flattened_scan_mode_dataset(dt, scan_mode, groups, variables=None, pref
             group = ""
         else:
             ds = dt[scan_mode][group].to_dataset()
+        if along_track_slice is not None:
+            ds = ds.isel(along_track=along_track_slice, missing_dims="ignore")
         ds = _process_group_dataset(ds, group, variables, prefix_group=prefix_group)
         list_ds.append(ds)
     return xr.merge(list_ds)
@@ -120,6 +137,8 @@ def _get_scan_mode_dataset(
     variables=None,
     groups=None,
     prefix_group=False,
+    along_track_slice=None,
+    attrs=None,
 ):
     """Retrieve scan mode `xarray.Dataset`."""
     # Retrieve granule info
@@ -128,6 +147,8 @@ def _get_scan_mode_dataset(
         scan_mode=scan_mode,
         variables=variables,
         groups=groups,
+        along_track_slice=along_track_slice,
+        attrs=attrs,
     )
 
     # Create flattened dataset for a specific scan_mode
@@ -137,6 +158,7 @@ def _get_scan_mode_dataset(
         groups=groups,
         variables=variables,
         prefix_group=prefix_group,
+        along_track_slice=along_track_slice,
     )
 
     # Assign coords
@@ -184,6 +206,27 @@ def remove_unused_var_dims(ds):
     return ds
 
 
+def _get_along_track_slice(dt, scan_mode, start_time=None, end_time=None, along_track_slice=None):
+    """Return the along-track slice of the orbit scans to read.
+
+    The slice spans the scans of ``along_track_slice`` within the ``[start_time, end_time]`` period.
+    Only the ``ScanTime`` group is read.
+    Scans with invalid time are selected only if within the first and last valid scans of the period.
+    If no scan is selected, ``None`` is returned.
+    """
+    time = _get_orbit_scan_time(dt, scan_mode)
+    is_selected = np.zeros(time.shape, dtype=bool)
+    is_selected[slice(None) if along_track_slice is None else along_track_slice] = True
+    if start_time is not None:
+        is_selected &= ~(time < np.datetime64(start_time))
+    if end_time is not None:
+        is_selected &= ~(time > np.datetime64(end_time))
+    idx_scans = np.where(is_selected & ~np.isnat(time))[0]
+    if idx_scans.size == 0:
+        return None
+    return slice(int(idx_scans[0]), int(idx_scans[-1]) + 1)
+
+
 def _open_granule(
     filepath,
     scan_mode,
@@ -192,12 +235,63 @@ def _open_granule(
     decode_cf,
     chunks,
     prefix_group,
+    start_time=None,
+    end_time=None,
+    along_track_slice=None,
+    engine="netcdf4",
 ):
-    """Open granule file into xarray Dataset."""
-    from gpm.dataset.datatree import open_datatree
+    """Open granule file into xarray Dataset.
+
+    For orbit granules, if ``start_time``, ``end_time`` or ``along_track_slice`` are specified,
+    the ``ScanTime`` is read first and only the along-track scans within the requested period
+    (and ``along_track_slice``) are read for all variables and coordinates.
+    ``None`` is returned if the granule has no scans within the requested period.
+
+    If the ``use_granule_cache`` configuration option is enabled, the granule structure and
+    attributes are retrieved from the granules cache and only the required groups are opened.
+    Otherwise, with ``engine='h5netcdf'``, only the required groups are opened with ``h5netcdf``.
+    """
+    from gpm.dataset.cache import open_cached_datatree
+    from gpm.dataset.datatree import open_datatree, open_partial_datatree
 
     # Open datatree
-    dt = open_datatree(filepath=filepath, chunks=chunks, decode_cf=decode_cf, use_api_defaults=True)
+    attrs = None
+    if gpm.config.get("use_granule_cache"):
+        dt, attrs = open_cached_datatree(
+            filepath=filepath,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            chunks=chunks,
+            decode_cf=decode_cf,
+            engine=engine,
+        )
+    elif engine == "h5netcdf":
+        dt = open_partial_datatree(
+            filepath=filepath,
+            scan_mode=scan_mode,
+            variables=variables,
+            groups=groups,
+            chunks=chunks,
+            decode_cf=decode_cf,
+        )
+    else:
+        dt = open_datatree(filepath=filepath, chunks=chunks, decode_cf=decode_cf, use_api_defaults=True)
+
+    # Retrieve the along-track scans to read
+    is_subsetted = start_time is not None or end_time is not None or along_track_slice is not None
+    if scan_mode != "Grid" and is_subsetted:
+        along_track_slice = _get_along_track_slice(
+            dt,
+            scan_mode=scan_mode,
+            start_time=start_time,
+            end_time=end_time,
+            along_track_slice=along_track_slice,
+        )
+        if along_track_slice is None:
+            if dt._close is not None:
+                dt._close()
+            return None
 
     # Retrieve the granule dataset (without cf decoding)
     ds = _get_scan_mode_dataset(
@@ -206,6 +300,8 @@ def _open_granule(
         groups=groups,
         variables=variables,
         prefix_group=prefix_group,
+        along_track_slice=along_track_slice,
+        attrs=attrs,
     )
 
     ###-----------------------------------------------------------------------.
@@ -230,6 +326,7 @@ def open_granule(
     decode_cf=True,
     chunks={},
     prefix_group=False,
+    engine="netcdf4",
 ):
     """Create a lazy ``xarray.Dataset`` with relevant GPM data and attributes for a specific granule.
 
@@ -271,6 +368,10 @@ def open_granule(
     prefix_group: bool, optional
         Whether to add the group as a prefix to the variable names.
         THe default is ``True``.
+    engine : str, optional
+        Engine used to read the HDF5 granule. Either ``'netcdf4'`` or ``'h5netcdf'``.
+        With ``'h5netcdf'``, only the HDF5 groups containing the requested variables and
+        the coordinates are opened. The default is ``'netcdf4'``.
 
     Returns
     -------
@@ -280,6 +381,7 @@ def open_granule(
     # Check variables and groups
     variables = check_variables(variables)
     groups = check_groups(groups)
+    engine = check_engine(engine)
 
     # Get product and version
     product = get_product_from_filepath(filepath)
@@ -297,6 +399,7 @@ def open_granule(
         decode_cf=False,
         chunks=chunks,
         prefix_group=prefix_group,
+        engine=engine,
     )
 
     # Finalize granule
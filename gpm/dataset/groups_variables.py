@@ -165,17 +165,20 @@ def _add_mandatory_variables(variables, available_variables):
     return variables
 
 
-def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
+def _get_relevant_groups_variables_from_dict(group_variables, variables=None, groups=None):
     """Get groups names that contains the variables of interest.
 
+    ``group_variables`` is a dictionary with the list of variables of each group.
+    The <scan_mode> is node is represented by ''.
+
     If variables and groups is None, return all groups.
     If only groups is specified, gpm_api will select all variables for such groups.
     If only variables is specified, gpm_api selects all variables specified.
     If groups and variables are specified, it selects all variables of the specified 'groups'
     and the variables specified in 'variables'.
     """
-    available_groups = _get_available_groups(dt, scan_mode, name=True)
-    available_variables = _get_available_variables(dt, scan_mode)
+    available_groups = list(group_variables)
+    available_variables = flatten_list(list(group_variables.values()))
     if variables is not None:
         if isinstance(variables, np.ndarray):
             variables = variables.tolist()
@@ -185,7 +188,7 @@ def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
         # Check variables validity
         variables = _check_valid_variables(variables, available_variables)
         # Get groups subset
-        var_group_dict = _get_variables_group_dict(dt, scan_mode)
+        var_group_dict = {var: group for group, group_vars in group_variables.items() for var in group_vars}
         required_groups = np.unique([var_group_dict[var] for var in variables]).tolist()
 
     if groups is not None:
@@ -195,7 +198,7 @@ def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
 
     # Identify input combination
     if variables is not None and groups is not None:
-        groups_variables = _get_availables_variables_in_groups(dt, scan_mode, groups)
+        groups_variables = flatten_list([group_variables[group] for group in groups])
         variables = np.unique(groups_variables + variables).tolist()
         groups = np.unique(groups + required_groups).tolist()
     elif variables is not None and groups is None:
@@ -203,7 +206,6 @@ def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
     elif variables is None and groups is None:
         groups = available_groups
     else:  # groups is not None and variable is None
-        # variables = _get_availables_variables_in_groups(dt, scan_mode, groups) # variable=None
         pass
 
     # Remove "ScanTime" from groups
@@ -211,3 +213,14 @@ def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
 
     # Return groups
     return groups, variables
+
+
+def _get_relevant_groups_variables(dt, scan_mode, variables=None, groups=None):
+    """Get groups names that contains the variables of interest.
+
+    See ``_get_relevant_groups_variables_from_dict``.
+    """
+    group_variables = {
+        group: _get_variables(dt[scan_mode][group]) for group in _get_available_groups(dt, scan_mode, name=True)
+    }
+    return _get_relevant_groups_variables_from_dict(group_variables, variables=variables, groups=groups)
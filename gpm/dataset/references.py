@@ -0,0 +1,402 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""This module contains functions to open multiple GPM granules as a single virtual Zarr store.
+
+``build_reference_index`` scans once the HDF5 chunks byte ranges of each granule and writes
+a reference index (JSON or Parquet) describing a virtual Zarr store where each variable is a
+single logical array spanning all granules, with the native HDF5 chunking.
+``open_reference_dataset`` opens the virtual store without opening the HDF5 granules:
+the data chunks are read directly from the HDF5 files when the data are loaded.
+
+The virtual concatenation is available only for grid products (i.e. IMERG), where each granule
+contains a single timestep with fixed shape. The ``kerchunk``, ``zarr`` and ``fsspec`` packages
+are required.
+"""
+
+import importlib
+import json
+import os
+
+import datatree
+import numpy as np
+import xarray as xr
+
+from gpm.dataset.attrs import decode_string, get_granule_attrs
+from gpm.dataset.datatree import check_non_empty_granule, get_required_groups
+from gpm.dataset.dimensions import _rename_dataset_dimensions
+from gpm.dataset.granule import _get_scan_mode_dataset, remove_unused_var_dims
+from gpm.dataset.groups_variables import _get_relevant_groups_variables_from_dict
+from gpm.io.checks import (
+    check_product,
+    check_product_type,
+    check_product_version,
+    check_scan_mode,
+    check_start_end_time,
+)
+from gpm.io.filter import is_granule_within_time
+from gpm.io.find import find_filepaths
+from gpm.io.info import get_start_end_time_from_filepaths
+
+REFERENCES_DIRNAME = "References"
+
+_ROOT_ATTRS_KEYS = ["gpm_product", "gpm_version", "gpm_granules_filename", "gpm_granules_start_time"]
+
+
+def _check_packages(packages):
+    """Check that the packages required to build and open a reference index are installed."""
+    for package in packages:
+        if not importlib.util.find_spec(package):
+            raise ImportError(
+                f"The '{package}' package is required but not found. "
+                "Please install it using the following command: "
+                f"conda install -c conda-forge {package}",
+            )
+
+
+def _is_parquet_path(filepath):
+    """Return ``True`` if the reference index must be written as Parquet."""
+    return os.path.splitext(filepath)[1] in [".parq", ".parquet"]
+
+
+def get_reference_index_filepath(product, start_time, end_time, version, product_type="RS", base_dir=None):
+    """Return the default filepath of the reference index of a product time period."""
+    from gpm.configs import get_base_dir
+    from gpm.io.checks import check_base_dir
+
+    base_dir = check_base_dir(get_base_dir(base_dir=base_dir))
+    filename = f"{product}.V{version:02d}.{start_time:%Y%m%d%H%M%S}_{end_time:%Y%m%d%H%M%S}.json"
+    return os.path.join(base_dir, "GPM", REFERENCES_DIRNAME, product_type, product, filename)
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Index creation ####
+#########################
+
+
+def _get_array_dims(zattrs):
+    """Return the dimension names of an array from its Zarr attributes.
+
+    Kerchunk names the dimensions with the full HDF5 path (i.e. ``Grid/time``).
+    """
+    return [os.path.basename(dim) for dim in zattrs.get("_ARRAY_DIMENSIONS", [])]
+
+
+def _get_granule_references(filepath):
+    """Scan the HDF5 chunks byte ranges of a granule."""
+    from kerchunk.hdf import SingleHdf5ToZarr
+
+    refs = SingleHdf5ToZarr(filepath, inline_threshold=0).translate()["refs"]
+    return {
+        key: json.loads(value) if key.endswith((".zarray", ".zattrs", ".zgroup")) else value
+        for key, value in refs.items()
+    }
+
+
+def _split_array_references(refs):
+    """Split the references by array.
+
+    Returns
+    -------
+    arrays : dict
+        Dictionary with the ``.zarray`` and ``.zattrs`` metadata of each array path.
+    chunks : dict
+        Dictionary with the chunks references of each array path.
+
+    """
+    arrays = {}
+    chunks = {}
+    for key, value in refs.items():
+        path, name = os.path.split(key)
+        if name == ".zarray":
+            arrays[path] = {".zarray": value, ".zattrs": refs.get(f"{path}/.zattrs", {})}
+            chunks[path] = {}
+    for key, value in refs.items():
+        path, name = os.path.split(key)
+        if path in chunks and not name.startswith("."):
+            chunks[path][name] = value
+    return arrays, chunks
+
+
+def _get_granule_start_time(refs, filepath):
+    """Return the granule start time from the FileHeader attribute."""
+    attrs = refs[".zattrs"]
+    check_non_empty_granule(xr.Dataset(attrs=attrs), filepath)
+    return decode_string(attrs["FileHeader"])["StartGranuleDateTime"][:-1]  # 2016-03-09T10:30:00.000Z
+
+
+def _combine_granules_references(list_refs, filepaths):
+    """Combine the granules references along the ``time`` dimension.
+
+    The metadata and the arrays without the ``time`` dimension are taken from the first granule.
+    The chunks of the arrays with a leading ``time`` dimension are offset along the ``time`` axis.
+    """
+    n_granules = len(list_refs)
+    combined_refs = {key: value for key, value in list_refs[0].items() if key.endswith((".zattrs", ".zgroup"))}
+    arrays, first_chunks = _split_array_references(list_refs[0])
+    list_chunks = [_split_array_references(refs)[1] for refs in list_refs]
+    for path, metadata in arrays.items():
+        zarray = dict(metadata[".zarray"])
+        zattrs = dict(metadata[".zattrs"])
+        dims = _get_array_dims(zattrs)
+        zattrs["_ARRAY_DIMENSIONS"] = dims
+        combined_refs[f"{path}/.zattrs"] = zattrs
+        if len(dims) == 0 or dims[0] != "time":
+            combined_refs[f"{path}/.zarray"] = zarray
+            combined_refs.update({f"{path}/{key}": value for key, value in first_chunks[path].items()})
+            continue
+        if zarray["chunks"][0] != zarray["shape"][0]:
+            raise ValueError(f"The '{path}' array is chunked along the 'time' dimension.")
+        for refs, filepath in zip(list_refs, filepaths):
+            if refs.get(f"{path}/.zarray") != metadata[".zarray"]:
+                raise ValueError(f"The '{path}' array of {filepath} differs from the one of {filepaths[0]}.")
+        for i, chunks in enumerate(list_chunks):
+            for key, value in chunks[path].items():
+                index = key.split(".")
+                index[0] = str(i)
+                combined_refs[f"{path}/{'.'.join(index)}"] = value
+        zarray["shape"] = [zarray["shape"][0] * n_granules, *zarray["shape"][1:]]
+        combined_refs[f"{path}/.zarray"] = zarray
+    return combined_refs
+
+
+def _write_references(refs, filepath):
+    """Write the references as JSON or Parquet."""
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    refs = {
+        key: json.dumps(value) if key.endswith((".zarray", ".zattrs", ".zgroup")) else value
+        for key, value in refs.items()
+    }
+    if _is_parquet_path(filepath):
+        _check_packages(["fastparquet"])
+        from kerchunk.df import refs_to_dataframe
+
+        refs_to_dataframe({"version": 1, "refs": refs}, filepath)
+    else:
+        with open(filepath, "w") as f:
+            json.dump({"version": 1, "refs": refs}, f)
+
+
+def build_reference_index(
+    product,
+    start_time,
+    end_time,
+    filepath=None,
+    version=None,
+    product_type="RS",
+    verbose=False,
+):
+    """Build a reference index to open the granules of a grid product as a single virtual Zarr store.
+
+    The HDF5 chunks byte ranges of each local granule are scanned once and written to a reference
+    index. The reference index can then be opened with ``gpm.open_dataset(..., from_references=filepath)``
+    without opening the HDF5 granules.
+    Each variable is represented by a single logical array concatenating the granules along the
+    ``time`` dimension, with the native HDF5 chunking.
+
+    Parameters
+    ----------
+    product : str
+        GPM grid product acronym (i.e. ``'IMERG-FR'``).
+    start_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        Start time.
+    end_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        End time.
+    filepath : str, optional
+        Filepath of the reference index.
+        If the extension is ``.parq`` or ``.parquet``, the references are written as a Parquet directory
+        (the ``fastparquet`` package is required).
+        Otherwise, the references are written as JSON.
+        If ``None``, the JSON reference index is written in ``<base_dir>/GPM/References/<product_type>/<product>``.
+        The default is ``None``.
+    version : int, optional
+        GPM version of the data. The default is ``None`` (the latest version).
+    product_type : str, optional
+        GPM product type. Either ``'RS'`` (Research) or ``'NRT'`` (Near-Real-Time).
+        The default is ``'RS'``.
+    verbose : bool, optional
+        Whether to print processing details. The default is ``False``.
+
+    Returns
+    -------
+    filepath : str
+        Filepath of the reference index.
+
+    """
+    _check_packages(["kerchunk", "zarr", "fsspec"])
+    product_type = check_product_type(product_type=product_type)
+    product = check_product(product, product_type=product_type)
+    version = check_product_version(version, product)
+    start_time, end_time = check_start_end_time(start_time, end_time)
+    scan_mode = check_scan_mode(None, product, version=version)
+    if scan_mode != "Grid":
+        raise ValueError(
+            "A reference index can be built only for grid products. "
+            "The orbit granules have a variable number of scans and can not be concatenated virtually.",
+        )
+    filepaths = find_filepaths(
+        storage="LOCAL",
+        version=version,
+        product=product,
+        product_type=product_type,
+        start_time=start_time,
+        end_time=end_time,
+        verbose=verbose,
+    )
+    if len(filepaths) == 0:
+        raise ValueError("No files found on disk. Please download them before.")
+
+    # Scan the granules chunks and sort the granules by start time
+    list_refs = [_get_granule_references(filepath) for filepath in filepaths]
+    list_start_time = [_get_granule_start_time(refs, filepath) for refs, filepath in zip(list_refs, filepaths)]
+    indices = sorted(range(len(filepaths)), key=lambda i: list_start_time[i])
+    list_refs = [list_refs[i] for i in indices]
+    filepaths = [filepaths[i] for i in indices]
+
+    # Combine the references
+    refs = _combine_granules_references(list_refs, filepaths)
+    refs[".zattrs"] = {
+        **refs[".zattrs"],
+        "gpm_product": product,
+        "gpm_version": version,
+        "gpm_granules_filename": [os.path.basename(filepath) for filepath in filepaths],
+        "gpm_granules_start_time": [list_start_time[i] for i in indices],
+    }
+
+    # Write the reference index
+    if filepath is None:
+        filepath = get_reference_index_filepath(
+            product=product,
+            start_time=start_time,
+            end_time=end_time,
+            version=version,
+            product_type=product_type,
+        )
+    _write_references(refs, filepath)
+    if verbose:
+        print(f"The reference index of {len(filepaths)} granules has been written to {filepath}.")
+    return filepath
+
+
+####--------------------------------------------------------------------------.
+#######################
+#### Index reading ####
+#######################
+
+
+def _open_reference_mapper(filepath):
+    """Return the mapper of the virtual Zarr store described by a reference index."""
+    import fsspec
+
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"The reference index {filepath} does not exist.")
+    fs = fsspec.filesystem("reference", fo=filepath, remote_protocol="file")
+    return fs.get_mapper("")
+
+
+def _get_reference_structure(mapper, scan_mode):
+    """Return the root attributes, the groups paths and the groups variables of the virtual store."""
+    import zarr
+
+    root = zarr.open_group(mapper, mode="r")
+    attrs = dict(root.attrs)
+    node = root[scan_mode]
+    group_paths = {"": scan_mode}
+    group_variables = {"": list(node.array_keys())}
+    for name, group in node.groups():
+        group_paths[name] = f"{scan_mode}/{name}"
+        group_variables[name] = list(group.array_keys())
+    return attrs, group_paths, group_variables
+
+
+def _set_chunksizes_encoding(ds):
+    """Set the Zarr chunks encoding as the HDF5 ``chunksizes`` encoding expected by ``finalize_dataset``."""
+    for var in ds.variables.values():
+        if "chunks" in var.encoding:
+            var.encoding["chunksizes"] = tuple(var.encoding.pop("chunks"))
+    return ds
+
+
+def open_reference_dataset(
+    filepath,
+    product,
+    scan_mode,
+    variables=None,
+    groups=None,
+    prefix_group=False,
+    chunks={},
+    start_time=None,
+    end_time=None,
+):
+    """Open the virtual Zarr store described by a reference index into a `xarray.Dataset`.
+
+    Only the timesteps of the granules within ``start_time`` and ``end_time`` are selected.
+    The dataset is not finalized (i.e. CF decoding is not applied).
+    """
+    _check_packages(["kerchunk", "zarr", "fsspec"])
+    mapper = _open_reference_mapper(filepath)
+    attrs, group_paths, group_variables = _get_reference_structure(mapper, scan_mode=scan_mode)
+    if attrs.get("gpm_product") != product:
+        raise ValueError(f"The reference index {filepath} refers to the '{attrs.get('gpm_product')}' product.")
+
+    # Define the (partial) DataTree
+    root_attrs = {key: value for key, value in attrs.items() if key not in _ROOT_ATTRS_KEYS}
+    dict_ds = {"/": xr.Dataset(attrs={**root_attrs, "gpm_granules_start_time": attrs["gpm_granules_start_time"]})}
+    relevant_groups, _ = _get_relevant_groups_variables_from_dict(group_variables, variables=variables, groups=groups)
+    for group in get_required_groups(relevant_groups, scan_mode=scan_mode):
+        path = group_paths[group]
+        ds = xr.open_dataset(
+            mapper,
+            engine="zarr",
+            group=path,
+            consolidated=False,
+            chunks=chunks,
+            decode_cf=False,
+        )
+        ds = _set_chunksizes_encoding(ds)
+        dict_ds[path] = _rename_dataset_dimensions(ds, use_api_defaults=True)
+    dt = datatree.DataTree.from_dict(dict_ds)
+
+    # Retrieve the dataset
+    ds = _get_scan_mode_dataset(
+        dt=dt,
+        scan_mode=scan_mode,
+        groups=groups,
+        variables=variables,
+        prefix_group=prefix_group,
+        attrs=get_granule_attrs(xr.Dataset(attrs=root_attrs)),
+    )
+
+    # Select the timesteps of the granules within the requested time period
+    # - As done by find_filepaths, the granules partially overlapping the time period are selected
+    if start_time is not None and end_time is not None:
+        l_start_time, l_end_time = get_start_end_time_from_filepaths(attrs["gpm_granules_filename"])
+        is_valid = is_granule_within_time(start_time, end_time, l_start_time, l_end_time)
+        if not is_valid.any():
+            raise ValueError(f"The reference index {filepath} has no granules within the requested time period.")
+        if not is_valid.all():
+            ds = ds.isel(time=np.where(is_valid)[0])
+    return remove_unused_var_dims(ds)
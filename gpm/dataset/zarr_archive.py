@@ -0,0 +1,468 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -----------------------------------------------------------------------------.
+"""This module contains functions to convert the GPM granules of a product into a Zarr archive.
+
+Each granule is opened, finalized, decoded and encoded (see ``gpm.encoding.set_encoding``)
+only once, and appended along the ``along_track`` (orbit products) or ``time`` (grid products)
+dimension to a consolidated Zarr store. The archive can then be read with
+``gpm.open_dataset(..., storage="ZARR")``.
+
+The granules are ingested entirely (i.e. not clipped to the requested time period), so that
+an archive can be extended without gaps. The names of the ingested granules and their size
+along the append dimension are stored in the Zarr store attributes after each append.
+The empty or unreadable granules are recorded with a size of 0.
+If the conversion is interrupted, the arrays are truncated to the last recorded append and
+the conversion restarts from the next granule.
+"""
+
+import importlib
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import xarray as xr
+
+import gpm
+from gpm.dataset.conventions import _subset_dataset_by_time
+from gpm.encoding.routines import set_encoding
+from gpm.io.checks import (
+    check_engine,
+    check_groups,
+    check_product,
+    check_product_version,
+    check_scan_mode,
+    check_start_end_time,
+    check_variables,
+)
+from gpm.io.filter import is_granule_within_time
+from gpm.io.info import get_start_time_from_filepaths
+
+ZARR_DIRNAME = "Zarr"
+
+# Encodings of the netCDF4/h5netcdf backends not supported by the Zarr backend
+_NETCDF_ENCODINGS = [
+    "chunksizes",
+    "preferred_chunks",
+    "contiguous",
+    "zlib",
+    "complevel",
+    "shuffle",
+    "fletcher32",
+    "szip_coding",
+    "szip_pixels_per_block",
+    "blosc_shuffle",
+    "compression",
+    "source",
+    "original_shape",
+]
+
+
+def _check_zarr():
+    """Check that the ``zarr`` package is installed."""
+    if not importlib.util.find_spec("zarr"):
+        raise ImportError(
+            "The 'zarr' package is required but not found. "
+            "Please install it using the following command: "
+            "conda install -c conda-forge zarr",
+        )
+
+
+def get_zarr_archive_path(product, version, scan_mode, product_type="RS", base_dir=None):
+    """Return the default path of the Zarr archive of a product scan mode.
+
+    The Zarr archive is located at ``<base_dir>/GPM/Zarr/<product_type>/<product>.V<version>.<scan_mode>.zarr``.
+    """
+    from gpm.configs import get_base_dir
+    from gpm.io.checks import check_base_dir
+
+    base_dir = check_base_dir(get_base_dir(base_dir=base_dir))
+    filename = f"{product}.V{version:02d}.{scan_mode}.zarr"
+    return os.path.join(base_dir, "GPM", ZARR_DIRNAME, product_type, filename)
+
+
+def _get_append_dim(ds):
+    """Return the dimension along which the granules are appended."""
+    return "along_track" if "along_track" in ds.dims else "time"
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Progress tracking ####
+##########################
+
+
+def _read_progress(store):
+    """Return the attributes of the Zarr store recording the ingested granules.
+
+    ``None`` is returned if the Zarr store does not exist.
+    """
+    import zarr
+
+    try:
+        group = zarr.open_group(store, mode="r")
+    except (zarr.errors.GroupNotFoundError, FileNotFoundError):
+        return None
+    return dict(group.attrs)
+
+
+def _write_progress(store, filenames, sizes):
+    """Record the ingested granules and their size along the append dimension."""
+    import zarr
+
+    group = zarr.open_group(store, mode="r+")
+    group.attrs.update({"gpm_granules_filename": filenames, "gpm_granules_size": sizes})
+    zarr.consolidate_metadata(store)
+
+
+def _truncate_arrays(store, append_dim, size):
+    """Truncate the arrays along the append dimension to the size of the recorded granules.
+
+    The arrays are longer than the recorded size if the conversion was interrupted during an append.
+    """
+    import zarr
+
+    group = zarr.open_group(store, mode="r+")
+    is_truncated = False
+    for _, array in group.arrays():
+        dims = array.attrs.get("_ARRAY_DIMENSIONS", [])
+        if append_dim in dims:
+            axis = dims.index(append_dim)
+            if array.shape[axis] != size:
+                shape = list(array.shape)
+                shape[axis] = size
+                array.resize(*shape)
+                is_truncated = True
+    if is_truncated:
+        zarr.consolidate_metadata(store)
+
+
+####--------------------------------------------------------------------------.
+###################
+#### Ingestion ####
+###################
+
+
+def _prepare_dataset(ds, encoding, chunks):
+    """Set the Zarr encodings of the finalized granule dataset."""
+    ds = set_encoding(ds, encoding_dict=encoding)
+    for name, var in ds.variables.items():
+        for key in _NETCDF_ENCODINGS:
+            var.encoding.pop(key, None)
+        # Store strings as variable-length strings (i.e. gpm_id of granules with larger ids)
+        if var.dtype.kind == "U":
+            var.encoding["dtype"] = str
+        if chunks is not None and name not in ds.dims:
+            var.encoding["chunks"] = tuple(min(chunks.get(dim, size), size) for dim, size in var.sizes.items())
+    return ds
+
+
+def _append_dataset(ds, store, is_first):
+    """Write or append a finalized granule dataset to the Zarr store.
+
+    The variables without the append dimension and the global attributes are written only with the first granule.
+    """
+    append_dim = _get_append_dim(ds)
+    if is_first:
+        ds.to_zarr(store, mode="w", consolidated=True)
+        return
+    ds = ds.drop_vars([name for name, var in ds.variables.items() if append_dim not in var.dims])
+    # The Zarr backend replaces the global attributes when appending
+    # - The 'coordinates' attribute is set by xarray and is restored after the append
+    ds.attrs = _read_progress(store)
+    coordinates = ds.attrs.pop("coordinates", None)
+    ds.to_zarr(store, append_dim=append_dim, consolidated=True)
+    if coordinates is not None:
+        import zarr
+
+        zarr.open_group(store, mode="r+").attrs["coordinates"] = coordinates
+
+
+def _get_pending_filepaths(filepaths, progress):
+    """Return the filepaths of the granules not yet ingested in the Zarr store."""
+    if progress is None:
+        return filepaths
+    ingested_filenames = progress.get("gpm_granules_filename", [])
+    if len(ingested_filenames) == 0:
+        return filepaths
+    filepaths = [filepath for filepath in filepaths if os.path.basename(filepath) not in ingested_filenames]
+    if len(filepaths) > 0:
+        last_start_time = get_start_time_from_filepaths(ingested_filenames[-1])[0]
+        if get_start_time_from_filepaths(filepaths[0])[0] <= last_start_time:
+            raise ValueError(
+                "The Zarr archive can only be extended with granules following the last ingested granule "
+                f"{ingested_filenames[-1]}.",
+            )
+    return filepaths
+
+
+def _iter_finalized_granules(filepaths, parallel, max_workers, **open_kwargs):
+    """Yield the filepath and the finalized granule dataset (or ``None``) in the order of ``filepaths``.
+
+    If ``parallel=True``, the granules are opened and decoded in a pool of processes while the
+    previous granules are appended to the Zarr store. At most ``2 * max_workers`` granules are
+    kept in memory.
+    """
+    from gpm.dataset.dataset import _open_finalized_granule
+
+    config = dict(gpm.config.config)
+    if not parallel:
+        for filepath in filepaths:
+            yield filepath, _open_finalized_granule(filepath, config=config, **open_kwargs)
+        return
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        submit = partial(executor.submit, _open_finalized_granule, config=config, **open_kwargs)
+        list_futures = [(filepath, submit(filepath)) for filepath in filepaths[: 2 * max_workers]]
+        for filepath in filepaths[2 * max_workers :]:
+            yield list_futures[0][0], list_futures.pop(0)[1].result()
+            list_futures.append((filepath, submit(filepath)))
+        for filepath, future in list_futures:
+            yield filepath, future.result()
+
+
+def to_zarr_archive(
+    product,
+    start_time,
+    end_time,
+    store=None,
+    variables=None,
+    groups=None,
+    scan_mode=None,
+    version=None,
+    product_type="RS",
+    chunks=None,
+    encoding=None,
+    parallel=False,
+    max_workers=None,
+    engine="netcdf4",
+    verbose=False,
+):
+    """Convert the local granules of a product time period into a consolidated Zarr archive.
+
+    Each granule is opened, finalized and CF-decoded as in ``gpm.open_dataset``. The product encodings
+    (see ``gpm.encoding.set_encoding``) are then applied and the granule is appended along the
+    ``along_track`` (orbit products) or ``time`` (grid products) dimension to the Zarr store.
+    The granules overlapping the time period are ingested entirely.
+    The conversion can be interrupted and restarted: the granules already ingested are skipped.
+    An existing archive can be extended with the granules following the last ingested granule.
+    The empty or unreadable granules are recorded in the archive attributes and are not retried.
+
+    Parameters
+    ----------
+    product : str
+        GPM product acronym.
+    start_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        Start time.
+    end_time :  `datetime.datetime`, `datetime.date`, `numpy.datetime64` or str
+        End time.
+    store : str, optional
+        Path of the Zarr store.
+        If ``None``, the Zarr store is located at
+        ``<base_dir>/GPM/Zarr/<product_type>/<product>.V<version>.<scan_mode>.zarr``
+        and can be read with ``gpm.open_dataset(..., storage="ZARR")``.
+        The default is ``None``.
+    variables : list, str, optional
+        Variables to convert. The default is ``None`` (all variables).
+    groups : list, str, optional
+        HDF5 groups from which to convert all variables. The default is ``None`` (all groups).
+    scan_mode : str, optional
+        Scan mode of the GPM product. The default is ``None``.
+    version : int, optional
+        GPM version of the data. The default is ``None`` (the latest version).
+    product_type : str, optional
+        GPM product type. Either ``'RS'`` (Research) or ``'NRT'`` (Near-Real-Time).
+        The default is ``'RS'``.
+    chunks : dict, optional
+        Dictionary with the Zarr chunk size of each dimension.
+        The dimensions not specified are not chunked.
+        If ``None``, each granule array is written in a single chunk.
+        The default is ``None``.
+    encoding : dict, optional
+        Dictionary with the encoding of each variable.
+        If ``None``, the product encodings of ``gpm.encoding`` are used (if available).
+        The default is ``None``.
+    parallel : bool, optional
+        If ``True``, the granules are opened and decoded in a pool of ``max_workers`` processes
+        while the previous granules are appended to the Zarr store.
+        The default is ``False``.
+    max_workers : int, optional
+        Maximum number of worker processes if ``parallel=True``.
+        If ``None``, it defaults to the number of processors of the machine.
+        The default is ``None``.
+    engine : str, optional
+        Engine used to read the HDF5 granules. Either ``'netcdf4'`` or ``'h5netcdf'``.
+        The default is ``'netcdf4'``.
+    verbose : bool, optional
+        Whether to print processing details. The default is ``False``.
+
+    Returns
+    -------
+    store : str
+        Path of the Zarr store.
+
+    """
+    from gpm.dataset.dataset import _find_granules
+
+    _check_zarr()
+    product = check_product(product, product_type=product_type)
+    version = check_product_version(version, product)
+    scan_mode = check_scan_mode(scan_mode, product, version=version)
+    variables = check_variables(variables)
+    groups = check_groups(groups)
+    engine = check_engine(engine)
+    start_time, end_time = check_start_end_time(start_time, end_time)
+    if store is None:
+        store = get_zarr_archive_path(product=product, version=version, scan_mode=scan_mode, product_type=product_type)
+
+    # Retrieve the granules not yet ingested
+    filepaths, _ = _find_granules(
+        product=product,
+        product_type=product_type,
+        version=version,
+        scan_mode=scan_mode,
+        start_time=start_time,
+        end_time=end_time,
+        extent=None,
+        verbose=verbose,
+    )
+    progress = _read_progress(store)
+    filepaths = _get_pending_filepaths(filepaths, progress)
+    filenames = [] if progress is None else list(progress.get("gpm_granules_filename", []))
+    sizes = [] if progress is None else list(progress.get("gpm_granules_size", []))
+    if verbose:
+        print(f"{len(filenames)} granules already ingested. {len(filepaths)} granules to ingest in {store}.")
+
+    # Discard an interrupted append
+    if np.sum(sizes) > 0:
+        append_dim = "time" if scan_mode == "Grid" else "along_track"
+        _truncate_arrays(store, append_dim=append_dim, size=int(np.sum(sizes)))
+
+    # Open, decode and append each granule
+    # - The granules are not clipped to the time period to avoid gaps when extending the archive
+    iterator = _iter_finalized_granules(
+        filepaths,
+        parallel=parallel,
+        max_workers=max_workers,
+        product=product,
+        scan_mode=scan_mode,
+        variables=variables,
+        groups=groups,
+        prefix_group=False,
+        decode_cf=True,
+        engine=engine,
+    )
+    for filepath, (ds, list_warnings) in iterator:
+        for msg, category in list_warnings:
+            warnings.warn(msg, category, stacklevel=2)
+        if ds is None:
+            # Record the skipped granule (once the Zarr store has been created)
+            filenames.append(os.path.basename(filepath))
+            sizes.append(0)
+            if np.sum(sizes) > 0:
+                _write_progress(store, filenames=filenames, sizes=sizes)
+            if verbose:
+                print(f"{filenames[-1]} has been skipped.")
+            continue
+        ds = _prepare_dataset(ds, encoding=encoding, chunks=chunks)
+        _append_dataset(ds, store=store, is_first=np.sum(sizes) == 0)
+        filenames.append(os.path.basename(filepath))
+        sizes.append(ds.sizes[_get_append_dim(ds)])
+        _write_progress(store, filenames=filenames, sizes=sizes)
+        if verbose:
+            print(f"{filenames[-1]} has been appended to {store}.")
+    if np.sum(sizes) == 0:
+        raise ValueError("No valid GPM granule available for current request.")
+    return store
+
+
+####--------------------------------------------------------------------------.
+#################
+#### Reading ####
+#################
+
+
+def _subset_grid_by_time(ds, start_time, end_time):
+    """Select the timesteps of the granules within the requested time period.
+
+    As done by ``find_filepaths``, the granules partially overlapping the time period are selected.
+    The granule end time is the end of the accumulation period minus one second (as in the granule filename).
+    """
+    file_start_time = ds["time_bnds"].isel(nv=0).to_numpy()
+    file_end_time = ds["time_bnds"].isel(nv=1).to_numpy() - np.timedelta64(1, "s")
+    is_valid = is_granule_within_time(
+        np.datetime64(start_time),
+        np.datetime64(end_time),
+        file_start_time,
+        file_end_time,
+    )
+    return ds.isel(time=np.where(is_valid)[0])
+
+
+def open_zarr_archive(
+    product,
+    start_time,
+    end_time,
+    variables=None,
+    scan_mode=None,
+    version=None,
+    product_type="RS",
+    chunks={},
+):
+    """Open the Zarr archive of a product scan mode created with ``gpm.to_zarr_archive``.
+
+    Only the data within ``start_time`` and ``end_time`` are returned.
+    """
+    _check_zarr()
+    version = check_product_version(version, product)
+    store = get_zarr_archive_path(product=product, version=version, scan_mode=scan_mode, product_type=product_type)
+    if not os.path.exists(store):
+        raise ValueError(f"The Zarr archive {store} does not exist. Create it with gpm.to_zarr_archive.")
+    ds = xr.open_zarr(store, chunks=chunks, consolidated=True)
+    # Load the time coordinates in memory to select the time period
+    ds = ds.assign_coords({name: ds[name].compute() for name in ["time", "time_bnds"] if name in ds})
+    for key in ["gpm_granules_filename", "gpm_granules_size"]:
+        _ = ds.attrs.pop(key, None)
+
+    # Select the variables
+    if variables is not None:
+        missing_variables = [var for var in variables if var not in ds.data_vars]
+        if len(missing_variables) > 0:
+            raise ValueError(f"The Zarr archive {store} does not contain the variables {missing_variables}.")
+        ds = ds[variables]
+
+    # Select the time period
+    if "time_bnds" in ds:
+        ds = _subset_grid_by_time(ds, start_time=start_time, end_time=end_time)
+    else:
+        ds = _subset_dataset_by_time(ds, start_time=start_time, end_time=end_time)
+    if ds.sizes[_get_append_dim(ds)] == 0:
+        raise ValueError(f"The Zarr archive {store} has no data within the requested time period.")
+    return ds
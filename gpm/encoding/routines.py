@@ -67,7 +67,7 @@ def get_product_encoding_dict(product):
     """Read encoding dictionary from GPM product YAML file."""
     # Define retrievals for 2A-<RADAR> products
     if product in available_products(product_categories="RADAR", product_levels="2A"):
-        module_name = "gpm.dataset.encoding.encode_2a_radar"
+        module_name = "gpm.encoding.encode_2a_radar"
         return _get_encoding_function(module_name)()
     return None
 
@@ -87,6 +87,9 @@ def set_encoding(ds, encoding_dict=None):
 
         # Set the variable encodings
         for k, encoding in encoding_dict.items():
+            # The _FillValue can not be defined both in the attributes and encoding
+            if "_FillValue" in encoding:
+                ds[k].attrs.pop("_FillValue", None)
             ds[k].encoding.update(encoding)
 
     return ds
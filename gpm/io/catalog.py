@@ -0,0 +1,492 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module contains functions to maintain a persistent catalog of the GPM granules on disk.
+
+The catalog is a SQLite database stored at ``<base_dir>/GPM/catalog.sqlite``.
+It records the filename information and the size of every local granule, together with the
+modification time of the daily directories where the granules are stored.
+When the catalog is updated, only the directories whose modification time changed are listed again.
+
+Enable the catalog in ``gpm.find_files(storage="LOCAL")`` and ``gpm.open_dataset`` with
+``gpm.config.set({"use_local_catalog": True})``.
+"""
+
+import contextlib
+import datetime
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from gpm.configs import get_base_dir
+from gpm.io.checks import (
+    check_base_dir,
+    check_product,
+    check_product_type,
+    check_product_version,
+    check_start_end_time,
+)
+from gpm.io.filter import is_granule_within_time
+from gpm.io.info import group_filepaths, parse_filepaths
+from gpm.io.local import _get_local_product_base_directory, get_local_product_directory
+from gpm.io.products import available_products, get_product_pattern
+from gpm.io.transfer import is_part_filepath
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+INFO_COLUMNS = [
+    "product_level",
+    "satellite",
+    "sensor",
+    "algorithm",
+    "start_time",
+    "end_time",
+    "granule_id",
+    "version",
+    "product_type",
+    "product",
+    "data_format",
+]
+
+GRANULES_COLUMNS = ["filepath", "directory", "product_dir", *INFO_COLUMNS, "file_size"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS granules (
+    filepath TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    product_dir TEXT NOT NULL,
+    product_level TEXT,
+    satellite TEXT,
+    sensor TEXT,
+    algorithm TEXT,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    granule_id INTEGER,
+    version TEXT,
+    product_type TEXT,
+    product TEXT,
+    data_format TEXT,
+    file_size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_granules_time ON granules (product_dir, start_time);
+CREATE INDEX IF NOT EXISTS idx_granules_directory ON granules (directory);
+CREATE TABLE IF NOT EXISTS directories (
+    directory TEXT PRIMARY KEY,
+    product_dir TEXT NOT NULL,
+    mtime INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_directories_product_dir ON directories (product_dir);
+"""
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Catalog database ####
+##########################
+
+
+def get_catalog_filepath(base_dir=None):
+    """Return the filepath of the local granules catalog."""
+    base_dir = get_base_dir(base_dir=base_dir)
+    base_dir = check_base_dir(base_dir)
+    return os.path.join(base_dir, "GPM", CATALOG_FILENAME)
+
+
+@contextlib.contextmanager
+def _connect(base_dir=None):
+    """Open a connection to the catalog and commit the changes on exit."""
+    filepath = get_catalog_filepath(base_dir=base_dir)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    con = sqlite3.connect(filepath, timeout=60)
+    try:
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def _format_time(time):
+    return time.strftime(TIME_FORMAT)
+
+
+def _parse_time(time):
+    return datetime.datetime.strptime(time, TIME_FORMAT)
+
+
+####--------------------------------------------------------------------------.
+#######################
+#### Catalog scans ####
+#######################
+
+
+def _scan_directory(con, directory, product_dir, product, mtime):
+    """Replace the catalog rows of the granules stored in a directory.
+
+    Files which are not valid granules of the directory product (or partial downloads) are not cataloged.
+    """
+    filepaths = sorted(
+        entry.path for entry in os.scandir(directory) if entry.is_file() and not is_part_filepath(entry.name)
+    )
+    df = parse_filepaths(filepaths, on_error="ignore")
+    df = df[df["product"].notna() & df["filepath"].str.contains(get_product_pattern(product), regex=True)]
+    df = df.assign(
+        directory=directory,
+        product_dir=product_dir,
+        product=product,
+        start_time=df["start_time"].dt.strftime(TIME_FORMAT),
+        end_time=df["end_time"].dt.strftime(TIME_FORMAT),
+        file_size=[os.path.getsize(filepath) for filepath in df["filepath"]],
+    )[GRANULES_COLUMNS]
+    df = df.astype(object).where(df.notna(), None)
+    rows = list(df.itertuples(index=False, name=None))
+    con.execute("DELETE FROM granules WHERE directory = ?", (directory,))
+    con.executemany(
+        f"INSERT INTO granules ({', '.join(GRANULES_COLUMNS)}) VALUES ({', '.join(['?'] * len(GRANULES_COLUMNS))})",
+        rows,
+    )
+    con.execute(
+        "INSERT OR REPLACE INTO directories (directory, product_dir, mtime) VALUES (?, ?, ?)",
+        (directory, product_dir, mtime),
+    )
+
+
+def _delete_directory(con, directory):
+    """Remove a directory and its granules from the catalog."""
+    con.execute("DELETE FROM granules WHERE directory = ?", (directory,))
+    con.execute("DELETE FROM directories WHERE directory = ?", (directory,))
+
+
+def _list_subdirectories(dir_path):
+    """Return the sorted list of the subdirectories with a numeric name (i.e. year, month, day)."""
+    if not os.path.isdir(dir_path):
+        return []
+    return sorted(entry.path for entry in os.scandir(dir_path) if entry.is_dir() and entry.name.isdigit())
+
+
+def _list_day_directories(product_dir):
+    """List the ``<YYYY>/<MM>/<DD>`` directories of a product directory."""
+    return [
+        day_dir
+        for year_dir in _list_subdirectories(product_dir)
+        for month_dir in _list_subdirectories(year_dir)
+        for day_dir in _list_subdirectories(month_dir)
+    ]
+
+
+def _define_day_directories(base_dir, product, product_type, version, start_time, end_time):
+    """Define the daily directories where granules overlapping the time period are stored.
+
+    The day before ``start_time`` is included to account for granules crossing midnight.
+    """
+    start_date = datetime.datetime(start_time.year, start_time.month, start_time.day)
+    start_date = start_date - datetime.timedelta(days=1)
+    end_date = datetime.datetime(end_time.year, end_time.month, end_time.day)
+    dates = pd.date_range(start=start_date, end=end_date, freq="D").to_pydatetime()
+    return [
+        get_local_product_directory(
+            base_dir=base_dir,
+            product=product,
+            product_type=product_type,
+            version=version,
+            date=date,
+        )
+        for date in dates
+    ]
+
+
+def _update_product_directory(con, product_dir, product, day_directories=None):
+    """Rescan the daily directories of a product whose modification time changed.
+
+    If ``day_directories`` is ``None``, all daily directories on disk are checked, and the
+    directories which do not exist anymore are removed from the catalog.
+    """
+    cataloged_mtimes = dict(
+        con.execute("SELECT directory, mtime FROM directories WHERE product_dir = ?", (product_dir,)).fetchall(),
+    )
+    if day_directories is None:
+        day_directories = set(_list_day_directories(product_dir)).union(cataloged_mtimes)
+    n_scanned = 0
+    for directory in sorted(day_directories):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            if directory in cataloged_mtimes:
+                _delete_directory(con, directory)
+            continue
+        if cataloged_mtimes.get(directory) != mtime:
+            _scan_directory(con, directory=directory, product_dir=product_dir, product=product, mtime=mtime)
+            n_scanned += 1
+    return n_scanned
+
+
+def _get_local_versions(base_dir):
+    """Return the RS versions available on disk."""
+    rs_dir = os.path.join(base_dir, "GPM", "RS")
+    if not os.path.isdir(rs_dir):
+        return []
+    return sorted(int(entry.name[1:]) for entry in os.scandir(rs_dir) if re.fullmatch(r"V\d+", entry.name))
+
+
+def _get_product_directories(base_dir, product=None, product_type=None, version=None):
+    """Return the list of ``(product, product_dir)`` tuples to be cataloged."""
+    product_types = ["RS", "NRT"] if product_type is None else [check_product_type(product_type)]
+    list_product_dirs = []
+    for p_type in product_types:
+        products = available_products(product_types=p_type) if product is None else [product]
+        if p_type == "NRT":
+            versions = [None]
+        elif version is None:
+            versions = _get_local_versions(base_dir)
+        else:
+            versions = [version]
+        for p in products:
+            for v in versions:
+                product_dir = _get_local_product_base_directory(
+                    base_dir=base_dir,
+                    product=p,
+                    product_type=p_type,
+                    version=v,
+                )
+                if os.path.isdir(product_dir):
+                    list_product_dirs.append((p, product_dir))
+    return list_product_dirs
+
+
+def update(product=None, product_type=None, version=None, base_dir=None, verbose=False):
+    """Update the catalog of the GPM granules stored on disk.
+
+    Only the daily directories whose modification time changed since the last update are listed.
+    Directories removed from disk are also removed from the catalog.
+
+    Parameters
+    ----------
+    product : str, optional
+        GPM product acronym. See ``gpm.available_products()``.
+        If ``None`` (the default), all products on disk are cataloged.
+    product_type : str, optional
+        GPM product type. Either ``RS`` (Research) or ``NRT`` (Near-Real-Time).
+        If ``None`` (the default), both product types are cataloged.
+    version : int, optional
+        GPM version of the ``RS`` products.
+        If ``None`` (the default), all versions on disk are cataloged.
+    base_dir : str, optional
+        The base directory where GPM data are stored.
+        If ``None`` (the default), it uses the ``base_dir`` specified in the GPM-API configuration file.
+    verbose : bool, optional
+        Whether to print the number of rescanned directories. The default is ``False``.
+
+    Returns
+    -------
+    n_scanned : int
+        Number of daily directories which have been (re)scanned.
+
+    """
+    base_dir = check_base_dir(get_base_dir(base_dir=base_dir))
+    list_product_dirs = _get_product_directories(
+        base_dir=base_dir,
+        product=product,
+        product_type=product_type,
+        version=version,
+    )
+    n_scanned = 0
+    with _connect(base_dir=base_dir) as con:
+        for p, product_dir in list_product_dirs:
+            n_scanned += _update_product_directory(con, product_dir=product_dir, product=p)
+    if verbose:
+        print(f"The GPM-API local catalog has been updated. {n_scanned} directories have been scanned.")
+    return n_scanned
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Catalog queries ####
+#########################
+
+
+def _row_to_info_dict(row):
+    """Convert a catalog row into a file information dictionary."""
+    info_dict = dict(zip(["filepath", *INFO_COLUMNS, "file_size"], row))
+    info_dict["start_time"] = _parse_time(info_dict["start_time"])
+    info_dict["end_time"] = _parse_time(info_dict["end_time"])
+    return info_dict
+
+
+def get_records(
+    product,
+    start_time=None,
+    end_time=None,
+    product_type="RS",
+    version=None,
+    base_dir=None,
+    update_catalog=True,
+):
+    """Return the catalog records of the local granules of a product.
+
+    The records are sorted by filepath.
+
+    Parameters
+    ----------
+    product : str
+        GPM product acronym. See ``gpm.available_products()``.
+    start_time : `datetime.datetime`, optional
+        Start time. If ``None`` (and ``end_time`` is ``None``), all granules are returned.
+    end_time : `datetime.datetime`, optional
+        End time. If ``None`` (and ``start_time`` is ``None``), all granules are returned.
+    product_type : str, optional
+        GPM product type. Either ``RS`` (Research) or ``NRT`` (Near-Real-Time).
+    version : int, optional
+        GPM version of the data to retrieve if ``product_type = "RS"``.
+    base_dir : str, optional
+        The base directory where GPM data are stored.
+    update_catalog : bool, optional
+        Whether to first rescan the directories whose modification time changed.
+        If a time period is specified, only the directories of the time period are checked.
+        The default is ``True``.
+
+    Returns
+    -------
+    records : list
+        List of dictionaries with the ``filepath``, the ``file_size`` and the
+        information extracted from the filename of each granule.
+
+    """
+    product_type = check_product_type(product_type=product_type)
+    product = check_product(product=product, product_type=product_type)
+    version = check_product_version(version, product)
+    base_dir = check_base_dir(get_base_dir(base_dir=base_dir))
+    time_filter = start_time is not None or end_time is not None
+    if time_filter:
+        if start_time is None:
+            start_time = datetime.datetime(1998, 1, 1, 0, 0, 0)  # GPM start mission
+        if end_time is None:
+            end_time = datetime.datetime.utcnow()  # Current time
+        start_time, end_time = check_start_end_time(start_time, end_time)
+
+    product_dir = _get_local_product_base_directory(
+        base_dir=base_dir,
+        product=product,
+        product_type=product_type,
+        version=version,
+    )
+    columns = ", ".join(["filepath", *INFO_COLUMNS, "file_size"])
+    with _connect(base_dir=base_dir) as con:
+        # Rescan the modified directories
+        if update_catalog:
+            day_directories = None
+            if time_filter:
+                day_directories = _define_day_directories(
+                    base_dir=base_dir,
+                    product=product,
+                    product_type=product_type,
+                    version=version,
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+            _update_product_directory(con, product_dir=product_dir, product=product, day_directories=day_directories)
+        # Query the granules
+        # - Granules starting the day before start_time can cross midnight
+        if time_filter:
+            start_date = datetime.datetime(start_time.year, start_time.month, start_time.day)
+            start_date = start_date - datetime.timedelta(days=1)
+            rows = con.execute(
+                f"SELECT {columns} FROM granules WHERE product_dir = ? AND start_time >= ? AND start_time <= ? "
+                "AND end_time >= ? ORDER BY filepath",
+                (product_dir, _format_time(start_date), _format_time(end_time), _format_time(start_time)),
+            ).fetchall()
+        else:
+            rows = con.execute(
+                f"SELECT {columns} FROM granules WHERE product_dir = ? ORDER BY filepath",
+                (product_dir,),
+            ).fetchall()
+
+    records = [_row_to_info_dict(row) for row in rows]
+    if time_filter:
+        records = [
+            record
+            for record in records
+            if is_granule_within_time(start_time, end_time, record["start_time"], record["end_time"])
+        ]
+    return records
+
+
+def get_filepaths(
+    product,
+    start_time=None,
+    end_time=None,
+    product_type="RS",
+    version=None,
+    groups=None,
+    base_dir=None,
+    update_catalog=True,
+):
+    """Retrieve the filepaths of the local granules of a product from the catalog.
+
+    Parameters
+    ----------
+    product : str
+        GPM product acronym. See ``gpm.available_products()``.
+    start_time : `datetime.datetime`, optional
+        Start time. If ``None`` (and ``end_time`` is ``None``), all granules are returned.
+    end_time : `datetime.datetime`, optional
+        End time. If ``None`` (and ``start_time`` is ``None``), all granules are returned.
+    product_type : str, optional
+        GPM product type. Either ``RS`` (Research) or ``NRT`` (Near-Real-Time).
+    version : int, optional
+        GPM version of the data to retrieve if ``product_type = "RS"``.
+    groups: list or str, optional
+        Whether to group the filepaths in a dictionary by a custom selection of keys.
+        See ``gpm.io.info.group_filepaths`` for the valid group keys.
+        If groups is ``None`` returns the filepaths list.
+        The default is ``None``.
+    base_dir : str, optional
+        The base directory where GPM data are stored.
+    update_catalog : bool, optional
+        Whether to first rescan the directories whose modification time changed.
+        The default is ``True``.
+
+    Returns
+    -------
+    filepaths : list or dict
+        List of GPM filepaths, or a dictionary of format ``{<group_value>: <list_filepaths>}``.
+
+    """
+    records = get_records(
+        product=product,
+        start_time=start_time,
+        end_time=end_time,
+        product_type=product_type,
+        version=version,
+        base_dir=base_dir,
+        update_catalog=update_catalog,
+    )
+    info = pd.DataFrame(records, columns=["filepath", *INFO_COLUMNS])
+    info["granule_id"] = info["granule_id"].astype("Int64")
+    return group_filepaths(info["filepath"].tolist(), groups=groups, info=info)
@@ -25,7 +25,9 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains functions to check the GPM-API arguments."""
+
 import datetime
+import importlib
 import os
 import subprocess
 
@@ -116,6 +118,22 @@ def check_remote_storage(storage):
     return storage.upper()
 
 
+def check_engine(engine):
+    """Check the engine used to read the GPM HDF5 granules."""
+    if not isinstance(engine, str):
+        raise TypeError("'engine' must be a string.")
+    valid_engines = ["netcdf4", "h5netcdf"]
+    if engine not in valid_engines:
+        raise ValueError(f"'{engine}' is an invalid 'engine'. Valid values are {valid_engines}.")
+    if engine == "h5netcdf" and not importlib.util.find_spec("h5netcdf"):
+        raise ImportError(
+            "The 'h5netcdf' package is required but not found. "
+            "Please install it using the following command: "
+            "conda install -c conda-forge h5netcdf",
+        )
+    return engine
+
+
 def check_transfer_tool_availability(transfer_tool):
     """Check availability of a transfer_tool. Return True if available."""
     try:
@@ -134,16 +152,27 @@ CURL_IS_AVAILABLE = check_transfer_tool_availability("curl")
 WGET_IS_AVAILABLE = check_transfer_tool_availability("wget")
 
 
+def check_n_threads(n_threads):
+    """Check the number of parallel downloads."""
+    if isinstance(n_threads, str):
+        if n_threads.lower() != "auto":
+            raise ValueError(f"'{n_threads}' is an invalid 'n_threads'. Specify an integer or 'auto'.")
+        return "auto"
+    if not isinstance(n_threads, (int, np.integer)):
+        raise TypeError("'n_threads' must be an integer or 'auto'.")
+    return int(n_threads)
+
+
 def check_transfer_tool(transfer_tool):
     """Check the transfer tool."""
-    valid_transfer_tools = ["CURL", "WGET"]
+    valid_transfer_tools = ["CURL", "WGET", "PYTHON"]
 
     if transfer_tool.upper() not in valid_transfer_tools:
         raise ValueError(
             f"'{transfer_tool}' is an invalid 'transfer_tool'. Valid values are {valid_transfer_tools}.",
         )
 
-    # Check WGET or CURL is installed
+    # Check WGET or CURL is installed (PYTHON only relies on the standard library)
     transfer_tool = transfer_tool.upper()
     if transfer_tool == "CURL" and not CURL_IS_AVAILABLE:
         raise ValueError("CURL is not installed on your machine !")
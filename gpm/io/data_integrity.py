@@ -24,10 +24,26 @@
 # SOFTWARE.
 
 # -----------------------------------------------------------------------------.
-"""This module contains functions that check the GPM files integrity."""
+"""This module contains functions that check the GPM files integrity.
+
+The integrity of a GPM HDF5 file is checked by:
+
+- validating the HDF5 superblock signature,
+- comparing the end-of-file address stored in the superblock with the actual file size,
+- reading the root ``FileHeader`` attribute.
+
+The checks do not read the file data and run in parallel using a pool of threads.
+The results are recorded in a SQLite ledger at ``<base_dir>/GPM/integrity_ledger.sqlite``.
+A file is checked again only if its size or modification time changed since the last check.
+"""
+
+import contextlib
 import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
-import xarray as xr
+import netCDF4
+from xarray.backends.locks import HDF5_LOCK, NETCDFC_LOCK, combine_locks
 
 from gpm.io.checks import (
     check_product,
@@ -36,28 +52,294 @@ from gpm.io.checks import (
 )
 from gpm.io.find import find_filepaths
 
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
 
-def get_corrupted_filepaths(filepaths):
-    """Return the file paths of corrupted files."""
-    l_corrupted = []
-    for filepath in filepaths:
+LEDGER_FILENAME = "integrity_ledger.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    filepath TEXT NOT NULL PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    corruption TEXT
+);
+"""
+
+# The netCDF-C and HDF5 libraries are not thread-safe
+# - Use the locks of the xarray netCDF4 backend when the attribute is read with netCDF4
+_NETCDF_LOCK = combine_locks([NETCDFC_LOCK, HDF5_LOCK])
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### HDF5 file checks ####
+##########################
+
+
+def _find_superblock_offset(f, file_size):
+    """Return the offset of the HDF5 superblock (or ``None`` if the signature is not found).
+
+    The superblock is located at offset 0, 512, 1024, 2048, ... (if an user block is present).
+    """
+    offset = 0
+    while offset + len(HDF5_SIGNATURE) <= file_size:
+        f.seek(offset)
+        if f.read(len(HDF5_SIGNATURE)) == HDF5_SIGNATURE:
+            return offset
+        offset = 512 if offset == 0 else offset * 2
+    return None
+
+
+def _read_eof_address(f, superblock_offset):
+    """Read the end-of-file address stored in the HDF5 superblock."""
+    f.seek(superblock_offset + len(HDF5_SIGNATURE))
+    version = f.read(1)[0]
+    if version in [0, 1]:
+        f.seek(superblock_offset + 13)
+        size_of_offsets = f.read(1)[0]
+        base_address_offset = 24 if version == 0 else 28
+    elif version in [2, 3]:
+        size_of_offsets = f.read(1)[0]
+        base_address_offset = 12
+    else:
+        raise ValueError(f"unsupported HDF5 superblock version {version}")
+    # Skip base address and free-space (or superblock extension) address
+    f.seek(superblock_offset + base_address_offset + 2 * size_of_offsets)
+    eof_address = int.from_bytes(f.read(size_of_offsets), byteorder="little")
+    # An undefined address has all bits set
+    if eof_address == 2 ** (8 * size_of_offsets) - 1:
+        return None
+    return eof_address
+
+
+def get_expected_file_size(filepath):
+    """Return the file size declared in the HDF5 superblock.
+
+    Returns ``None`` if the file is not an HDF5 file or if the end-of-file address is undefined.
+    """
+    file_size = os.path.getsize(filepath)
+    with open(filepath, "rb") as f:
+        superblock_offset = _find_superblock_offset(f, file_size=file_size)
+        if superblock_offset is None:
+            return None
         try:
-            # Try open the HDF file
+            return _read_eof_address(f, superblock_offset=superblock_offset)
+        except (IndexError, ValueError):
+            return None
 
-            # DataTree.close() does not work yet!
-            # dt = datatree.open_datatree(filepath, engine="netcdf4")
-            # dt.close()
 
-            # h5py it's an heavy dependency !
-            # hdf = h5py.File(filepath, "r")  # h5py._hl.files.File
-            # hdf.close()
+def is_incomplete_file(filepath):
+    """Return ``True`` if a file is empty or smaller than the size declared in its HDF5 superblock."""
+    file_size = os.path.getsize(filepath)
+    if file_size == 0:
+        return True
+    expected_size = get_expected_file_size(filepath)
+    return expected_size is not None and file_size < expected_size
 
-            ds = xr.open_dataset(filepath, engine="netcdf4", group="")
-            ds.close()
 
-        except OSError:
-            l_corrupted.append(filepath)
-    return l_corrupted
+def _check_hdf5_structure(filepath):
+    """Check the HDF5 superblock signature and end-of-file address.
+
+    Returns ``None`` if the file is valid, otherwise the description of the corruption.
+    """
+    file_size = os.path.getsize(filepath)
+    if file_size == 0:
+        return "empty file"
+    with open(filepath, "rb") as f:
+        superblock_offset = _find_superblock_offset(f, file_size=file_size)
+        if superblock_offset is None:
+            return "invalid HDF5 signature"
+        try:
+            eof_address = _read_eof_address(f, superblock_offset=superblock_offset)
+        except (IndexError, ValueError) as e:
+            return f"invalid HDF5 superblock ({e})"
+    if eof_address is not None and file_size < eof_address:
+        return f"truncated file (expected {eof_address} bytes, found {file_size} bytes)"
+    return None
+
+
+def _check_hdf5_attribute(filepath, attribute="FileHeader"):
+    """Check the readability of a root attribute (if present).
+
+    Returns ``None`` if the attribute can be read, otherwise the description of the corruption.
+    """
+    try:
+        import h5py
+    except ImportError:
+        h5py = None
+    try:
+        # Read with h5py if available, so that the check does not share the netCDF-C state
+        # of the granules opened with xarray in other threads (i.e. download pipeline callback)
+        if h5py is not None:
+            with HDF5_LOCK, h5py.File(filepath, mode="r") as f:
+                if attribute in f.attrs:
+                    _ = f.attrs[attribute]
+        else:
+            with _NETCDF_LOCK, netCDF4.Dataset(filepath, mode="r") as nc:
+                if attribute in nc.ncattrs():
+                    nc.getncattr(attribute)
+    except (OSError, KeyError, AttributeError, RuntimeError) as e:
+        return f"unreadable {attribute} attribute ({e})"
+    return None
+
+
+def get_file_corruption(filepath, attribute="FileHeader"):
+    """Check the integrity of a GPM HDF5 file without reading the data.
+
+    Parameters
+    ----------
+    filepath : str
+        File path.
+    attribute : str, optional
+        Root attribute which must be readable (if present). The default is ``"FileHeader"``.
+        If ``None``, only the HDF5 superblock is checked.
+
+    Returns
+    -------
+    str or None
+        Description of the corruption. ``None`` if the file is valid.
+
+    """
+    try:
+        corruption = _check_hdf5_structure(filepath)
+    except OSError as e:
+        return f"unreadable file ({e})"
+    if corruption is None and attribute is not None:
+        corruption = _check_hdf5_attribute(filepath, attribute=attribute)
+    return corruption
+
+
+####--------------------------------------------------------------------------.
+################
+#### Ledger ####
+################
+
+
+def get_integrity_ledger_filepath(base_dir=None):
+    """Return the filepath of the integrity ledger."""
+    from gpm.configs import get_base_dir
+    from gpm.io.checks import check_base_dir
+
+    base_dir = get_base_dir(base_dir=base_dir)
+    base_dir = check_base_dir(base_dir)
+    return os.path.join(base_dir, "GPM", LEDGER_FILENAME)
+
+
+@contextlib.contextmanager
+def _connect():
+    """Open a connection to the integrity ledger and commit the changes on exit.
+
+    If the GPM base directory is not specified, ``None`` is returned and the results are not recorded.
+    """
+    try:
+        filepath = get_integrity_ledger_filepath()
+    except ValueError:
+        yield None
+        return
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    con = sqlite3.connect(filepath, timeout=60)
+    try:
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def _get_file_fingerprint(filepath):
+    """Return the modification time and size of a file (or ``None`` if the file does not exist)."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_ledger(con, filepaths):
+    """Return the recorded corruption of the unchanged files as a dictionary."""
+    if con is None:
+        return {}
+    records = {}
+    for filepath in filepaths:
+        row = con.execute("SELECT mtime, file_size, corruption FROM ledger WHERE filepath = ?", (filepath,)).fetchone()
+        if row is not None and tuple(row[:2]) == _get_file_fingerprint(filepath):
+            records[filepath] = row[2]
+    return records
+
+
+def _write_ledger(con, results):
+    """Record the corruption of the checked files."""
+    if con is None:
+        return
+    rows = []
+    for filepath, corruption in results.items():
+        fingerprint = _get_file_fingerprint(filepath)
+        if fingerprint is not None:
+            rows.append((filepath, *fingerprint, corruption))
+    con.executemany("INSERT OR REPLACE INTO ledger VALUES (?, ?, ?, ?)", rows)
+
+
+def record_files_integrity(results):
+    """Record the corruption of files checked with ``get_file_corruption``.
+
+    Parameters
+    ----------
+    results : dict
+        Dictionary with the file paths as keys and their corruption (or ``None``) as values.
+
+    """
+    results = {os.path.abspath(filepath): corruption for filepath, corruption in results.items()}
+    with _connect() as con:
+        _write_ledger(con, results)
+
+
+def clear_integrity_ledger():
+    """Remove the recorded file integrity checks."""
+    with _connect() as con:
+        if con is not None:
+            con.execute("DELETE FROM ledger")
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Integrity check ####
+#########################
+
+
+def get_corrupted_filepaths(filepaths, max_workers=None):
+    """Return the file paths of corrupted files.
+
+    The files are checked in parallel with ``get_file_corruption``.
+    The files which have not changed since their last check are not checked again.
+
+    Parameters
+    ----------
+    filepaths : list
+        List of file paths.
+    max_workers : int, optional
+        Maximum number of threads checking the files.
+        If ``None``, it uses the ``concurrent.futures.ThreadPoolExecutor`` default.
+
+    Returns
+    -------
+    l_corrupted : list
+        List of corrupted file paths.
+
+    """
+    dict_abspaths = {filepath: os.path.abspath(filepath) for filepath in filepaths}
+    abspaths = list(dict.fromkeys(dict_abspaths.values()))
+    with _connect() as con:
+        # Retrieve the corruption of the already checked files
+        results = _read_ledger(con, abspaths)
+        # Check the other files
+        pending_abspaths = [abspath for abspath in abspaths if abspath not in results]
+        if len(pending_abspaths) > 0:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                corruptions = executor.map(get_file_corruption, pending_abspaths)
+                new_results = dict(zip(pending_abspaths, corruptions))
+            _write_ledger(con, new_results)
+            results.update(new_results)
+    return [filepath for filepath in filepaths if results[dict_abspaths[filepath]] is not None]
 
 
 def remove_corrupted_filepaths(filepaths, verbose=True):
@@ -67,7 +349,7 @@ def remove_corrupted_filepaths(filepaths, verbose=True):
         os.remove(filepath)
 
 
-def check_filepaths_integrity(filepaths, remove_corrupted=True, verbose=True):
+def check_filepaths_integrity(filepaths, remove_corrupted=True, verbose=True, max_workers=None):
     """Check the integrity of GPM files.
 
     Parameters
@@ -79,6 +361,9 @@ def check_filepaths_integrity(filepaths, remove_corrupted=True, verbose=True):
        The default is ``True``.
     verbose : bool, optional
         Whether to verbose the corrupted files. The default is ``True``.
+    max_workers : int, optional
+        Maximum number of threads checking the files.
+        If ``None``, it uses the ``concurrent.futures.ThreadPoolExecutor`` default.
 
     Returns
     -------
@@ -86,8 +371,8 @@ def check_filepaths_integrity(filepaths, remove_corrupted=True, verbose=True):
         List of corrupted file paths.
 
     """
-    # Loop over files and list file that can't be opened
-    l_corrupted = get_corrupted_filepaths(filepaths)
+    # List the corrupted files
+    l_corrupted = get_corrupted_filepaths(filepaths, max_workers=max_workers)
 
     # Report corrupted and remove if asked
     if remove_corrupted:
@@ -107,6 +392,7 @@ def check_archive_integrity(
     product_type="RS",
     remove_corrupted=True,
     verbose=True,
+    max_workers=None,
 ):
     """Check GPM granule file integrity over a given period.
 
@@ -128,6 +414,11 @@ def check_archive_integrity(
     remove_corrupted : bool, optional
         Whether to remove the corrupted files.
         The default is ``True``.
+    verbose : bool, optional
+        Whether to verbose the corrupted files. The default is ``True``.
+    max_workers : int, optional
+        Maximum number of threads checking the files.
+        If ``None``, it uses the ``concurrent.futures.ThreadPoolExecutor`` default.
 
     Returns
     -------
@@ -160,4 +451,5 @@ def check_archive_integrity(
         filepaths=filepaths,
         remove_corrupted=remove_corrupted,
         verbose=verbose,
+        max_workers=max_workers,
     )
@@ -25,8 +25,11 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains the routines required to download data from the NASA PPS and GES DISC servers."""
+
+import contextlib
 import datetime
 import ftplib
+import functools
 import os
 import platform
 import re
@@ -48,6 +51,7 @@ from gpm.configs import (
 )
 from gpm.io.checks import (
     check_date,
+    check_n_threads,
     check_product,
     check_product_type,
     check_product_version,
@@ -57,21 +61,23 @@ from gpm.io.checks import (
     check_valid_time_request,
 )
 from gpm.io.data_integrity import (
-    check_archive_integrity,
     check_filepaths_integrity,
+    is_incomplete_file,
 )
 from gpm.io.find import find_daily_filepaths
 from gpm.io.ges_disc import define_ges_disc_filepath
 from gpm.io.info import get_info_from_filepath
 from gpm.io.local import define_local_filepath
+from gpm.io.pipeline import DownloadPipeline
 from gpm.io.pps import define_pps_filepath
-from gpm.utils.list import flatten_list
+from gpm.io.transfer import TransferSession
+from gpm.utils.parallel import AIMDController, run_adaptive
 from gpm.utils.timing import print_elapsed_time
 from gpm.utils.warnings import GPMDownloadWarning
 
 ### Notes
-# - Currently we open a connection for every file
-# --> Maybe we can improve on that (open once, and then ask many stuffs)
+# - With CURL and WGET we open a connection for every file
+# --> The PYTHON transfer tool keeps the connections open across files (see gpm.io.transfer)
 # - Is it possible to download entire directories (instead of per-file?)
 
 ## For https connection, it requires Authorization header: <type><credentials>
@@ -246,24 +252,93 @@ def _get_list_status_commands(dict_futures, pbar=None):
     return status
 
 
-def run(commands, n_threads=10, progress_bar=True, verbose=True):
+class DownloadStatus(list):
+    """Download status of each file (0=Failed, 1=Success) with the measured transfer statistics.
+
+    It is returned by the download routines when ``n_threads="auto"``.
+
+    Attributes
+    ----------
+    n_bytes : int
+        Number of bytes downloaded.
+    elapsed : float
+        Download time in seconds.
+    throughput : float
+        Average throughput in bytes per second.
+    n_threads : list
+        Number of parallel downloads chosen by the controller over time.
+
+    """
+
+    def __init__(self, status, controller):
+        super().__init__(status)
+        self.n_bytes = controller.amount
+        self.elapsed = controller.elapsed
+        self.throughput = controller.throughput
+        self.n_threads = controller.history
+
+
+def _update_progress_bar(pbar, controller):
+    """Update the progress bar with the measured throughput."""
+    pbar.update(1)
+    pbar.set_postfix(throughput=f"{controller.throughput / 1e6:.2f} MB/s", n_threads=controller.n_workers)
+
+
+def _run_adaptive_downloads(functions, progress_bar=True):
+    """Run download functions with a number of parallel downloads adapted to the measured throughput.
+
+    Each function must return the number of bytes downloaded.
+    The number of parallel downloads (between 1 and 10) is increased by one as long as the throughput
+    increases, and it is halved when the throughput decreases or when a download fails.
+    """
+    from tqdm import tqdm
+
+    controller = AIMDController(min_workers=1, max_workers=10, initial_workers=2)
+    if progress_bar:
+        with tqdm(total=len(functions)) as pbar:
+            callback = functools.partial(_update_progress_bar, pbar)
+            status = run_adaptive(functions, controller=controller, callback=callback)
+    else:
+        status = run_adaptive(functions, controller=controller)
+    return DownloadStatus(status, controller=controller)
+
+
+def _run_command(cmd, filepath=None):
+    """Run a bash command and return the size of the downloaded file (if specified)."""
+    subprocess.check_call(shlex.split(cmd), shell=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if filepath is None or not os.path.exists(filepath):
+        return 0
+    return os.path.getsize(filepath)
+
+
+def run(commands, n_threads=10, progress_bar=True, verbose=True, filepaths=None):
     """Run bash commands in parallel using multithreading.
 
     Parameters
     ----------
     commands : list
         list of commands to execute in the terminal.
-    n_threads : int, optional
+    n_threads : int or str, optional
         Number of parallel download. The default is 10.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
+    filepaths : list, optional
+        Local file paths downloaded by the commands.
+        If specified with ``n_threads="auto"``, the throughput is measured in bytes per second.
 
     Returns
     -------
     status : list
         Download status of each file. 0=Failed. 1=Success.
+        If ``n_threads="auto"``, a ``DownloadStatus`` list reporting also the measured throughput.
 
     """
     from tqdm import tqdm
 
+    if n_threads == "auto":
+        filepaths = [None] * len(commands) if filepaths is None else filepaths
+        functions = [functools.partial(_run_command, cmd, filepath) for cmd, filepath in zip(commands, filepaths)]
+        return _run_adaptive_downloads(functions, progress_bar=progress_bar)
+
     if n_threads < 1:
         n_threads = 1
     n_threads = min(n_threads, 10)
@@ -288,6 +363,64 @@ def run(commands, n_threads=10, progress_bar=True, verbose=True):
     return status
 
 
+def _download_with_session(session, remote_filepath, local_filepath):
+    """Download a file with a ``TransferSession`` and return its size."""
+    session.download(remote_filepath, local_filepath)
+    return os.path.getsize(local_filepath)
+
+
+def run_transfers(remote_filepaths, local_filepaths, username, password, n_threads=10, progress_bar=True):
+    """Download files in parallel using multithreading and persistent connections.
+
+    Each thread keeps its connections to the servers open across files.
+
+    Parameters
+    ----------
+    remote_filepaths : list
+        URLs of the files to download.
+    local_filepaths : list
+        Local file paths where to save the files.
+    username : str
+        Username for the server authentication.
+    password : str
+        Password for the server authentication.
+    n_threads : int or str, optional
+        Number of parallel download. The default is 10.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
+
+    Returns
+    -------
+    status : list
+        Download status of each file. 0=Failed. 1=Success.
+        If ``n_threads="auto"``, a ``DownloadStatus`` list reporting also the measured throughput.
+
+    """
+    from tqdm import tqdm
+
+    session = TransferSession(username=username, password=password)
+    if n_threads == "auto":
+        with session:
+            functions = [
+                functools.partial(_download_with_session, session, remote_filepath, local_filepath)
+                for remote_filepath, local_filepath in zip(remote_filepaths, local_filepaths)
+            ]
+            return _run_adaptive_downloads(functions, progress_bar=progress_bar)
+
+    n_threads = min(max(n_threads, 1), 10)
+    # The executor waits for the downloads to complete before the session closes the connections
+    with session, ThreadPoolExecutor(max_workers=n_threads) as executor:
+        dict_futures = {
+            executor.submit(session.download, remote_filepath, local_filepath): (i, remote_filepath)
+            for i, (remote_filepath, local_filepath) in enumerate(zip(remote_filepaths, local_filepaths))
+        }
+        if progress_bar:
+            with tqdm(total=len(dict_futures)) as pbar:
+                status = _get_list_status_commands(dict_futures, pbar=pbar)
+        else:
+            status = _get_list_status_commands(dict_futures)
+    return status
+
+
 ####--------------------------------------------------------------------------.
 #######################################
 #### Download Single File Commands ####
@@ -393,6 +526,19 @@ def _get_storage_username_password(storage):
     return username, password
 
 
+def _download_file(remote_filepath, local_filepath, storage, transfer_tool, session=None):
+    """Download a single remote file to its GPM-API local file path.
+
+    A ``TransferSession`` must be specified if ``transfer_tool="PYTHON"``.
+    """
+    if transfer_tool == "PYTHON":
+        session.download(remote_filepath, local_filepath)
+        return
+    username, password = _get_storage_username_password(storage)
+    get_single_file_cmd = _get_single_file_cmd_function(transfer_tool, storage)
+    _run_command(get_single_file_cmd(remote_filepath, local_filepath, username, password))
+
+
 def _ensure_local_directories_exists(local_filepaths):
     _ = [os.makedirs(os.path.dirname(path), exist_ok=True) for path in local_filepaths]
 
@@ -408,14 +554,27 @@ def _download_files(
 ):
     """Download a list of remote files to their GPM-API local file paths.
 
-    This function open a connection to the server for each file to download !.
+    With ``curl`` and ``wget``, this function open a connection to the server for each file to download !
+    With ``python``, the connections are reused across files.
     """
     transfer_tool = check_transfer_tool(transfer_tool)
+    n_threads = check_n_threads(n_threads)
     _ensure_local_directories_exists(local_filepaths)
 
     # Retrieve username and password
     username, password = _get_storage_username_password(storage)
 
+    # Download the data with persistent connections (in parallel)
+    if transfer_tool == "PYTHON":
+        return run_transfers(
+            remote_filepaths=remote_filepaths,
+            local_filepaths=local_filepaths,
+            username=username,
+            password=password,
+            n_threads=n_threads,
+            progress_bar=progress_bar,
+        )
+
     # Define command list
     get_single_file_cmd = _get_single_file_cmd_function(transfer_tool, storage)
     list_cmd = [
@@ -424,7 +583,7 @@ def _download_files(
     ]
 
     ## Download the data (in parallel)
-    return run(list_cmd, n_threads=n_threads, progress_bar=progress_bar, verbose=verbose)
+    return run(list_cmd, n_threads=n_threads, progress_bar=progress_bar, verbose=verbose, filepaths=local_filepaths)
 
 
 ####--------------------------------------------------------------------------.
@@ -433,9 +592,17 @@ def _download_files(
 ############################
 
 
+def _is_on_disk(filepath):
+    """Return ``True`` if a complete file exists on disk."""
+    return os.path.exists(filepath) and not is_incomplete_file(filepath)
+
+
 def filter_download_list(remote_filepaths, local_filepaths, force_download=False):
     """Removes filepaths of GPM file already existing on disk.
 
+    Files on disk which are empty or truncated (i.e. smaller than the size declared
+    in the HDF5 superblock) are considered incomplete and are kept in the download list.
+
     Parameters
     ----------
     remote_filepaths : str
@@ -456,8 +623,8 @@ def filter_download_list(remote_filepaths, local_filepaths, force_download=False
     # -------------------------------------------------------------------------.
     # Check if data already exists
     if force_download is False:
-        # Get index of files which does not exist on disk
-        idx_not_existing = [i for i, filepath in enumerate(local_filepaths) if not os.path.exists(filepath)]
+        # Get index of files which does not exist (or are incomplete) on disk
+        idx_not_existing = [i for i, filepath in enumerate(local_filepaths) if not _is_on_disk(filepath)]
         # Select paths of files not present on disk
         local_filepaths = [local_filepaths[i] for i in idx_not_existing]
         remote_filepaths = [remote_filepaths[i] for i in idx_not_existing]
@@ -562,12 +729,14 @@ def download_files(
     storage : str, optional
         The remote repository from where to download.
         Either ``pps`` or ``ges_disc``. The default is "PPS".
-    n_threads : int, optional
+    n_threads : int or str, optional
         Number of parallel downloads. The default is set to 10.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
     progress_bar : bool, optional
         Whether to display progress. The default is ``True``.
     transfer_tool : str, optional
-        Whether to use ``curl`` or ``wget`` for data download. The default is  ``curl``.
+        Whether to use ``curl``, ``wget`` or ``python`` for data download. The default is  ``curl``.
+        The ``python`` transfer tool reuses the server connections across files.
     verbose : bool, optional
         Whether to print processing details. The default is ``False``.
     force_download : bool, optional
@@ -591,6 +760,7 @@ def download_files(
 
     # Check inputs
     storage = check_remote_storage(storage)
+    n_threads = check_n_threads(n_threads)
     if isinstance(filepaths, type(None)):
         return None
     if isinstance(filepaths, str):
@@ -670,93 +840,6 @@ def download_files(
 ###########################
 
 
-def _ensure_files_completness(
-    filepaths,
-    product_type,
-    remove_corrupted,
-    verbose,
-    transfer_tool,
-    retry,
-    n_threads,
-    progress_bar,
-):
-    """Check file validity and attempt download if corrupted."""
-    l_corrupted = check_filepaths_integrity(
-        filepaths=filepaths,
-        remove_corrupted=remove_corrupted,
-        verbose=verbose,
-    )
-    if verbose:
-        print("Integrity checking of GPM files has completed.")
-    if retry > 0 and remove_corrupted and len(l_corrupted) > 0:
-        if verbose:
-            print("Start attempts to redownload the corrupted files.")
-        l_corrupted = download_files(
-            filepaths=l_corrupted,
-            product_type=product_type,
-            force_download=True,
-            n_threads=n_threads,
-            transfer_tool=transfer_tool,
-            progress_bar=progress_bar,
-            verbose=verbose,
-            retry=retry - 1,
-        )
-        if verbose:
-            if len(l_corrupted) == 0:
-                print("All corrupted files have been redownloaded successively.")
-            else:
-                print("Some corrupted files couldn't been redownloaded.")
-                print("Returning the list of corrupted files.")
-    return l_corrupted
-
-
-def _ensure_archive_completness(
-    product,
-    start_time,
-    end_time,
-    version,
-    product_type,
-    remove_corrupted,
-    verbose,
-    transfer_tool,
-    retry,
-    n_threads,
-    progress_bar,
-):
-    """Check the archive completeness over the specified time period."""
-    l_corrupted = check_archive_integrity(
-        product=product,
-        start_time=start_time,
-        end_time=end_time,
-        version=version,
-        product_type=product_type,
-        remove_corrupted=remove_corrupted,
-        verbose=verbose,
-    )
-    if verbose:
-        print("Integrity checking of GPM files has completed.")
-    if retry > 0 and remove_corrupted and len(l_corrupted) > 0:
-        if verbose:
-            print("Start attempts to redownload the corrupted files.")
-        l_corrupted = download_files(
-            filepaths=l_corrupted,
-            product_type=product_type,
-            force_download=True,
-            n_threads=n_threads,
-            transfer_tool=transfer_tool,
-            progress_bar=progress_bar,
-            verbose=verbose,
-            retry=retry - 1,
-        )
-        if verbose:
-            if len(l_corrupted) == 0:
-                print("All corrupted files have been redownloaded successively.")
-            else:
-                print("Some corrupted files couldn't been redownloaded.")
-                print("Returning the list of corrupted files.")
-    return l_corrupted
-
-
 def _download_daily_data(
     date,
     version,
@@ -771,6 +854,7 @@ def _download_daily_data(
     force_download,
     verbose,
     warn_missing_files,
+    pipeline=None,
 ):
     """Download GPM data from NASA servers using curl or wget.
 
@@ -791,16 +875,21 @@ def _download_daily_data(
     storage : str
         The remote repository from where to download.
         Either ``pps`` or ``ges_disc``.
-    n_threads : int
+    n_threads : int or str
         Number of parallel downloads.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
     progress_bar : bool
         Whether to display progress.
     transfer_tool : str
-        Whether to use ``curl`` or ``wget`` for data download.
+        Whether to use ``curl``, ``wget`` or ``python`` for data download.
     force_download : bool
         Whether to redownload data if already existing on disk.
     verbose : bool
         Whether to print processing details. T
+    pipeline : gpm.io.pipeline.DownloadPipeline, optional
+        If specified, the files to download are submitted to the pipeline and the
+        function returns without waiting for the downloads.
+        The download status must then be retrieved with ``pipeline.join()``.
 
     Returns
     -------
@@ -815,6 +904,7 @@ def _download_daily_data(
     product = check_product(product=product, product_type=product_type)
     storage = check_remote_storage(storage)
     transfer_tool = check_transfer_tool(transfer_tool)
+    n_threads = check_n_threads(n_threads)
     # -------------------------------------------------------------------------.
     ## Retrieve the list of files available on NASA PPS server
     remote_filepaths, available_version = find_daily_filepaths(
@@ -852,6 +942,13 @@ def _download_daily_data(
     if len(remote_filepaths) == 0:
         return [-1], available_version  # flag for already on disk
 
+    # -------------------------------------------------------------------------.
+    # Submit the files to the download pipeline
+    if pipeline is not None:
+        _ensure_local_directories_exists(local_filepaths)
+        pipeline.submit(remote_filepaths, local_filepaths)
+        return [], available_version
+
     # -------------------------------------------------------------------------.
     # Retrieve commands
     status = _download_files(
@@ -925,9 +1022,15 @@ def download_archive(
     remove_corrupted=True,
     retry=1,
     verbose=True,
+    callback=None,
 ):
     """Download GPM data from NASA servers (day by day).
 
+    The files are downloaded, checked and optionally processed by a pipeline:
+    the integrity of each file is checked as soon as it is downloaded, while the
+    next files are being downloaded. The corrupted files (or failed downloads) are
+    downloaded again after a backoff delay.
+
     Parameters
     ----------
     product : str
@@ -947,12 +1050,14 @@ def download_archive(
     storage : str, optional
         The remote repository from where to download.
         Either ``pps`` or ``ges_disc``. The default is ``pps``.
-    n_threads : int, optional
+    n_threads : int or str, optional
         Number of parallel downloads. The default is set to 10.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
     progress_bar : bool, optional
         Whether to display progress. The default is ``True``.
     transfer_tool : str, optional
-        Whether to use ``curl`` or ``wget`` for data download. The default is  ``curl``.
+        Whether to use ``curl``, ``wget`` or ``python`` for data download. The default is  ``curl``.
+        The ``python`` transfer tool reuses the server connections across files.
     force_download : bool, optional
         Whether to redownload data if already existing on disk. The default is ``False``.
     verbose : bool, optional
@@ -966,6 +1071,18 @@ def download_archive(
     retry : int, optional,
         The number of attempts to redownload the corrupted files. The default is 1.
         Only applies if ``check_integrity=True``!
+    callback : callable, optional
+        Function called with the local file path of each downloaded (and valid) file,
+        while the next files are being downloaded.
+        For example, ``functools.partial(write_granule_bucket, bucket_dir=..., partitioning=...,
+        granule_to_df_func=...)`` writes each granule into a bucket archive.
+        The default is ``None``.
+
+    Returns
+    -------
+    l_corrupted : list or None
+        If ``check_integrity=True``, the local file paths of the files still corrupted
+        after the retries. Otherwise ``None``.
 
     """
     # -------------------------------------------------------------------------.
@@ -975,6 +1092,7 @@ def download_archive(
     product = check_product(product=product, product_type=product_type)
     version = check_product_version(version, product)
     transfer_tool = check_transfer_tool(transfer_tool)
+    n_threads = check_n_threads(n_threads)
     start_time, end_time = check_start_end_time(start_time, end_time)
     start_time, end_time = check_valid_time_request(start_time, end_time, product)
     # -------------------------------------------------------------------------.
@@ -988,29 +1106,55 @@ def download_archive(
     dates = list(date_range.to_pydatetime())
 
     # -------------------------------------------------------------------------.
-    # Loop over dates and download the files
+    # Define the pipeline downloading, checking and processing the files
+    if transfer_tool == "PYTHON":
+        session = TransferSession(*_get_storage_username_password(storage))
+    else:
+        session = contextlib.nullcontext()
+    download_function = functools.partial(
+        _download_file,
+        storage=storage,
+        transfer_tool=transfer_tool,
+        session=session,
+    )
+    pipeline = DownloadPipeline(
+        download_function=download_function,
+        n_threads=n_threads,
+        check_integrity=check_integrity,
+        remove_corrupted=remove_corrupted,
+        retry=retry if check_integrity else 0,
+        callback=callback,
+        progress_bar=progress_bar,
+    )
+
+    # -------------------------------------------------------------------------.
+    # Loop over dates and submit the files to download
+    # - The files of a day are downloaded while the files of the next days are searched
     list_status = []
     list_versions = []
-    for i, date in enumerate(dates):
-        warn_missing_files = not (i == 0 or i == len(dates) - 1 and date == end_time)
+    with session, pipeline:
+        for i, date in enumerate(dates):
+            warn_missing_files = not (i == 0 or i == len(dates) - 1 and date == end_time)
 
-        status, available_version = _download_daily_data(
-            date=date,
-            version=version,
-            product=product,
-            product_type=product_type,
-            start_time=start_time,
-            end_time=end_time,
-            storage=storage,
-            n_threads=n_threads,
-            transfer_tool=transfer_tool,
-            progress_bar=progress_bar,
-            force_download=force_download,
-            verbose=verbose,
-            warn_missing_files=warn_missing_files,
-        )
-        list_status += status
-        list_versions += available_version
+            status, available_version = _download_daily_data(
+                date=date,
+                version=version,
+                product=product,
+                product_type=product_type,
+                start_time=start_time,
+                end_time=end_time,
+                storage=storage,
+                n_threads=n_threads,
+                transfer_tool=transfer_tool,
+                progress_bar=progress_bar,
+                force_download=force_download,
+                verbose=verbose,
+                warn_missing_files=warn_missing_files,
+                pipeline=pipeline,
+            )
+            list_status += status
+            list_versions += available_version
+        list_status += pipeline.join()
 
     # -------------------------------------------------------------------------.
     # Check download status
@@ -1026,26 +1170,13 @@ def download_archive(
         warnings.warn(msg, GPMDownloadWarning, stacklevel=1)
 
     # -------------------------------------------------------------------------.
+    # Retrieve the corrupted files
+    # - The files have already been checked (and redownloaded) by the pipeline
     if check_integrity:
-        l_corrupted = [
-            _ensure_archive_completness(
-                product=product,
-                start_time=start_time,
-                end_time=end_time,
-                version=version,
-                product_type=product_type,
-                remove_corrupted=remove_corrupted,
-                verbose=verbose,
-                transfer_tool=transfer_tool,
-                retry=retry,
-                n_threads=n_threads,
-                progress_bar=progress_bar,
-            )
-            for version in versions
-        ]
-        l_corrupted = flatten_list(l_corrupted)
-        if len(l_corrupted) == 0:
-            return l_corrupted
+        l_corrupted = pipeline.corrupted_filepaths
+        if verbose and len(l_corrupted) > 0:
+            print(f"The following files are still corrupted after the redownload attempts: {l_corrupted}")
+        return l_corrupted
     return None
 
 
@@ -37,32 +37,35 @@ from gpm.io.checks import (
     check_version,
 )
 from gpm.io.info import (
-    get_info_from_filepath,
     get_start_end_time_from_filepaths,
     get_version_from_filepaths,
+    parse_filepaths,
 )
 from gpm.io.products import get_product_pattern
 
 
 def is_granule_within_time(start_time, end_time, file_start_time, file_end_time):
-    """Check if a granule is within start_time and end_time."""
+    """Check if a granule is within start_time and end_time.
+
+    ``file_start_time`` and ``file_end_time`` can also be arrays. In such case, a boolean array is returned.
+    """
     # - Case 1
     #     s               e
     #     |               |
     #   ---------> (-------->)
-    is_case1 = file_start_time <= start_time and file_end_time > start_time
+    is_case1 = (file_start_time <= start_time) & (file_end_time > start_time)
     # - Case 2
     #     s               e
     #     |               |
     #          --------
-    is_case2 = file_start_time >= start_time and file_end_time < end_time
+    is_case2 = (file_start_time >= start_time) & (file_end_time < end_time)
     # - Case 3
     #     s               e
     #     |               |
     #                ------------->
-    is_case3 = file_start_time < end_time and file_end_time > end_time
+    is_case3 = (file_start_time < end_time) & (file_end_time > end_time)
     # - Check if one of the conditions occurs
-    return is_case1 or is_case2 or is_case3
+    return is_case1 | is_case2 | is_case3
 
 
 ####--------------------------------------------------------------------------.
@@ -76,63 +79,6 @@ def _string_match(pattern, string):
     return bool(re.search(pattern, string))
 
 
-def _filter_filepath(filepath, product=None, version=None, start_time=None, end_time=None):
-    """Check if a single filepath pass the filtering parameters.
-
-    If do not match the filtering criteria, it returns ``None``.
-
-    Parameters
-    ----------
-    filepath : str
-        Filepath string.
-    product : str
-        GPM product name. See ``gpm.available_products()``.
-        The default is ``None``.
-    start_time : `datetime.datetime`
-        Start time
-        The default is ``None``.
-    end_time : `datetime.datetime`
-        End time.
-        The default is ``None``.
-    version: int
-        GPM product version.
-        The default is ``None``.
-
-    Returns
-    -------
-    filepaths : list
-        Returns the filepaths subset.
-        If no valid filepaths, return an empty list.
-
-    """
-    try:
-        info_dict = get_info_from_filepath(filepath)
-    except ValueError:
-        return None
-
-    # Filter by version
-    if version is not None:
-        file_version = info_dict["version"]
-        file_version = int(re.findall("\\d+", file_version)[0])
-        if file_version != version:
-            return None
-
-    # Filter by product
-    if product is not None:
-        product_pattern = get_product_pattern(product)
-        if not _string_match(pattern=product_pattern, string=filepath):
-            return None
-
-    # Filter by start_time and end_time
-    if start_time is not None and end_time is not None:
-        file_start_time = info_dict["start_time"]
-        file_end_time = info_dict["end_time"]
-        if not is_granule_within_time(start_time, end_time, file_start_time, file_end_time):
-            return None
-
-    return filepath
-
-
 def filter_filepaths(
     filepaths,
     product=None,
@@ -183,19 +129,22 @@ def filter_filepaths(
             start_time = datetime.datetime(1998, 1, 1, 0, 0, 0)  # GPM start mission
         if end_time is None:
             end_time = datetime.datetime.now()  # Current time
-    # Filter filepaths
-    filepaths = [
-        _filter_filepath(
-            filepath,
-            product=product,
-            version=version,
-            start_time=start_time,
-            end_time=end_time,
-        )
-        for filepath in filepaths
-    ]
-    # Remove None from the list
-    return [filepath for filepath in filepaths if filepath is not None]
+    # Parse all filenames at once
+    # - Filepaths with invalid filenames are discarded
+    df = parse_filepaths(filepaths, on_error="ignore")
+    is_valid = df["product"].notna().to_numpy()
+    # Filter by version
+    if version is not None:
+        file_versions = df["version"].str.extract(r"(\d+)", expand=False).astype(float)
+        is_valid &= (file_versions == version).to_numpy()
+    # Filter by product
+    if product is not None:
+        product_pattern = get_product_pattern(product)
+        is_valid &= df["filepath"].str.contains(product_pattern, regex=True).to_numpy()
+    # Filter by start_time and end_time
+    if start_time is not None and end_time is not None:
+        is_valid &= is_granule_within_time(start_time, end_time, df["start_time"], df["end_time"]).to_numpy()
+    return [filepath for filepath, flag in zip(filepaths, is_valid) if flag]
 
 
 def filter_by_product(filepaths, product, product_type="RS"):
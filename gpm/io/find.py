@@ -25,15 +25,19 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains functions to find data on local and NASA servers."""
+
 import datetime
 import os
+import urllib.parse
 import warnings
 
 import dask
 import numpy as np
 import pandas as pd
 
+import gpm
 from gpm._config import config
+from gpm.configs import get_password_pps, get_username_pps
 from gpm.io.checks import (
     check_date,
     check_product,
@@ -44,10 +48,11 @@ from gpm.io.checks import (
     check_valid_time_request,
 )
 from gpm.io.filter import filter_filepaths
-from gpm.io.ges_disc import get_ges_disc_daily_filepaths
+from gpm.io.ges_disc import get_ges_disc_daily_filepaths, get_ges_disc_product_directory
 from gpm.io.info import get_version_from_filepaths, group_filepaths
+from gpm.io.listing import get_listing_ttl, get_listings, use_listings
 from gpm.io.local import get_local_daily_filepaths
-from gpm.io.pps import get_pps_daily_filepaths
+from gpm.io.pps import get_pps_daily_filepaths, get_pps_product_directory
 from gpm.io.products import available_products
 from gpm.utils.list import flatten_list
 from gpm.utils.warnings import GPMDownloadWarning
@@ -218,6 +223,55 @@ def find_daily_filepaths(
     return filepaths, [available_version]
 
 
+def _get_daily_listings(storage, product, product_type, version, dates):
+    """Retrieve concurrently the listings of the remote daily directories.
+
+    The listings are cached according to the ``use_listing_cache`` configuration option.
+    """
+    urls = {}
+    username, password, auth_hosts = None, None, ()
+    if storage == "PPS":
+        username = get_username_pps()
+        password = get_password_pps()
+        for date in dates:
+            url = get_pps_product_directory(
+                product=product,
+                product_type=product_type,
+                date=date,
+                version=version,
+                server_type="text",
+            )
+            urls[f"{url}/"] = date
+        auth_hosts = tuple({urllib.parse.urlsplit(url).hostname for url in urls})
+    else:  # storage == "GES_DISC"
+        for date in dates:
+            url = get_ges_disc_product_directory(product=product, date=date, version=version)
+            urls[url] = date
+    ttls = {url: get_listing_ttl(product_type=product_type, date=date, product=product) for url, date in urls.items()}
+    return get_listings(list(urls), ttls=ttls, username=username, password=password, auth_hosts=auth_hosts)
+
+
+def _find_catalog_filepaths(product, product_type, version, start_time, end_time, groups, verbose):
+    """Retrieve the local filepaths from the local granules catalog."""
+    from gpm.io.catalog import get_filepaths
+
+    filepaths = get_filepaths(
+        product=product,
+        product_type=product_type,
+        version=version,
+        start_time=start_time,
+        end_time=end_time,
+        groups=groups,
+    )
+    if len(filepaths) == 0 and verbose:
+        version_str = str(int(version))
+        print(
+            f"The GPM product {product} (V0{version_str}) between {start_time} and {end_time} "
+            "has not been downloaded !",
+        )
+    return filepaths
+
+
 def find_filepaths(
     storage,
     product,
@@ -247,6 +301,8 @@ def find_filepaths(
         Whether to print processing details. The default is ``True``.
     parallel : bool, optional
         Whether to loop over dates in parallel.
+        For the ``PPS`` and ``GES_DISC`` storages, the remote daily directories are listed
+        concurrently with ``asyncio``.
         The default is ``True``.
     groups: list or str, optional
         Whether to group the filepaths in a dictionary by a custom selection of keys.
@@ -264,6 +320,15 @@ def find_filepaths(
     filepaths : list
         List of GPM filepaths.
 
+    Notes
+    -----
+    If ``gpm.config.get("use_local_catalog")`` is ``True``, the ``LOCAL`` filepaths are
+    retrieved from the local granules catalog (see ``gpm.catalog``) instead of listing
+    the content of each daily directory.
+
+    If ``gpm.config.get("use_listing_cache")`` is ``True``, the listings of the ``PPS`` and
+    ``GES_DISC`` daily directories are cached on disk (see ``gpm.io.listing``).
+
     """
     # -------------------------------------------------------------------------.
     ## Checks input arguments
@@ -274,6 +339,19 @@ def find_filepaths(
     start_time, end_time = check_start_end_time(start_time, end_time)
     start_time, end_time = check_valid_time_request(start_time, end_time, product)
 
+    # -------------------------------------------------------------------------.
+    # If asked, retrieve the local filepaths from the local granules catalog
+    if storage == "LOCAL" and gpm.config.get("use_local_catalog"):
+        return _find_catalog_filepaths(
+            product=product,
+            product_type=product_type,
+            version=version,
+            start_time=start_time,
+            end_time=end_time,
+            groups=groups,
+            verbose=verbose,
+        )
+
     # Retrieve sequence of dates
     # - Specify start_date - 1 day to include data potentially on previous day directory
     # --> Example granules starting at 23:XX:XX in the day before and extending to 01:XX:XX
@@ -290,6 +368,20 @@ def find_filepaths(
         dates = [dates[0]]
         parallel = False
 
+    # -------------------------------------------------------------------------.
+    # If remote storage, list concurrently the daily directories
+    # - The daily directories are then parsed sequentially
+    listings = {}
+    if parallel and storage != "LOCAL":
+        listings = _get_daily_listings(
+            storage=storage,
+            product=product,
+            product_type=product_type,
+            version=version,
+            dates=dates,
+        )
+        parallel = False
+
     # -------------------------------------------------------------------------.
     # Loop over dates and retrieve available filepaths
     if parallel:
@@ -319,20 +411,21 @@ def find_filepaths(
         #   and the searched granule is in previous day directory
         list_filepaths = []
         verbose_arg = verbose
-        for i, date in enumerate(dates):
-            verbose = False if i == 0 else verbose_arg
-            filepaths, _ = find_daily_filepaths(
-                storage=storage,
-                version=version,
-                product=product,
-                product_type=product_type,
-                date=date,
-                start_time=start_time,
-                end_time=end_time,
-                verbose=verbose,
-            )
-            # Concatenate filepaths
-            list_filepaths += filepaths
+        with use_listings(listings):
+            for i, date in enumerate(dates):
+                verbose = False if i == 0 else verbose_arg
+                filepaths, _ = find_daily_filepaths(
+                    storage=storage,
+                    version=version,
+                    product=product,
+                    product_type=product_type,
+                    date=date,
+                    start_time=start_time,
+                    end_time=end_time,
+                    verbose=verbose,
+                )
+                # Concatenate filepaths
+                list_filepaths += filepaths
 
     filepaths = flatten_list(list_filepaths)
 
@@ -31,6 +31,7 @@ import re
 import shlex
 import subprocess
 
+from gpm.io.listing import get_listing
 from gpm.io.products import get_product_info, is_trmm_product
 
 ###---------------------------------------------------------------------------.
@@ -40,11 +41,14 @@ from gpm.io.products import get_product_info, is_trmm_product
 
 
 def _get_ges_disc_url_content(url):
-    # cmd = f"wget -O - {url}"
-    cmd = f"curl -L {url}"
-    list_cmd = shlex.split(cmd)
-    process = subprocess.Popen(list_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout = process.communicate()[0].decode()
+    # Use the listing retrieved by the concurrent lister or cached, if available
+    stdout = get_listing(url)
+    if stdout is None:
+        # cmd = f"wget -O - {url}"
+        cmd = f"curl -L {url}"
+        list_cmd = shlex.split(cmd)
+        process = subprocess.Popen(list_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout = process.communicate()[0].decode()
     # Check if server is available
     if stdout == "":
         raise ValueError(f"The requested url {url} was not found on the GES DISC server.")
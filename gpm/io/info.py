@@ -32,6 +32,7 @@ import re
 from collections import defaultdict
 
 import numpy as np
+import pandas as pd
 
 ####---------------------------------------------------------------------------
 ########################
@@ -45,6 +46,23 @@ NASA_NRT_filename_PATTERN = "{product_level:s}.{satellite:s}.{sensor:s}.{algorit
 # - Pattern for 1B-Ku and 1B-Ka
 JAXA_filename_PATTERN = "{mission_id}_{sensor:s}_{start_date_time:%y%m%d%H%M}_{end_time:%H%M}_{granule_id}_{product_level:2s}{product_type}_{algorithm:s}_{version}.{data_format}"  # noqa
 
+# Precompiled regular expressions of the filename patterns (used by the bulk filename parser)
+NASA_RS_FILENAME_REGEX = re.compile(
+    r"^(?P<product_level>[^.]+)\.(?P<satellite>[^.]+)\.(?P<sensor>[^.]+)\.(?P<algorithm>[^.]+)\."
+    r"(?P<start_date>\d{8})-S(?P<start_time>\d{6})-E(?P<end_time>\d{6})\."
+    r"(?P<granule_id>[^.]+)\.(?P<version>[^.]+)\.(?P<data_format>.+)$",
+)
+NASA_NRT_FILENAME_REGEX = re.compile(
+    r"^(?P<product_level>[^.]+)\.(?P<satellite>[^.]+)\.(?P<sensor>[^.]+)\.(?P<algorithm>[^.]+)\."
+    r"(?P<start_date>\d{8})-S(?P<start_time>\d{6})-E(?P<end_time>\d{6})\."
+    r"(?P<version>[^.]+)\.(?P<data_format>.+)$",
+)
+JAXA_FILENAME_REGEX = re.compile(
+    r"^(?P<mission_id>[^_]+)_(?P<sensor>[^_]+)_(?P<start_date_time>\d{10})_(?P<end_time>\d{4})_"
+    r"(?P<granule_id>[^_]+)_(?P<product_level>[^_]{2})(?P<product_type>[^_]*)_(?P<algorithm>[^_]+)_"
+    r"(?P<version>[^.]+)\.(?P<data_format>.+)$",
+)
+
 
 ####---------------------------------------------------------------------------.
 ##########################
@@ -166,7 +184,183 @@ def get_key_from_filepaths(filepaths, key):
     """Extract specific key information from a list of filepaths."""
     if isinstance(filepaths, str):
         filepaths = [filepaths]
-    return [get_key_from_filepath(filepath, key=key) for filepath in filepaths]
+    if key not in FILE_KEYS:
+        return [get_key_from_filepath(filepath, key=key) for filepath in filepaths]
+    df = parse_filepaths(filepaths)
+    return _get_column_values(df, key)
+
+
+####--------------------------------------------------------------------------.
+##############################
+#### Bulk filename parser ####
+##############################
+
+
+def _to_pydatetime(values):
+    """Convert an array of ``numpy.datetime64`` into an object array of `datetime.datetime` (or ``None``)."""
+    return np.asarray(values, dtype="datetime64[us]").astype(object)
+
+
+def _get_column_values(df, key):
+    """Return a list with the python values of a ``parse_filepaths`` column."""
+    if key in ["start_time", "end_time"]:
+        return _to_pydatetime(df[key]).tolist()
+    return [None if pd.isna(value) else value for value in df[key].tolist()]
+
+
+def _extract(filenames, regex):
+    """Extract the regular expression groups of a filenames series.
+
+    Return a DataFrame with a row (with the ``filenames`` index) for each matched filename.
+    """
+    index = []
+    rows = []
+    for i, filename in filenames.items():
+        match = regex.match(filename)
+        if match is not None:
+            index.append(i)
+            rows.append(match.groups())
+    return pd.DataFrame(rows, index=index, columns=list(regex.groupindex), dtype=object)
+
+
+def _to_datetime(dates, times, date_format):
+    """Convert date strings and ``HHMM[SS]`` time strings to ``datetime64``.
+
+    Dates are parsed once per unique value, while time strings are converted arithmetically.
+    Invalid dates or times are returned as ``NaT``.
+    """
+    dates = pd.to_datetime(dates, format=date_format, errors="coerce", cache=True)
+    n_digits = times.str.len().max() if len(times) > 0 else 6
+    values = pd.to_numeric(times, errors="coerce") * 10 ** (6 - n_digits)
+    hours, minutes, seconds = values // 10000, values // 100 % 100, values % 100
+    is_valid = (hours < 24) & (minutes < 60) & (seconds < 60)
+    offsets = pd.to_timedelta(hours * 3600 + minutes * 60 + seconds, unit="s")
+    return (dates + offsets).where(is_valid)
+
+
+def _concat_dataframes(list_df):
+    """Concatenate the non-empty DataFrames, keeping the columns of the empty DataFrames."""
+    columns = list(dict.fromkeys(column for df in list_df for column in df.columns))
+    list_df = [df for df in list_df if len(df) > 0] or list_df[:1]
+    df = pd.concat(list_df) if len(list_df) > 1 else list_df[0]
+    return df.reindex(columns=columns)
+
+
+def _parse_nasa_filenames(filenames):
+    """Parse the NASA filenames (RS and NRT) into a DataFrame.
+
+    Unmatched filenames are not included in the returned DataFrame.
+    """
+    df_rs = _extract(filenames, NASA_RS_FILENAME_REGEX)
+    df_nrt = _extract(filenames[~filenames.index.isin(df_rs.index)], NASA_NRT_FILENAME_REGEX)
+    df_rs = df_rs[df_rs["granule_id"].str.isdigit()]
+    df_rs["product_type"] = "RS"
+    df_nrt["product_type"] = "NRT"
+    df = _concat_dataframes([df_rs, df_nrt])
+    # Retrieve correct start_time and end_time
+    start_time = _to_datetime(df["start_date"], df["start_time"], date_format="%Y%m%d")
+    end_time = _to_datetime(df["start_date"], df["end_time"], date_format="%Y%m%d")
+    end_time = end_time.where(end_time >= start_time, end_time + pd.Timedelta(days=1))
+    df["start_time"] = start_time
+    df["end_time"] = end_time
+    # Define the prefix used to infer the product
+    df["prefix"] = df["product_level"] + "." + df["satellite"] + "." + df["sensor"] + "." + df["algorithm"] + "."
+    return df.drop(columns="start_date")
+
+
+def _parse_jaxa_filenames(filenames):
+    """Parse the JAXA filenames into a DataFrame.
+
+    Unmatched filenames are not included in the returned DataFrame.
+    """
+    df = _extract(filenames, JAXA_FILENAME_REGEX)
+    df = df[df["granule_id"].str.isdigit() & df["product_type"].isin(["S", "R"])]
+    # Retrieve correct start_time and end_time
+    dates = df["start_date_time"].str[0:6]
+    start_time = _to_datetime(dates, df["start_date_time"].str[6:10], date_format="%y%m%d")
+    end_time = _to_datetime(dates, df["end_time"], date_format="%y%m%d")
+    end_time = end_time.where(end_time >= start_time, end_time + pd.Timedelta(days=1))
+    df["start_time"] = start_time
+    df["end_time"] = end_time
+    # Product type
+    df["product_type"] = df["product_type"].map({"S": "RS", "R": "NRT"})
+    # Infer satellite
+    df["satellite"] = None
+    df.loc[df["mission_id"].str.contains("GPM"), "satellite"] = "GPM"
+    df.loc[df["mission_id"].str.contains("TRMM"), "satellite"] = "TRMM"
+    # Define the prefix used to infer the product
+    df["prefix"] = df["mission_id"] + "_" + df["sensor"] + "_"
+    return df.drop(columns=["start_date_time", "mission_id"])
+
+
+def _get_product_from_prefix(prefix):
+    """Infer the ``product`` from the filename prefix. Return ``None`` if unknown."""
+    try:
+        return get_product_from_filepath(prefix)
+    except ValueError:
+        return None
+
+
+def parse_filepaths(filepaths, on_error="raise"):
+    """Extract the filename information of many filepaths in a single vectorized pass.
+
+    The filenames are parsed with precompiled regular expressions and the ``product``
+    is inferred only once for each distinct filename prefix.
+
+    Parameters
+    ----------
+    filepaths : list or str
+        List of filepaths or filenames.
+    on_error : str, optional
+        Either ``"raise"`` or ``"ignore"``.
+        If ``"raise"`` (the default), raise an error if a filename can not be parsed.
+        If ``"ignore"``, the information of the invalid filenames are set to missing values.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with a row for each filepath (in the input order) and the
+        ``filepath`` column plus a column for each key of ``gpm.io.info.FILE_KEYS``.
+        The ``start_time`` and ``end_time`` columns have ``datetime64[ns]`` dtype,
+        the ``granule_id`` column has ``Int64`` dtype (missing for NRT NASA products).
+
+    """
+    if on_error not in ["raise", "ignore"]:
+        raise ValueError("'on_error' must be either 'raise' or 'ignore'.")
+    if isinstance(filepaths, str):
+        filepaths = [filepaths]
+    filepaths = list(filepaths)
+    filenames = pd.Series([os.path.basename(filepath) for filepath in filepaths], dtype=object)
+
+    # Parse NASA filenames, then JAXA filenames
+    df_nasa = _parse_nasa_filenames(filenames)
+    df_jaxa = _parse_jaxa_filenames(filenames[~filenames.index.isin(df_nasa.index)])
+    df_info = _concat_dataframes([df_nasa, df_jaxa])
+
+    # Infer the product
+    prefixes = df_info["prefix"].unique()
+    products_dict = {prefix: _get_product_from_prefix(prefix) for prefix in prefixes}
+    df_info["product"] = df_info["prefix"].map(products_dict)
+
+    # Discard invalid filenames
+    is_valid = df_info["product"].notna() & df_info["start_time"].notna() & df_info["end_time"].notna()
+    df_info = df_info[is_valid]
+
+    # Build the output DataFrame with the input order
+    # - Missing values are NaN (or NaT)
+    df_info = df_info.reindex(filenames.index)
+    df = pd.DataFrame({"filepath": pd.Series(filepaths, dtype=object)})
+    for key in FILE_KEYS:
+        df[key] = df_info[key]
+    df["start_time"] = pd.to_datetime(df_info["start_time"])
+    df["end_time"] = pd.to_datetime(df_info["end_time"])
+    df["granule_id"] = pd.to_numeric(df_info["granule_id"]).astype("Int64")
+
+    # Raise error if invalid filenames
+    if on_error == "raise" and df["product"].isna().any():
+        filename = filenames[df["product"].isna()].iloc[0]
+        raise ValueError(f"Impossible to infer file information from '{filename}'")
+    return df
 
 
 ####--------------------------------------------------------------------------.
@@ -205,7 +399,10 @@ def get_version_from_filepaths(filepaths, integer=True):
     """Infer granules ``version`` from file paths."""
     if isinstance(filepaths, str):
         filepaths = [filepaths]
-    return [get_version_from_filepath(filepath, integer=integer) for filepath in filepaths]
+    versions = parse_filepaths(filepaths)["version"]
+    if integer:
+        versions = versions.str.extract(r"(\d+)", expand=False).astype(int)
+    return versions.tolist()
 
 
 def get_granule_from_filepaths(filepaths):
@@ -225,9 +422,8 @@ def get_end_time_from_filepaths(filepaths):
 
 def get_start_end_time_from_filepaths(filepaths):
     """Infer granules ``start_time`` and ``end_time`` from file paths."""
-    list_start_time = get_key_from_filepaths(filepaths, key="start_time")
-    list_end_time = get_key_from_filepaths(filepaths, key="end_time")
-    return np.array(list_start_time), np.array(list_end_time)
+    df = parse_filepaths(filepaths)
+    return _to_pydatetime(df["start_time"]), _to_pydatetime(df["end_time"])
 
 
 ####--------------------------------------------------------------------------.
@@ -281,7 +477,11 @@ def check_groups(groups):
 
 def get_season(time):
     """Get season from `datetime.datetime` or `datetime.date` object."""
-    month = time.month
+    return get_season_from_month(time.month)
+
+
+def get_season_from_month(month):
+    """Get season from month number."""
     if month in [12, 1, 2]:
         return "DJF"  # Winter (December, January, February)
     if month in [3, 4, 5]:
@@ -310,30 +510,52 @@ def get_time_component(time, component):
     return str(func_dict[component](time))
 
 
-def _get_groups_value(groups, filepath):
-    """Return the value associated to the groups keys.
+def get_time_components(times, component):
+    """Get time component from a `pandas.Series` of ``datetime64`` values.
+
+    Vectorized version of ``get_time_component``. It returns a `pandas.Series` of strings.
+    """
+    times = pd.Series(times).dt
+    func_dict = {
+        "year": lambda times: times.year,
+        "month": lambda times: times.month,
+        "day": lambda times: times.day,
+        "doy": lambda times: times.dayofyear,  # Day of year
+        "dow": lambda times: times.dayofweek,  # Day of week (0=Monday, 6=Sunday)
+        "hour": lambda times: times.hour,
+        "minute": lambda times: times.minute,
+        "second": lambda times: times.second,
+        # Additional
+        "month_name": lambda times: times.month_name(),  # Full month name
+        "quarter": lambda times: times.quarter,  # Quarter (1-4)
+        "season": lambda times: times.month.map(get_season_from_month),  # Season (DJF, MAM, JJA, SON)
+    }
+    return func_dict[component](times).astype(str)
 
-    If multiple keys are specified, the value returned is a string of format: ``<group_value_1>/<group_value_2>/...``
 
-    If a single key is specified and is ``start_time`` or ``end_time``, the function
-    returns a `datetime.datetime` object.
+def _get_groups_values(df, groups):
+    """Return the value associated to the groups keys for each row of a ``parse_filepaths`` DataFrame.
+
+    If multiple keys are specified, the values are strings of format: ``<group_value_1>/<group_value_2>/...``
+
+    If a single key is specified and is ``start_time`` or ``end_time``, the values
+    are `datetime.datetime` objects.
     """
     single_key = len(groups) == 1
-    info_dict = get_info_from_filepath(filepath)
-    start_time = info_dict["start_time"]
     list_key_values = []
     for key in groups:
         if key in TIME_KEYS:
-            list_key_values.append(get_time_component(start_time, component=key))
+            values = get_time_components(df["start_time"], component=key).tolist()
         else:
-            value = info_dict.get(key, f"{key}=None")
-            list_key_values.append(value if single_key else str(value))
+            values = _get_column_values(df, key)
+            values = [f"{key}=None" if value is None else value for value in values]
+        list_key_values.append(values if single_key else [str(value) for value in values])
     if single_key:
         return list_key_values[0]
-    return "/".join(list_key_values)
+    return ["/".join(key_values) for key_values in zip(*list_key_values)]
 
 
-def group_filepaths(filepaths, groups=None):
+def group_filepaths(filepaths, groups=None, info=None):
     """
     Group filepaths in a dictionary if groups are specified.
 
@@ -351,6 +573,9 @@ def group_filepaths(filepaths, groups=None):
         The time components are extracted from ``start_time`` !
         If groups is ``None`` returns the input filepaths list.
         The default is ``None``.
+    info : pandas.DataFrame, optional
+        DataFrame with the file information of each filepath, as returned by ``parse_filepaths``.
+        If ``None`` (the default), the file information are extracted from the filepaths.
 
     Returns
     -------
@@ -362,6 +587,13 @@ def group_filepaths(filepaths, groups=None):
     if groups is None:
         return filepaths
     groups = check_groups(groups)
+    if len(filepaths) == 0:
+        return {}
+    if info is None:
+        info = parse_filepaths(filepaths)
     filepaths_dict = defaultdict(list)
-    _ = [filepaths_dict[_get_groups_value(groups, filepath)].append(filepath) for filepath in filepaths]
+    _ = [
+        filepaths_dict[value].append(filepath)
+        for value, filepath in zip(_get_groups_values(info, groups), filepaths)
+    ]
     return dict(filepaths_dict)
@@ -0,0 +1,335 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module implements a concurrent lister of the remote NASA PPS and GES DISC directories.
+
+The ``curl`` based routines of ``gpm.io.pps`` and ``gpm.io.ges_disc`` spawn a new process,
+and open a new connection, for every daily directory to list. When searching the files of a
+long time period, thousands of directories must be listed, and the same directories are listed
+again at every new search.
+
+``get_listings`` lists many directories concurrently with ``asyncio``. The requests are sent over
+a shared pool of persistent HTTP(S) connections and the number of requests in flight is limited
+by ``max_concurrency``. The directory listings are cached in a SQLite database at
+``<base_dir>/GPM/listing_cache.sqlite`` together with an expiry time depending on the listed day:
+
+- the listings of finalized ``RS`` days are kept for a long time (``FINALIZED_TTL``),
+- the listings of recent ``RS`` days are kept for a short time (``RECENT_TTL``),
+- the listings of ``NRT`` directories are refreshed frequently (``NRT_TTL``).
+
+A ``RS`` day is considered finalized ``FINALIZED_DELAY`` after the publication latency of the
+product (see ``PRODUCTS_LATENCY``). The missing (``404``) or empty directory listings are
+never kept longer than ``RECENT_TTL``, as the files of the day might be published later.
+
+The on-disk cache is used only if the ``use_listing_cache`` configuration option is enabled.
+The listings retrieved by ``get_listings`` are made available to the ``curl`` based routines
+within the ``use_listings`` context manager.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import datetime
+import os
+import sqlite3
+import time
+
+import gpm
+from gpm.io.transfer import HTTPConnectionPool
+
+LISTING_CACHE_FILENAME = "listing_cache.sqlite"
+MAX_CONCURRENCY = 16
+NRT_TTL = 10 * 60
+RECENT_TTL = 60 * 60
+FINALIZED_TTL = 30 * 24 * 60 * 60
+FINALIZED_DELAY = datetime.timedelta(days=7)
+CACHEABLE_STATUS = (200, 404)
+# Publication latency of the RS products published later than a few days after the acquisition
+# - IMERG-FR is published about 3.5 months after the end of the month
+PRODUCTS_LATENCY = {
+    "IMERG-FR": datetime.timedelta(days=150),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    url TEXT NOT NULL PRIMARY KEY,
+    content TEXT NOT NULL,
+    expiry REAL NOT NULL
+);
+"""
+
+_LISTINGS = contextvars.ContextVar("listings", default=None)
+
+
+def get_finalized_delay(product=None):
+    """Return the delay after which the ``RS`` directory listings of a product are considered finalized."""
+    return FINALIZED_DELAY + PRODUCTS_LATENCY.get(product, datetime.timedelta(0))
+
+
+def get_listing_ttl(product_type, date, product=None):
+    """Return the number of seconds the listing of a daily directory can be cached.
+
+    Parameters
+    ----------
+    product_type : str
+        GPM product type. Either ``RS`` (Research) or ``NRT`` (Near-Real-Time).
+    date : `datetime.date`
+        Date of the listed directory.
+    product : str, optional
+        GPM product acronym. It defines the publication latency of the product.
+        The default is ``None``.
+
+    Returns
+    -------
+    ttl : int
+        Time to live of the directory listing in seconds.
+
+    """
+    if product_type == "NRT":
+        return NRT_TTL
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    if date >= today - get_finalized_delay(product):
+        return RECENT_TTL
+    return FINALIZED_TTL
+
+
+####--------------------------------------------------------------------------.
+########################
+#### SQLite storage ####
+########################
+
+
+def get_listing_cache_filepath(base_dir=None):
+    """Return the filepath of the directory listings cache."""
+    from gpm.configs import get_base_dir
+    from gpm.io.checks import check_base_dir
+
+    base_dir = get_base_dir(base_dir=base_dir)
+    base_dir = check_base_dir(base_dir)
+    return os.path.join(base_dir, "GPM", LISTING_CACHE_FILENAME)
+
+
+@contextlib.contextmanager
+def _connect():
+    """Open a connection to the listings cache and commit the changes on exit.
+
+    If the cache is disabled or the GPM base directory is not specified, ``None`` is returned.
+    """
+    if not gpm.config.get("use_listing_cache"):
+        yield None
+        return
+    try:
+        filepath = get_listing_cache_filepath()
+    except ValueError:
+        yield None
+        return
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    con = sqlite3.connect(filepath, timeout=60)
+    try:
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def get_cached_listings(urls):
+    """Return a dictionary with the non-expired cached listings of the specified urls."""
+    with _connect() as con:
+        if con is None:
+            return {}
+        now = time.time()
+        listings = {}
+        for url in urls:
+            row = con.execute("SELECT content FROM listings WHERE url = ? AND expiry > ?", (url, now)).fetchone()
+            if row is not None:
+                listings[url] = row[0]
+    return listings
+
+
+def cache_listings(listings, ttls):
+    """Cache the listings of the specified urls for ``ttls[url]`` seconds."""
+    with _connect() as con:
+        if con is None:
+            return
+        now = time.time()
+        con.executemany(
+            "INSERT OR REPLACE INTO listings VALUES (?, ?, ?)",
+            [(url, content, now + ttls[url]) for url, content in listings.items()],
+        )
+
+
+def clear_listing_cache():
+    """Remove all the cached directory listings."""
+    with _connect() as con:
+        if con is not None:
+            con.execute("DELETE FROM listings")
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Concurrent lister ###
+##########################
+
+
+def _fetch_listing(pool, url):
+    """Return the HTTP status and the content of a directory listing."""
+    response = pool.open(url, raise_for_status=False)
+    return response.status, response.read().decode()
+
+
+async def _fetch_listings(pool, urls, max_concurrency):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # The executor threads own the pooled connections: each connection is reused across requests
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        async def fetch(url):
+            async with semaphore:
+                return await loop.run_in_executor(executor, _fetch_listing, pool, url)
+
+        results = await asyncio.gather(*[fetch(url) for url in urls], return_exceptions=True)
+    return dict(zip(urls, results))
+
+
+def _run_coroutine(coroutine):
+    """Run a coroutine to completion, also when called from a running event loop (i.e. Jupyter)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def fetch_listings(urls, username=None, password=None, auth_hosts=(), max_concurrency=MAX_CONCURRENCY):
+    """List concurrently the content of remote directories.
+
+    Parameters
+    ----------
+    urls : list
+        Urls of the directories to list.
+    username : str, optional
+        Username sent with HTTP Basic authentication.
+    password : str, optional
+        Password sent with HTTP Basic authentication.
+    auth_hosts : tuple, optional
+        Hostnames to which the credentials are sent without waiting for an authentication challenge.
+    max_concurrency : int, optional
+        Maximum number of concurrent requests. The default is ``16``.
+
+    Returns
+    -------
+    results : dict
+        Dictionary with the ``(status, content)`` of each listed url.
+        The urls which could not be listed because of a connection error are not included.
+
+    """
+    urls = list(dict.fromkeys(urls))
+    if len(urls) == 0:
+        return {}
+    pool = HTTPConnectionPool(username=username, password=password, auth_hosts=auth_hosts)
+    try:
+        results = _run_coroutine(_fetch_listings(pool, urls=urls, max_concurrency=max_concurrency))
+    finally:
+        pool.close()
+    return {url: result for url, result in results.items() if not isinstance(result, Exception)}
+
+
+def get_listings(urls, ttls, username=None, password=None, auth_hosts=(), max_concurrency=MAX_CONCURRENCY):
+    """Return the content of remote directories, using the listings cache when possible.
+
+    The directories which are not cached (or whose cached listing expired) are listed
+    concurrently with ``fetch_listings``. The successful listings are then cached
+    for ``ttls[url]`` seconds. The missing (``404``) or empty listings are cached for
+    at most ``RECENT_TTL`` seconds.
+
+    Parameters
+    ----------
+    urls : list
+        Urls of the directories to list.
+    ttls : dict
+        Time to live (in seconds) of the listing of each url. See ``get_listing_ttl``.
+    username : str, optional
+        Username sent with HTTP Basic authentication.
+    password : str, optional
+        Password sent with HTTP Basic authentication.
+    auth_hosts : tuple, optional
+        Hostnames to which the credentials are sent without waiting for an authentication challenge.
+    max_concurrency : int, optional
+        Maximum number of concurrent requests. The default is ``16``.
+
+    Returns
+    -------
+    listings : dict
+        Dictionary with the content of each listed url.
+        The urls which could not be listed are not included.
+
+    """
+    listings = get_cached_listings(urls)
+    results = fetch_listings(
+        [url for url in urls if url not in listings],
+        username=username,
+        password=password,
+        auth_hosts=auth_hosts,
+        max_concurrency=max_concurrency,
+    )
+    # Do not cache transient errors (i.e. authentication errors or unavailable server)
+    results_to_cache = {url: result for url, result in results.items() if result[0] in CACHEABLE_STATUS}
+    # Do not cache for long the missing or empty listings (the files might be published later)
+    cache_ttls = {
+        url: ttls[url] if status == 200 and content.strip() != "" else min(ttls[url], RECENT_TTL)
+        for url, (status, content) in results_to_cache.items()
+    }
+    cache_listings({url: content for url, (_, content) in results_to_cache.items()}, ttls=cache_ttls)
+    listings.update({url: content for url, (_, content) in results.items()})
+    return listings
+
+
+@contextlib.contextmanager
+def use_listings(listings):
+    """Make the specified directory listings available to ``get_listing`` within the context."""
+    token = _LISTINGS.set(listings)
+    try:
+        yield
+    finally:
+        _LISTINGS.reset(token)
+
+
+def get_listing(url):
+    """Return the available listing of a remote directory.
+
+    The listings provided within the ``use_listings`` context are used first,
+    then the non-expired cached listings.
+    ``None`` is returned if the directory listing is not available.
+    """
+    listings = _LISTINGS.get()
+    if listings is not None and url in listings:
+        return listings[url]
+    return get_cached_listings([url]).get(url)
@@ -25,12 +25,15 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains functions defining where to download GPM data on the local machine."""
+
 import os
 import re
 
+import gpm
 from gpm.configs import get_base_dir
 from gpm.io.checks import check_base_dir
 from gpm.io.products import get_product_category
+from gpm.io.transfer import is_part_filepath
 from gpm.utils.directories import list_files
 
 ####--------------------------------------------------------------------------.
@@ -212,8 +215,9 @@ def get_local_daily_filepaths(product, product_type, date, version, base_dir=Non
     if not os.path.exists(dir_path):
         return []
 
-    # Retrieve the file names in the directory
+    # Retrieve the file names in the directory (excluding partial downloads)
     filenames = sorted(os.listdir(dir_path))  # returns [] if empty
+    filenames = [filename for filename in filenames if not is_part_filepath(filename)]
 
     # Retrieve the filepaths
     return [os.path.join(dir_path, filename) for filename in filenames]
@@ -299,6 +303,12 @@ def get_local_filepaths(product, version=7, product_type="RS", base_dir=None, gr
         If groups is ``None`` returns the filepaths list.
         The default is ``None``.
 
+    Notes
+    -----
+    If ``gpm.config.get("use_local_catalog")`` is ``True``, the filepaths are retrieved
+    from the local granules catalog (see ``gpm.catalog``). In such case, only the
+    files with a valid GPM filename are returned.
+
     """
     from gpm.io.info import group_filepaths
 
@@ -306,6 +316,18 @@ def get_local_filepaths(product, version=7, product_type="RS", base_dir=None, gr
     base_dir = get_base_dir(base_dir=base_dir)
     base_dir = check_base_dir(base_dir)
 
+    # Retrieve the filepaths from the local granules catalog if asked
+    if gpm.config.get("use_local_catalog"):
+        from gpm.io.catalog import get_filepaths
+
+        return get_filepaths(
+            product=product,
+            product_type=product_type,
+            version=version,
+            base_dir=base_dir,
+            groups=groups,
+        )
+
     # Retrieve the local directory where the data are stored
     product_dir = _get_local_product_base_directory(
         base_dir=base_dir,
@@ -320,7 +342,7 @@ def get_local_filepaths(product, version=7, product_type="RS", base_dir=None, gr
 
     # Retrieve the filepaths
     filepaths = list_files(product_dir, glob_pattern="*", recursive=True)
-    filepaths = sorted(filepaths)
+    filepaths = sorted(filepath for filepath in filepaths if not is_part_filepath(filepath))
 
     # Group filepaths if groups is not None
     return group_filepaths(filepaths, groups=groups)
@@ -0,0 +1,294 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module implements a pipeline downloading, verifying and processing GPM files concurrently.
+
+Each file goes through the following stages:
+
+- download, in a pool of ``n_threads`` threads (or in an adaptive pool if ``n_threads="auto"``),
+- integrity verification, in a separate pool of threads, as soon as the file is downloaded,
+- an optional user-defined callback (i.e. ingestion into a bucket archive), as soon as the file is valid.
+
+Files which fail to download or are corrupted are put back in the download queue
+after an exponential backoff delay. The wall-clock time of the pipeline therefore
+approaches the time of its slowest stage instead of the sum of the stages.
+"""
+
+import collections
+import contextlib
+import functools
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from gpm.io.data_integrity import get_file_corruption, record_files_integrity
+from gpm.utils.parallel import AIMDController
+from gpm.utils.warnings import GPMDownloadWarning
+
+
+class _PipelineItem:
+    """File travelling through the pipeline."""
+
+    def __init__(self, index, remote_filepath, local_filepath):
+        self.index = index
+        self.remote_filepath = remote_filepath
+        self.local_filepath = local_filepath
+        self.attempt = 1
+
+
+class DownloadPipeline:
+    """Download, verify and process files concurrently.
+
+    Parameters
+    ----------
+    download_function : callable
+        Function ``download_function(remote_filepath, local_filepath)`` downloading a single file.
+        It must raise an error if the download fails.
+    n_threads : int or str, optional
+        Number of parallel downloads. The default is 4.
+        If ``"auto"``, the number of parallel downloads is adapted to the measured throughput.
+    check_integrity : bool, optional
+        Whether to check the integrity of the downloaded files. The default is ``True``.
+    remove_corrupted : bool, optional
+        Whether to remove the corrupted files. The default is ``True``.
+    retry : int, optional
+        Number of attempts to redownload the failed or corrupted files. The default is 1.
+    backoff : float, optional
+        Delay in seconds before the first retry of a file. The delay doubles at every retry.
+        The default is 1.
+    callback : callable, optional
+        Function called with the local file path of every downloaded (and valid) file.
+        The default is ``None``.
+    n_verify_threads : int, optional
+        Number of threads checking the files integrity. The default is 2.
+    n_callback_threads : int, optional
+        Number of threads executing the callback. The default is 1.
+    progress_bar : bool, optional
+        Whether to display the progress. The default is ``False``.
+
+    """
+
+    def __init__(
+        self,
+        download_function,
+        n_threads=4,
+        check_integrity=True,
+        remove_corrupted=True,
+        retry=1,
+        backoff=1,
+        callback=None,
+        n_verify_threads=2,
+        n_callback_threads=1,
+        progress_bar=False,
+    ):
+        self.download_function = download_function
+        self.check_integrity = check_integrity
+        self.remove_corrupted = remove_corrupted
+        self.retry = retry
+        self.backoff = backoff
+        self.callback = callback
+        if n_threads == "auto":
+            self.controller = AIMDController(min_workers=1, max_workers=10, initial_workers=2)
+            max_download_threads = self.controller.max_workers
+        else:
+            self.controller = None
+            self.n_threads = min(max(n_threads, 1), 10)
+            max_download_threads = self.n_threads
+        self._download_executor = ThreadPoolExecutor(max_workers=max_download_threads)
+        self._verify_executor = ThreadPoolExecutor(max_workers=n_verify_threads)
+        self._callback_executor = ThreadPoolExecutor(max_workers=n_callback_threads)
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._queue = collections.deque()
+        self._n_running_downloads = 0
+        self._n_pending = 0
+        self._timers = []
+        self.status = []
+        self.local_filepaths = []
+        self.integrity = {}
+        self._unrecorded_integrity = {}
+        self.callback_errors = {}
+        self._pbar = None
+        if progress_bar:
+            from tqdm import tqdm
+
+            self._pbar = tqdm(total=0)
+
+    ####----------------------------------------------------------------------.
+    #### Queue management
+
+    @property
+    def _max_downloads(self):
+        return self.controller.n_workers if self.controller is not None else self.n_threads
+
+    def submit(self, remote_filepaths, local_filepaths):
+        """Add files to the download queue."""
+        with self._lock:
+            for remote_filepath, local_filepath in zip(remote_filepaths, local_filepaths):
+                self._queue.append(_PipelineItem(len(self.status), remote_filepath, local_filepath))
+                self.status.append(0)
+                self.local_filepaths.append(local_filepath)
+                self._n_pending += 1
+            if self._pbar is not None:
+                self._pbar.total = len(self.status)
+                self._pbar.refresh()
+        self._dispatch()
+
+    def _dispatch(self):
+        """Submit the queued downloads up to the number of parallel downloads."""
+        submitted = []
+        with self._lock:
+            while self._queue and self._n_running_downloads < self._max_downloads:
+                item = self._queue.popleft()
+                self._n_running_downloads += 1
+                submitted.append((item, self._download_executor.submit(self._download, item)))
+        # The callback is executed immediately (with the lock released) if the download already completed
+        for item, future in submitted:
+            future.add_done_callback(functools.partial(self._on_downloaded, item))
+
+    def _requeue(self, item):
+        with self._lock:
+            self._queue.append(item)
+        self._dispatch()
+
+    ####----------------------------------------------------------------------.
+    #### Stages
+
+    def _download(self, item):
+        self.download_function(item.remote_filepath, item.local_filepath)
+        return os.path.getsize(item.local_filepath)
+
+    def _on_downloaded(self, item, future):
+        error = future.exception() is not None
+        with self._lock:
+            self._n_running_downloads -= 1
+            if self.controller is not None:
+                self.controller.update(amount=0 if error else future.result(), error=error)
+        self._dispatch()
+        if error:
+            self._on_failure(item)
+        elif self.check_integrity:
+            future = self._verify_executor.submit(get_file_corruption, item.local_filepath)
+            future.add_done_callback(functools.partial(self._on_verified, item))
+        else:
+            self._on_success(item)
+
+    def _on_verified(self, item, future):
+        corruption = future.result() if future.exception() is None else f"failed check ({future.exception()})"
+        with self._lock:
+            self.integrity[item.local_filepath] = corruption
+            self._unrecorded_integrity[item.local_filepath] = corruption
+        if corruption is None:
+            self._on_success(item)
+            return
+        if self.remove_corrupted:
+            with contextlib.suppress(OSError):
+                os.remove(item.local_filepath)
+        self._on_failure(item)
+
+    def _on_success(self, item):
+        with self._lock:
+            self.status[item.index] = 1
+        if self.callback is None:
+            self._on_completed()
+            return
+        future = self._callback_executor.submit(self.callback, item.local_filepath)
+        future.add_done_callback(functools.partial(self._on_callback_completed, item))
+
+    def _on_callback_completed(self, item, future):
+        if future.exception() is not None:
+            with self._lock:
+                self.callback_errors[item.local_filepath] = future.exception()
+        self._on_completed()
+
+    def _on_failure(self, item):
+        """Put the file back in the download queue after a backoff delay, or mark it as failed."""
+        if item.attempt > self.retry:
+            self._on_completed()
+            return
+        delay = self.backoff * 2 ** (item.attempt - 1)
+        item.attempt += 1
+        timer = threading.Timer(delay, self._requeue, args=(item,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.append(timer)
+        timer.start()
+
+    def _on_completed(self):
+        with self._lock:
+            self._n_pending -= 1
+            if self._pbar is not None:
+                self._pbar.update(1)
+            self._done.notify_all()
+
+    ####----------------------------------------------------------------------.
+    #### Results
+
+    def join(self):
+        """Wait for all the submitted files to go through the pipeline and return their status.
+
+        Returns
+        -------
+        status : list
+            Status of each file. 0=Failed (or corrupted). 1=Success.
+
+        """
+        with self._lock:
+            self._done.wait_for(lambda: self._n_pending == 0)
+        if self.check_integrity:
+            record_files_integrity(self._unrecorded_integrity)
+            self._unrecorded_integrity = {}
+        if len(self.callback_errors) > 0:
+            msg = f"The callback failed for {len(self.callback_errors)} files: {self.callback_errors}"
+            warnings.warn(msg, GPMDownloadWarning, stacklevel=2)
+        return list(self.status)
+
+    @property
+    def failed_filepaths(self):
+        """Local file paths of the files which could not be downloaded (or are corrupted)."""
+        return [filepath for filepath, status in zip(self.local_filepaths, self.status) if status == 0]
+
+    @property
+    def corrupted_filepaths(self):
+        """Local file paths of the failed files whose last integrity check reported a corruption."""
+        return [filepath for filepath in self.failed_filepaths if self.integrity.get(filepath) is not None]
+
+    def close(self):
+        """Shut down the pipeline threads."""
+        with self._lock:
+            for timer in self._timers:
+                timer.cancel()
+        self._download_executor.shutdown(wait=True)
+        self._verify_executor.shutdown(wait=True)
+        self._callback_executor.shutdown(wait=True)
+        if self._pbar is not None:
+            self._pbar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -25,6 +25,7 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains the routines required to search data on the NASA PPS servers."""
+
 import datetime
 import subprocess
 
@@ -36,6 +37,7 @@ from gpm.io.checks import (
     check_product_validity,
     check_product_version,
 )
+from gpm.io.listing import get_listing
 from gpm.io.products import available_products, get_product_info
 
 ####--------------------------------------------------------------------------.
@@ -226,20 +228,28 @@ def get_pps_product_directory(product, product_type, date, version, server_type)
 ############################
 
 
-def _try_get_pps_file_list(url_product_dir):
+def _get_pps_url_content(url_product_dir):
     # Retrieve GPM-API configs
     username = get_username_pps()
     password = get_password_pps()
-    # Ensure url_file_list ends with "/"
-    if url_product_dir[-1] != "/":
-        url_product_dir = url_product_dir + "/"
     # Define curl command
     # -k is required with curl > 7.71 otherwise results in "unauthorized access".
     cmd = f"curl -k --user {username}:{password} {url_product_dir}"
     # Run command
     args = cmd.split()
     process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout = process.communicate()[0].decode()
+    return process.communicate()[0].decode()
+
+
+def _try_get_pps_file_list(url_product_dir):
+    # Ensure url_file_list ends with "/"
+    if url_product_dir[-1] != "/":
+        url_product_dir = url_product_dir + "/"
+    # Retrieve the directory listing
+    # - Use the listing retrieved by the concurrent lister or cached, if available
+    stdout = get_listing(url_product_dir)
+    if stdout is None:
+        stdout = _get_pps_url_content(url_product_dir)
     # Check if server is available
     if stdout == "":
         raise ValueError("The PPS server is currently unavailable. Sorry for the inconvenience.")
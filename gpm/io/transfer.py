@@ -0,0 +1,454 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module implements a pure-python transfer backend reusing server connections across files.
+
+The ``curl`` and ``wget`` backends spawn a new process, and open a new connection,
+for every file to download. When downloading many small granules (i.e. NRT products),
+the connection and authentication handshakes dominate the transfer time.
+
+The ``TransferSession`` keeps, for each worker thread, a pool of open HTTP(S)
+connections and logged-in FTP(S) control connections that are reused for all the
+files served by the same host. Each file is streamed to a ``<filepath>.part`` file
+which is atomically renamed to ``<filepath>`` once the transfer is completed.
+
+The expected size of a file being downloaded is recorded in ``<filepath>.part.size``.
+An interrupted transfer is resumed from the end of the ``.part`` file using the
+HTTP ``Range`` header or the FTP ``REST`` command. The transfer restarts from scratch
+if the size of the remote file changed in the meantime.
+"""
+
+import base64
+import contextlib
+import ftplib
+import functools
+import http.client
+import http.cookiejar
+import ipaddress
+import os
+import threading
+import urllib.parse
+import urllib.request
+
+PART_SUFFIX = ".part"
+SIZE_SUFFIX = ".size"
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60
+MAX_REDIRECTS = 10
+REDIRECT_STATUS = (301, 302, 303, 307, 308)
+EARTHDATA_LOGIN_HOST = "urs.earthdata.nasa.gov"
+
+
+def get_part_filepath(filepath):
+    """Return the path of the temporary file used while downloading ``filepath``."""
+    return filepath + PART_SUFFIX
+
+
+def is_part_filepath(filepath):
+    """Return ``True`` if ``filepath`` is a temporary file of an ongoing or interrupted download."""
+    return filepath.endswith((PART_SUFFIX, PART_SUFFIX + SIZE_SUFFIX))
+
+
+def get_part_size_filepath(filepath):
+    """Return the path of the file recording the expected size of ``filepath`` while downloading."""
+    return get_part_filepath(filepath) + SIZE_SUFFIX
+
+
+def read_expected_size(filepath):
+    """Return the expected size of a file being downloaded (or ``None`` if unknown)."""
+    try:
+        with open(get_part_size_filepath(filepath)) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _record_expected_size(filepath, size):
+    """Record (or forget if ``None``) the expected size of a file being downloaded."""
+    size_filepath = get_part_size_filepath(filepath)
+    if size is None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(size_filepath)
+        return
+    with open(size_filepath, "w") as f:
+        f.write(str(size))
+
+
+def _clear_part_files(filepath):
+    """Remove the ``.part`` and ``.part.size`` files of ``filepath``."""
+    for part_filepath in [get_part_filepath(filepath), get_part_size_filepath(filepath)]:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part_filepath)
+
+
+def _parse_content_range(content_range):
+    """Return the first byte position and the complete length of a ``Content-Range`` header."""
+    try:
+        _, _, value = content_range.partition(" ")
+        byte_range, _, length = value.partition("/")
+        return int(byte_range.split("-")[0]), int(length)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def _is_loopback_host(hostname):
+    """Return ``True`` if the hostname refers to the local machine."""
+    if hostname == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        return False
+
+
+def _split_url(url):
+    """Return the scheme, the network location and the path (with query) of an URL."""
+    parsed = urllib.parse.urlsplit(url)
+    path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+    return parsed.scheme.lower(), parsed.netloc, path
+
+
+####--------------------------------------------------------------------------.
+#########################
+#### Connection pools ###
+#########################
+
+
+class _ConnectionPool:
+    """Pool of open connections, kept per thread and per server.
+
+    Connections are not thread-safe: each worker thread owns its connections.
+    All opened connections are registered so that they can be closed at once.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self.n_connections = 0
+
+    def _get_thread_connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _connect(self, scheme, netloc):
+        raise NotImplementedError
+
+    @staticmethod
+    def _close(connection):
+        connection.close()
+
+    def get(self, scheme, netloc):
+        """Return an open connection to ``<scheme>://<netloc>`` owned by the current thread."""
+        connections = self._get_thread_connections()
+        key = (scheme, netloc)
+        if key not in connections:
+            connection = self._connect(scheme, netloc)
+            connections[key] = connection
+            with self._lock:
+                self._connections.append(connection)
+                self.n_connections += 1
+        return connections[key]
+
+    def discard(self, scheme, netloc):
+        """Close and forget the connection to ``<scheme>://<netloc>`` of the current thread."""
+        connection = self._get_thread_connections().pop((scheme, netloc), None)
+        if connection is not None:
+            with self._lock:
+                self._connections.remove(connection)
+            self._close(connection)
+
+    def close(self):
+        """Close all connections opened by the pool."""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for connection in connections:
+            with contextlib.suppress(Exception):
+                self._close(connection)
+        self._local = threading.local()
+
+
+class HTTPConnectionPool(_ConnectionPool):
+    """Pool of persistent HTTP(S) connections.
+
+    Redirections are followed and cookies are shared across all connections.
+    The HTTP Basic credentials are sent to the ``auth_hosts`` (by default the NASA EarthData
+    login server) and to the host of the requested URL if it answers with a ``401``
+    authentication challenge. The credentials are never sent to the other hosts reached
+    through a redirection, nor over plain HTTP (except to the local machine).
+    """
+
+    def __init__(self, username=None, password=None, auth_hosts=(EARTHDATA_LOGIN_HOST,)):
+        super().__init__()
+        self.cookiejar = http.cookiejar.CookieJar()
+        self.auth_hosts = set(auth_hosts)
+        self._authorization = None
+        if username is not None and password is not None:
+            credentials = base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
+            self._authorization = f"Basic {credentials}"
+
+    def _connect(self, scheme, netloc):
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=TIMEOUT)
+        return http.client.HTTPConnection(netloc, timeout=TIMEOUT)
+
+    def _send(self, url, authenticate, offset=0):
+        """Send a GET request over a pooled connection and return the response."""
+        scheme, netloc, path = _split_url(url)
+        request = urllib.request.Request(url)
+        if offset > 0:
+            request.add_header("Range", f"bytes={offset}-")
+        if authenticate:
+            request.add_header("Authorization", self._authorization)
+        self.cookiejar.add_cookie_header(request)
+        headers = {key: value for key, value in request.header_items() if value is not None}
+        # A kept-alive connection might have been closed by the server in the meantime
+        # --> Retry once with a new connection
+        for attempt in range(2):
+            connection = self.get(scheme, netloc)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                break
+            except (http.client.HTTPException, OSError):
+                self.discard(scheme, netloc)
+                if attempt == 1:
+                    raise
+        self.cookiejar.extract_cookies(response, request)
+        return response
+
+    def _can_authenticate(self, url, origin_hostname):
+        """Return ``True`` if the credentials can be sent to ``url``.
+
+        The credentials are sent only over HTTPS (or to the local machine), to the ``auth_hosts``
+        and to the host ``origin_hostname`` of the URL requested by the caller.
+        """
+        if self._authorization is None:
+            return False
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme.lower() != "https" and not _is_loopback_host(parts.hostname):
+            return False
+        return parts.hostname in self.auth_hosts or parts.hostname == origin_hostname
+
+    def open(self, url, offset=0, raise_for_status=True):
+        """Open an URL and return the HTTP response of the requested resource.
+
+        If ``offset > 0``, the content is requested from the byte ``offset``.
+        The server answers with a ``206`` status if it supports range requests, ``200`` otherwise.
+        If ``raise_for_status=False``, the response is returned whatever its status.
+        The response body must be read entirely before the next request.
+        """
+        origin_hostname = urllib.parse.urlsplit(url).hostname
+        authenticate = False
+        for _ in range(MAX_REDIRECTS):
+            # The credentials are sent to the auth_hosts without waiting for an authentication challenge
+            if urllib.parse.urlsplit(url).hostname in self.auth_hosts:
+                authenticate = self._can_authenticate(url, origin_hostname)
+            response = self._send(url, authenticate=authenticate, offset=offset)
+            if response.status in REDIRECT_STATUS:
+                response.read()
+                url = urllib.parse.urljoin(url, response.getheader("Location"))
+                authenticate = False
+                continue
+            if response.status == 401 and not authenticate and self._can_authenticate(url, origin_hostname):
+                response.read()
+                authenticate = True
+                continue
+            if response.status not in (200, 206) and raise_for_status:
+                response.read()
+                raise OSError(f"HTTP error {response.status} ({response.reason}) for {url}.")
+            return response
+        raise OSError(f"Too many redirections for {url}.")
+
+    def retrieve(self, url, file, expected_size=None, on_size=None):
+        """Stream the content of an URL into an open binary file.
+
+        The content is appended to the file if ``expected_size`` matches the size of the remote file.
+        ``on_size`` is called with the size of the remote file (or ``None``) before the transfer starts.
+        """
+        offset = file.tell()
+        if expected_size is None or offset > expected_size:
+            offset = 0
+        elif offset == expected_size:
+            return
+        response = self.open(url, offset=offset)
+        size = expected_size
+        if response.status == 206 and _parse_content_range(response.getheader("Content-Range")) != (
+            offset,
+            expected_size,
+        ):
+            # The remote file changed since the transfer was interrupted
+            response.read()
+            offset = 0
+            response = self.open(url)
+        if response.status == 200:
+            offset = 0
+            content_length = response.getheader("Content-Length")
+            size = int(content_length) if content_length is not None else None
+        file.seek(offset)
+        file.truncate()
+        if on_size is not None:
+            on_size(size)
+        while chunk := response.read(CHUNK_SIZE):
+            file.write(chunk)
+
+
+class FTPConnectionPool(_ConnectionPool):
+    """Pool of logged-in FTP(S) control connections.
+
+    The ``ftps`` scheme uses explicit TLS with a protected data channel.
+    """
+
+    def __init__(self, username="anonymous", password=""):
+        super().__init__()
+        self.username = username
+        self.password = password
+
+    def _connect(self, scheme, netloc):
+        parsed = urllib.parse.urlsplit(f"//{netloc}")
+        ftp = ftplib.FTP_TLS() if scheme == "ftps" else ftplib.FTP()
+        ftp.connect(parsed.hostname, parsed.port or 21, timeout=TIMEOUT)
+        ftp.login(user=self.username, passwd=self.password)
+        if scheme == "ftps":
+            ftp.prot_p()  # Switch to secure data connection
+        return ftp
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    @staticmethod
+    def _get_size(connection, path):
+        """Return the size of a remote file (or ``None`` if the server does not support ``SIZE``)."""
+        connection.voidcmd("TYPE I")
+        try:
+            return connection.size(path)
+        except ftplib.error_perm:
+            return None
+
+    def retrieve(self, url, file, expected_size=None, on_size=None):
+        """Stream the content of an URL into an open binary file.
+
+        The content is appended to the file if ``expected_size`` matches the size of the remote file.
+        ``on_size`` is called with the size of the remote file (or ``None``) before the transfer starts.
+        """
+        scheme, netloc, path = _split_url(url)
+        # A control connection might have timed out since the last transfer
+        # --> Retry once with a new connection (permanent errors are not retried)
+        for attempt in range(2):
+            connection = self.get(scheme, netloc)
+            try:
+                size = self._get_size(connection, path)
+                if size is None or size != expected_size or file.tell() > size:
+                    file.seek(0)
+                    file.truncate()
+                expected_size = size
+                if on_size is not None:
+                    on_size(size)
+                offset = file.tell()
+                if offset > 0 and offset == size:
+                    return
+                connection.retrbinary(f"RETR {path}", file.write, blocksize=CHUNK_SIZE, rest=offset or None)
+                return
+            except (ftplib.error_temp, ftplib.error_reply, EOFError, OSError):
+                self.discard(scheme, netloc)
+                if attempt == 1:
+                    raise
+
+
+####--------------------------------------------------------------------------.
+##########################
+#### Transfer session ####
+##########################
+
+
+class TransferSession:
+    """Download files over HTTP(S) and FTP(S) reusing the server connections.
+
+    The session can be shared across the threads of a thread pool.
+    Use it as a context manager to ensure that all connections are closed.
+    """
+
+    def __init__(self, username=None, password=None):
+        self.http = HTTPConnectionPool(username=username, password=password)
+        self.ftp = FTPConnectionPool(username=username, password=password)
+
+    @property
+    def n_connections(self):
+        """Number of connections opened by the session."""
+        return self.http.n_connections + self.ftp.n_connections
+
+    def _get_pool(self, url):
+        scheme = urllib.parse.urlsplit(url).scheme.lower()
+        if scheme in ("ftp", "ftps"):
+            return self.ftp
+        if scheme in ("http", "https"):
+            return self.http
+        raise ValueError(f"Unsupported URL scheme '{scheme}' for {url}.")
+
+    def download(self, remote_filepath, local_filepath):
+        """Download a remote file to ``local_filepath``.
+
+        The data are first written to ``<local_filepath>.part``, which is renamed
+        to ``local_filepath`` only once the download is completed.
+        If the ``.part`` file of an interrupted download exists, the download is resumed.
+        """
+        pool = self._get_pool(remote_filepath)
+        os.makedirs(os.path.dirname(local_filepath) or ".", exist_ok=True)
+        part_filepath = get_part_filepath(local_filepath)
+        on_size = functools.partial(_record_expected_size, local_filepath)
+        try:
+            with open(part_filepath, "ab") as f:
+                pool.retrieve(remote_filepath, f, expected_size=read_expected_size(local_filepath), on_size=on_size)
+        except BaseException:
+            # Keep the partial download to resume it later
+            if os.path.getsize(part_filepath) == 0:
+                _clear_part_files(local_filepath)
+            raise
+        file_size = os.path.getsize(part_filepath)
+        expected_size = read_expected_size(local_filepath)
+        if expected_size is not None and file_size != expected_size:
+            raise OSError(
+                f"Incomplete download of {remote_filepath} (expected {expected_size} bytes, found {file_size} bytes).",
+            )
+        os.replace(part_filepath, local_filepath)
+        _clear_part_files(local_filepath)
+        return local_filepath
+
+    def close(self):
+        """Close all connections of the session."""
+        self.http.close()
+        self.ftp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
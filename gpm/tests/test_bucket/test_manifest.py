@@ -0,0 +1,198 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module tests the bucket manifest."""
+import datetime
+import os
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from gpm.bucket import LonLatPartitioning
+from gpm.bucket.io import get_filepaths
+from gpm.bucket.manifest import (
+    MANIFEST_FILENAME,
+    get_files_manifest,
+    get_manifest_row_groups,
+    prune_bucket_manifest,
+    read_bucket_manifest,
+    update_bucket_manifest,
+)
+from gpm.bucket.readers import read_bucket
+from gpm.bucket.routines import write_bucket, write_granule_bucket
+from gpm.tests.utils.fake_datasets import get_orbit_dataarray
+
+
+def create_dataframe():
+    da = get_orbit_dataarray(
+        start_lon=0,
+        start_lat=0,
+        end_lon=10,
+        end_lat=20,
+        width=1e6,
+        n_along_track=10,
+        n_cross_track=5,
+    )
+    ds = da.to_dataset(name="dummy_var")
+    df = ds.gpm.to_pandas_dataframe()
+    df["time"] = pd.date_range("2021-01-01", periods=len(df), freq="D")
+    return df
+
+
+def create_bucket_archive(bucket_dir, **kwargs):
+    write_bucket(
+        df=create_dataframe(),
+        bucket_dir=bucket_dir,
+        partitioning=LonLatPartitioning(size=(10, 10)),
+        row_group_size=5,
+        **kwargs,
+    )
+
+
+def test_write_bucket_manifest(tmp_path):
+    """Test the manifest written by write_bucket."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir, manifest_columns=["dummy_var"])
+    assert os.path.exists(os.path.join(bucket_dir, MANIFEST_FILENAME))
+
+    manifest = read_bucket_manifest(bucket_dir)
+    filepaths = get_filepaths(bucket_dir)
+    assert manifest["n_rows"].sum() == 50
+    assert sorted(manifest["filepath"].unique()) == sorted(os.path.relpath(fpath, bucket_dir) for fpath in filepaths)
+    assert set(manifest["partition"]) == {os.path.dirname(os.path.relpath(fpath, bucket_dir)) for fpath in filepaths}
+    for column in ["time", "lon", "lat", "dummy_var"]:
+        assert f"{column}_min" in manifest
+        assert f"{column}_max" in manifest
+    assert manifest["time_min"].dtype == pl.Datetime("ns")
+    assert (manifest["lon_min"] <= manifest["lon_max"]).all()
+
+    # Check the recorded values
+    df = pl.read_parquet(os.path.join(bucket_dir, manifest["filepath"][0]))
+    row_group = manifest.filter(pl.col("filepath") == manifest["filepath"][0], pl.col("row_group") == 0)
+    assert row_group["lat_min"][0] == df["lat"][:5].min()
+    assert row_group["time_max"][0] == df["time"][:5].max()
+
+
+def test_get_files_manifest_from_statistics(tmp_path):
+    """Test the manifest values are read from the Parquet statistics if available."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir, write_statistics=True)
+    filepaths = get_filepaths(bucket_dir)
+    records = get_files_manifest(filepaths, bucket_dir=bucket_dir, parallel=False)
+    update_bucket_manifest(bucket_dir)
+    manifest = read_bucket_manifest(bucket_dir)
+    assert len(records) == len(manifest)
+    assert manifest["lat_max"].max() == max(record["lat_max"] for record in records)
+
+
+def test_read_bucket_manifest_missing(tmp_path):
+    """Test read_bucket_manifest returns None if the bucket has no manifest."""
+    assert read_bucket_manifest(tmp_path) is None
+
+
+def test_write_granule_bucket_removes_manifest(tmp_path):
+    """Test the manifest is removed when files are added by write_granule_bucket."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir)
+    assert read_bucket_manifest(bucket_dir) is not None
+    write_granule_bucket(
+        src_filepath="2A.GPM.GMI.GPROF2021v1.20210101-S000000-E010000.036000.V07A.HDF5",
+        bucket_dir=bucket_dir,
+        partitioning=LonLatPartitioning(size=(10, 10)),
+        granule_to_df_func=lambda filepath: create_dataframe(),
+    )
+    assert read_bucket_manifest(bucket_dir) is None
+    assert len(read_bucket(bucket_dir)) == 100
+
+
+def test_prune_bucket_manifest(tmp_path):
+    """Test the selection of the files and row groups with the manifest."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir, manifest_columns=["dummy_var"])
+    manifest = read_bucket_manifest(bucket_dir)
+
+    # Test without criteria
+    assert len(prune_bucket_manifest(manifest)) == len(manifest)
+
+    # Test time pruning
+    start_time = datetime.datetime(2021, 1, 10)
+    end_time = datetime.datetime(2021, 1, 12)
+    pruned = prune_bucket_manifest(manifest, start_time=start_time, end_time=end_time)
+    assert 0 < len(pruned) < len(manifest)
+    assert (pruned["time_max"] >= start_time).all()
+    assert (pruned["time_min"] <= end_time).all()
+
+    # Test spatial pruning
+    pruned = prune_bucket_manifest(manifest, extent=[-30, -20, -30, -20])
+    assert len(pruned) == 0
+    pruned = prune_bucket_manifest(manifest, partitions=[manifest["partition"][0]])
+    assert set(pruned["partition"]) == {manifest["partition"][0]}
+
+    # Test values pruning
+    pruned = prune_bucket_manifest(manifest, filters={"dummy_var": (2, None)})
+    assert len(pruned) == 0
+
+    # Test filename pruning
+    assert len(prune_bucket_manifest(manifest, glob_pattern="dummy*")) == 0
+    assert len(prune_bucket_manifest(manifest, file_extension=".parquet")) == len(manifest)
+
+    # Test row groups selection
+    dict_row_groups = get_manifest_row_groups(manifest, bucket_dir=bucket_dir)
+    assert all(row_groups is None for row_groups in dict_row_groups.values())
+    dict_row_groups = get_manifest_row_groups(pruned.head(0), bucket_dir=bucket_dir)
+    assert dict_row_groups == {}
+    pruned = manifest.filter(pl.col("row_group") == 0, pl.col("n_row_groups") > 1)
+    dict_row_groups = get_manifest_row_groups(pruned, bucket_dir=bucket_dir)
+    assert all(row_groups == [0] for row_groups in dict_row_groups.values())
+
+
+@pytest.mark.parametrize("backend", ["polars", "polars_lazy", "pandas"])
+def test_read_bucket_with_manifest(tmp_path, backend):
+    """Test read_bucket with time and values filters using the bucket manifest."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir, manifest_columns=["dummy_var"])
+    df = create_dataframe()
+
+    # Test time filtering
+    df_pl = read_bucket(bucket_dir, start_time="2021-01-10 00:00:00", end_time="2021-01-19 00:00:00", backend=backend)
+    if backend == "polars_lazy":
+        df_pl = df_pl.collect()
+    assert len(df_pl) == 10
+
+    # Test values filtering (with spatial filtering)
+    df_pl = read_bucket(bucket_dir, extent=[0, 10, 0, 10], filters={"dummy_var": (0.5, None)}, columns=["lon", "lat"])
+    expected_rows = df[(df["dummy_var"] >= 0.5) & df["lon"].between(0, 10) & df["lat"].between(0, 10)]
+    assert len(df_pl) == len(expected_rows)
+
+    # Test no row groups matching
+    with pytest.raises(ValueError):
+        read_bucket(bucket_dir, start_time="2000-01-01 00:00:00", end_time="2000-01-02 00:00:00")
+
+    # Test read_bucket does not list the bucket directories
+    os.rename(os.path.join(bucket_dir, "bucket_info.yaml"), os.path.join(bucket_dir, "bucket_info.bak"))
+    df_pl = read_bucket(bucket_dir, start_time="2021-01-10 00:00:00")
+    assert len(df_pl) == 41
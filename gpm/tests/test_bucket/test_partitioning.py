@@ -979,6 +979,33 @@ class TestLonLatPartitioning:
         np.testing.assert_allclose(vertices[0, 0, :, :], expected_vertices)
         np.testing.assert_allclose(vertices, partitioning.vertices(origin="top"))
 
+    def test_is_aligned_with(self):
+        """Test alignment checks between partitionings."""
+        partitioning = LonLatPartitioning(size=1)
+        assert partitioning.is_aligned_with(LonLatPartitioning(size=5))
+        assert partitioning.is_aligned_with(TilePartitioning(size=10, extent=[-180, 180, -90, 90], n_levels=1))
+        assert not partitioning.is_aligned_with(LonLatPartitioning(size=2.5))
+        assert not LonLatPartitioning(size=5).is_aligned_with(partitioning)
+        # Destination partitioning not covering the source extent
+        assert not partitioning.is_aligned_with(LonLatPartitioning(size=5, extent=[0, 180, -90, 90]))
+        # Destination partitioning larger than the source extent
+        assert LonLatPartitioning(size=1, extent=[0, 10, 0, 10]).is_aligned_with(LonLatPartitioning(size=5))
+
+    def test_get_directories_mapping(self):
+        """Test mapping of the directories to the directories of an aligned partitioning."""
+        partitioning = LonLatPartitioning(size=1, extent=[0, 10, 0, 5])
+        mapping = partitioning.get_directories_mapping(LonLatPartitioning(size=5, extent=[0, 10, 0, 5]))
+        assert len(mapping) == 50
+        assert mapping[os.path.join("lon_bin=0.5", "lat_bin=0.5")] == os.path.join("lon_bin=2.5", "lat_bin=2.5")
+        assert mapping[os.path.join("lon_bin=9.5", "lat_bin=4.5")] == os.path.join("lon_bin=7.5", "lat_bin=2.5")
+        # Tile partitioning
+        tile_partitioning = TilePartitioning(size=5, extent=[0, 10, 0, 5], n_levels=1, flavor="hive")
+        mapping = partitioning.get_directories_mapping(tile_partitioning)
+        assert sorted(set(mapping.values())) == ["tile=0", "tile=1"]
+        # Not aligned partitioning
+        with pytest.raises(ValueError):
+            partitioning.get_directories_mapping(LonLatPartitioning(size=2.5))
+
 
 class TestTilePartitioning:
     """Tests for the TilePartitioning class."""
@@ -26,6 +26,8 @@
 # -----------------------------------------------------------------------------.
 """This module tests the bucket readers."""
 
+import os
+
 import pandas as pd
 import polars as pl
 import pyarrow as pa
@@ -254,3 +256,54 @@ def test_read_bucket_around_point(tmp_path):
     # Test with point outside bucket  (but intersecting area outside intersecting partitions
     df_pl = read_bucket(bucket_dir, point=(-10, -10), size=25)
     assert df_pl.shape == (15, NUM_COLUMNS)
+
+
+def test_read_bucket_with_polars_expressions(tmp_path):
+    """Test read_bucket with polars expressions filters."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir)
+    df = create_granule_dataframe()
+    n_expected_rows = 3 * (df["dummy_var"] > 0.5).sum()
+
+    # Test single expression
+    df_pl = read_bucket(bucket_dir, filters=pl.col("dummy_var") > 0.5)
+    assert df_pl.shape == (n_expected_rows, NUM_COLUMNS)
+
+    # Test list of expressions with columns not including the filtered columns
+    df_pl = read_bucket(bucket_dir, filters=[pl.col("dummy_var") > 0.5, pl.col("lat") < 100], columns=["lon"])
+    assert df_pl.shape == (n_expected_rows, 1)
+
+    # Test dictionary of values ranges
+    df_pl = read_bucket(bucket_dir, filters={"dummy_var": (0.5, None)})
+    assert len(df_pl) == 3 * (df["dummy_var"] >= 0.5).sum()
+
+
+def test_read_bucket_lazy_query(tmp_path):
+    """Test read_bucket pushes the filters and columns selection into a single lazy scan."""
+    bucket_dir = tmp_path
+    create_bucket_archive(bucket_dir)
+
+    # Test the filters and the columns are pushed into the scan
+    df_lazy = read_bucket(bucket_dir, extent=[5, 8, 0, 20], columns=["dummy_var"], backend="polars_lazy")
+    assert isinstance(df_lazy, pl.LazyFrame)
+    query_plan = df_lazy.explain()
+    assert query_plan.count("SCAN") == 1
+    assert "SELECTION" in query_plan
+    assert df_lazy.collect().shape == (33, 1)
+
+    # Test the partition columns are not returned
+    df_pl = read_bucket(bucket_dir, extent=[5, 8, 0, 20])
+    assert "lon_bin" not in df_pl
+    assert "lat_bin" not in df_pl
+
+    # Test the files of the partitions outside the extent are not read
+    partition_dir = os.path.join(bucket_dir, "lon_bin=15.0", "lat_bin=15.0")
+    with open(os.path.join(partition_dir, os.listdir(partition_dir)[0]), "wb") as f:
+        f.write(b"corrupted")
+    df_pl = read_bucket(bucket_dir, extent=[5, 8, 0, 20])
+    assert df_pl.shape == (33, NUM_COLUMNS)
+
+    # Test the distance is returned with the selected columns
+    df_pl = read_bucket(bucket_dir, point=(3, 3), distance=200_000, columns=["dummy_var"])
+    assert df_pl.columns == ["dummy_var", "distance"]
+    assert len(df_pl) == 9
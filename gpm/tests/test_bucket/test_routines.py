@@ -30,7 +30,9 @@ import os
 import pandas as pd
 import pytest
 
-from gpm.bucket import LonLatPartitioning
+from gpm.bucket import LonLatPartitioning, TilePartitioning
+from gpm.bucket.io import get_bucket_partitioning, read_ingested_granules
+from gpm.bucket.manifest import read_bucket_manifest
 from gpm.bucket.readers import read_dask_partitioned_dataset
 from gpm.bucket.routines import merge_granule_buckets, write_bucket, write_granules_bucket
 from gpm.tests.utils.fake_datasets import get_orbit_dataarray
@@ -253,6 +255,55 @@ def test_write_granules_bucket_parallel(tmp_path):
     assert expected_directories == sorted(os.listdir(bucket_dir))
 
 
+def test_write_granules_bucket_processes(tmp_path):
+    """Test write_granules_bucket routine with a pool of processes and the granules ledger."""
+    bucket_dir = tmp_path
+    filepaths = [
+        "2A.GPM.DPR.V9-20211125.20210705-S013942-E031214.041760.V07A.HDF5",
+        "2A.GPM.DPR.V9-20211125.20210805-S013942-E031214.041760.V07A.HDF5",
+    ]
+    partitioning = LonLatPartitioning(size=(10, 10))
+    kwargs = {
+        "bucket_dir": bucket_dir,
+        "partitioning": partitioning,
+        "granule_to_df_func": granule_to_df_toy_func,
+        "parallel": "processes",
+        "max_workers": 2,
+    }
+    report = write_granules_bucket(filepaths=filepaths, **kwargs)
+
+    # Check the report
+    n_rows = len(create_granule_dataframe())
+    assert sorted(report["filepath"]) == sorted(filepaths)
+    assert report["n_rows"].tolist() == [n_rows, n_rows]
+    assert report["error"].isna().all()
+    assert (report["elapsed"] > 0).all()
+
+    # Check parquet files named by granule
+    partition_dir = os.path.join(bucket_dir, "lon_bin=-5.0", "lat_bin=5.0")
+    expected_filenames = [os.path.splitext(f)[0] + "_0.parquet" for f in filepaths]
+    assert sorted(os.listdir(partition_dir)) == sorted(expected_filenames)
+    assert read_ingested_granules(bucket_dir) == {os.path.splitext(f)[0] for f in filepaths}
+
+    # Check only the new granules are processed when resuming
+    new_filepath = "2A.GPM.DPR.V9-20211125.20230705-S013942-E031214.041760.V07A.HDF5"
+    report = write_granules_bucket(filepaths=[*filepaths, new_filepath], resume=True, **kwargs)
+    assert report["filepath"].tolist() == [new_filepath]
+    assert len(read_ingested_granules(bucket_dir)) == 3
+
+
+def test_write_granules_bucket_invalid_parallel(tmp_path):
+    """Test write_granules_bucket raises an error with an invalid parallel argument."""
+    with pytest.raises(ValueError):
+        write_granules_bucket(
+            filepaths=[],
+            bucket_dir=tmp_path,
+            partitioning=LonLatPartitioning(size=(10, 10)),
+            granule_to_df_func=granule_to_df_toy_func,
+            parallel="threads",
+        )
+
+
 def test_merge_granule_buckets(tmp_path):
     """Test merge_granule_buckets routine."""
     # Define bucket dir
@@ -295,6 +346,116 @@ def test_merge_granule_buckets(tmp_path):
     assert os.path.exists(os.path.join(dst_bucket_dir, "_common_metadata"))
     assert os.path.exists(os.path.join(dst_bucket_dir, "_metadata"))
 
+    # Check the manifest of the merged files
+    manifest = read_bucket_manifest(dst_bucket_dir)
+    assert manifest["n_rows"].sum() == 3 * len(create_granule_dataframe())
+    assert os.path.join("lon_bin=-5.0", "lat_bin=5.0", "2021_0.parquet") in manifest["filepath"].to_list()
+
     # Assert can be read with Dask too without errors
     df = read_dask_partitioned_dataset(base_dir=dst_bucket_dir)
     assert isinstance(df.compute(), pd.DataFrame)
+
+
+def _write_toy_granules_bucket(bucket_dir):
+    filepaths = [
+        "2A.GPM.DPR.V9-20211125.20210705-S013942-E031214.041760.V07A.HDF5",  # year 2021
+        "2A.GPM.DPR.V9-20211125.20210805-S013942-E031214.041760.V07A.HDF5",  # year 2021
+        "2A.GPM.DPR.V9-20211125.20230705-S013942-E031214.041760.V07A.HDF5",  # year 2023
+    ]
+    write_granules_bucket(
+        filepaths=filepaths,
+        bucket_dir=bucket_dir,
+        partitioning=LonLatPartitioning(size=(10, 10)),
+        granule_to_df_func=granule_to_df_toy_func,
+        parallel=False,
+    )
+
+
+def test_merge_granule_buckets_parallel(tmp_path):
+    """Test merge_granule_buckets with a pool of processes and per-year tasks."""
+    src_bucket_dir = tmp_path / "src"
+    _write_toy_granules_bucket(src_bucket_dir)
+
+    # Merge sequentially and in parallel
+    report = merge_granule_buckets(src_bucket_dir=src_bucket_dir, dst_bucket_dir=tmp_path / "serial", parallel=False)
+    report_parallel = merge_granule_buckets(
+        src_bucket_dir=src_bucket_dir,
+        dst_bucket_dir=tmp_path / "parallel",
+        parallel=True,
+        max_workers=2,
+        max_partition_size=0,  # split partitions by year
+        write_metadata=True,
+    )
+    columns = ["partition", "year", "n_src_files", "n_dst_files"]
+    sort_keys = ["partition", "year"]
+    pd.testing.assert_frame_equal(
+        report[columns].sort_values(sort_keys, ignore_index=True),
+        report_parallel[columns].sort_values(sort_keys, ignore_index=True),
+    )
+    n_src_files = sum(len(files) for _, _, files in os.walk(src_bucket_dir)) - 1  # bucket_info.yaml
+    assert report["n_src_files"].sum() == report_parallel["n_src_files"].sum() == n_src_files
+
+    # Check the merged archives are identical
+    partition_dir = os.path.join("lon_bin=-5.0", "lat_bin=5.0")
+    assert sorted(os.listdir(tmp_path / "parallel" / partition_dir)) == ["2021_0.parquet", "2023_0.parquet"]
+    df = read_dask_partitioned_dataset(base_dir=tmp_path / "serial").compute()
+    df_parallel = read_dask_partitioned_dataset(base_dir=tmp_path / "parallel").compute()
+    assert len(df) == len(df_parallel)
+    assert os.path.exists(os.path.join(tmp_path / "parallel", "_metadata"))
+
+
+def test_merge_granule_buckets_dry_run(tmp_path):
+    """Test merge_granule_buckets reports the expected merged files without writing them."""
+    src_bucket_dir = tmp_path / "src"
+    dst_bucket_dir = tmp_path / "dst"
+    _write_toy_granules_bucket(src_bucket_dir)
+    report = merge_granule_buckets(src_bucket_dir=src_bucket_dir, dst_bucket_dir=dst_bucket_dir, dry_run=True)
+    assert not os.path.exists(dst_bucket_dir)
+    assert report["n_rows"].sum() == 3 * len(create_granule_dataframe())
+
+    # Check the expected number of files
+    report_merge = merge_granule_buckets(src_bucket_dir=src_bucket_dir, dst_bucket_dir=dst_bucket_dir)
+    n_files = sum(len(files) for _, _, files in os.walk(dst_bucket_dir)) - 2  # bucket_info.yaml and _manifest
+    assert report["n_dst_files"].sum() == report_merge["n_dst_files"].sum() == n_files
+
+
+@pytest.mark.parametrize(
+    "dst_partitioning",
+    [
+        LonLatPartitioning(size=(20, 20)),
+        TilePartitioning(size=20, extent=[-180, 180, -90, 90], n_levels=1, flavor="hive"),
+    ],
+)
+def test_merge_granule_buckets_dst_partitioning(tmp_path, dst_partitioning):
+    """Test merge_granule_buckets into a coarser aligned partitioning."""
+    src_bucket_dir = tmp_path / "src"
+    dst_bucket_dir = tmp_path / "dst"
+    _write_toy_granules_bucket(src_bucket_dir)
+    report = merge_granule_buckets(
+        src_bucket_dir=src_bucket_dir,
+        dst_bucket_dir=dst_bucket_dir,
+        dst_partitioning=dst_partitioning,
+        parallel=False,
+    )
+    # Check the source partitions are grouped in the destination partitions
+    assert report["n_src_files"].sum() == 21
+    assert set(report["partition"]).issubset(set(dst_partitioning.directories.tolist()))
+    assert get_bucket_partitioning(dst_bucket_dir).to_dict() == dst_partitioning.to_dict()
+
+    # Check all rows are written
+    df_src = read_dask_partitioned_dataset(base_dir=src_bucket_dir).compute()
+    df_dst = read_dask_partitioned_dataset(base_dir=dst_bucket_dir).compute()
+    assert len(df_src) == len(df_dst)
+    assert df_src["dummy_var"].sum() == pytest.approx(df_dst["dummy_var"].sum())
+
+
+def test_merge_granule_buckets_not_aligned_dst_partitioning(tmp_path):
+    """Test merge_granule_buckets raises an error with a not aligned destination partitioning."""
+    src_bucket_dir = tmp_path / "src"
+    _write_toy_granules_bucket(src_bucket_dir)
+    with pytest.raises(ValueError, match="not aligned"):
+        merge_granule_buckets(
+            src_bucket_dir=src_bucket_dir,
+            dst_bucket_dir=tmp_path / "dst",
+            dst_partitioning=LonLatPartitioning(size=(15, 15)),
+        )
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from gpm.dataset.decoding.cf import apply_cf_decoding
+from gpm.dataset.decoding.dtypes import (
+    apply_decode_dtype_policy,
+    check_decode_dtype_policy,
+    get_compact_flag_dtype,
+    get_source_dtypes,
+    mask_fill_value,
+)
+from gpm.dataset.decoding.routines import decode_variables
+from gpm.encoding.routines import set_encoding
+
+
+def _create_2a_radar_dataset() -> xr.Dataset:
+    """Create a 2A-DPR dataset with CF-encoded flags, bins and 3D variables."""
+    dims = ("cross_track", "along_track", "range")
+    ds = xr.Dataset(
+        {
+            "phase": (dims, np.array([[[-1111, 0, 100], [200, 255, 150]]], dtype="int16")),
+            "flagPrecip": (dims[:2], np.array([[0, 22]], dtype="int32")),
+            "qualityFlag": (dims[:2], np.array([[-99, 2]], dtype="int8")),
+            "binZeroDeg": (dims[:2], np.array([[-1111, 120]], dtype="int16")),
+            "zFactorFinal": (dims, np.array([[[-29999.0, 10.5, 35.25], [20.0, 0.5, -9999.9]]], dtype="float32")),
+        },
+    )
+    ds["phase"].attrs["_FillValue"] = np.int16(255)
+    ds["zFactorFinal"].attrs["_FillValue"] = np.float32(-9999.9)
+    for var in ds.data_vars:
+        ds[var].attrs["gpm_api_product"] = "2A-DPR"
+    ds.attrs["gpm_api_product"] = "2A-DPR"
+    return ds
+
+
+def _decode(ds: xr.Dataset, policy: str) -> xr.Dataset:
+    """Decode the dataset with the specified decoding dtype policy."""
+    source_dtypes = get_source_dtypes(ds)
+    ds = decode_variables(apply_cf_decoding(ds), product="2A-DPR")
+    return apply_decode_dtype_policy(ds, policy=policy, source_dtypes=source_dtypes)
+
+
+def test_check_decode_dtype_policy() -> None:
+    """Test the decoding dtype policy validity check."""
+    assert check_decode_dtype_policy("compact") == "compact"
+    with pytest.raises(ValueError):
+        check_decode_dtype_policy("small")
+
+
+@pytest.mark.parametrize(
+    ("flag_values", "expected_dtype", "expected_fill_value"),
+    [
+        ([0, 1, 2], np.uint8, 255),
+        ([0, 255], np.uint16, 65535),
+        ([-1, 0, 1], np.int16, -32768),
+        ([0, 100_000], np.int32, np.iinfo(np.int32).min),
+    ],
+)
+def test_get_compact_flag_dtype(flag_values, expected_dtype, expected_fill_value) -> None:
+    """Test the smallest integer dtype able to represent the flag values."""
+    dtype, fill_value = get_compact_flag_dtype(flag_values)
+    assert dtype == np.dtype(expected_dtype)
+    assert fill_value == expected_fill_value
+
+
+def test_apply_decode_dtype_policy() -> None:
+    """Test the compact decoding dtype policy preserves the decoded values with smaller dtypes."""
+    ds = _create_2a_radar_dataset()
+    ds_default = _decode(ds.copy(deep=True), policy="default")
+    ds_compact = _decode(ds.copy(deep=True), policy="compact")
+
+    # Check flags are stored as small integers with an explicit _FillValue
+    for var in ["phase", "flagPrecip", "qualityFlag"]:
+        assert ds_compact[var].dtype == np.uint8
+        assert ds_compact[var].attrs["_FillValue"] == 255
+        assert ds_compact[var].encoding["dtype"] == np.uint8
+        assert "_FillValue" not in ds_compact[var].encoding
+        assert ds_compact[var].attrs["flag_values"] == ds_default[var].attrs["flag_values"]
+
+    # Check float variables are float32
+    assert ds_compact["binZeroDeg"].dtype == np.float32
+    assert ds_compact["zFactorFinal"].dtype == np.float32
+
+    # Check the values are unchanged once the _FillValue is masked
+    for var in ds_default.data_vars:
+        np.testing.assert_allclose(mask_fill_value(ds_compact[var]).values, ds_default[var].values, equal_nan=True)
+
+    # Check the default policy does not change the dataset
+    ds_decoded = _decode(ds.copy(deep=True), policy="default")
+    xr.testing.assert_identical(apply_decode_dtype_policy(ds_decoded.copy(), policy="default"), ds_decoded)
+
+
+@pytest.mark.parametrize(
+    ("source_dtype", "expected_dtype"),
+    [
+        ("float32", np.float32),
+        ("int16", np.float32),
+        ("int32", np.float64),
+        ("float64", np.float64),
+    ],
+)
+def test_apply_decode_dtype_policy_float_variables(source_dtype, expected_dtype) -> None:
+    """Test float64 variables are casted to float32 only if the source dtype fits in float32."""
+    ds = xr.Dataset({"var": xr.DataArray(np.array([1.5, np.nan]), dims="x", attrs={"units": "mm"})})
+    ds = apply_decode_dtype_policy(ds, policy="compact", source_dtypes={"var": np.dtype(source_dtype)})
+    assert ds["var"].dtype == expected_dtype
+    assert ds["var"].attrs == {"units": "mm"}
+
+    # Check the dtype encoding is used if the source dtype is not specified
+    ds["var"].encoding["dtype"] = np.dtype(source_dtype)
+    assert apply_decode_dtype_policy(ds, policy="compact")["var"].dtype == expected_dtype
+
+
+def test_apply_decode_dtype_policy_out_of_range_values() -> None:
+    """Test flag values out of the compact dtype range are set to the _FillValue."""
+    da = xr.DataArray(np.array([0.0, 1.0, np.nan, 300.0, -5.0]), dims="x", attrs={"flag_values": [0, 1]})
+    ds = apply_decode_dtype_policy(xr.Dataset({"flag": da}), policy="compact")
+    np.testing.assert_equal(ds["flag"].values, np.array([0, 1, 255, 255, 255], dtype=np.uint8))
+
+
+def test_mask_fill_value() -> None:
+    """Test the _FillValue of integer variables is masked with np.nan."""
+    da = xr.DataArray(np.array([0, 1, 255], dtype=np.uint8), dims="x", attrs={"_FillValue": 255, "units": "-"})
+    da_masked = mask_fill_value(da)
+    np.testing.assert_equal(da_masked.values, np.array([0, 1, np.nan]))
+    assert da_masked.attrs == {"units": "-"}
+
+    # Check float variables are not modified
+    da = da_masked.assign_attrs({"_FillValue": 1})
+    xr.testing.assert_identical(mask_fill_value(da), da)
+
+
+def test_set_encoding_compact_dataset() -> None:
+    """Test the encodings can be set on a dataset decoded with the compact policy."""
+    ds = _decode(_create_2a_radar_dataset(), policy="compact")
+    ds = set_encoding(ds)
+    assert "_FillValue" not in ds["phase"].attrs
+    assert ds["phase"].encoding["_FillValue"] == 255
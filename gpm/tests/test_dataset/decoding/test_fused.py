@@ -0,0 +1,69 @@
+import dask.array
+import numpy as np
+import xarray as xr
+
+from gpm.dataset.decoding.cf import apply_cf_decoding
+from gpm.dataset.decoding.fused import split_fused_variables
+from gpm.dataset.decoding.routines import decode_variables
+from gpm.utils.dask import count_dask_tasks
+
+
+def _create_2a_radar_dataset() -> xr.Dataset:
+    """Create a dask-backed 2A-DPR dataset with CF-encoded variables."""
+    rng = np.random.default_rng(0)
+    shape = (4, 6, 3)
+    dims = ("cross_track", "along_track", "range")
+    ds = xr.Dataset(
+        {
+            "phase": (dims, rng.integers(-1, 300, size=shape).astype("int16")),
+            "landSurfaceType": (dims[:2], rng.integers(-1, 400, size=shape[:2]).astype("int32")),
+            "precipRate": (dims, rng.random(shape).astype("float32")),
+            "paramDSD": ((*dims, "DSD_params"), rng.random((*shape, 2)).astype("float32")),
+        },
+    )
+    ds["phase"].attrs["_FillValue"] = np.int16(255)
+    ds["precipRate"].attrs["_FillValue"] = np.float32(-9999.9)
+    ds["precipRate"].attrs["units"] = "mm/hr"
+    return ds.chunk({"along_track": 2})
+
+
+def _decode(ds: xr.Dataset) -> xr.Dataset:
+    """Apply the standard decoding."""
+    return decode_variables(apply_cf_decoding(ds), product="2A-DPR")
+
+
+def test_split_fused_variables() -> None:
+    """Test the fused decoding gives the same results of the standard decoding with less dask tasks."""
+    ds = _create_2a_radar_dataset()
+    expected = _decode(ds.copy())
+
+    ds_remaining, fused_variables = split_fused_variables(ds, product="2A-DPR", decode_cf=True, decode_product=True)
+
+    # Check paramDSD (split into dBNw, Dm and Nw) falls back to the standard decoding
+    assert set(fused_variables) == {"phase", "landSurfaceType", "precipRate"}
+    assert list(ds_remaining.data_vars) == ["paramDSD"]
+
+    # Check the decoded variables
+    for name, variable in fused_variables.items():
+        assert isinstance(variable.data, dask.array.Array)
+        assert variable.dtype == expected[name].dtype
+        assert variable.attrs == expected[name].attrs
+        assert variable.encoding == expected[name].encoding
+        xr.testing.assert_identical(variable.compute(), expected[name].variable.compute())
+
+    # Check the dask graph size is reduced
+    n_tasks = count_dask_tasks(xr.Dataset(fused_variables))
+    assert n_tasks < count_dask_tasks(expected[list(fused_variables)])
+
+
+def test_split_fused_variables_without_decoding() -> None:
+    """Test no variable is fused without decoding or with numpy arrays."""
+    ds = _create_2a_radar_dataset()
+    ds_remaining, fused_variables = split_fused_variables(ds, product="2A-DPR", decode_cf=False, decode_product=False)
+    assert fused_variables == {}
+    assert ds_remaining is ds
+
+    ds = ds.compute()
+    ds_remaining, fused_variables = split_fused_variables(ds, product="2A-DPR", decode_cf=True, decode_product=True)
+    assert fused_variables == {}
+    xr.testing.assert_identical(ds_remaining, ds)
@@ -0,0 +1,50 @@
+import dask.array
+import numpy as np
+import pytest
+
+from gpm.dataset.decoding.utils import remap_numeric_array
+
+
+def _select_remap_numeric_array(arr, remapping_dict, fill_value=np.nan):
+    """Reference remapping with np.select."""
+    conditions = [arr == i for i in remapping_dict]
+    return np.select(conditions, list(remapping_dict.values()), default=fill_value)
+
+
+@pytest.mark.parametrize(
+    "remapping_dict",
+    [
+        {0: 0, 10: 1, 11: 2, 20: 3, 21: 4},  # dense integer codes
+        {1: 0, 100: 1, 100_000: 2},  # sparse integer codes
+        {0.5: 1, 1.5: 2},  # non-integer codes
+    ],
+)
+def test_remap_numeric_array(remapping_dict) -> None:
+    """Test that the remapping equals the np.select remapping."""
+    arr = np.array([[0, 10, 11, 20], [21, 5, np.nan, -1111], [10.5, 0.5, 1.5, 100_000]])
+    expected = _select_remap_numeric_array(arr, remapping_dict)
+
+    res = remap_numeric_array(arr, remapping_dict)
+    np.testing.assert_equal(res, expected)
+    assert res.dtype == np.float32
+
+    # Test with dask array
+    res = remap_numeric_array(dask.array.from_array(arr, chunks=2), remapping_dict)
+    assert isinstance(res, dask.array.Array)
+    assert res.dtype == np.float32
+    np.testing.assert_equal(res.compute(), expected)
+
+
+def test_remap_numeric_array_dtype() -> None:
+    """Test that the smallest output dtype is returned."""
+    arr = np.array([1, 5, 3], dtype="int16")
+    res = remap_numeric_array(arr, {1: 10, 5: 20}, fill_value=255)
+    assert res.dtype == np.uint8
+    np.testing.assert_equal(res, [10, 20, 255])
+
+    res = remap_numeric_array(arr, {1: -1, 5: 1000}, fill_value=0)
+    assert res.dtype == np.int16
+    np.testing.assert_equal(res, [-1, 1000, 0])
+
+    # Test empty remapping
+    np.testing.assert_equal(remap_numeric_array(arr, {}), [np.nan] * 3)
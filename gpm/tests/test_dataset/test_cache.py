@@ -0,0 +1,163 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""This module test the granules structure and attributes cache."""
+
+import datetime
+import json
+import os
+import sqlite3
+
+import netCDF4
+import pytest
+import xarray as xr
+
+import gpm
+from gpm.dataset import cache
+from gpm.dataset.cache import (
+    clear_granules_cache,
+    get_cached_attrs,
+    get_cached_structure,
+    open_cached_datatree,
+)
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+
+
+@pytest.fixture()
+def filepath(tmp_path):
+    """Create a fake 2A-GMI granule with an additional group."""
+    filepath = create_fake_granule(str(tmp_path), START_TIME, granule_id=36000, n_scans=10, n_pixels=5)
+    with netCDF4.Dataset(filepath, mode="a") as nc:
+        group = nc["S1"].createGroup("extra")
+        var = group.createVariable("pixelStatus", "i1", ("nscan", "npixel"))
+        var.setncattr("DimensionNames", "nscan,npixel")
+        var[:] = 0
+    with gpm.config.set({"base_dir": str(tmp_path), "use_granule_cache": True}):
+        clear_granules_cache()
+        yield filepath
+        clear_granules_cache()
+
+
+def _open_granule(filepath, **kwargs):
+    ds = gpm.open_granule(filepath, **kwargs)
+    _ = ds.attrs.pop("history")
+    return ds
+
+
+@pytest.mark.parametrize("variables", [None, "surfacePrecipitation", "pixelStatus"])
+def test_open_granule_with_cache(filepath, variables, monkeypatch):
+    """Test open_granule returns the same dataset with and without the granules cache."""
+    with gpm.config.set({"use_granule_cache": False}):
+        ds_expected = _open_granule(filepath, variables=variables)
+
+    # The first opening fills the cache
+    xr.testing.assert_identical(_open_granule(filepath, variables=variables), ds_expected)
+    assert get_cached_structure("2A-GMI", "V07A", "S1") is not None
+
+    # The second opening does not open the full granule
+    def open_datatree(*args, **kwargs):
+        raise AssertionError("The full granule has been opened.")
+
+    monkeypatch.setattr(cache, "open_datatree", open_datatree)
+    xr.testing.assert_identical(_open_granule(filepath, variables=variables), ds_expected)
+
+
+def test_open_cached_datatree_groups(filepath):
+    """Test open_cached_datatree opens only the required groups."""
+    _ = open_cached_datatree(filepath, scan_mode="S1")
+    dt, attrs = open_cached_datatree(filepath, scan_mode="S1", variables=["surfacePrecipitation"])
+    assert sorted(dt["S1"].children) == ["ScanTime"]
+    assert attrs["AlgorithmID"] == "2AGPROF"
+    dt, _ = open_cached_datatree(filepath, scan_mode="S1", variables=["pixelStatus"])
+    assert sorted(dt["S1"].children) == ["ScanTime", "extra"]
+    assert dt["S1/extra"]["pixelStatus"].dims == ("along_track", "cross_track")
+
+
+def test_granules_cache_minor_versions(filepath):
+    """Test the structure is cached separately for each minor version of the granules."""
+    _ = open_cached_datatree(filepath, scan_mode="S1", variables=["pixelStatus"])
+    filepath_v07b = create_fake_granule(
+        os.path.dirname(filepath),
+        START_TIME + ORBIT_DURATION,
+        granule_id=36001,
+        n_scans=10,
+        n_pixels=5,
+    ).replace(".V07A.", ".V07B.")
+    os.rename(filepath_v07b.replace(".V07B.", ".V07A."), filepath_v07b)
+    with netCDF4.Dataset(filepath_v07b, mode="a") as nc:
+        for group_name, var_name in [("extra", "pixelStatus"), ("extra_v07b", "qualityFlag")]:
+            group = nc["S1"].createGroup(group_name)
+            var = group.createVariable(var_name, "i1", ("nscan", "npixel"))
+            var.setncattr("DimensionNames", "nscan,npixel")
+            var[:] = 0
+    dt, _ = open_cached_datatree(filepath_v07b, scan_mode="S1")
+    assert sorted(dt["S1"].children) == ["ScanTime", "extra", "extra_v07b"]
+    assert sorted(get_cached_structure("2A-GMI", "V07A", "S1")["groups"]) == ["", "ScanTime", "extra"]
+
+
+def test_granules_cache_schema_version(filepath):
+    """Test the cache tables are recreated when the schema version changes."""
+    _ = open_cached_datatree(filepath, scan_mode="S1")
+    with sqlite3.connect(os.path.join(gpm.config.get("base_dir"), "GPM", cache.CACHE_FILENAME)) as conn:
+        conn.execute("PRAGMA user_version = 1")
+    cache._STRUCTURES.clear()
+    assert get_cached_structure("2A-GMI", "V07A", "S1") is None
+
+
+def test_granules_cache_persistence(filepath):
+    """Test the granules cache is persisted on disk."""
+    _ = open_cached_datatree(filepath, scan_mode="S1")
+    assert os.path.exists(os.path.join(gpm.config.get("base_dir"), "GPM", cache.CACHE_FILENAME))
+    cache._STRUCTURES.clear()
+    cache._ATTRIBUTES.clear()
+    assert sorted(get_cached_structure("2A-GMI", "V07A", "S1")["groups"]) == ["", "ScanTime", "extra"]
+    assert get_cached_structure("2A-GMI", "V07A", "FS") is None
+
+
+def test_granules_cache_persistence_roundtrip(filepath):
+    """Test the granules cache persisted as JSON reopens an identical granule."""
+    variables = ["surfacePrecipitation"]
+    _ = open_cached_datatree(filepath, scan_mode="S1")
+    dt, attrs = open_cached_datatree(filepath, scan_mode="S1", variables=variables)
+    cache._STRUCTURES.clear()
+    cache._ATTRIBUTES.clear()
+    with sqlite3.connect(os.path.join(gpm.config.get("base_dir"), "GPM", cache.CACHE_FILENAME)) as conn:
+        for (content,) in conn.execute("SELECT attrs FROM attributes"):
+            assert isinstance(json.loads(content), list)
+    dt_cached, attrs_cached = open_cached_datatree(filepath, scan_mode="S1", variables=variables)
+    assert dt_cached.identical(dt)
+    assert attrs_cached == attrs
+
+
+def test_get_cached_attrs_modified_file(filepath):
+    """Test the cached attributes are updated when the granule is modified."""
+    _, granule_attrs = get_cached_attrs(filepath)
+    assert granule_attrs["AlgorithmID"] == "2AGPROF"
+    with netCDF4.Dataset(filepath, mode="a") as nc:
+        nc.setncattr("FileHeader", "GranuleNumber=36000;\nEmptyGranule=NOT_EMPTY;\nAlgorithmID=2AGPROF2;\n")
+    os.utime(filepath, ns=(0, 0))
+    _, granule_attrs = get_cached_attrs(filepath)
+    assert granule_attrs["AlgorithmID"] == "2AGPROF2"
@@ -94,6 +94,23 @@ def test_get_orbit_coords():
     diff = DeepDiff(expected_coords, returned_coords)
     assert diff == {}, f"Dictionaries are not equal: {diff}"
 
+    # Test get_orbit_coords with along_track_slice
+    along_track_slice = slice(2, 5)
+    expected_coords = {
+        "lon": (["along_track", "cross_track"], lon.data[2:5]),
+        "lat": (["along_track", "cross_track"], lat.data[2:5]),
+        "time": (["along_track"], time_array[2:5]),
+        "gpm_id": (["along_track"], np.array([f"{granule_id}-{i}" for i in range(2, 5)])),
+        "gpm_granule_id": (["along_track"], np.repeat(granule_id, 3)),
+        "gpm_cross_track_id": (["cross_track"], np.arange(shape[1])),
+        "gpm_along_track_id": (["along_track"], np.arange(2, 5)),
+    }
+    returned_coords = coords.get_orbit_coords(dt, scan_mode, along_track_slice=along_track_slice)
+    returned_coords = {k: (list(da.dims), da.data) for k, da in returned_coords.items()}
+
+    diff = DeepDiff(expected_coords, returned_coords)
+    assert diff == {}, f"Dictionaries are not equal: {diff}"
+
 
 def test_get_grid_coords():
     """Test get_grid_coords."""
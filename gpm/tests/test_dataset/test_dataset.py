@@ -0,0 +1,187 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module test the opening of multiple granules into a GPM-API Dataset."""
+
+import datetime
+import os
+import threading
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import gpm
+from gpm.io.local import get_local_product_directory
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+
+PRODUCT = "2A-GMI"
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+N_GRANULES = 3
+
+
+@pytest.fixture()
+def base_dir(tmp_path):
+    """Create a local archive with fake 2A-GMI granules."""
+    base_dir = str(tmp_path)
+    dir_path = get_local_product_directory(
+        base_dir=base_dir,
+        product=PRODUCT,
+        product_type="RS",
+        version=7,
+        date=START_TIME.date(),
+    )
+    os.makedirs(dir_path)
+    for i in range(N_GRANULES):
+        create_fake_granule(dir_path, START_TIME + i * ORBIT_DURATION, granule_id=36000 + i, n_scans=300, n_pixels=20)
+    with gpm.config.set({"base_dir": base_dir, "warn_non_contiguous_scans": False}):
+        yield base_dir
+
+
+def _open_dataset(**kwargs):
+    ds = gpm.open_dataset(PRODUCT, start_time="2020-07-05 00:10:00", end_time="2020-07-05 03:00:00", **kwargs)
+    _ = ds.attrs.pop("history")
+    return ds
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_open_dataset_time_window():
+    """Test open_dataset reads only the scans within the time period."""
+    with pytest.warns(gpm.utils.warnings.GPM_Warning, match="Some granules may be missing"):
+        ds = _open_dataset()
+    assert ds["time"].to_numpy()[0] >= np.datetime64("2020-07-05T00:10:00")
+    assert ds["time"].to_numpy()[-1] <= np.datetime64("2020-07-05T03:00:00")
+    assert np.unique(ds["gpm_granule_id"]).tolist() == [36000, 36001]
+    # The original along-track index is preserved
+    assert ds["gpm_along_track_id"].to_numpy()[0] > 0
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_open_dataset_extent():
+    """Test open_dataset with a region of interest."""
+    extent = [0, 30, -10, 10]
+    ds = _open_dataset(extent=extent)
+    lon = ds["lon"].to_numpy()
+    lat = ds["lat"].to_numpy()
+    is_inside = (lon >= extent[0]) & (lon <= extent[1]) & (lat >= extent[2]) & (lat <= extent[3])
+    # The first and last scan have pixels within the extent
+    assert is_inside[:, 0].any()
+    assert is_inside[:, -1].any()
+    assert np.unique(ds["gpm_granule_id"]).tolist() == [36000]
+
+    with pytest.raises(ValueError, match="No GPM granule intersects"):
+        _open_dataset(extent=[-50, -49, 80, 85])
+
+    with pytest.raises(ValueError, match="Specify either"):
+        _open_dataset(extent=extent, country="Italy")
+
+
+@pytest.mark.usefixtures("base_dir")
+@pytest.mark.parametrize(("extent", "chunks"), [(None, -1), ([0, 30, -10, 10], None)])
+def test_open_dataset_processes(extent, chunks):
+    """Test open_dataset with parallel='processes' returns the same dataset of parallel=False."""
+    with gpm.config.set({"warn_non_contiguous_scans": False}):
+        ds = _open_dataset(extent=extent, chunks=chunks)
+        ds_processes = _open_dataset(extent=extent, chunks=chunks, parallel="processes", max_workers=2)
+    xr.testing.assert_identical(ds, ds_processes)
+    assert isinstance(ds_processes["surfacePrecipitation"].data, np.ndarray) == (chunks is None)
+
+
+def test_open_dataset_invalid_parallel():
+    """Test open_dataset raise an error with an invalid parallel argument."""
+    with pytest.raises(ValueError, match="'parallel' must be"):
+        _open_dataset(parallel="threads")
+
+
+def _iter_granules(**kwargs):
+    for ds in gpm.iter_granules(PRODUCT, start_time="2020-07-05 00:10:00", end_time="2020-07-05 03:00:00", **kwargs):
+        _ = ds.attrs.pop("history")
+        yield ds
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_iter_granules():
+    """Test iter_granules yields the same data of open_dataset."""
+    with pytest.warns(gpm.utils.warnings.GPM_Warning, match="Some granules may be missing"):
+        ds = _open_dataset()
+
+    # Test one dataset per granule
+    list_ds = list(_iter_granules(prefetch=2))
+    assert [np.unique(ds_granule["gpm_granule_id"]).tolist() for ds_granule in list_ds] == [[36000], [36001]]
+    assert all(isinstance(ds_granule["surfacePrecipitation"].data, np.ndarray) for ds_granule in list_ds)
+    ds_concat = xr.concat(list_ds, dim="along_track")
+    xr.testing.assert_equal(ds["surfacePrecipitation"], ds_concat["surfacePrecipitation"])
+
+    # Test blocks of contiguous granules
+    list_ds = list(_iter_granules(n_granules=2))
+    assert len(list_ds) == 1
+    xr.testing.assert_identical(ds.compute(), list_ds[0])
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_iter_granules_max_memory():
+    """Test iter_granules memory cap."""
+    list_ds = list(_iter_granules(prefetch=2, max_memory="10MB"))
+    assert len(list_ds) == 2
+
+    # Test max_memory smaller than two blocks
+    n_bytes = list_ds[0].nbytes
+    list_ds = list(_iter_granules(prefetch=2, max_memory=int(n_bytes * 1.5)))
+    assert [np.unique(ds_granule["gpm_granule_id"]).tolist() for ds_granule in list_ds] == [[36000], [36001]]
+
+    # Test blocks larger than max_memory are loaded one at a time
+    list_ds = list(_iter_granules(max_memory=1000))
+    assert len(list_ds) == 2
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_iter_granules_early_stop():
+    """Test iter_granules stops the prefetching thread when the iteration is interrupted."""
+    iterator = _iter_granules(max_memory="10MB")
+    ds = next(iterator)
+    assert np.unique(ds["gpm_granule_id"]).tolist() == [36000]
+    iterator.close()
+    assert not any(thread.name == "gpm-iter-granules" for thread in threading.enumerate())
+
+
+def test_iter_granules_invalid_arguments():
+    """Test iter_granules raise an error with invalid arguments."""
+    with pytest.raises(ValueError, match="'n_granules' must be"):
+        next(_iter_granules(n_granules=0))
+    with pytest.raises(ValueError, match="'prefetch' must be"):
+        next(_iter_granules(prefetch=0))
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_open_dataset_engine():
+    """Test open_dataset returns the same dataset with the netcdf4 and h5netcdf engines."""
+    extent = [0, 30, -10, 10]
+    ds = _open_dataset(extent=extent)
+    ds_h5netcdf = _open_dataset(extent=extent, engine="h5netcdf")
+    xr.testing.assert_identical(ds, ds_h5netcdf)
+
+    with pytest.raises(ValueError, match="is an invalid 'engine'"):
+        _open_dataset(engine="h5py")
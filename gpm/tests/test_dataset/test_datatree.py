@@ -25,3 +25,68 @@
 
 # -----------------------------------------------------------------------------.
 """This module test the GPM-API DataTree."""
+
+import h5py
+import numpy as np
+import pytest
+import xarray as xr
+
+from gpm.dataset.datatree import open_datatree, open_partial_datatree
+
+N_SCANS = 6
+N_RAYS = 4
+N_BINS = 4
+
+
+def _create_dataset(group, name, dims, dtype="f4"):
+    """Create a HDF5 dataset with the GPM DimensionNames attribute."""
+    shape = [{"nscan": N_SCANS, "nray": N_RAYS, "nbin": N_BINS}[dim] for dim in dims]
+    dataset = group.create_dataset(name, data=np.arange(np.prod(shape)).reshape(shape).astype(dtype))
+    dataset.attrs.create("DimensionNames", np.bytes_(",".join(dims)))
+    return dataset
+
+
+@pytest.fixture()
+def filepath(tmp_path):
+    """Create a fake 2A-DPR granule without HDF5 dimension scales."""
+    filepath = str(tmp_path / "2A.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5")
+    with h5py.File(filepath, mode="w") as f:
+        f.attrs.create("FileHeader", np.bytes_("GranuleNumber=36092;\nEmptyGranule=NOT_EMPTY;\n"))
+        group = f.create_group("FS")
+        _create_dataset(group, "Latitude", dims=["nscan", "nray"])
+        _create_dataset(group, "Longitude", dims=["nscan", "nray"])
+        scan_time = group.create_group("ScanTime")
+        for name in ["Year", "Month", "DayOfMonth", "Hour", "Minute", "Second"]:
+            _create_dataset(scan_time, name, dims=["nscan"], dtype="i2")
+        slv = group.create_group("SLV")
+        _create_dataset(slv, "precipRateNearSurface", dims=["nscan", "nray"])
+        _create_dataset(slv, "zFactorFinal", dims=["nscan", "nray", "nbin"])
+        pre = group.create_group("PRE")
+        _create_dataset(pre, "heightStormTop", dims=["nscan", "nray"], dtype="i2")
+    return filepath
+
+
+def test_open_partial_datatree(filepath):
+    """Test open_partial_datatree opens only the required groups."""
+    dt_expected = open_datatree(filepath, chunks=None)
+
+    dt = open_partial_datatree(filepath, scan_mode="FS", variables=["precipRateNearSurface"], chunks=None)
+    assert sorted(dt["FS"].children) == ["SLV", "ScanTime"]
+    assert dt.attrs == dt_expected.attrs
+    for path in ["/FS", "/FS/ScanTime", "/FS/SLV"]:
+        xr.testing.assert_identical(dt[path].to_dataset(), dt_expected[path].to_dataset())
+    assert dt["FS/SLV"]["zFactorFinal"].dims == ("along_track", "cross_track", "range")
+
+    dt = open_partial_datatree(filepath, scan_mode="FS", groups=["PRE"], chunks={})
+    assert sorted(dt["FS"].children) == ["PRE", "ScanTime"]
+
+
+def test_open_partial_datatree_errors(filepath):
+    """Test open_partial_datatree raise errors."""
+    with pytest.raises(ValueError, match="not available"):
+        open_partial_datatree(filepath, scan_mode="FS", variables=["dummy"])
+
+    with h5py.File(filepath, mode="a") as f:
+        f.attrs["FileHeader"] = np.bytes_("GranuleNumber=36092;\nEmptyGranule=EMPTY;\n")
+    with pytest.raises(ValueError, match="EMPTY granule"):
+        open_partial_datatree(filepath, scan_mode="FS")
@@ -0,0 +1,171 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module test the granules footprint index."""
+
+import os
+
+import netCDF4
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from gpm.dataset import footprint
+from gpm.dataset.footprint import (
+    compute_footprint_bounds,
+    crop_granule,
+    get_along_track_slices,
+    update_footprint_index,
+)
+
+SCAN_MODE = "FS"
+N_SCANS = 120
+N_CROSS_TRACK = 5
+
+
+def create_fake_granule(filepath, lon_center):
+    """Create a fake granule with a north-south swath centered at ``lon_center``."""
+    lat = np.repeat(np.linspace(-60, 60, N_SCANS)[:, None], N_CROSS_TRACK, axis=1)
+    lon = np.repeat(np.linspace(-2, 2, N_CROSS_TRACK)[None, :], N_SCANS, axis=0) + lon_center
+    lon[0, 0] = -9999.9  # invalid geolocation
+    with netCDF4.Dataset(filepath, mode="w") as nc:
+        group = nc.createGroup(SCAN_MODE)
+        group.createDimension("nscan", N_SCANS)
+        group.createDimension("nray", N_CROSS_TRACK)
+        group.createVariable("Latitude", "f4", ("nscan", "nray"))[:] = lat
+        group.createVariable("Longitude", "f4", ("nscan", "nray"))[:] = lon
+    return filepath
+
+
+@pytest.fixture()
+def filepaths(tmp_path):
+    """Create fake granules."""
+    return [
+        create_fake_granule(str(tmp_path / "granule_1.HDF5"), lon_center=10),
+        create_fake_granule(str(tmp_path / "granule_2.HDF5"), lon_center=100),
+    ]
+
+
+def test_compute_footprint_bounds():
+    """Test compute_footprint_bounds."""
+    lon = np.array([[0, 1], [2, 3], [np.nan, np.nan], [179, -179], [5, 6]], dtype="float32")
+    lat = np.array([[0, 1], [2, 3], [np.nan, np.nan], [10, 11], [20, 21]], dtype="float32")
+    bounds = compute_footprint_bounds(lon, lat, n_scans_per_block=2)
+    assert bounds.shape == (3, 4)
+    np.testing.assert_allclose(bounds[0], [0, 3, 0, 3])
+    # Block crossing the antimeridian spans all longitudes
+    np.testing.assert_allclose(bounds[1], [-180, 180, 10, 11])
+    # Last block is padded
+    np.testing.assert_allclose(bounds[2], [5, 6, 20, 21])
+
+    # Test block without valid coordinates
+    bounds = compute_footprint_bounds(lon[2:3], lat[2:3], n_scans_per_block=2)
+    assert np.all(np.isnan(bounds))
+
+
+def test_update_footprint_index(tmp_path, filepaths, mocker):
+    """Test update_footprint_index only (re)indexes new or modified granules."""
+    base_dir = str(tmp_path)
+    assert update_footprint_index(filepaths, scan_mode=SCAN_MODE, base_dir=base_dir) == 2
+    assert os.path.exists(footprint.get_footprint_index_filepath(base_dir=base_dir))
+    assert update_footprint_index(filepaths, scan_mode=SCAN_MODE, base_dir=base_dir) == 0
+
+    # Test a modified granule is reindexed
+    stat = os.stat(filepaths[0])
+    os.utime(filepaths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert update_footprint_index(filepaths, scan_mode=SCAN_MODE, base_dir=base_dir) == 1
+
+    # Test unreadable granules are not indexed
+    invalid_filepath = str(tmp_path / "invalid.HDF5")
+    with open(invalid_filepath, "w") as f:
+        f.write("Hello World")
+    assert update_footprint_index([invalid_filepath], scan_mode=SCAN_MODE, base_dir=base_dir) == 0
+
+    # Test another scan mode is indexed separately
+    spy = mocker.spy(footprint, "_read_geolocation")
+    assert update_footprint_index(filepaths, scan_mode="HS", base_dir=base_dir) == 0
+    assert spy.call_count == 2
+
+
+def test_get_along_track_slices(tmp_path, filepaths):
+    """Test get_along_track_slices."""
+    base_dir = str(tmp_path)
+    invalid_filepath = str(tmp_path / "invalid.HDF5")
+    with open(invalid_filepath, "w") as f:
+        f.write("Hello World")
+
+    # Granules not intersecting the extent are discarded
+    extent = [5, 15, 0, 10]
+    dict_slices = get_along_track_slices(
+        [*filepaths, invalid_filepath],
+        scan_mode=SCAN_MODE,
+        extent=extent,
+        base_dir=base_dir,
+    )
+    assert list(dict_slices) == [filepaths[0], invalid_filepath]
+    # Latitudes between 0 and 10 are at scans 60-69 --> block of 50 scans [50, 100)
+    assert dict_slices[filepaths[0]] == slice(50, 100)
+    # Granules not indexed are kept entirely
+    assert dict_slices[invalid_filepath] == slice(None)
+
+    # Test extent intersecting multiple blocks
+    dict_slices = get_along_track_slices(filepaths, scan_mode=SCAN_MODE, extent=[90, 110, -60, 60], base_dir=base_dir)
+    assert dict_slices == {filepaths[1]: slice(0, N_SCANS)}
+
+    # Test extent not intersecting any granule
+    assert get_along_track_slices(filepaths, scan_mode=SCAN_MODE, extent=[-50, -40, 0, 10], base_dir=base_dir) == {}
+
+
+def test_crop_granule():
+    """Test crop_granule."""
+    lat = np.repeat(np.linspace(-60, 60, N_SCANS)[:, None], N_CROSS_TRACK, axis=1)
+    lon = np.repeat(np.linspace(8, 12, N_CROSS_TRACK)[None, :], N_SCANS, axis=0)
+    time = pd.date_range("2020-07-05 00:00:00", periods=N_SCANS, freq="1s").to_numpy()
+    ds = xr.Dataset(
+        data_vars={"var": (("along_track", "cross_track"), np.zeros((N_SCANS, N_CROSS_TRACK)))},
+        coords={
+            "lon": (("along_track", "cross_track"), lon),
+            "lat": (("along_track", "cross_track"), lat),
+            "time": ("along_track", time),
+        },
+    )
+    # Latitudes between 0 and 10 are at scans 60-69
+    extent = [5, 15, 0, 10]
+    ds_cropped = crop_granule(ds, extent=extent, along_track_slice=slice(50, 100))
+    assert ds_cropped.sizes["along_track"] == 10
+    np.testing.assert_allclose(ds_cropped["lat"].isel(cross_track=0).data, lat[60:70, 0])
+
+    # Test time subsetting
+    ds_cropped = crop_granule(ds, extent=extent, start_time=time[62], end_time=time[65])
+    np.testing.assert_equal(ds_cropped["time"].data, time[62:66])
+
+    # Test no scans within extent
+    assert crop_granule(ds, extent=[-50, -40, 0, 10]) is None
+
+    # Test grid datasets are returned unchanged
+    ds_grid = xr.Dataset(coords={"lon": np.arange(3), "lat": np.arange(2)})
+    assert crop_granule(ds_grid, extent=extent) is ds_grid
@@ -36,6 +36,7 @@ from datatree import DataTree
 
 from gpm.dataset import conventions, datatree, granule
 from gpm.dataset.conventions import finalize_dataset
+from gpm.tests.utils.fake_granules import create_fake_granule
 from gpm.utils.time import ensure_time_validity
 
 # Tests for public functions ###################################################
@@ -126,6 +127,16 @@ def test_open_granule(monkeypatch):
     assert list(returned_dataset.coords) == expected_coordinate_keys
 
 
+@pytest.mark.parametrize("variables", [None, "surfacePrecipitation"])
+def test_open_granule_engine(tmp_path, variables):
+    """Test open_granule returns the same dataset with the netcdf4 and h5netcdf engines."""
+    filepath = create_fake_granule(str(tmp_path), datetime(2020, 7, 5), granule_id=36000, n_scans=10, n_pixels=5)
+    ds = granule.open_granule(filepath, variables=variables)
+    ds_h5netcdf = granule.open_granule(filepath, variables=variables, engine="h5netcdf")
+    _ = ds.attrs.pop("history"), ds_h5netcdf.attrs.pop("history")
+    xr.testing.assert_identical(ds, ds_h5netcdf)
+
+
 # Tests for internal functions #################################################
 
 
@@ -269,6 +280,53 @@ def test_get_flattened_scan_mode_dataset():
     )
     assert list(returned_dataset.data_vars) == expected_data_vars
 
+    # Check along-track subsetting
+    dt[scan_mode]["group_1"]["var_4"] = xr.DataArray(np.arange(10), dims="along_track")
+    group = ["group_1"]
+    returned_dataset = granule._get_flattened_scan_mode_dataset(
+        dt,
+        scan_mode,
+        group,
+        along_track_slice=slice(2, 5),
+    )
+    np.testing.assert_equal(returned_dataset["var_4"].data, np.arange(2, 5))
+
+
+def test_get_along_track_slice():
+    """Test _get_along_track_slice."""
+    scan_mode = "FS"
+    time = pd.date_range("2020-07-05 00:00:00", periods=10, freq="1min")
+    ds_time = xr.Dataset(
+        {
+            "Year": ("along_track", time.year),
+            "Month": ("along_track", time.month),
+            "DayOfMonth": ("along_track", time.day),
+            "Hour": ("along_track", time.hour),
+            "Minute": ("along_track", time.minute),
+            "Second": ("along_track", time.second),
+        },
+    )
+    dt = DataTree.from_dict({scan_mode: DataTree.from_dict({"ScanTime": ds_time})})
+
+    # Test time period selection
+    start_time = datetime(2020, 7, 5, 0, 2, 30)
+    end_time = datetime(2020, 7, 5, 0, 5, 0)
+    returned_slice = granule._get_along_track_slice(dt, scan_mode, start_time=start_time, end_time=end_time)
+    assert returned_slice == slice(3, 6)
+
+    # Test time period selection with along_track_slice
+    returned_slice = granule._get_along_track_slice(
+        dt,
+        scan_mode,
+        start_time=start_time,
+        along_track_slice=slice(0, 5),
+    )
+    assert returned_slice == slice(3, 5)
+
+    # Test no scans within the time period
+    returned_slice = granule._get_along_track_slice(dt, scan_mode, start_time=datetime(2021, 1, 1))
+    assert returned_slice is None
+
 
 def test_ensure_time_validity():
     """Test ensure_time_validity."""
@@ -0,0 +1,138 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module test the reference index of multiple grid granules."""
+
+import datetime
+import json
+import os
+
+import pytest
+import xarray as xr
+
+import gpm
+from gpm.dataset.references import open_reference_dataset
+from gpm.io.local import get_local_product_directory
+from gpm.tests.utils.fake_granules import IMERG_TIME_INTERVAL, create_fake_imerg_granule
+
+PRODUCT = "IMERG-FR"
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+N_GRANULES = 4
+
+
+@pytest.fixture()
+def base_dir(tmp_path):
+    """Create a local archive with fake IMERG-FR granules."""
+    base_dir = str(tmp_path)
+    dir_path = get_local_product_directory(
+        base_dir=base_dir,
+        product=PRODUCT,
+        product_type="RS",
+        version=7,
+        date=START_TIME.date(),
+    )
+    os.makedirs(dir_path)
+    for i in range(N_GRANULES):
+        create_fake_imerg_granule(dir_path, START_TIME + i * IMERG_TIME_INTERVAL)
+    with gpm.config.set({"base_dir": base_dir}):
+        yield base_dir
+
+
+def _open_dataset(start_time="2020-07-05 00:00:00", end_time="2020-07-05 02:00:00", **kwargs):
+    ds = gpm.open_dataset(PRODUCT, start_time=start_time, end_time=end_time, **kwargs)
+    _ = ds.attrs.pop("history")
+    return ds.compute()
+
+
+@pytest.mark.parametrize("extension", [".json", ".parquet"])
+def test_build_reference_index(base_dir, extension):
+    """Test build_reference_index writes the references of all granules."""
+    filepath = os.path.join(base_dir, f"references{extension}")
+    assert gpm.build_reference_index(PRODUCT, START_TIME, "2020-07-05 02:00:00", filepath=filepath) == filepath
+    assert os.path.exists(filepath)
+
+    # Test the default reference index filepath
+    filepath = gpm.build_reference_index(PRODUCT, START_TIME, "2020-07-05 02:00:00")
+    assert filepath.startswith(os.path.join(base_dir, "GPM", "References", "RS", PRODUCT))
+    with open(filepath) as f:
+        refs = json.load(f)["refs"]
+    attrs = json.loads(refs[".zattrs"])
+    assert len(attrs["gpm_granules_filename"]) == N_GRANULES
+    assert attrs["gpm_granules_start_time"][1] == "2020-07-05T00:30:00.000"
+    assert json.loads(refs["Grid/precipitation/.zarray"])["shape"] == [N_GRANULES, 36, 18]
+    assert "Grid/precipitation/3.0.1" in refs
+    assert json.loads(refs["Grid/lon/.zarray"])["shape"] == [36]
+
+
+@pytest.mark.parametrize("extension", [".json", ".parquet"])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"variables": "precipitation"},
+        {"groups": "Intermediate"},
+        {"start_time": "2020-07-05 00:40:00", "end_time": "2020-07-05 01:40:00"},
+    ],
+)
+def test_open_dataset_from_references(base_dir, extension, kwargs):
+    """Test open_dataset returns the same dataset with and without the reference index."""
+    filepath = gpm.build_reference_index(
+        PRODUCT,
+        START_TIME,
+        "2020-07-05 02:00:00",
+        filepath=os.path.join(base_dir, f"references{extension}"),
+    )
+    ds_expected = _open_dataset(**kwargs)
+    ds = _open_dataset(from_references=filepath, **kwargs)
+    xr.testing.assert_identical(ds, ds_expected)
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_open_dataset_from_references_native_chunks():
+    """Test the reference index preserves the native chunks across the granules."""
+    filepath = gpm.build_reference_index(PRODUCT, START_TIME, "2020-07-05 02:00:00")
+    ds = gpm.open_dataset(PRODUCT, START_TIME, "2020-07-05 02:00:00", from_references=filepath, chunks={})
+    assert ds["precipitation"].data.chunks == ((1,) * N_GRANULES, (9, 9), (36,))
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_reference_index_errors():
+    """Test the reference index errors."""
+    # Orbit products can not be concatenated virtually
+    with pytest.raises(ValueError, match="only for grid products"):
+        gpm.build_reference_index("2A-DPR", START_TIME, "2020-07-05 02:00:00")
+
+    # Reference index of another product
+    filepath = gpm.build_reference_index(PRODUCT, START_TIME, "2020-07-05 02:00:00")
+    with pytest.raises(ValueError, match="refers to the 'IMERG-FR' product"):
+        open_reference_dataset(filepath, product="IMERG-ER", scan_mode="Grid")
+
+    # No granules within the requested time period
+    with pytest.raises(ValueError, match="no granules within the requested time period"):
+        gpm.open_dataset(PRODUCT, "2020-07-06 00:00:00", "2020-07-06 02:00:00", from_references=filepath)
+
+    # Missing reference index
+    with pytest.raises(FileNotFoundError):
+        gpm.open_dataset(PRODUCT, START_TIME, "2020-07-05 02:00:00", from_references="references.json")
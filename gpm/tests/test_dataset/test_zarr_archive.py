@@ -0,0 +1,182 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module test the conversion of GPM granules into a Zarr archive."""
+
+import datetime
+import os
+
+import netCDF4
+import pytest
+import xarray as xr
+from xarray.coding.variables import SerializationWarning
+
+import gpm
+from gpm.dataset import zarr_archive
+from gpm.io.local import get_local_product_directory
+from gpm.tests.utils.fake_granules import (
+    IMERG_TIME_INTERVAL,
+    ORBIT_DURATION,
+    create_fake_granule,
+    create_fake_imerg_granule,
+)
+
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+ORBIT_PERIOD = ("2020-07-05 00:10:00", "2020-07-05 04:00:00")
+GRID_PERIOD = ("2020-07-05 00:00:00", "2020-07-05 02:00:00")
+
+
+@pytest.fixture()
+def base_dir(tmp_path):
+    """Create a local archive with fake 2A-GMI and IMERG-FR granules."""
+    base_dir = str(tmp_path)
+    date = START_TIME.date()
+    dir_path = get_local_product_directory(base_dir, product="2A-GMI", product_type="RS", version=7, date=date)
+    os.makedirs(dir_path)
+    for i in range(3):
+        create_fake_granule(dir_path, START_TIME + i * ORBIT_DURATION, granule_id=36000 + i, n_scans=300, n_pixels=20)
+    dir_path = get_local_product_directory(base_dir, product="IMERG-FR", product_type="RS", version=7, date=date)
+    os.makedirs(dir_path)
+    for i in range(4):
+        create_fake_imerg_granule(dir_path, START_TIME + i * IMERG_TIME_INTERVAL)
+    with gpm.config.set({"base_dir": base_dir, "warn_non_contiguous_scans": False}):
+        yield base_dir
+
+
+def _open_dataset(product, period, **kwargs):
+    ds = gpm.open_dataset(product, start_time=period[0], end_time=period[1], **kwargs)
+    _ = ds.attrs.pop("history")
+    return ds.compute()
+
+
+@pytest.mark.usefixtures("base_dir")
+@pytest.mark.parametrize(("product", "period"), [("2A-GMI", ORBIT_PERIOD), ("IMERG-FR", GRID_PERIOD)])
+def test_to_zarr_archive(product, period):
+    """Test open_dataset returns the same dataset from the HDF5 granules and from the Zarr archive."""
+    store = gpm.to_zarr_archive(product, *period)
+    assert store.endswith(f"{product}.V07.{'Grid' if product == 'IMERG-FR' else 'S1'}.zarr")
+    xr.testing.assert_identical(
+        _open_dataset(product, period, storage="ZARR"),
+        _open_dataset(product, period),
+    )
+
+    # Subset the time period
+    period = ("2020-07-05 00:40:00", "2020-07-05 01:40:00")
+    xr.testing.assert_identical(
+        _open_dataset(product, period, storage="ZARR"),
+        _open_dataset(product, period),
+    )
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_to_zarr_archive_chunks():
+    """Test the Zarr archive chunks."""
+    store = gpm.to_zarr_archive("2A-GMI", *ORBIT_PERIOD, chunks={"along_track": 100})
+    ds = xr.open_zarr(store, consolidated=True)
+    assert ds["surfacePrecipitation"].data.chunks == ((20,), (100,) * 9)
+
+
+def test_to_zarr_archive_restart(base_dir, monkeypatch):
+    """Test the conversion restarts after an interruption and extends an existing archive."""
+    expected_ds = _open_dataset("IMERG-FR", GRID_PERIOD)
+
+    # Interrupt the conversion after the second granule has been appended
+    write_progress = zarr_archive._write_progress
+
+    def interrupted_write_progress(store, filenames, sizes):
+        if len(filenames) == 2:
+            raise KeyboardInterrupt
+        write_progress(store, filenames=filenames, sizes=sizes)
+
+    monkeypatch.setattr(zarr_archive, "_write_progress", interrupted_write_progress)
+    with pytest.raises(KeyboardInterrupt):
+        gpm.to_zarr_archive("IMERG-FR", "2020-07-05 00:00:00", "2020-07-05 01:00:00")
+    monkeypatch.setattr(zarr_archive, "_write_progress", write_progress)
+
+    # Restart the conversion and extend the archive
+    store = gpm.to_zarr_archive("IMERG-FR", *GRID_PERIOD)
+    assert zarr_archive._read_progress(store)["gpm_granules_size"] == [1, 1, 1, 1]
+    xr.testing.assert_identical(_open_dataset("IMERG-FR", GRID_PERIOD, storage="ZARR"), expected_ds)
+
+    # Granules preceding the last ingested granule can not be appended
+    start_time = START_TIME - IMERG_TIME_INTERVAL
+    dir_path = get_local_product_directory(base_dir, "IMERG-FR", product_type="RS", version=7, date=start_time.date())
+    os.makedirs(dir_path)
+    create_fake_imerg_granule(dir_path, start_time)
+    with pytest.raises(ValueError, match="following the last ingested granule"):
+        gpm.to_zarr_archive("IMERG-FR", "2020-07-04 23:00:00", "2020-07-05 02:00:00", store=store)
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_to_zarr_archive_extend_within_granule():
+    """Test extending an archive whose time period ends within a granule does not leave a gap."""
+    store = gpm.to_zarr_archive("2A-GMI", ORBIT_PERIOD[0], "2020-07-05 02:00:00")
+    store = gpm.to_zarr_archive("2A-GMI", *ORBIT_PERIOD)
+    assert zarr_archive._read_progress(store)["gpm_granules_size"] == [300, 300, 300]
+    xr.testing.assert_identical(
+        _open_dataset("2A-GMI", ORBIT_PERIOD, storage="ZARR"),
+        _open_dataset("2A-GMI", ORBIT_PERIOD),
+    )
+
+
+def test_to_zarr_archive_empty_granule(base_dir, recwarn):
+    """Test the empty granules are recorded and the archive can be extended."""
+    dir_path = get_local_product_directory(base_dir, "2A-GMI", product_type="RS", version=7, date=START_TIME.date())
+    filepath = sorted(os.listdir(dir_path))[1]
+    with netCDF4.Dataset(os.path.join(dir_path, filepath), mode="a") as nc:
+        nc.setncattr("FileHeader", "GranuleNumber=36001;\nEmptyGranule=EMPTY;\nAlgorithmID=2AGPROF;\n")
+    store = gpm.to_zarr_archive("2A-GMI", ORBIT_PERIOD[0], "2020-07-05 02:00:00")
+    progress = zarr_archive._read_progress(store)
+    assert progress["gpm_granules_filename"][1] == filepath
+    assert progress["gpm_granules_size"] == [300, 0]
+    store = gpm.to_zarr_archive("2A-GMI", *ORBIT_PERIOD)
+    assert zarr_archive._read_progress(store)["gpm_granules_size"] == [300, 0, 300]
+    assert not any(issubclass(warning.category, SerializationWarning) for warning in recwarn)
+
+
+def test_to_zarr_archive_parallel(base_dir):
+    """Test the granules are decoded in a pool of processes."""
+    store = gpm.to_zarr_archive("IMERG-FR", *GRID_PERIOD, store=os.path.join(base_dir, "imerg.zarr"), parallel=True)
+    xr.testing.assert_identical(
+        xr.open_zarr(store, consolidated=True)["precipitation"].compute(),
+        _open_dataset("IMERG-FR", GRID_PERIOD)["precipitation"],
+    )
+
+
+@pytest.mark.usefixtures("base_dir")
+def test_open_dataset_zarr_storage_errors():
+    """Test open_dataset errors with storage='ZARR'."""
+    with pytest.raises(ValueError, match="does not exist"):
+        gpm.open_dataset("IMERG-FR", *GRID_PERIOD, storage="ZARR")
+    with pytest.raises(ValueError, match="invalid 'storage'"):
+        gpm.open_dataset("IMERG-FR", *GRID_PERIOD, storage="PPS")
+
+    gpm.to_zarr_archive("IMERG-FR", *GRID_PERIOD)
+    with pytest.raises(ValueError, match="'groups' can not be specified"):
+        gpm.open_dataset("IMERG-FR", *GRID_PERIOD, storage="ZARR", groups="Intermediate")
+    with pytest.raises(ValueError, match="does not contain the variables"):
+        gpm.open_dataset("IMERG-FR", *GRID_PERIOD, storage="ZARR", variables="dummy")
+    with pytest.raises(ValueError, match="no data within the requested time period"):
+        gpm.open_dataset("IMERG-FR", "2020-07-06 00:00:00", "2020-07-06 02:00:00", storage="ZARR")
@@ -0,0 +1,168 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module test the local granules catalog."""
+
+import datetime
+import os
+
+import pytest
+
+import gpm
+from gpm.io import catalog
+from gpm.io.find import find_filepaths
+from gpm.io.local import get_local_filepaths, get_local_product_directory
+
+PRODUCT = "2A-DPR"
+FILENAMES = [
+    "2A.GPM.DPR.V9-20211125.20200704-S233000-E010232.036086.V07A.HDF5",
+    "2A.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5",
+    "2A.GPM.DPR.V9-20211125.20200705-S183318-E200550.036093.V07A.HDF5",
+    "2A.GPM.DPR.V9-20211125.20200706-S200551-E213823.036110.V07A.HDF5",
+]
+
+
+def create_fake_granule(base_dir, filename, product=PRODUCT, product_type="RS", version=7):
+    """Create a fake granule in the local archive."""
+    from gpm.io.info import get_start_time_from_filepaths
+
+    date = get_start_time_from_filepaths(filename)[0].date()
+    dir_path = get_local_product_directory(
+        base_dir=base_dir,
+        product=product,
+        product_type=product_type,
+        version=version,
+        date=date,
+    )
+    os.makedirs(dir_path, exist_ok=True)
+    filepath = os.path.join(dir_path, filename)
+    with open(filepath, "w") as f:
+        f.write("Hello World")
+    return filepath
+
+
+@pytest.fixture()
+def base_dir(tmp_path):
+    """Create a local archive with fake granules."""
+    base_dir = str(tmp_path)
+    for filename in FILENAMES:
+        create_fake_granule(base_dir, filename)
+    # Add a file which is not a GPM granule
+    dir_path = os.path.dirname(create_fake_granule(base_dir, FILENAMES[0]))
+    with open(os.path.join(dir_path, "dummy.txt"), "w") as f:
+        f.write("Hello World")
+    return base_dir
+
+
+def test_update(base_dir):
+    """Test the catalog update rescans only modified directories."""
+    assert catalog.update(base_dir=base_dir) == 3
+    assert os.path.exists(catalog.get_catalog_filepath(base_dir))
+    # No directory changed
+    assert catalog.update(base_dir=base_dir) == 0
+
+    # Add a new granule
+    filepath = create_fake_granule(base_dir, "2A.GPM.DPR.V9-20211125.20200706-S213824-E231056.036111.V07A.HDF5")
+    assert catalog.update(product=PRODUCT, base_dir=base_dir) == 1
+    records = catalog.get_records(PRODUCT, base_dir=base_dir, update_catalog=False)
+    assert filepath in [record["filepath"] for record in records]
+
+    # Remove a directory
+    os.remove(filepath)
+    os.remove(filepath.replace("S213824-E231056.036111", "S200551-E213823.036110"))
+    os.rmdir(os.path.dirname(filepath))
+    catalog.update(base_dir=base_dir)
+    records = catalog.get_records(PRODUCT, base_dir=base_dir, update_catalog=False)
+    assert len(records) == 3
+
+
+def test_get_records(base_dir):
+    """Test the catalog records content."""
+    records = catalog.get_records(PRODUCT, base_dir=base_dir)
+    assert [os.path.basename(record["filepath"]) for record in records] == FILENAMES
+    record = records[1]
+    assert record["product"] == PRODUCT
+    assert record["product_type"] == "RS"
+    assert record["version"] == "V07A"
+    assert record["granule_id"] == 36092
+    assert record["file_size"] == 11
+    assert record["start_time"] == datetime.datetime(2020, 7, 5, 17, 0, 44)
+    assert record["end_time"] == datetime.datetime(2020, 7, 5, 18, 33, 17)
+
+
+@pytest.mark.parametrize(
+    ("start_time", "end_time", "expected_indices"),
+    [
+        (datetime.datetime(2020, 7, 5, 0, 0, 0), datetime.datetime(2020, 7, 5, 0, 10, 0), [0]),
+        (datetime.datetime(2020, 7, 5, 17, 0, 0), datetime.datetime(2020, 7, 5, 19, 0, 0), [1, 2]),
+        (datetime.datetime(2020, 7, 5, 12, 0, 0), datetime.datetime(2020, 7, 7, 0, 0, 0), [1, 2, 3]),
+        (datetime.datetime(2020, 7, 8, 0, 0, 0), datetime.datetime(2020, 7, 9, 0, 0, 0), []),
+    ],
+)
+def test_find_filepaths_with_catalog(base_dir, start_time, end_time, expected_indices):
+    """Test find_filepaths returns the same filepaths with and without the catalog."""
+    kwargs = {
+        "storage": "LOCAL",
+        "product": PRODUCT,
+        "start_time": start_time,
+        "end_time": end_time,
+        "version": 7,
+        "verbose": False,
+        "parallel": False,
+    }
+    with gpm.config.set({"base_dir": base_dir}):
+        expected_filepaths = find_filepaths(**kwargs)
+        with gpm.config.set({"use_local_catalog": True}):
+            filepaths = find_filepaths(**kwargs)
+    assert filepaths == expected_filepaths
+    assert [os.path.basename(filepath) for filepath in filepaths] == [FILENAMES[i] for i in expected_indices]
+
+
+def test_find_filepaths_with_catalog_groups(base_dir):
+    """Test find_filepaths grouping with the catalog."""
+    kwargs = {
+        "storage": "LOCAL",
+        "product": PRODUCT,
+        "start_time": datetime.datetime(2020, 7, 1),
+        "end_time": datetime.datetime(2020, 7, 10),
+        "version": 7,
+        "groups": ["day", "granule_id"],
+        "parallel": False,
+    }
+    with gpm.config.set({"base_dir": base_dir}):
+        expected_dict = find_filepaths(**kwargs)
+        with gpm.config.set({"use_local_catalog": True}):
+            filepaths_dict = find_filepaths(**kwargs)
+    assert filepaths_dict == expected_dict
+
+
+def test_get_local_filepaths_with_catalog(base_dir):
+    """Test get_local_filepaths with the catalog only returns GPM granules."""
+    with gpm.config.set({"base_dir": base_dir, "use_local_catalog": True}):
+        filepaths = get_local_filepaths(product=PRODUCT, version=7)
+        assert [os.path.basename(filepath) for filepath in filepaths] == FILENAMES
+        filepaths_dict = get_local_filepaths(product=PRODUCT, version=7, groups="day")
+        assert list(filepaths_dict) == ["4", "5", "6"]
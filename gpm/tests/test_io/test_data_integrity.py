@@ -25,13 +25,16 @@
 
 # -----------------------------------------------------------------------------.
 """This module test the data integrity checks."""
+import concurrent.futures
 import datetime
 import os
 
 import pytest
 import xarray as xr
 from pytest_mock.plugin import MockerFixture
+from xarray.backends.locks import HDF5_LOCK
 
+import gpm
 from gpm.io import data_integrity as di
 
 
@@ -181,3 +184,76 @@ def test_check_archive_integrity(
             verbose=verbose,
         )
         assert l_corrupted == filepaths
+
+
+def _create_granule_file(filepath, file_header="DOI=10.5067/GPM/DPR/GPM/2A/07;"):
+    """Write a small HDF5 file with a FileHeader root attribute."""
+    ds = xr.Dataset({"var": ("x", list(range(1000)))})
+    ds.attrs["FileHeader"] = file_header
+    ds.to_netcdf(filepath, engine="netcdf4")
+
+
+def test_get_file_corruption(tmpdir: str) -> None:
+    """Test get_file_corruption detects invalid, truncated and missing files."""
+    filepath = os.path.join(tmpdir, "granule.HDF5")
+    _create_granule_file(filepath)
+    assert di.get_file_corruption(filepath) is None
+
+    # Test truncated file (also only of few bytes)
+    file_size = os.path.getsize(filepath)
+    with open(filepath, "r+b") as f:
+        f.truncate(file_size - 10)
+    assert di.get_file_corruption(filepath).startswith("truncated file")
+
+    # Test invalid signature
+    filepath = os.path.join(tmpdir, "dummy.HDF5")
+    _write_dummy_file(filepath)
+    assert di.get_file_corruption(filepath) == "invalid HDF5 signature"
+
+    # Test empty file
+    open(filepath, "w").close()
+    assert di.get_file_corruption(filepath) == "empty file"
+
+    # Test missing file
+    assert di.get_file_corruption(os.path.join(tmpdir, "missing.HDF5")).startswith("unreadable file")
+
+
+def test_get_file_corruption_xarray_lock(tmpdir: str) -> None:
+    """Test the FileHeader attribute is read under the HDF5 lock of the xarray netCDF4 backend."""
+    filepath = os.path.join(tmpdir, "granule.HDF5")
+    _create_granule_file(filepath)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        with HDF5_LOCK:
+            future = executor.submit(di.get_file_corruption, filepath)
+            with pytest.raises(concurrent.futures.TimeoutError):
+                future.result(timeout=0.2)
+        assert future.result(timeout=10) is None
+
+
+def test_get_corrupted_filepaths_ledger(tmpdir: str, mocker: MockerFixture) -> None:
+    """Test get_corrupted_filepaths does not check again the unchanged files."""
+    base_dir = os.path.join(tmpdir, "base_dir")
+    filepaths = [os.path.join(tmpdir, f"granule_{i}.HDF5") for i in range(3)]
+    for filepath in filepaths:
+        _create_granule_file(filepath)
+    _write_dummy_file(filepaths[2])
+
+    with gpm.config.set({"base_dir": base_dir}):
+        spy = mocker.spy(di, "get_file_corruption")
+        assert di.get_corrupted_filepaths(filepaths, max_workers=2) == [filepaths[2]]
+        assert spy.call_count == 3
+        assert os.path.exists(di.get_integrity_ledger_filepath())
+
+        # Test the unchanged files are not checked again
+        assert di.get_corrupted_filepaths(filepaths) == [filepaths[2]]
+        assert spy.call_count == 3
+
+        # Test the modified files are checked again
+        _create_granule_file(filepaths[2])
+        assert di.get_corrupted_filepaths(filepaths) == []
+        assert spy.call_count == 4
+
+        # Test clearing the ledger
+        di.clear_integrity_ledger()
+        assert di.get_corrupted_filepaths(filepaths) == []
+        assert spy.call_count == 7
@@ -25,6 +25,7 @@
 
 # -----------------------------------------------------------------------------.
 """This module test the download routines."""
+
 import datetime
 import os
 import platform
@@ -33,6 +34,7 @@ from typing import Any
 from unittest.mock import patch
 
 import pytest
+import xarray as xr
 from pytest_mock.plugin import MockerFixture
 
 import gpm.configs
@@ -198,8 +200,8 @@ class TestDownloadUtility:
     @pytest.mark.parametrize("progress_bar", [True, False])
     @pytest.mark.parametrize(
         "n_threads",
-        [0, 1, 2, 20],
-    )  # [Error, Single, Multiple Threads, n_threads > n_commands]
+        [0, 1, 2, 20, "auto"],
+    )  # [Error, Single, Multiple Threads, n_threads > n_commands, Adaptive]
     def test_run(self, mocker: MockerFixture, verbose, progress_bar, n_threads) -> None:
         """Test run function."""
         commands = [
@@ -286,7 +288,7 @@ def test_check_download_status(
         assert dl._check_download_status([1, 0, 1], product, True) is True  # Some failed download
 
 
-@pytest.mark.parametrize("transfer_tool", ["WGET", "CURL"])
+@pytest.mark.parametrize("transfer_tool", ["WGET", "CURL", "PYTHON"])
 @pytest.mark.parametrize("storage", ["PPS", "GES_DISC"])
 def test_private_download_files(
     remote_filepaths: dict[str, dict[str, Any]],
@@ -303,8 +305,9 @@ def test_private_download_files(
     if platform.system() == "Windows" and transfer_tool == "WGET":
         return
 
-    # Don't actually download anything, so mock the run function
+    # Don't actually download anything, so mock the run functions
     mocker.patch.object(dl, "run", autospec=True, return_value=None)
+    mocker.patch.object(dl, "run_transfers", autospec=True, return_value=None)
 
     mock_config = {
         "username_pps": "test_username_pps",
@@ -380,6 +383,32 @@ def test_download_files(
     assert dl.download_files(filepaths=list(remote_filepaths.keys())) is None
 
 
+def test_filter_download_list(tmp_path) -> None:
+    """Test filter_download_list keeps missing, empty and truncated files."""
+    ds = xr.Dataset({"var": ("x", list(range(1000)))})
+    filenames = ["complete.HDF5", "truncated.HDF5", "empty.HDF5", "missing.HDF5"]
+    local_filepaths = [str(tmp_path / filename) for filename in filenames]
+    remote_filepaths = [f"https://server/{filename}" for filename in filenames]
+    ds.to_netcdf(local_filepaths[0])
+    ds.to_netcdf(local_filepaths[1])
+    with open(local_filepaths[1], "r+b") as f:
+        f.truncate(os.path.getsize(local_filepaths[0]) - 10)
+    open(local_filepaths[2], "w").close()
+
+    new_remote_filepaths, new_local_filepaths = dl.filter_download_list(
+        remote_filepaths=remote_filepaths,
+        local_filepaths=local_filepaths,
+    )
+    assert new_remote_filepaths == remote_filepaths[1:]
+    assert new_local_filepaths == local_filepaths[1:]
+
+    # Test force_download=True
+    assert dl.filter_download_list(remote_filepaths, local_filepaths, force_download=True) == (
+        remote_filepaths,
+        local_filepaths,
+    )
+
+
 @pytest.mark.parametrize("storage", ["PPS", "GES_DISC"])
 def test__download_daily_data(
     versions: list[str],
@@ -504,9 +533,6 @@ class TestDownloadArchive:
         # Mock download status as failed
         mocker.patch.object(dl, "_check_download_status", autospec=True, return_value=False)
 
-        # Mock file integrity check as passed
-        mocker.patch.object(dl, "check_archive_integrity", autospec=True, return_value=[])
-
         dl.download_archive(
             product=product,
             start_time=start_time,
@@ -532,68 +558,3 @@ def test_download_monthly_data(mocker: MockerFixture):
         month=2,
     )
     assert l_corrupted == []
-
-
-@pytest.mark.parametrize("verbose", [True, False])
-@pytest.mark.parametrize("remove_corrupted", [True, False])
-@pytest.mark.parametrize("retry", [0, 1])
-@pytest.mark.parametrize("filepaths", [["some_corrupted_filepaths"], []])
-def test_ensure_files_completness(
-    mocker: MockerFixture,
-    verbose,
-    remove_corrupted,
-    retry,
-    filepaths,
-):
-    """Test _ensure_files_completness."""
-    # Patch download functions as to not actually download anything
-    mocker.patch.object(dl, "download_files", autospec=True, return_value=filepaths)
-    mocker.patch.object(dl, "check_filepaths_integrity", autospec=True, return_value=filepaths)
-
-    # Ensure completeness
-    l_corrupted = dl._ensure_files_completness(
-        filepaths=filepaths,
-        retry=retry,
-        remove_corrupted=remove_corrupted,
-        verbose=verbose,
-        # Dummy
-        product_type="RS",
-        transfer_tool="WGET",
-        n_threads=1,
-        progress_bar=True,
-    )
-    assert l_corrupted == filepaths
-
-
-@pytest.mark.parametrize("verbose", [True, False])
-@pytest.mark.parametrize("remove_corrupted", [True, False])
-@pytest.mark.parametrize("retry", [0, 1])
-@pytest.mark.parametrize("filepaths", [["some_corrupted_filepaths"], []])
-def test_ensure_archive_completness(
-    mocker: MockerFixture,
-    verbose,
-    remove_corrupted,
-    retry,
-    filepaths,
-):
-    """Test _ensure_archive_completness."""
-    # Patch download functions as to not actually download anything
-    mocker.patch.object(dl, "download_files", autospec=True, return_value=filepaths)
-    mocker.patch.object(dl, "check_archive_integrity", autospec=True, return_value=filepaths)
-
-    # Ensure completeness
-    l_corrupted = dl._ensure_archive_completness(
-        retry=retry,
-        remove_corrupted=remove_corrupted,
-        verbose=verbose,
-        # Dummy
-        product="dummy",
-        start_time="dummy",
-        end_time="dummy",
-        version=7,
-        product_type="RS",
-        transfer_tool="WGET",
-        n_threads=1,
-        progress_bar=True,
-    )
-    assert l_corrupted == filepaths
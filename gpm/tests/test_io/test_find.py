@@ -25,6 +25,7 @@
 
 # -----------------------------------------------------------------------------.
 """This module test the file search routines."""
+
 import datetime
 import os
 from typing import Any
@@ -529,6 +530,8 @@ def test_find_filepaths(
         autospec=True,
         side_effect=mock_find_daily_filepaths,
     )
+    # Mock the concurrent listing of the PPS directories
+    mocker.patch.object(find, "_get_daily_listings", return_value={})
 
     kwargs = {
         "storage": storage,
@@ -29,6 +29,7 @@
 import datetime
 from typing import Any
 
+import pandas as pd
 import pytest
 
 from gpm.io.info import (
@@ -45,6 +46,7 @@ from gpm.io.info import (
     get_time_component,
     get_version_from_filepaths,
     group_filepaths,
+    parse_filepaths,
 )
 
 
@@ -141,6 +143,46 @@ def test_invalid_filepaths():
         get_info_from_filepath(123)
 
 
+def test_parse_filepaths(
+    remote_filepaths: dict[str, dict[str, Any]],
+) -> None:
+    """Test parse_filepaths returns the same information of get_info_from_filepath."""
+    filepaths = list(remote_filepaths)
+    df = parse_filepaths(filepaths)
+    assert df["filepath"].tolist() == filepaths
+    assert list(df.columns) == ["filepath", *FILE_KEYS]
+    for i, filepath in enumerate(filepaths):
+        info_dict = get_info_from_filepath(filepath)
+        row = df.iloc[i]
+        for key in FILE_KEYS:
+            expected_value = info_dict.get(key, None)
+            value = None if pd.isna(row[key]) else row[key]
+            assert value == expected_value, f"Different {key} for {filepath}"
+
+
+def test_parse_filepaths_invalid():
+    """Test parse_filepaths with invalid filenames."""
+    filepaths = [
+        "invalid_filepath",
+        "2A.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5",
+        # Invalid JAXA product type
+        "GPMCOR_KAR_2007050002_0135_036081_1B😵_DAB_07A.h5",
+        # Unknown product
+        "😥.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5",
+        # Invalid date
+        "2A.GPM.DPR.V9-20211125.20201305-S170044-E183317.036092.V07A.HDF5",
+    ]
+    with pytest.raises(ValueError, match="Impossible to infer file information"):
+        parse_filepaths(filepaths)
+
+    df = parse_filepaths(filepaths, on_error="ignore")
+    assert df["product"].isna().tolist() == [True, False, True, True, True]
+    assert df["start_time"].isna().tolist() == [True, False, True, True, True]
+
+    with pytest.raises(ValueError):
+        parse_filepaths(filepaths, on_error="invalid")
+
+
 def test_check_groups():
     """Test check_groups function."""
     valid_groups = ["product_level", "satellite", "sensor", "year"]
@@ -205,3 +247,25 @@ def test_group_filepaths():
 
     # Test all file keys pass
     assert group_filepaths(filepaths, FILE_KEYS)
+
+    # Test results are equal to the values returned by get_time_component
+    for key in TIME_KEYS:
+        expected_keys = [
+            get_time_component(get_info_from_filepath(filepath)["start_time"], component=key) for filepath in filepaths
+        ]
+        assert list(group_filepaths(filepaths, key)) == list(dict.fromkeys(expected_keys))
+
+    # Test missing keys
+    assert list(group_filepaths(filepaths, "granule_id")) == [8090, "granule_id=None", 37875, 660]
+    assert list(group_filepaths(filepaths, ["satellite", "granule_id"])) == [
+        "GPM/8090",
+        "GPM/granule_id=None",
+        "GPM/37875",
+        "MS/660",
+    ]
+
+    # Test start_time is returned as datetime.datetime
+    assert list(group_filepaths([filepaths[0]], "start_time")) == [datetime.datetime(2015, 8, 1, 14, 46, 42)]
+
+    # Test empty list
+    assert group_filepaths([], "year") == {}
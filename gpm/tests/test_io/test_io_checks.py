@@ -182,6 +182,24 @@ def test_check_storage() -> None:
         checks.check_storage(123)
 
 
+def test_check_engine(mocker: MockerFixture) -> None:
+    """Test check_engine()."""
+    assert checks.check_engine("netcdf4") == "netcdf4"
+    assert checks.check_engine("h5netcdf") == "h5netcdf"
+
+    # Check invalid engine
+    with pytest.raises(ValueError):
+        checks.check_engine("h5py")
+
+    with pytest.raises(TypeError):
+        checks.check_engine(None)
+
+    # Check h5netcdf not installed
+    mocker.patch("importlib.util.find_spec", return_value=None)
+    with pytest.raises(ImportError):
+        checks.check_engine("h5netcdf")
+
+
 def test_check_remote_storage() -> None:
     """Test check_remote_storage()."""
     # Check valid storage
@@ -212,12 +230,25 @@ def test_check_transfer_tool_availability(mocker: MockerFixture):
     assert not checks.check_transfer_tool_availability("wget")
 
 
+def test_check_n_threads():
+    """Test check_n_threads()."""
+    assert checks.check_n_threads(4) == 4
+    assert checks.check_n_threads("AUTO") == "auto"
+    with pytest.raises(ValueError):
+        checks.check_n_threads("invalid")
+    with pytest.raises(TypeError):
+        checks.check_n_threads(4.0)
+
+
 def test_check_transfer_tool():
     """Test check_transfer_tool()."""
     # Assert "CURL" is available and return "CURL"
     transfer_tool = "CURL"  # "WGET" is not mandatory
     assert checks.check_transfer_tool(transfer_tool=transfer_tool) == transfer_tool
 
+    # Assert "PYTHON" does not require external tools
+    assert checks.check_transfer_tool(transfer_tool="python") == "PYTHON"
+
     # Test the function with an invalid transfer tool
     invalid_tool = "invalid_tool"
     with pytest.raises(ValueError) as exc_info:
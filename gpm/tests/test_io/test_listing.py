@@ -0,0 +1,166 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module test the concurrent lister of the remote directories."""
+
+import asyncio
+import datetime
+import os
+import sqlite3
+import time
+
+import pytest
+
+import gpm
+from gpm.io import listing, pps
+from gpm.io.find import find_filepaths
+from gpm.tests.utils.servers import LocalHTTPServer, start_server, stop_server
+
+N_DIRECTORIES = 12
+FILENAME = "2A.GPM.DPR.V9-20211125.20200705-S170044-E183317.036092.V07A.HDF5"
+
+
+@pytest.fixture()
+def remote_dir(tmp_path):
+    """Directory with the directory listings served by the stand-in server."""
+    remote_dir = tmp_path / "remote"
+    for i in range(N_DIRECTORIES):
+        os.makedirs(remote_dir / f"dir_{i}")
+        (remote_dir / f"dir_{i}" / "index.html").write_text(f"file_{i}.HDF5")
+    # PPS text server
+    pps_dir = remote_dir / "text" / "gpmdata" / "2020" / "07" / "05" / "radar"
+    os.makedirs(pps_dir)
+    (pps_dir / "index.html").write_text(f"/gpmdata/2020/07/05/radar/{FILENAME}\n")
+    return remote_dir
+
+
+@pytest.fixture()
+def http_server(remote_dir):
+    server = start_server(LocalHTTPServer(remote_dir, username="user", password="password"))
+    yield server
+    stop_server(server)
+
+
+def test_get_listing_ttl():
+    """Test the time to live of the directory listings."""
+    today = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    assert listing.get_listing_ttl("NRT", datetime.datetime(2020, 7, 5)) == listing.NRT_TTL
+    assert listing.get_listing_ttl("RS", datetime.datetime(2020, 7, 5)) == listing.FINALIZED_TTL
+    assert listing.get_listing_ttl("RS", today) == listing.RECENT_TTL
+    assert listing.get_listing_ttl("RS", today.date() - datetime.timedelta(days=2)) == listing.RECENT_TTL
+    # Test the finalized delay depends on the product latency
+    date = today.date() - datetime.timedelta(days=60)
+    assert listing.get_listing_ttl("RS", date, product="2A-DPR") == listing.FINALIZED_TTL
+    assert listing.get_listing_ttl("RS", date, product="IMERG-FR") == listing.RECENT_TTL
+
+
+def test_fetch_listings(http_server):
+    """Test that the directories are listed concurrently over a limited number of connections."""
+    urls = [f"{http_server.url}/dir_{i}/" for i in range(N_DIRECTORIES)]
+    results = listing.fetch_listings([*urls, f"{http_server.url}/missing/"], max_concurrency=4)
+    assert [results[url] for url in urls] == [(200, f"file_{i}.HDF5") for i in range(N_DIRECTORIES)]
+    assert results[f"{http_server.url}/missing/"][0] == 404
+    assert 1 <= http_server.n_connections <= 4
+
+    # Test urls which can not be listed are discarded
+    assert listing.fetch_listings(["http://127.0.0.1:1/dir_0/"]) == {}
+
+    # Test listing from a running event loop (i.e. Jupyter)
+    async def fetch():
+        return listing.fetch_listings(urls[:2])
+
+    assert asyncio.run(fetch()) == {url: results[url] for url in urls[:2]}
+
+
+def test_get_listings_cache(http_server, tmp_path):
+    """Test that the cached listings are reused until they expire."""
+    urls = [f"{http_server.url}/dir_{i}/" for i in range(N_DIRECTORIES)]
+    expected_listings = {url: f"file_{i}.HDF5" for i, url in enumerate(urls)}
+    ttls = {url: 3600 if i % 2 == 0 else -1 for i, url in enumerate(urls)}
+    with gpm.config.set({"base_dir": str(tmp_path), "use_listing_cache": True}):
+        assert listing.get_listings(urls, ttls=ttls) == expected_listings
+        assert len(http_server.requested_paths) == N_DIRECTORIES
+        assert os.path.exists(listing.get_listing_cache_filepath())
+
+        # Only the expired listings are requested again
+        assert listing.get_listings(urls, ttls=ttls) == expected_listings
+        assert len(http_server.requested_paths) == N_DIRECTORIES + N_DIRECTORIES // 2
+        assert listing.get_listing(urls[0]) == expected_listings[urls[0]]
+        assert listing.get_listing(urls[1]) is None
+
+        # Test listings provided within the context manager have precedence
+        with listing.use_listings({urls[0]: "other"}):
+            assert listing.get_listing(urls[0]) == "other"
+
+        listing.clear_listing_cache()
+        assert listing.get_listing(urls[0]) is None
+
+    # Test the listings are not cached if the cache is disabled
+    with gpm.config.set({"base_dir": str(tmp_path), "use_listing_cache": False}):
+        listing.get_listings(urls, ttls=ttls)
+        assert listing.get_cached_listings(urls) == {}
+
+
+def test_get_listings_cache_missing(http_server, tmp_path):
+    """Test that the missing or empty listings are cached for a short time only."""
+    urls = [f"{http_server.url}/dir_0/", f"{http_server.url}/missing/"]
+    ttls = dict.fromkeys(urls, listing.FINALIZED_TTL)
+    with gpm.config.set({"base_dir": str(tmp_path), "use_listing_cache": True}):
+        listing.get_listings(urls, ttls=ttls)
+        with sqlite3.connect(listing.get_listing_cache_filepath()) as con:
+            expiries = dict(con.execute("SELECT url, expiry FROM listings").fetchall())
+    assert expiries[urls[0]] > time.time() + listing.RECENT_TTL
+    assert expiries[urls[1]] <= time.time() + listing.RECENT_TTL
+
+
+def test_find_filepaths_pps(http_server, mocker, tmp_path):
+    """Test find_filepaths lists the PPS daily directories concurrently and caches the listings."""
+    mocker.patch.object(pps, "_get_pps_text_server", return_value=f"{http_server.url}/protected/text")
+    # Ensure curl is not called
+    mocker.patch.object(pps, "_get_pps_url_content", side_effect=AssertionError("curl called"))
+    kwargs = {
+        "storage": "PPS",
+        "product": "2A-DPR",
+        "start_time": datetime.datetime(2020, 7, 5, 10, 0, 0),
+        "end_time": datetime.datetime(2020, 7, 5, 23, 0, 0),
+        "version": 7,
+        "verbose": False,
+    }
+    config = {
+        "base_dir": str(tmp_path),
+        "username_pps": "user",
+        "password_pps": "password",
+        "use_listing_cache": True,
+    }
+    with gpm.config.set(config):
+        filepaths = find_filepaths(**kwargs)
+        assert filepaths == [f"ftps://arthurhouftps.pps.eosdis.nasa.gov/gpmdata/2020/07/05/radar/{FILENAME}"]
+        # The directories of 2020-07-04 (empty) and 2020-07-05 are listed
+        assert len(http_server.requested_paths) == 2
+
+        # The listings are cached
+        assert find_filepaths(**kwargs) == filepaths
+        assert len(http_server.requested_paths) == 2
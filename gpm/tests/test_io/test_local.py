@@ -100,7 +100,17 @@ def test_get_local_filepaths(tmp_path):
         )
         expected_filepaths = [filepath1, filepath2]
 
-        # Test it retrieve the available (fake) files
+        # Create partial downloads
+        for filename in ["file3.HDF5.part", "file3.HDF5.part.size"]:
+            create_fake_file(
+                base_dir=base_dir,
+                filename=filename,
+                product=product,
+                product_type=product_type,
+                version=version,
+            )
+
+        # Test it retrieve the available (fake) files (excluding partial downloads)
         returned_filepaths = local.get_local_filepaths(
             product=product,
             product_type=product_type,
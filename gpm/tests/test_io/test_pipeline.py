@@ -0,0 +1,241 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module test the download pipeline."""
+
+import datetime
+import os
+import shutil
+import threading
+import time
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+import gpm
+from gpm.io import download as dl
+from gpm.io.data_integrity import get_corrupted_filepaths
+from gpm.io.pipeline import DownloadPipeline
+from gpm.tests.utils.fake_granules import ORBIT_DURATION, create_fake_granule
+from gpm.tests.utils.servers import LocalHTTPServer, start_server, stop_server
+from gpm.utils.warnings import GPMDownloadWarning
+
+START_TIME = datetime.datetime(2020, 7, 5, 0, 0, 0)
+
+
+@pytest.fixture()
+def remote_dir(tmp_path):
+    """Directory with fake 2A-GMI granules."""
+    remote_dir = tmp_path / "remote"
+    os.makedirs(remote_dir)
+    for i in range(4):
+        create_fake_granule(remote_dir, START_TIME + i * ORBIT_DURATION, granule_id=36000 + i, n_scans=10, n_pixels=5)
+    return remote_dir
+
+
+class FakeDownloader:
+    """Copy files and write corrupted files for the first ``n_corrupted`` attempts of each file."""
+
+    def __init__(self, n_corrupted=0, n_failures=0, delay=0):
+        self.n_corrupted = n_corrupted
+        self.n_failures = n_failures
+        self.delay = delay
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, remote_filepath, local_filepath):
+        with self.lock:
+            attempt = self.attempts.get(remote_filepath, 0) + 1
+            self.attempts[remote_filepath] = attempt
+        time.sleep(self.delay)
+        if attempt <= self.n_failures:
+            raise OSError("Download failed")
+        os.makedirs(os.path.dirname(local_filepath), exist_ok=True)
+        if attempt <= self.n_failures + self.n_corrupted:
+            with open(local_filepath, "wb") as f:
+                f.write(b"corrupted")
+            return
+        shutil.copyfile(remote_filepath, local_filepath)
+
+
+def _get_filepaths(remote_dir, tmp_path):
+    remote_filepaths = sorted(str(remote_dir / filename) for filename in os.listdir(remote_dir))
+    local_filepaths = [str(tmp_path / "local" / os.path.basename(filepath)) for filepath in remote_filepaths]
+    return remote_filepaths, local_filepaths
+
+
+@pytest.mark.parametrize("n_threads", [2, "auto"])
+def test_download_pipeline(remote_dir, tmp_path, mocker: MockerFixture, n_threads):
+    """Test that corrupted downloads are retried and valid files are passed to the callback."""
+    remote_filepaths, local_filepaths = _get_filepaths(remote_dir, tmp_path)
+    downloader = FakeDownloader(n_corrupted=1)
+    processed = []
+    with gpm.config.set({"base_dir": str(tmp_path / "base_dir")}):
+        with DownloadPipeline(downloader, n_threads=n_threads, retry=1, backoff=0.01, callback=processed.append) as p:
+            p.submit(remote_filepaths[:2], local_filepaths[:2])
+            p.submit(remote_filepaths[2:], local_filepaths[2:])
+            status = p.join()
+        assert status == [1, 1, 1, 1]
+        assert p.failed_filepaths == []
+        assert sorted(processed) == local_filepaths
+        assert all(attempt == 2 for attempt in downloader.attempts.values())
+
+        # Test the verified files are recorded in the integrity ledger
+        spy = mocker.spy(gpm.io.data_integrity, "get_file_corruption")
+        assert get_corrupted_filepaths(local_filepaths) == []
+        assert spy.call_count == 0
+
+
+def test_download_pipeline_failures(remote_dir, tmp_path):
+    """Test that files are marked as failed once the retries are exhausted."""
+    remote_filepaths, local_filepaths = _get_filepaths(remote_dir, tmp_path)
+    downloader = FakeDownloader(n_failures=1, n_corrupted=1)
+    with DownloadPipeline(downloader, n_threads=2, retry=1, backoff=0.01) as pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        assert pipeline.join() == [0, 0, 0, 0]
+    assert pipeline.failed_filepaths == local_filepaths
+    assert all(attempt == 2 for attempt in downloader.attempts.values())
+    # The corrupted files are removed
+    assert not any(os.path.exists(filepath) for filepath in local_filepaths)
+
+    # Test the corrupted files are kept if remove_corrupted=False
+    downloader = FakeDownloader(n_corrupted=1)
+    with DownloadPipeline(downloader, retry=0, remove_corrupted=False) as pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        assert pipeline.join() == [0, 0, 0, 0]
+    assert all(os.path.exists(filepath) for filepath in local_filepaths)
+
+    # Test without integrity check
+    with DownloadPipeline(FakeDownloader(n_corrupted=1), check_integrity=False) as pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        assert pipeline.join() == [1, 1, 1, 1]
+
+
+def _failing_callback(filepath):
+    raise ValueError("Ingestion failed")
+
+
+def test_download_pipeline_callback_errors(remote_dir, tmp_path):
+    """Test that callback errors are reported with a warning."""
+    remote_filepaths, local_filepaths = _get_filepaths(remote_dir, tmp_path)
+    with DownloadPipeline(FakeDownloader(), callback=_failing_callback) as pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        with pytest.warns(GPMDownloadWarning, match="The callback failed for 4 files"):
+            assert pipeline.join() == [1, 1, 1, 1]
+    assert set(pipeline.callback_errors) == set(local_filepaths)
+
+
+def _slow_callback(filepath):
+    time.sleep(0.1)
+
+
+def test_download_pipeline_overlaps_stages(remote_dir, tmp_path):
+    """Test that the files are processed while the next files are downloaded."""
+    remote_filepaths, local_filepaths = _get_filepaths(remote_dir, tmp_path)
+    downloader = FakeDownloader(delay=0.1)
+    t_i = time.perf_counter()
+    with DownloadPipeline(downloader, n_threads=1, callback=_slow_callback) as pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        assert pipeline.join() == [1, 1, 1, 1]
+    elapsed = time.perf_counter() - t_i
+    # Sequential stages would take at least 0.8 seconds
+    assert elapsed < 0.7
+
+
+def _open_granule_callback(filepath):
+    ds = gpm.open_granule(filepath, variables="surfacePrecipitation", chunks=None)
+    return float(ds["surfacePrecipitation"].sum())
+
+
+def test_download_pipeline_callback_opening_granules(remote_dir, tmp_path):
+    """Test the callback can open the granules with xarray while the next files are verified."""
+    # Download many copies of the granules to overlap the verification with the callback
+    remote_filepaths = []
+    local_filepaths = []
+    for i in range(10):
+        remote_paths, local_paths = _get_filepaths(remote_dir, tmp_path / f"copy_{i}")
+        remote_filepaths += remote_paths
+        local_filepaths += local_paths
+    pipeline = DownloadPipeline(FakeDownloader(), n_threads=4, n_verify_threads=2, callback=_open_granule_callback)
+    with gpm.config.set({"warn_non_contiguous_scans": False}), pipeline:
+        pipeline.submit(remote_filepaths, local_filepaths)
+        assert pipeline.join() == [1] * len(local_filepaths)
+    assert pipeline.callback_errors == {}
+
+
+def test_download_archive_pipeline(remote_dir, tmp_path, mocker: MockerFixture):
+    """Test download_archive downloads, checks and processes the files with the pipeline."""
+    server = start_server(LocalHTTPServer(remote_dir))
+    remote_filepaths = [f"{server.url}/{filename}" for filename in sorted(os.listdir(remote_dir))]
+    mocker.patch.object(dl, "find_daily_filepaths", autospec=True, side_effect=[([], [7]), (remote_filepaths, [7])])
+    processed = []
+    config = {"base_dir": str(tmp_path / "base_dir"), "username_pps": "user", "password_pps": "password"}
+    try:
+        with gpm.config.set(config):
+            l_corrupted = dl.download_archive(
+                product="2A-GMI",
+                start_time=START_TIME,
+                end_time=START_TIME + datetime.timedelta(hours=1),
+                version=7,
+                transfer_tool="PYTHON",
+                progress_bar=False,
+                verbose=False,
+                callback=processed.append,
+            )
+    finally:
+        stop_server(server)
+    assert l_corrupted == []
+    assert len(processed) == 4
+    for filepath in processed:
+        with open(filepath, "rb") as f, open(remote_dir / os.path.basename(filepath), "rb") as f_remote:
+            assert f.read() == f_remote.read()
+
+
+def test_download_archive_pipeline_corrupted(remote_dir, tmp_path, mocker: MockerFixture):
+    """Test download_archive returns the files still corrupted after the retries of the pipeline."""
+    filename = sorted(os.listdir(remote_dir))[0]
+    with open(remote_dir / filename, "wb") as f:
+        f.write(b"corrupted")
+    server = start_server(LocalHTTPServer(remote_dir))
+    remote_filepaths = [f"{server.url}/{filename}" for filename in sorted(os.listdir(remote_dir))]
+    mocker.patch.object(dl, "find_daily_filepaths", autospec=True, side_effect=[([], [7]), (remote_filepaths, [7])])
+    config = {"base_dir": str(tmp_path / "base_dir"), "username_pps": "user", "password_pps": "password"}
+    try:
+        with gpm.config.set(config):
+            l_corrupted = dl.download_archive(
+                product="2A-GMI",
+                start_time=START_TIME,
+                end_time=START_TIME + datetime.timedelta(hours=1),
+                version=7,
+                transfer_tool="PYTHON",
+                retry=1,
+                progress_bar=False,
+                verbose=False,
+            )
+    finally:
+        stop_server(server)
+    assert [os.path.basename(filepath) for filepath in l_corrupted] == [filename]
+    # The corrupted file is downloaded twice (no additional redownload after the pipeline)
+    assert server.requested_paths.count(f"/{filename}") == 2
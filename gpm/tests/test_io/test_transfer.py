@@ -0,0 +1,250 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module test the pure-python transfer backend."""
+
+import ftplib
+import http.client
+import os
+
+import pytest
+
+from gpm.io import download as dl
+from gpm.io.transfer import (
+    HTTPConnectionPool,
+    TransferSession,
+    get_part_filepath,
+    get_part_size_filepath,
+    read_expected_size,
+)
+from gpm.tests.utils.servers import LocalFTPServer, LocalHTTPServer, start_server, stop_server
+
+N_FILES = 6
+TRANSFER_ERRORS = (OSError, http.client.HTTPException, ftplib.Error)
+
+
+@pytest.fixture()
+def remote_dir(tmp_path):
+    """Directory with the files served by the stand-in servers."""
+    remote_dir = tmp_path / "remote"
+    os.makedirs(remote_dir / "protected")
+    for i in range(N_FILES):
+        (remote_dir / f"file_{i}.HDF5").write_bytes(os.urandom(1000 * (i + 1)))
+    return remote_dir
+
+
+@pytest.fixture()
+def http_server(remote_dir):
+    server = start_server(LocalHTTPServer(remote_dir, username="user", password="password"))
+    yield server
+    stop_server(server)
+
+
+@pytest.fixture()
+def ftp_server(remote_dir):
+    server = start_server(LocalFTPServer(remote_dir))
+    yield server
+    stop_server(server)
+
+
+def _assert_downloaded(local_filepaths, remote_dir):
+    for filepath in local_filepaths:
+        expected = (remote_dir / os.path.basename(filepath)).read_bytes()
+        with open(filepath, "rb") as f:
+            assert f.read() == expected
+        assert not os.path.exists(get_part_filepath(filepath))
+
+
+@pytest.mark.parametrize("server_name", ["http_server", "ftp_server"])
+def test_transfer_session_reuses_connections(server_name, remote_dir, tmp_path, request):
+    """Test that a single connection is used to download many files."""
+    server = request.getfixturevalue(server_name)
+    local_filepaths = [str(tmp_path / "local" / f"file_{i}.HDF5") for i in range(N_FILES)]
+    with TransferSession(username="user", password="password") as session:
+        for i, local_filepath in enumerate(local_filepaths):
+            assert session.download(f"{server.url}/file_{i}.HDF5", local_filepath) == local_filepath
+        assert session.n_connections == 1
+    assert server.n_connections == 1
+    _assert_downloaded(local_filepaths, remote_dir)
+
+
+def test_transfer_session_http_redirect_and_authentication(http_server, remote_dir, tmp_path):
+    """Test that redirections are followed and credentials are sent on authentication challenges of the host."""
+    local_filepath = str(tmp_path / "file_0.HDF5")
+    url = f"{http_server.url}/redirect/protected/file_0.HDF5"
+    with TransferSession(username="user", password="password") as session:
+        session.download(url, local_filepath)
+    _assert_downloaded([local_filepath], remote_dir)
+    assert http_server.requested_paths == [
+        "/redirect/protected/file_0.HDF5",
+        "/protected/file_0.HDF5",
+        "/protected/file_0.HDF5",
+    ]
+
+    # Test invalid credentials
+    os.remove(local_filepath)
+    with TransferSession(username="user", password="invalid") as session, pytest.raises(OSError, match="401"):
+        session.download(url, local_filepath)
+    assert not os.path.exists(local_filepath)
+    assert not os.path.exists(get_part_filepath(local_filepath))
+
+    # Test credentials are not sent to another host reached through a redirection
+    http_server.redirect_url = f"http://localhost:{http_server.server_address[1]}"
+    with TransferSession(username="user", password="password") as session, pytest.raises(OSError, match="401"):
+        session.download(url, local_filepath)
+
+
+def test_http_connection_pool_can_authenticate():
+    """Test the hosts to which the credentials can be sent."""
+    pool = HTTPConnectionPool(username="user", password="password", auth_hosts=("auth.example.com",))
+    origin_hostname = "data.example.com"
+    assert pool._can_authenticate("https://data.example.com/file", origin_hostname)
+    assert pool._can_authenticate("https://auth.example.com/login", origin_hostname)
+    assert not pool._can_authenticate("https://other.example.com/file", origin_hostname)
+    assert not pool._can_authenticate("http://data.example.com/file", origin_hostname)
+    assert not pool._can_authenticate("http://auth.example.com/login", origin_hostname)
+    assert pool._can_authenticate("http://127.0.0.1:8000/file", "127.0.0.1")
+    assert not HTTPConnectionPool()._can_authenticate("https://data.example.com/file", origin_hostname)
+
+
+@pytest.mark.parametrize("server_name", ["http_server", "ftp_server"])
+def test_transfer_session_missing_file(server_name, tmp_path, request):
+    """Test that a failed download does not leave files on disk."""
+    server = request.getfixturevalue(server_name)
+    local_filepath = str(tmp_path / "missing.HDF5")
+    with TransferSession() as session, pytest.raises((OSError, ftplib.error_perm)):
+        session.download(f"{server.url}/missing.HDF5", local_filepath)
+    assert not os.path.exists(local_filepath)
+    assert not os.path.exists(get_part_filepath(local_filepath))
+
+
+def test_transfer_session_invalid_scheme(tmp_path):
+    """Test that unsupported URL schemes raise an error."""
+    with TransferSession() as session, pytest.raises(ValueError, match="Unsupported URL scheme"):
+        session.download("s3://bucket/file.HDF5", str(tmp_path / "file.HDF5"))
+
+
+@pytest.mark.parametrize("server_name", ["http_server", "ftp_server"])
+def test_run_transfers(server_name, remote_dir, tmp_path, request):
+    """Test the parallel download with persistent connections."""
+    server = request.getfixturevalue(server_name)
+    filenames = [f"file_{i}.HDF5" for i in range(N_FILES)] + ["missing.HDF5"]
+    remote_filepaths = [f"{server.url}/{filename}" for filename in filenames]
+    local_filepaths = [str(tmp_path / "local" / filename) for filename in filenames]
+    status = dl.run_transfers(
+        remote_filepaths=remote_filepaths,
+        local_filepaths=local_filepaths,
+        username="user",
+        password="password",
+        n_threads=2,
+        progress_bar=False,
+    )
+    assert status == [1] * N_FILES + [0]
+    assert server.n_connections <= 2
+    _assert_downloaded(local_filepaths[:-1], remote_dir)
+
+
+@pytest.mark.parametrize("server_name", ["http_server", "ftp_server"])
+def test_transfer_session_resume(server_name, remote_dir, tmp_path, request):
+    """Test that an interrupted download is resumed from the partial file."""
+    server = request.getfixturevalue(server_name)
+    local_filepath = str(tmp_path / "file_5.HDF5")
+    part_filepath = get_part_filepath(local_filepath)
+    file_size = (remote_dir / "file_5.HDF5").stat().st_size
+    url = f"{server.url}/file_5.HDF5"
+
+    # Interrupt the download
+    server.interrupt_after = 1000
+    with TransferSession() as session, pytest.raises(TRANSFER_ERRORS):
+        session.download(url, local_filepath)
+    assert not os.path.exists(local_filepath)
+    part_size = os.path.getsize(part_filepath)
+    assert 0 < part_size < file_size
+    assert read_expected_size(local_filepath) == file_size
+
+    # Resume the download
+    server.interrupt_after = None
+    with TransferSession() as session:
+        session.download(url, local_filepath)
+    _assert_downloaded([local_filepath], remote_dir)
+    assert not os.path.exists(get_part_size_filepath(local_filepath))
+    if server_name == "http_server":
+        assert server.requested_ranges == [f"bytes={part_size}-"]
+    else:
+        assert server.retrieved_paths[-1] == ("/file_5.HDF5", part_size)
+
+
+@pytest.mark.parametrize("server_name", ["http_server", "ftp_server"])
+def test_transfer_session_restart(server_name, remote_dir, tmp_path, request):
+    """Test that the download restarts from scratch if the remote file changed."""
+    server = request.getfixturevalue(server_name)
+    local_filepath = str(tmp_path / "file_5.HDF5")
+    url = f"{server.url}/file_5.HDF5"
+    server.interrupt_after = 1000
+    with TransferSession() as session, pytest.raises(TRANSFER_ERRORS):
+        session.download(url, local_filepath)
+
+    # Update the remote file
+    (remote_dir / "file_5.HDF5").write_bytes(os.urandom(3000))
+    server.interrupt_after = None
+    with TransferSession() as session:
+        session.download(url, local_filepath)
+    _assert_downloaded([local_filepath], remote_dir)
+
+
+def test_transfer_session_http_without_range_support(http_server, remote_dir, tmp_path):
+    """Test that the download restarts from scratch if the server does not support range requests."""
+    local_filepath = str(tmp_path / "file_5.HDF5")
+    url = f"{http_server.url}/file_5.HDF5"
+    http_server.interrupt_after = 1000
+    with TransferSession() as session, pytest.raises(TRANSFER_ERRORS):
+        session.download(url, local_filepath)
+    http_server.interrupt_after = None
+    http_server.support_range = False
+    with TransferSession() as session:
+        session.download(url, local_filepath)
+    _assert_downloaded([local_filepath], remote_dir)
+
+
+def test_run_transfers_auto(http_server, remote_dir, tmp_path):
+    """Test that the number of parallel downloads grows when the bandwidth is limited per connection."""
+    filenames = [f"small_{i}.HDF5" for i in range(40)]
+    for filename in filenames:
+        (remote_dir / filename).write_bytes(os.urandom(8192))
+    http_server.bandwidth = 200_000
+    status = dl.run_transfers(
+        remote_filepaths=[f"{http_server.url}/{filename}" for filename in filenames],
+        local_filepaths=[str(tmp_path / "local" / filename) for filename in filenames],
+        username="user",
+        password="password",
+        n_threads="auto",
+        progress_bar=True,
+    )
+    assert isinstance(status, dl.DownloadStatus)
+    assert status == [1] * 40
+    assert status.n_bytes == 40 * 8192
+    assert status.throughput > 0
+    assert status.n_threads[0] == 2
+    assert max(status.n_threads) > 2
@@ -0,0 +1,141 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# -----------------------------------------------------------------------------.
+"""This module test the flags utilities."""
+
+import dask.array
+import numpy as np
+import pytest
+import xarray as xr
+
+from gpm.utils.flags import get_flag_categories, get_flags, get_flags_mask
+
+
+@pytest.fixture()
+def ds_radar() -> xr.Dataset:
+    """Create a 2A-DPR dataset with raw (not decoded) flag variables."""
+    dims = ("cross_track", "along_track")
+    ds = xr.Dataset(
+        {
+            "qualityFlag": (dims, np.array([[0, 1, 2, -99]], dtype="int16")),
+            "typePrecip": (dims, np.array([[10000001, 21000000, -1111, 31000000]], dtype="int32")),
+            "flagPrecip": (dims, np.array([[0, 11, 1, 22]], dtype="int32")),
+            "precipRate": (dims, np.array([[0.0, 10.0, 1.0, 2.0]], dtype="float32")),
+        },
+        coords={"dataQuality": ("along_track", np.array([0, 1, 32, 96], dtype="uint8"))},
+    )
+    ds.attrs["gpm_api_product"] = "2A-DPR"
+    return ds
+
+
+def test_get_flags(ds_radar) -> None:
+    """Test the flag variables and categories."""
+    flags = get_flags(ds_radar)
+    assert list(flags) == ["qualityFlag", "typePrecip", "flagPrecip", "dataQuality"]
+    assert "quality" in flags
+    assert "pixel" not in flags
+    assert flags["quality"].name == "qualityFlag"
+    assert flags["qualityFlag"].categories == ["good", "low", "bad"]
+
+    # Test categories masks
+    np.testing.assert_equal(flags["qualityFlag"]["good"].values, [[True, False, False, False]])
+    np.testing.assert_equal(flags["typePrecip"]["convective"].values, [[False, True, False, False]])
+    np.testing.assert_equal(flags["flagPrecip"]["ku_and_ka"].values, [[False, True, False, True]])
+
+    # Test bits masks
+    np.testing.assert_equal(flags["dataQuality"]["missing"].values, [False, True, False, False])
+    np.testing.assert_equal(flags["dataQuality"]["geolocation_error"].values, [False, False, True, True])
+    np.testing.assert_equal(flags["dataQuality"]["geolocation_warning"].values, [False, False, False, True])
+
+    # Test all categories masks
+    ds_mask = flags["qualityFlag"].to_dataset()
+    assert list(ds_mask.data_vars) == ["good", "low", "bad"]
+    assert ds_mask["bad"].dtype == bool
+
+    # Test invalid flags and categories
+    with pytest.raises(ValueError, match="Valid categories"):
+        flags["qualityFlag"]["dummy"]
+    with pytest.raises(ValueError, match="not available"):
+        flags["pixel"]
+
+
+def test_get_flags_mask(ds_radar) -> None:
+    """Test the combination of multiple flags masks."""
+    mask = get_flags_mask(ds_radar, quality="good", precip=["stratiform", "convective"])
+    np.testing.assert_equal(mask.values, [[True, False, False, False]])
+
+    # Test the alias is resolved to the first flag variable with the requested category
+    mask = get_flags_mask(ds_radar, quality=["good", "low"], precip="ku_and_ka")
+    np.testing.assert_equal(mask.values, [[False, True, False, False]])
+
+    # Test the accessor
+    mask = ds_radar.gpm.mask(qualityFlag="good", dataQuality="good")
+    np.testing.assert_equal(mask.values, [[True, False, False, False]])
+
+    # Test invalid arguments
+    with pytest.raises(ValueError, match="Valid categories"):
+        get_flags_mask(ds_radar, quality="dummy")
+    with pytest.raises(ValueError):
+        get_flags_mask(ds_radar)
+
+
+def test_get_flags_mask_lazy(ds_radar) -> None:
+    """Test the flags masks are computed lazily in a single dask layer."""
+    ds_radar = ds_radar.chunk({"along_track": 2})
+    mask = ds_radar.gpm.mask(quality="good", precip=["stratiform", "convective"], dataQuality="good")
+    assert isinstance(mask.data, dask.array.Array)
+    np.testing.assert_equal(mask.values, [[True, False, False, False]])
+
+
+def test_get_flags_mask_decoded_variables() -> None:
+    """Test the flags masks of decoded flag variables with np.nan or _FillValue."""
+    # Float flag decoded with the default policy
+    da = xr.DataArray(np.array([0.0, 1.0, np.nan, 3.0]), dims="x", name="qualityFlag")
+    ds = xr.Dataset({"qualityFlag": da}, attrs={"gpm_api_product": "2A-GMI"})
+    np.testing.assert_equal(ds.gpm.flags["quality"]["good"].values, [True, False, False, False])
+    np.testing.assert_equal(ds.gpm.flags["quality"]["missing_channels"].values, [False, False, False, True])
+
+    # Integer flag decoded with the compact policy
+    ds["qualityFlag"] = ds["qualityFlag"].fillna(255).astype("uint8").assign_attrs({"_FillValue": 255})
+    np.testing.assert_equal(ds.gpm.mask(quality=["good", "caution"]).values, [True, True, False, False])
+
+
+def test_get_flag_categories_from_attrs() -> None:
+    """Test the flag categories inferred from the CF attributes."""
+    da = xr.DataArray(np.array([0, 1, 2, 5]), dims="x", name="dummy")
+    assert get_flag_categories(da) == {}
+
+    da.attrs = {"flag_values": [0, 1, 2], "flag_meanings": "clear cloudy unknown"}
+    assert get_flag_categories(da) == {
+        "clear": {"values": [0]},
+        "cloudy": {"values": [1]},
+        "unknown": {"values": [2]},
+    }
+
+    da.attrs = {"flag_masks": [1, 4], "flag_meanings": ["bit0", "bit2"]}
+    flags = get_flags(da)
+    np.testing.assert_equal(flags["dummy"]["bit0"].values, [False, True, False, True])
+    np.testing.assert_equal(flags["dummy"]["bit2"].values, [False, False, False, True])
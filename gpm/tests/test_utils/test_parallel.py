@@ -26,12 +26,15 @@
 # -----------------------------------------------------------------------------.
 """This module test the parallel utilities."""
 
+import functools
+import threading
+import time
 
 import dask
 import pytest
 from dask import delayed
 
-from gpm.utils.parallel import compute_list_delayed
+from gpm.utils.parallel import AIMDController, compute_list_delayed, run_adaptive
 
 
 # Test function to be used with dask.delayed
@@ -71,3 +74,78 @@ def test_compute_list_delayed():
     # Test with max_concurrent_tasks  > len(list_delayed)
     results = compute_list_delayed(list_delayed, max_concurrent_tasks=20)
     assert expected_results == results
+
+
+def test_aimd_controller():
+    """Check that AIMDController increases additively and decreases multiplicatively."""
+    controller = AIMDController(min_workers=1, max_workers=4, initial_workers=2)
+    assert controller.n_workers == 2
+
+    # Test additive increase (up to max_workers) if no errors and constant throughput
+    for _ in range(2 + 3 + 4 + 4):
+        controller.update(amount=0)
+    assert controller.history == [2, 3, 4, 4, 4]
+    assert controller.n_tasks == 13
+
+    # Test multiplicative decrease in case of errors
+    controller.update(amount=0, error=True)
+    assert controller.n_workers == 4  # the window is not completed
+    for _ in range(3):
+        controller.update(amount=0)
+    assert controller.n_workers == 2
+    assert controller.n_errors == 1
+    controller.update(error=True)
+    controller.update(error=True)
+    assert controller.n_workers == 1
+    controller.update(error=True)
+    assert controller.n_workers == 1  # min_workers
+
+    # Test invalid bounds
+    with pytest.raises(ValueError):
+        AIMDController(min_workers=0)
+    with pytest.raises(ValueError):
+        AIMDController(min_workers=3, max_workers=2)
+
+
+def test_aimd_controller_throughput_decrease(mocker):
+    """Check that AIMDController halves the number of workers if the throughput decreases."""
+    times = iter(range(100))
+    mocker.patch("gpm.utils.parallel.time.perf_counter", side_effect=lambda: next(times))
+    controller = AIMDController(min_workers=1, max_workers=10, initial_workers=4, tolerance=0.1)
+    for _ in range(4):
+        controller.update(amount=1000)
+    assert controller.n_workers == 5
+    # Throughput dropping by more than 10 %
+    for _ in range(5):
+        controller.update(amount=10)
+    assert controller.n_workers == 2
+    assert controller.history == [4, 5, 2]
+    assert controller.amount == 4 * 1000 + 5 * 10
+
+
+def _task(amount, fail, tracker):
+    with tracker["lock"]:
+        tracker["running"] += 1
+        tracker["max_running"] = max(tracker["max_running"], tracker["running"])
+    time.sleep(0.01)
+    with tracker["lock"]:
+        tracker["running"] -= 1
+    if fail:
+        raise ValueError("Task failure")
+    return amount
+
+
+def test_run_adaptive():
+    """Check that run_adaptive returns the status of each function and respects the controller."""
+    tracker = {"lock": threading.Lock(), "running": 0, "max_running": 0}
+    fails = [False] * 20 + [True] + [False] * 9
+    functions = [functools.partial(_task, 10, fail, tracker) for fail in fails]
+    controller = AIMDController(min_workers=1, max_workers=3, initial_workers=1)
+    callback_counts = []
+    status = run_adaptive(functions, controller=controller, callback=lambda c: callback_counts.append(c.n_tasks))
+    assert status == [int(not fail) for fail in fails]
+    assert tracker["max_running"] <= 3
+    assert max(controller.history) == 3
+    assert controller.amount == 10 * 29
+    assert controller.n_errors == 1
+    assert callback_counts == list(range(1, 31))
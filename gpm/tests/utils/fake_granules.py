@@ -0,0 +1,137 @@
+"""Utilities to create fake GPM granules readable by GPM-API."""
+
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+ORBIT_DURATION = datetime.timedelta(minutes=92, seconds=32)
+IMERG_TIME_INTERVAL = datetime.timedelta(minutes=30)
+
+
+def get_fake_granule_filename(start_time, end_time, granule_id):
+    """Return the filename of a fake 2A-GMI V07 granule."""
+    start_date = start_time.strftime("%Y%m%d")
+    start_hhmmss = start_time.strftime("%H%M%S")
+    end_hhmmss = end_time.strftime("%H%M%S")
+    return f"2A.GPM.GMI.GPROF2021v1.{start_date}-S{start_hhmmss}-E{end_hhmmss}.{granule_id:06d}.V07A.HDF5"
+
+
+def create_fake_granule(
+    dir_path,
+    start_time,
+    granule_id,
+    n_scans=2963,
+    n_pixels=221,
+    variables=("surfacePrecipitation",),
+):
+    """Create a fake 2A-GMI V07 granule.
+
+    The granule has the ``S1`` scan mode with the ``Latitude`` and ``Longitude`` variables,
+    the ``variables`` filled with random values, and the ``ScanTime`` group.
+
+    Returns
+    -------
+    filepath : str
+        Filepath of the fake granule.
+
+    """
+    import netCDF4
+
+    end_time = start_time + ORBIT_DURATION
+    filepath = os.path.join(dir_path, get_fake_granule_filename(start_time, end_time, granule_id))
+
+    # Define scans time and geolocation
+    time = pd.date_range(start_time, end_time, periods=n_scans)
+    phase = np.linspace(0, 2 * np.pi, n_scans)[:, None]
+    offsets = np.linspace(-4, 4, n_pixels)[None, :]
+    lat = 65 * np.sin(phase) + offsets / 2
+    lon = (np.rad2deg(phase) - 24 * granule_id + offsets + 180) % 360 - 180
+    rng = np.random.default_rng(granule_id)
+    dict_values = {"Latitude": lat, "Longitude": lon}
+    dict_values.update({var: rng.gamma(0.5, 2, size=(n_scans, n_pixels)) for var in variables})
+
+    file_header = f"GranuleNumber={granule_id};\nEmptyGranule=NOT_EMPTY;\nAlgorithmID=2AGPROF;\n"
+    with netCDF4.Dataset(filepath, mode="w", format="NETCDF4") as nc:
+        nc.setncattr("FileHeader", file_header)
+        group = nc.createGroup("S1")
+        group.createDimension("nscan", n_scans)
+        group.createDimension("npixel", n_pixels)
+        for name, values in dict_values.items():
+            var = group.createVariable(name, "f4", ("nscan", "npixel"), fill_value=-9999.9)
+            var.setncattr("DimensionNames", "nscan,npixel")
+            var[:] = values
+        scan_time = group.createGroup("ScanTime")
+        scan_time.createDimension("nscan", n_scans)
+        for name, values in [
+            ("Year", time.year),
+            ("Month", time.month),
+            ("DayOfMonth", time.day),
+            ("Hour", time.hour),
+            ("Minute", time.minute),
+            ("Second", time.second),
+        ]:
+            var = scan_time.createVariable(name, "i2", ("nscan",))
+            var.setncattr("DimensionNames", "nscan")
+            var[:] = values
+    return filepath
+
+
+def get_fake_imerg_granule_filename(start_time):
+    """Return the filename of a fake IMERG-FR V07 granule."""
+    end_time = start_time + IMERG_TIME_INTERVAL - datetime.timedelta(seconds=1)
+    minutes = start_time.hour * 60 + start_time.minute
+    return f"3B-HHR.MS.MRG.3IMERG.{start_time:%Y%m%d}-S{start_time:%H%M%S}-E{end_time:%H%M%S}.{minutes:04d}.V07B.HDF5"
+
+
+def create_fake_imerg_granule(dir_path, start_time, n_lon=36, n_lat=18):
+    """Create a fake IMERG-FR V07 half-hourly granule.
+
+    The granule has the ``Grid`` group with the ``time``, ``lon`` and ``lat`` coordinates and bounds,
+    the ``precipitation`` and ``randomError`` variables, and the ``Grid/Intermediate`` group with
+    the ``MWprecipitation`` variable.
+
+    Returns
+    -------
+    filepath : str
+        Filepath of the fake granule.
+
+    """
+    import netCDF4
+
+    filepath = os.path.join(dir_path, get_fake_imerg_granule_filename(start_time))
+    end_time = start_time + IMERG_TIME_INTERVAL
+    seconds = int((start_time - datetime.datetime(1970, 1, 1)).total_seconds())
+    lon_bnds = np.linspace(-180, 180, n_lon + 1)
+    lat_bnds = np.linspace(-90, 90, n_lat + 1)
+    rng = np.random.default_rng(seconds)
+
+    file_header = (
+        f"StartGranuleDateTime={start_time:%Y-%m-%dT%H:%M:%S}.000Z;\n"
+        f"StopGranuleDateTime={end_time - datetime.timedelta(seconds=1):%Y-%m-%dT%H:%M:%S}.999Z;\n"
+        "TimeInterval=HALF_HOUR;\nEmptyGranule=NOT_EMPTY;\nAlgorithmID=3IMERGHH;\n"
+    )
+    with netCDF4.Dataset(filepath, mode="w", format="NETCDF4") as nc:
+        nc.setncattr("FileHeader", file_header)
+        grid = nc.createGroup("Grid")
+        for dim, size in [("time", 1), ("lon", n_lon), ("lat", n_lat), ("nv", 2), ("lonv", 2), ("latv", 2)]:
+            grid.createDimension(dim, size)
+        var = grid.createVariable("time", "i4", ("time",))
+        var.setncattr("units", "seconds since 1970-01-01 00:00:00 UTC")
+        var[:] = seconds
+        var = grid.createVariable("time_bnds", "i4", ("time", "nv"))
+        var[:] = [[seconds, seconds + int(IMERG_TIME_INTERVAL.total_seconds())]]
+        grid.createVariable("lon", "f4", ("lon",))[:] = (lon_bnds[:-1] + lon_bnds[1:]) / 2
+        grid.createVariable("lon_bnds", "f4", ("lon", "lonv"))[:] = np.stack([lon_bnds[:-1], lon_bnds[1:]], axis=1)
+        grid.createVariable("lat", "f4", ("lat",))[:] = (lat_bnds[:-1] + lat_bnds[1:]) / 2
+        grid.createVariable("lat_bnds", "f4", ("lat", "latv"))[:] = np.stack([lat_bnds[:-1], lat_bnds[1:]], axis=1)
+        for name in ["precipitation", "randomError"]:
+            var = grid.createVariable(name, "f4", ("time", "lon", "lat"), fill_value=-9999.9, chunksizes=(1, n_lon, 9))
+            var.setncattr("DimensionNames", "time,lon,lat")
+            var[:] = rng.gamma(0.5, 2, size=(1, n_lon, n_lat))
+        intermediate = grid.createGroup("Intermediate")
+        var = intermediate.createVariable("MWprecipitation", "f4", ("time", "lon", "lat"), fill_value=-9999.9)
+        var.setncattr("DimensionNames", "time,lon,lat")
+        var[:] = rng.gamma(0.5, 2, size=(1, n_lon, n_lat))
+    return filepath
@@ -0,0 +1,218 @@
+"""Local HTTP and FTP stand-in servers to test the GPM-API transfer routines."""
+
+import base64
+import functools
+import http.server
+import os
+import socket
+import socketserver
+import threading
+import time
+
+
+class _CountingMixin:
+    """Count the client connections accepted by a server."""
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.n_connections += 1
+        super().process_request(request, client_address)
+
+
+class _HTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve files with keep-alive connections.
+
+    - A directory is served with the content of its ``index.html`` file.
+    - ``/redirect/<path>`` redirects to ``/<path>`` (on ``server.redirect_url`` if not ``None``).
+    - ``/protected/<path>`` requires the server HTTP Basic credentials.
+    - ``Range`` requests are supported if ``server.support_range`` is ``True``.
+    - The connection is closed after ``server.interrupt_after`` bytes of content (if not ``None``).
+    - The content is sent at ``server.bandwidth`` bytes per second per connection (if not ``None``).
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requested_paths.append(self.path)
+        if self.path.startswith("/redirect/"):
+            self.send_response(302)
+            self.send_header("Location", (self.server.redirect_url or "") + self.path[len("/redirect") :])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/protected/"):
+            if self.headers.get("Authorization") != self.server.authorization:
+                self.send_response(401)
+                self.send_header("WWW-Authenticate", 'Basic realm="test"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.path = self.path[len("/protected") :]
+        self._send_file(self.translate_path(self.path))
+
+    def _send_file(self, filepath):
+        if os.path.isdir(filepath):
+            filepath = os.path.join(filepath, "index.html")
+        if not os.path.isfile(filepath):
+            self.send_error(404, "File not found")
+            return
+        with open(filepath, "rb") as f:
+            content = f.read()
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header is not None and self.server.support_range:
+            self.server.requested_ranges.append(range_header)
+            start = int(range_header.removeprefix("bytes=").split("-")[0])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(content) - start))
+        self.end_headers()
+        content = content[start:]
+        if self.server.interrupt_after is not None:
+            self.wfile.write(content[: self.server.interrupt_after])
+            self.close_connection = True
+            return
+        if self.server.bandwidth is not None:
+            chunk_size = 4096
+            for i in range(0, len(content), chunk_size):
+                self.wfile.write(content[i : i + chunk_size])
+                time.sleep(chunk_size / self.server.bandwidth)
+            return
+        self.wfile.write(content)
+
+
+class LocalHTTPServer(_CountingMixin, http.server.ThreadingHTTPServer):
+    """HTTP server serving the files of a local directory."""
+
+    daemon_threads = True
+
+    def __init__(self, directory, username="user", password="password"):
+        handler = functools.partial(_HTTPRequestHandler, directory=str(directory))
+        super().__init__(("127.0.0.1", 0), handler)
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
+        self.authorization = f"Basic {credentials}"
+        self.lock = threading.Lock()
+        self.n_connections = 0
+        self.requested_paths = []
+        self.requested_ranges = []
+        self.support_range = True
+        self.interrupt_after = None
+        self.bandwidth = None
+        self.redirect_url = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _FTPRequestHandler(socketserver.StreamRequestHandler):
+    """Minimal passive-mode FTP server supporting file retrieval.
+
+    The data connection is closed after ``server.interrupt_after`` bytes (if not ``None``).
+    """
+
+    disable_nagle_algorithm = True
+
+    def _reply(self, msg):
+        self.wfile.write(f"{msg}\r\n".encode())
+
+    def _get_filepath(self, path):
+        return os.path.join(self.server.directory, path.lstrip("/"))
+
+    def _retrieve(self, data_socket, path, offset):
+        filepath = self._get_filepath(path)
+        if data_socket is None:
+            self._reply("425 Use PASV first.")
+            return
+        if not os.path.isfile(filepath):
+            data_socket.close()
+            self._reply("550 File not found.")
+            return
+        self._reply("150 Opening data connection.")
+        connection, _ = data_socket.accept()
+        with connection, open(filepath, "rb") as f:
+            f.seek(offset)
+            content = f.read()
+            if self.server.interrupt_after is not None:
+                content = content[: self.server.interrupt_after]
+            connection.sendall(content)
+        data_socket.close()
+        self.server.retrieved_paths.append((path, offset))
+        if self.server.interrupt_after is not None:
+            self._reply("426 Connection closed; transfer aborted.")
+            return
+        self._reply("226 Transfer complete.")
+
+    def handle(self):
+        self._reply("220 GPM-API test server ready.")
+        data_socket = None
+        offset = 0
+        while line := self.rfile.readline().decode().strip():
+            cmd, _, arg = line.partition(" ")
+            cmd = cmd.upper()
+            if cmd == "USER":
+                self._reply("331 Password required.")
+            elif cmd == "PASS":
+                self._reply("230 Logged in.")
+            elif cmd == "TYPE":
+                self._reply("200 Type set.")
+            elif cmd == "PASV":
+                data_socket = socket.create_server(("127.0.0.1", 0))
+                port = data_socket.getsockname()[1]
+                self._reply(f"227 Entering Passive Mode (127,0,0,1,{port // 256},{port % 256}).")
+            elif cmd == "SIZE":
+                filepath = self._get_filepath(arg)
+                if os.path.isfile(filepath):
+                    self._reply(f"213 {os.path.getsize(filepath)}")
+                else:
+                    self._reply("550 File not found.")
+            elif cmd == "REST":
+                offset = int(arg)
+                self._reply(f"350 Restarting at {offset}.")
+            elif cmd == "RETR":
+                self._retrieve(data_socket, arg, offset=offset)
+                data_socket = None
+                offset = 0
+            elif cmd == "QUIT":
+                self._reply("221 Goodbye.")
+                return
+            else:
+                self._reply("502 Command not implemented.")
+
+
+class LocalFTPServer(_CountingMixin, socketserver.ThreadingTCPServer):
+    """FTP server serving the files of a local directory."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, directory):
+        super().__init__(("127.0.0.1", 0), _FTPRequestHandler)
+        self.directory = str(directory)
+        self.lock = threading.Lock()
+        self.n_connections = 0
+        self.retrieved_paths = []
+        self.interrupt_after = None
+
+    @property
+    def url(self):
+        return f"ftp://127.0.0.1:{self.server_address[1]}"
+
+
+def start_server(server):
+    """Serve requests in a background thread."""
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_server(server):
+    """Stop a server started with ``start_server``."""
+    server.shutdown()
+    server.server_close()
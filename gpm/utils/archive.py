@@ -31,11 +31,7 @@ import numpy as np
 
 from gpm.io.checks import check_start_end_time
 from gpm.io.find import find_filepaths
-from gpm.io.info import (
-    get_end_time_from_filepaths,
-    get_granule_from_filepaths,
-    get_start_time_from_filepaths,
-)
+from gpm.io.info import _to_pydatetime, parse_filepaths
 from gpm.utils.warnings import GPM_Warning
 
 ####--------------------------------------------------------------------------.
@@ -72,7 +68,7 @@ def check_no_duplicated_files(
     ##---------------------------------------------------------------------.
     # Retrieve granule id from filename
     filepaths = np.array(filepaths)
-    granule_ids = get_granule_from_filepaths(filepaths)
+    granule_ids = parse_filepaths(filepaths)["granule_id"].to_numpy()
 
     # Count granule ids occurrence
     ids, counts = np.unique(granule_ids, return_counts=True)
@@ -103,8 +99,9 @@ def check_time_period_coverage(filepaths, start_time, end_time, raise_error=Fals
 
     # Get first and last timestep from filepaths
     filepaths = sorted(filepaths)
-    first_start = get_start_time_from_filepaths(filepaths[0])[0]
-    last_end = get_end_time_from_filepaths(filepaths[-1])[0]
+    df = parse_filepaths([filepaths[0], filepaths[-1]])
+    first_start = _to_pydatetime(df["start_time"])[0]
+    last_end = _to_pydatetime(df["end_time"])[-1]
     # Check time period is covered
     msg = ""
     if first_start > start_time:
@@ -138,13 +135,14 @@ def get_time_period_with_missing_files(filepaths):
     from gpm.utils.checks import _is_contiguous_granule
     from gpm.utils.slices import get_list_slices_from_bool_arr
 
-    # Retrieve granule id from filename
-    granule_ids = get_granule_from_filepaths(filepaths)
+    # Retrieve granule id, start_time and end_time from filenames
+    df = parse_filepaths(filepaths)
 
     # Sort filepaths by granule number
-    indices = np.argsort(granule_ids)
-    filepaths = np.array(filepaths)[indices]
-    granule_ids = np.array(granule_ids)[indices]
+    df = df.sort_values("granule_id", kind="stable")
+    granule_ids = df["granule_id"].to_numpy()
+    start_times = _to_pydatetime(df["start_time"])
+    end_times = _to_pydatetime(df["end_time"])
 
     # Check if next file granule number is +1
     is_not_missing = _is_contiguous_granule(granule_ids)
@@ -163,8 +161,8 @@ def get_time_period_with_missing_files(filepaths):
         )
         # Retrieve start and end_time where there are missing files
         for slc in list_slices[0:-1]:
-            missing_start = get_end_time_from_filepaths(filepaths[slc.stop - 1])[0]
-            missing_end = get_start_time_from_filepaths(filepaths[slc.stop])[0]
+            missing_start = end_times[slc.stop - 1]
+            missing_end = start_times[slc.stop]
             list_missing.append((missing_start, missing_end))
     return list_missing
 
@@ -51,6 +51,17 @@ def clean_memory(client):
     client.run(trim_memory)
 
 
+def count_dask_tasks(xr_obj):
+    """Return the number of tasks of the dask graph of a xarray object.
+
+    ``0`` is returned if the xarray object is not backed by dask arrays.
+    """
+    graph = xr_obj.__dask_graph__()
+    if graph is None:
+        return 0
+    return len(graph)
+
+
 def get_client():
     from dask.distributed import get_client
 
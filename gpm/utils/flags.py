@@ -0,0 +1,437 @@
+# -----------------------------------------------------------------------------.
+# MIT License
+
+# Copyright (c) 2024 GPM-API developers
+#
+# This file is part of GPM-API.
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module contains functions to derive boolean masks from GPM flag variables.
+
+The masks are computed with vectorized comparisons and bitwise operations on the raw integer
+values of the flag variables, without requiring the decoding of the flag variables.
+
+Each flag variable category is defined by one of the following specifications:
+
+- ``{"values": [...]}``: the flag is equal to one of the values.
+- ``{"bits": [...]}``: at least one of the bits of the flag is set.
+- ``{"range": [vmin, vmax]}``: the flag is within ``[vmin, vmax)``. ``None`` means unbounded.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import xarray as xr
+
+from gpm.io.products import get_product_category
+from gpm.utils.xarray import check_is_xarray
+
+####--------------------------------------------------------------------------.
+#### Flags definitions
+# - The categories are defined for the ``ALL`` products, a product category or a specific product.
+# - If a product (category) specific definition is available, it takes precedence.
+
+_PMW_QUALITY_CATEGORIES = {
+    "good": {"values": [0]},
+    "sun_glint": {"values": [1]},
+    "rfi": {"values": [2]},
+    "degraded_geolocation": {"values": [3]},
+    "warm_load_corrected": {"values": [4]},
+    "missing": {"values": [-1]},
+    "invalid_tb": {"values": [-2]},
+    "geolocation_error": {"values": [-3]},
+    "missing_channel": {"values": [-4]},
+    "missing_channels": {"values": [-5]},
+    "invalid_lonlat": {"values": [-6]},
+    "non_normal_status": {"values": [-7]},
+    "warning": {"range": [1, None]},
+    "bad": {"range": [None, 0]},
+}
+
+FLAGS_CATEGORIES = {
+    "qualityFlag": {
+        "RADAR": {
+            "good": {"values": [0]},
+            "low": {"values": [1]},
+            "bad": {"values": [2]},
+        },
+        "PMW": {
+            "good": {"values": [0]},
+            "caution": {"values": [1]},
+            "snow": {"values": [2]},
+            "missing_channels": {"values": [3]},
+        },
+    },
+    "Quality": {"PMW": _PMW_QUALITY_CATEGORIES},
+    "L1CqualityFlag": {"PMW": _PMW_QUALITY_CATEGORIES},
+    "dataQuality": {
+        "ALL": {
+            "good": {"values": [0]},
+            "missing": {"bits": [0]},
+            "geolocation_error": {"bits": [5]},
+            "geolocation_warning": {"bits": [6]},
+            "non_normal_status": {"bits": [7]},
+        },
+    },
+    "pixelStatus": {
+        "PMW": {
+            "valid": {"values": [0]},
+            "invalid_lonlat": {"values": [1]},
+            "invalid_tb": {"values": [2]},
+            "surface_mismatch": {"values": [3]},
+            "missing_ancillary": {"values": [4]},
+            "no_solution": {"values": [5]},
+        },
+    },
+    "precipitationYesNoFlag": {
+        "PMW": {
+            "no_precip": {"values": [0]},
+            "precip": {"values": [1]},
+        },
+    },
+    "flagPrecip": {
+        "RADAR": {
+            "no_precip": {"values": [0]},
+            "precip": {"values": [1]},
+        },
+        "2A-DPR": {
+            "no_precip": {"values": [0]},
+            "precip": {"values": [1, 2, 10, 11, 12, 20, 21, 22]},
+            "ka_only": {"values": [1, 2]},
+            "ku_only": {"values": [10]},
+            "ku_and_ka": {"values": [11, 12, 20, 21, 22]},
+        },
+    },
+    "typePrecip": {
+        "RADAR": {
+            "no_precip": {"range": [None, 10_000_000]},
+            "stratiform": {"range": [10_000_000, 20_000_000]},
+            "convective": {"range": [20_000_000, 30_000_000]},
+            "other": {"range": [30_000_000, 40_000_000]},
+        },
+    },
+    "flagBB": {
+        "RADAR": {
+            "no_bright_band": {"values": [0]},
+            "bright_band": {"range": [1, None]},
+        },
+    },
+}
+
+FLAGS_ALIASES = {
+    "quality": ["qualityFlag", "Quality", "L1CqualityFlag", "dataQuality"],
+    "precip": ["typePrecip", "flagPrecip", "precipitationYesNoFlag"],
+    "pixel": ["pixelStatus"],
+    "bright_band": ["flagBB"],
+}
+
+
+####--------------------------------------------------------------------------.
+#### Flags categories
+
+
+def _get_product_keys(product):
+    """Return the flag definition keys to search for a given product (by order of precedence)."""
+    keys = ["ALL"]
+    if product is not None:
+        try:
+            keys = [product, get_product_category(product), *keys]
+        except Exception:
+            keys = [product, *keys]
+    return keys
+
+
+def _get_categories_from_attrs(da):
+    """Return the flag categories defined by the CF ``flag_values``/``flag_masks`` and ``flag_meanings`` attributes."""
+    meanings = da.attrs.get("flag_meanings", None)
+    if meanings is None:
+        return {}
+    if isinstance(meanings, str):
+        meanings = meanings.split(" ")
+    if "flag_masks" in da.attrs:
+        masks = np.atleast_1d(da.attrs["flag_masks"]).astype(int)
+        return {meaning: {"bits": [int(mask).bit_length() - 1]} for meaning, mask in zip(meanings, masks)}
+    if "flag_values" in da.attrs:
+        values = np.atleast_1d(da.attrs["flag_values"]).tolist()
+        return {meaning: {"values": [value]} for meaning, value in zip(meanings, values)}
+    return {}
+
+
+def get_flag_categories(da, product=None):
+    """Return the categories of a flag `xarray.DataArray`.
+
+    The categories of the GPM flag variables are defined in ``FLAGS_CATEGORIES``.
+    For the other variables, the categories are inferred from the CF ``flag_values``
+    (or ``flag_masks``) and ``flag_meanings`` attributes.
+
+    Parameters
+    ----------
+    da : xarray.DataArray
+        Flag variable.
+    product : str, optional
+        GPM product acronym. If ``None``, it is taken from the ``gpm_api_product`` attribute.
+
+    Returns
+    -------
+    categories : dict
+        Dictionary with the specification of each flag category.
+
+    """
+    product = da.attrs.get("gpm_api_product", None) if product is None else product
+    definitions = FLAGS_CATEGORIES.get(da.name, {})
+    for key in _get_product_keys(product):
+        if key in definitions:
+            return definitions[key]
+    return _get_categories_from_attrs(da)
+
+
+####--------------------------------------------------------------------------.
+#### Masks
+
+
+def _np_flag_category_mask(arr, spec, fill_value=None):
+    """Return the boolean mask of a flag category for a numpy array."""
+    arr = np.asanyarray(arr)
+    if np.issubdtype(arr.dtype, np.floating):
+        is_valid = np.isfinite(arr)
+        arr = np.where(is_valid, arr, 0).astype(np.int64)
+    else:
+        is_valid = np.ones(arr.shape, dtype=bool) if fill_value is None else arr != fill_value
+    if "values" in spec:
+        mask = np.isin(arr, spec["values"])
+    elif "bits" in spec:
+        bitmask = sum(1 << int(bit) for bit in spec["bits"])
+        mask = (arr.astype(np.int64) & bitmask) != 0
+    elif "range" in spec:
+        vmin, vmax = spec["range"]
+        mask = np.ones(arr.shape, dtype=bool)
+        if vmin is not None:
+            mask &= arr >= vmin
+        if vmax is not None:
+            mask &= arr < vmax
+    else:
+        raise ValueError(f"Invalid flag category specification {spec}.")
+    return mask & is_valid
+
+
+def _np_flags_mask(*arrays, specs, fill_values):
+    """Return the boolean mask combining the flag categories of several numpy arrays.
+
+    ``specs`` is a list (one per array) of category specifications lists.
+    Within an array, the categories are combined with OR. Across arrays, with AND.
+    """
+    mask = True
+    for arr, arr_specs, fill_value in zip(arrays, specs, fill_values):
+        arr_mask = False
+        for spec in arr_specs:
+            arr_mask = arr_mask | _np_flag_category_mask(arr, spec, fill_value=fill_value)
+        mask = mask & arr_mask
+    return mask
+
+
+def _get_fill_value(da):
+    """Return the ``_FillValue`` attribute of integer flag variables (i.e. decoded with the compact policy)."""
+    if np.issubdtype(da.dtype, np.integer):
+        return da.attrs.get("_FillValue", None)
+    return None
+
+
+def _apply_flags_mask(dataarrays, specs):
+    """Compute lazily the boolean mask of the flag categories in a single pass over the data."""
+    mask = xr.apply_ufunc(
+        _np_flags_mask,
+        *dataarrays,
+        kwargs={"specs": specs, "fill_values": [_get_fill_value(da) for da in dataarrays]},
+        dask="parallelized",
+        output_dtypes=[bool],
+        keep_attrs=False,
+    )
+    mask.name = "mask"
+    return mask
+
+
+def _get_dataarrays(xr_obj):
+    """Return the variables and coordinates of a xarray object as a dictionary of `xarray.DataArray`."""
+    if isinstance(xr_obj, xr.Dataset):
+        return {name: xr_obj[name] for name in xr_obj.variables}
+    dict_da = {name: xr_obj[name] for name in xr_obj.coords}
+    if xr_obj.name is not None:
+        dict_da[xr_obj.name] = xr_obj
+    return dict_da
+
+
+class FlagVariable(Mapping):
+    """Mapping of the categories of a flag variable to lazy boolean masks."""
+
+    def __init__(self, da, categories):
+        self._da = da
+        self._categories = categories
+
+    @property
+    def name(self):
+        return self._da.name
+
+    @property
+    def categories(self):
+        return list(self._categories)
+
+    def _check_category(self, category):
+        if category not in self._categories:
+            raise ValueError(
+                f"Invalid category '{category}' for the '{self.name}' flag. Valid categories are {self.categories}.",
+            )
+
+    def __getitem__(self, category):
+        self._check_category(category)
+        mask = _apply_flags_mask([self._da], specs=[[self._categories[category]]])
+        mask.name = category
+        return mask
+
+    def __contains__(self, category):
+        return category in self._categories
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def __repr__(self):
+        return f"<FlagVariable '{self.name}' with categories {self.categories}>"
+
+    def to_dataset(self):
+        """Return a dataset with the boolean mask of each category."""
+        return xr.Dataset({category: self[category] for category in self._categories})
+
+
+class GPMFlags(Mapping):
+    """Mapping of the flag variables of a GPM xarray object.
+
+    The flag variables can be accessed by variable name or by alias (see ``FLAGS_ALIASES``).
+    """
+
+    def __init__(self, xr_obj):
+        check_is_xarray(xr_obj)
+        self._obj = xr_obj
+        self._product = xr_obj.attrs.get("gpm_api_product", None)
+        self._variables = {}
+        for name, da in _get_dataarrays(xr_obj).items():
+            categories = get_flag_categories(da, product=self._product)
+            if categories:
+                self._variables[name] = FlagVariable(da, categories)
+
+    def _resolve(self, name, category=None):
+        """Return the flag variable corresponding to a variable name or alias."""
+        if name in self._variables:
+            return self._variables[name]
+        candidates = [
+            self._variables[variable] for variable in FLAGS_ALIASES.get(name, []) if variable in self._variables
+        ]
+        if len(candidates) == 0:
+            raise ValueError(
+                f"The flag '{name}' is not available. Available flags are {list(self._variables)}. "
+                f"Available aliases are {list(FLAGS_ALIASES)}.",
+            )
+        for flag in candidates:
+            if category is None or category in flag:
+                return flag
+        valid_categories = {flag.name: flag.categories for flag in candidates}
+        raise ValueError(
+            f"Invalid category '{category}' for the '{name}' flag. Valid categories are {valid_categories}.",
+        )
+
+    def __getitem__(self, name):
+        return self._resolve(name)
+
+    def __contains__(self, name):
+        return name in self._variables or any(variable in self._variables for variable in FLAGS_ALIASES.get(name, []))
+
+    def __iter__(self):
+        return iter(self._variables)
+
+    def __len__(self):
+        return len(self._variables)
+
+    def __repr__(self):
+        return f"<GPMFlags with flags {list(self._variables)}>"
+
+    def mask(self, **flags):
+        """Return the boolean mask where all the flags are in the specified categories.
+
+        See ``gpm.utils.flags.get_flags_mask`` for more details.
+        """
+        if len(flags) == 0:
+            raise ValueError("Specify at least one flag (i.e. quality='good').")
+        dataarrays = []
+        specs = []
+        for name, categories in flags.items():
+            categories = [categories] if isinstance(categories, str) else list(categories)
+            flag = self._resolve(name, category=categories[0])
+            for category in categories:
+                flag._check_category(category)
+            dataarrays.append(flag._da)
+            specs.append([flag._categories[category] for category in categories])
+        return _apply_flags_mask(dataarrays, specs=specs)
+
+
+def get_flags(xr_obj):
+    """Return the flag variables of a GPM xarray object.
+
+    Each flag variable is a mapping of its categories to lazy boolean masks.
+    The flag variables can be accessed by variable name or by alias (i.e. ``"quality"``, ``"precip"``).
+
+    Examples
+    --------
+    >>> flags = get_flags(ds)
+    >>> flags["qualityFlag"].categories
+    ['good', 'low', 'bad']
+    >>> da_mask = flags["qualityFlag"]["good"]
+
+    """
+    return GPMFlags(xr_obj)
+
+
+def get_flags_mask(xr_obj, **flags):
+    """Return the boolean mask where all the specified flags are in the specified categories.
+
+    The mask is computed lazily in a single pass over the (raw or decoded) flag variables.
+
+    Parameters
+    ----------
+    xr_obj : xarray.Dataset or xarray.DataArray
+        GPM xarray object.
+    **flags
+        Flag variable names (or aliases) and category (or list of categories).
+        Multiple categories of a flag are combined with OR.
+        Multiple flags are combined with AND.
+        Aliases are resolved to the first available flag variable with the requested category.
+
+    Returns
+    -------
+    mask : xarray.DataArray
+        Boolean mask.
+
+    Examples
+    --------
+    >>> mask = get_flags_mask(ds, quality="good", precip=["convective", "stratiform"])
+    >>> ds_masked = ds.where(mask)
+
+    """
+    return get_flags(xr_obj).mask(**flags)
@@ -25,6 +25,10 @@
 
 # -----------------------------------------------------------------------------.
 """This module contains utilities for parallel processing."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import dask
 
 
@@ -53,3 +57,131 @@ def compute_list_delayed(list_delayed, max_concurrent_tasks=None):
         subset_delayed = list_delayed[i : (i + max_concurrent_tasks)]
         computed_results.extend(dask.compute(*subset_delayed))
     return computed_results
+
+
+class AIMDController:
+    """Adapt the number of concurrent tasks with an additive-increase/multiplicative-decrease rule.
+
+    The tasks report the amount of work (i.e. the number of bytes) they processed.
+    Every ``n_workers`` completed tasks, the throughput of the last window of tasks is compared
+    with the throughput of the previous window:
+
+    - if no task failed and the throughput did not decrease, one worker is added;
+    - if a task failed or the throughput decreased by more than ``tolerance``,
+      the number of workers is halved.
+
+    Parameters
+    ----------
+    min_workers : int, optional
+        Minimum number of concurrent tasks. The default is 1.
+    max_workers : int, optional
+        Maximum number of concurrent tasks. The default is 10.
+    initial_workers : int, optional
+        Initial number of concurrent tasks. The default is 2.
+    tolerance : float, optional
+        Relative throughput decrease tolerated before reducing the number of workers.
+        The default is 0.1.
+
+    """
+
+    def __init__(self, min_workers=1, max_workers=10, initial_workers=2, tolerance=0.1):
+        if min_workers < 1 or max_workers < min_workers:
+            raise ValueError("Expecting 1 <= 'min_workers' <= 'max_workers'.")
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.n_workers = min(max(initial_workers, min_workers), max_workers)
+        self.tolerance = tolerance
+        self.history = [self.n_workers]
+        self.n_tasks = 0
+        self.n_errors = 0
+        self.amount = 0
+        self.start_time = time.perf_counter()
+        self._previous_throughput = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_start_time = time.perf_counter()
+        self._window_tasks = 0
+        self._window_errors = 0
+        self._window_amount = 0
+
+    @property
+    def elapsed(self):
+        """Time elapsed since the controller creation (in seconds)."""
+        return time.perf_counter() - self.start_time
+
+    @property
+    def throughput(self):
+        """Average throughput since the controller creation (amount per second)."""
+        return self.amount / max(self.elapsed, 1e-9)
+
+    def update(self, amount=0, error=False):
+        """Record the completion of a task and adapt the number of workers at the end of a window."""
+        self.n_tasks += 1
+        self.n_errors += int(error)
+        self.amount += amount
+        self._window_tasks += 1
+        self._window_errors += int(error)
+        self._window_amount += amount
+        if self._window_tasks >= self.n_workers:
+            self._adapt()
+
+    def _adapt(self):
+        elapsed = max(time.perf_counter() - self._window_start_time, 1e-9)
+        throughput = self._window_amount / elapsed
+        previous_throughput = self._previous_throughput
+        if self._window_errors > 0 or (
+            previous_throughput is not None and throughput < (1 - self.tolerance) * previous_throughput
+        ):
+            self.n_workers = max(self.min_workers, self.n_workers // 2)
+            # The throughput with less workers is compared with the next window
+            self._previous_throughput = None
+        else:
+            self.n_workers = min(self.max_workers, self.n_workers + 1)
+            self._previous_throughput = throughput
+        self.history.append(self.n_workers)
+        self._reset_window()
+
+
+def run_adaptive(functions, controller, callback=None):
+    """Run functions in a pool of threads whose size is adapted by a controller.
+
+    Parameters
+    ----------
+    functions : list
+        List of functions without arguments returning the amount of work processed.
+    controller : AIMDController
+        Controller defining the number of concurrent functions.
+    callback : callable, optional
+        Function called with the controller every time a function completes.
+
+    Returns
+    -------
+    status : list
+        Execution status of each function. 0=Failed. 1=Success.
+
+    """
+    status = [0] * len(functions)
+    pending = iter(enumerate(functions))
+    running = {}
+    with ThreadPoolExecutor(max_workers=controller.max_workers) as executor:
+        while True:
+            # Submit new functions until the number of workers is reached
+            while len(running) < controller.n_workers:
+                item = next(pending, None)
+                if item is None:
+                    break
+                i, function = item
+                running[executor.submit(function)] = i
+            if len(running) == 0:
+                break
+            # Record the completed functions
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                error = future.exception() is not None
+                status[i] = int(not error)
+                controller.update(amount=0 if error else future.result() or 0, error=error)
+                if callback is not None:
+                    callback(controller)
+    return status
@@ -460,6 +460,10 @@ def preprocess_rgb_dataarray(da, rgb):
 
 def check_object_format(da, plot_kwargs, check_function, **function_kwargs):
     """Check object format and valid dimension names."""
+    from gpm.dataset.decoding.dtypes import mask_fill_value
+
+    # Mask the _FillValue of integer flags (i.e. decoded with decode_dtype_policy="compact")
+    da = mask_fill_value(da)
     # Preprocess RGB DataArrays
     da = da.squeeze()
     da = preprocess_rgb_dataarray(da, plot_kwargs.get("rgb", False))